@@ -10,7 +10,9 @@ import json
 import logging
 import os
 import re
+import signal
 import sys
+import threading
 
 from aws_lambda_builders import RPC_PROTOCOL_VERSION as lambda_builders_protocol_version
 from aws_lambda_builders.architecture import X86_64
@@ -27,8 +29,21 @@ LOG = logging.getLogger(__name__)
 VERSION_REGEX = re.compile("^([0-9])+.([0-9]+)$")
 
 
-def _success_response(request_id, artifacts_dir):
-    return json.dumps({"jsonrpc": "2.0", "id": request_id, "result": {"artifacts_dir": artifacts_dir}})
+def _success_response(request_id, artifacts_dir, build_report=None):
+    result = {"artifacts_dir": artifacts_dir}
+    result.update(build_report or {})
+    return json.dumps({"jsonrpc": "2.0", "id": request_id, "result": result})
+
+
+def _build_notification(result):
+    params = {
+        "changed_paths": sorted(result.changed_paths) if result.changed_paths is not None else None,
+        "actions": [action.NAME for action in result.actions],
+        "success": result.error is None,
+    }
+    if result.error is not None:
+        params["error"] = str(result.error)
+    return json.dumps({"jsonrpc": "2.0", "method": "LambdaBuilder.watch/build", "params": params})
 
 
 def _error_response(request_id, http_status_code, message):
@@ -66,6 +81,54 @@ def _write_response(response, exit_code):
     sys.exit(exit_code)
 
 
+def _write_notification(notification):
+    sys.stdout.write(notification)
+    sys.stdout.write("\n")
+    sys.stdout.flush()
+
+
+def _get_workflow_kwargs(params):
+    return {
+        "executable_search_paths": params.get("executable_search_paths", None),
+        "runtime": params["runtime"],
+        "optimizations": params["optimizations"],
+        "options": params["options"],
+        "mode": params.get("mode", None),
+        "download_dependencies": params.get("download_dependencies", True),
+        "dependencies_dir": params.get("dependencies_dir", None),
+        "combine_dependencies": params.get("combine_dependencies", True),
+        "architecture": params.get("architecture", X86_64),
+        "is_building_layer": params.get("is_building_layer", False),
+        "experimental_flags": params.get("experimental_flags", []),
+        "build_in_source": params.get("build_in_source", None),
+        "artifact_manifest_path": params.get("artifact_manifest_path", None),
+        "normalize_artifacts": params.get("normalize_artifacts", False),
+    }
+
+
+def _watch(builder, params):
+    """
+    Builds, then rebuilds on every change until the process is interrupted or terminated. The outcome of each build
+    is written to stdout as a JSON-RPC notification on its own line.
+    """
+    stop_event = threading.Event()
+    previous_handler = signal.signal(signal.SIGTERM, lambda *_: stop_event.set())
+    try:
+        builder.watch(
+            params["source_dir"],
+            params["artifacts_dir"],
+            params["scratch_dir"],
+            params["manifest_path"],
+            on_build=lambda result: _write_notification(_build_notification(result)),
+            stop_event=stop_event,
+            **_get_workflow_kwargs(params),
+        )
+    except KeyboardInterrupt:
+        LOG.debug("Watch interrupted")
+    finally:
+        signal.signal(signal.SIGTERM, previous_handler)
+
+
 def main():  # pylint: disable=too-many-statements
     """
     Implementation of CLI Interface. Handles only one JSON-RPC method at a time and responds with data
@@ -86,8 +149,7 @@ def main():  # pylint: disable=too-many-statements
     request_id = request["id"]
     params = request["params"]
 
-    # Currently, this is the only supported method
-    if request["method"] != "LambdaBuilder.build":
+    if request["method"] not in ("LambdaBuilder.build", "LambdaBuilder.watch"):
         response = _error_response(request_id, -32601, "Method unavailable")
         return _write_response(response, 1)
 
@@ -114,27 +176,22 @@ def main():  # pylint: disable=too-many-statements
         )
 
         artifacts_dir = params["artifacts_dir"]
-        builder.build(
-            params["source_dir"],
-            params["artifacts_dir"],
-            params["scratch_dir"],
-            params["manifest_path"],
-            executable_search_paths=params.get("executable_search_paths", None),
-            runtime=params["runtime"],
-            optimizations=params["optimizations"],
-            options=params["options"],
-            mode=params.get("mode", None),
-            download_dependencies=params.get("download_dependencies", True),
-            dependencies_dir=params.get("dependencies_dir", None),
-            combine_dependencies=params.get("combine_dependencies", True),
-            architecture=params.get("architecture", X86_64),
-            is_building_layer=params.get("is_building_layer", False),
-            experimental_flags=params.get("experimental_flags", []),
-            build_in_source=params.get("build_in_source", None),
-        )
+        build_report = None
+        if request["method"] == "LambdaBuilder.watch":
+            _watch(builder, params)
+        else:
+            build_report = builder.build(
+                params["source_dir"],
+                params["artifacts_dir"],
+                params["scratch_dir"],
+                params["manifest_path"],
+                cache_dir=params.get("cache_dir", None),
+                cache_max_size=params.get("cache_max_size", None),
+                **_get_workflow_kwargs(params),
+            )
 
         # Return a success response
-        response = _success_response(request_id, artifacts_dir)
+        response = _success_response(request_id, artifacts_dir, build_report)
 
     except (WorkflowNotFoundError, WorkflowUnknownError, WorkflowFailedError) as ex:
         LOG.debug("Builder workflow failed", exc_info=ex)
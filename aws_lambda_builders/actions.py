@@ -85,6 +85,10 @@ class BaseAction(object, metaclass=_ActionMetaClass):
     # What is this action meant for? Must be a valid instance of `Purpose` class
     PURPOSE = None
 
+    # Information about the last execution of the action, which is added to the build report. Actions that have
+    # something to report set it to a dict when they execute.
+    report = None
+
     def execute(self):
         """
         Runs the action. This method should complete the action, and if it fails raise appropriate exceptions.
@@ -144,6 +148,36 @@ class LinkSourceAction(BaseAction):
             utils.create_symlink_or_copy(str(source_path), str(destination_path))
 
 
+class LinkSourceTreeAction(BaseAction):
+    NAME = "LinkSourceTree"
+
+    DESCRIPTION = "Staging source code as a tree of symbolic links while skipping certain commonly excluded files"
+
+    PURPOSE = Purpose.LINK_SOURCE
+
+    def __init__(self, source_dir, dest_dir, excludes=None, materialize=None):
+        """
+        :type excludes: list
+        :param excludes: Patterns of the names that are not staged
+
+        :type materialize: list
+        :param materialize: Patterns of the names of the files and directories the build tool writes to. They are
+            copied rather than linked so that the source files are never modified.
+        """
+        self.source_dir = source_dir
+        self.dest_dir = dest_dir
+        self.excludes = excludes or []
+        self.materialize = materialize or []
+
+    def execute(self):
+        utils.create_symlink_tree(
+            self.source_dir,
+            self.dest_dir,
+            ignore=shutil.ignore_patterns(*self.excludes),
+            materialize=shutil.ignore_patterns(*self.materialize),
+        )
+
+
 class LinkSinglePathAction(BaseAction):
     NAME = "LinkSource"
 
@@ -0,0 +1,151 @@
+"""
+Content manifest of the built artifacts, so that packaging and upload steps can tell whether artifacts changed without
+hashing them again
+"""
+
+import hashlib
+import json
+import logging
+import os
+import stat
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+LOG = logging.getLogger(__name__)
+
+ARTIFACT_MANIFEST_VERSION = 1
+
+_CHUNK_SIZE = 1024 * 1024
+
+
+def hash_file(path: str) -> str:
+    """
+    Returns the SHA-256 digest of a file. A symbolic link is hashed as its target path rather than followed.
+
+    Parameters
+    ----------
+    path : str
+        Path to the file
+
+    Returns
+    -------
+    str
+        Hexadecimal digest
+    """
+    sha256 = hashlib.sha256()
+    if os.path.islink(path):
+        sha256.update(os.fsencode(os.readlink(path)))
+        return sha256.hexdigest()
+
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(_CHUNK_SIZE), b""):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+def list_artifact_files(artifacts_dir: str, excluded_paths: Optional[List[str]] = None) -> List[str]:
+    """
+    Lists the files under the artifacts directory, sorted by their relative path with ``/`` as separator so that the
+    order does not depend on the platform. Symbolic links to directories are listed as files and not followed.
+
+    Parameters
+    ----------
+    artifacts_dir : str
+        Path to the artifacts directory
+    excluded_paths : Optional[List[str]]
+        Paths of files that must not be listed
+
+    Returns
+    -------
+    List[str]
+        Relative paths of the files, using ``/`` as separator
+    """
+    excluded = {os.path.abspath(path) for path in excluded_paths or []}
+    files = []
+    for root, dirs, names in os.walk(artifacts_dir):
+        # os.walk reports symbolic links to directories as directories but does not follow them
+        linked_dirs = [name for name in dirs if os.path.islink(os.path.join(root, name))]
+        for name in names + linked_dirs:
+            path = os.path.join(root, name)
+            if os.path.abspath(path) in excluded:
+                continue
+            files.append(os.path.relpath(path, artifacts_dir).replace(os.sep, "/"))
+    return sorted(files)
+
+
+def compute_aggregate_digest(files: List[Dict]) -> str:
+    """
+    Combines the entries of a manifest in a single digest, which only changes if a file was added, removed, renamed or
+    changed its content or mode.
+
+    Parameters
+    ----------
+    files : List[Dict]
+        Entries of the manifest, sorted by path
+
+    Returns
+    -------
+    str
+        Hexadecimal SHA-256 digest
+    """
+    sha256 = hashlib.sha256()
+    for entry in files:
+        line = "{}\0{}\0{:o}\0{}\n".format(entry["path"], entry["size"], entry["mode"], entry["sha256"])
+        sha256.update(line.encode("utf-8"))
+    return sha256.hexdigest()
+
+
+def write_artifact_manifest(artifacts_dir: str, manifest_path: str, max_workers: Optional[int] = None) -> Dict:
+    """
+    Hashes every file in the artifacts directory in a thread pool, and writes the manifest as JSON. The manifest
+    lists the relative path, size, mode and SHA-256 digest of each file, sorted by path, along with an aggregate digest
+    of all the files.
+
+    Parameters
+    ----------
+    artifacts_dir : str
+        Path to the artifacts directory
+    manifest_path : str
+        Path of the manifest to write. It is not listed in the manifest if it is written in the artifacts directory.
+    max_workers : Optional[int]
+        Maximum number of files hashed at the same time, by default the default of ThreadPoolExecutor
+
+    Returns
+    -------
+    Dict
+        Path of the manifest, aggregate digest and number of files
+    """
+    relative_paths = list_artifact_files(artifacts_dir, excluded_paths=[manifest_path])
+
+    def describe(relative_path):
+        path = os.path.join(artifacts_dir, *relative_path.split("/"))
+        file_stat = os.lstat(path)
+        return {
+            "path": relative_path,
+            "size": file_stat.st_size,
+            "mode": stat.S_IMODE(file_stat.st_mode),
+            "sha256": hash_file(path),
+        }
+
+    # hashlib releases the GIL while hashing large buffers, so threads hash files concurrently
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        files = list(executor.map(describe, relative_paths))
+
+    digest = compute_aggregate_digest(files)
+    manifest = {
+        "version": ARTIFACT_MANIFEST_VERSION,
+        "algorithm": "sha256",
+        "digest": digest,
+        "files": files,
+    }
+
+    manifest_dir = os.path.dirname(os.path.abspath(manifest_path))
+    os.makedirs(manifest_dir, exist_ok=True)
+    # write to a temporary file first so that readers never see a partial manifest
+    temp_path = "{}.tmp{}".format(manifest_path, os.getpid())
+    with open(temp_path, "w") as file:
+        json.dump(manifest, file, indent=2, sort_keys=True)
+    os.replace(temp_path, manifest_path)
+
+    LOG.debug("Wrote the manifest of %d artifact file(s) to %s, digest %s", len(files), manifest_path, digest)
+    return {"path": manifest_path, "digest": digest, "file_count": len(files)}
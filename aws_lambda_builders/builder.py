@@ -5,15 +5,23 @@ Entrypoint for the AWS Lambda Builder library
 import importlib
 import logging
 import os
+from collections import namedtuple
 
 from aws_lambda_builders.architecture import X86_64
+from aws_lambda_builders.exceptions import LambdaBuilderError
 from aws_lambda_builders.registry import DEFAULT_REGISTRY, get_workflow
+from aws_lambda_builders.scratch import ScratchDirectoryManager
+from aws_lambda_builders.watcher import WatchRoot, create_file_watcher
 from aws_lambda_builders.workflow import Capability
 
 LOG = logging.getLogger(__name__)
 
 _SUPPORTED_WORKFLOWS = ["aws_lambda_builders.workflows"]
 
+# Outcome of a build run by `LambdaBuilder.watch`. `changed_paths` is None for full builds, and `error` is None for
+# successful builds.
+WatchBuildResult = namedtuple("WatchBuildResult", ["changed_paths", "actions", "error"])
+
 
 class LambdaBuilder(object):
     """
@@ -72,6 +80,10 @@ class LambdaBuilder(object):
         is_building_layer=False,
         experimental_flags=None,
         build_in_source=None,
+        cache_dir=None,
+        cache_max_size=None,
+        artifact_manifest_path=None,
+        normalize_artifacts=False,
     ):
         # pylint: disable-msg=too-many-locals
         """
@@ -144,32 +156,190 @@ class LambdaBuilder(object):
         :param build_in_source:
             Optional, will execute the build operation in the source directory if True.
 
+        :type cache_dir: str
+        :param cache_dir:
+            Optional, path to a persistent directory shared between builds. When provided, the caches workflows keep
+            in the scratch directory are stored under it and reused by the next builds, while the rest of the scratch
+            directory is removed once the build is finished. Workflows may also keep caches of their own under it,
+            ex: a wheelhouse of built Python packages.
+
+        :type cache_max_size: int
+        :param cache_max_size:
+            Optional, maximum number of bytes ``cache_dir`` may use. The least recently used caches are evicted
+            after the build until the budget is met. This is only used if ``cache_dir`` is provided.
+
+        :type artifact_manifest_path: str
+        :param artifact_manifest_path:
+            Optional, path of a JSON manifest to write after the build, listing the relative path, size, mode and
+            SHA-256 digest of every file in ``artifacts_dir`` along with an aggregate digest of all of them.
+
+        :type normalize_artifacts: bool
+        :param normalize_artifacts:
+            Optional, sets the timestamp of every file in ``artifacts_dir`` to ``SOURCE_DATE_EPOCH`` (1980-01-01 if
+            not set) and its mode to 0o755 or 0o644 depending on whether it is executable, after the build. Building
+            the same inputs then produces identical artifacts. False by default.
+
+        :rtype: dict
+        :return: Information about the build. If a manifest was written, ``artifact_manifest`` holds its path,
+            aggregate digest and number of files.
         """
 
         if not os.path.exists(scratch_dir):
             os.makedirs(scratch_dir)
 
-        workflow = self.selected_workflow_cls(
-            source_dir,
-            artifacts_dir,
-            scratch_dir,
-            manifest_path,
-            runtime=runtime,
-            unpatched_runtime=unpatched_runtime,
-            optimizations=optimizations,
-            options=options,
-            executable_search_paths=executable_search_paths,
-            mode=mode,
-            download_dependencies=download_dependencies,
-            dependencies_dir=dependencies_dir,
-            combine_dependencies=combine_dependencies,
-            architecture=architecture,
-            is_building_layer=is_building_layer,
-            experimental_flags=experimental_flags,
-            build_in_source=build_in_source,
+        scratch_manager = None
+        if cache_dir:
+            scratch_manager = ScratchDirectoryManager(cache_dir, max_size=cache_max_size)
+            scratch_manager.prepare(scratch_dir, source_dir)
+
+        try:
+            workflow = self.selected_workflow_cls(
+                source_dir,
+                artifacts_dir,
+                scratch_dir,
+                manifest_path,
+                runtime=runtime,
+                unpatched_runtime=unpatched_runtime,
+                optimizations=optimizations,
+                options=options,
+                executable_search_paths=executable_search_paths,
+                mode=mode,
+                download_dependencies=download_dependencies,
+                dependencies_dir=dependencies_dir,
+                combine_dependencies=combine_dependencies,
+                architecture=architecture,
+                is_building_layer=is_building_layer,
+                experimental_flags=experimental_flags,
+                build_in_source=build_in_source,
+                artifact_manifest_path=artifact_manifest_path,
+                normalize_artifacts=normalize_artifacts,
+                cache_dir=cache_dir,
+            )
+
+            return workflow.run()
+        finally:
+            if scratch_manager:
+                scratch_manager.cleanup(scratch_dir)
+
+    def watch(
+        self,
+        source_dir,
+        artifacts_dir,
+        scratch_dir,
+        manifest_path,
+        on_build=None,
+        stop_event=None,
+        poll_interval=0.5,
+        **kwargs,
+    ):
+        """
+        Builds the code, then watches the source directory and the manifest and builds again whenever they change.
+        The same workflow instance is kept between builds and only the actions affected by the changes are run again:
+        when only the source code changed the actions resolving, copying or cleaning dependencies are skipped.
+
+        Failed builds don't stop the watch, the next change triggers a new build. Until a full build succeeded, every
+        change triggers a full build.
+
+        :type source_dir: str
+        :param source_dir:
+            Path to a folder containing the source code
+
+        :type artifacts_dir: str
+        :param artifacts_dir:
+            Path to a folder where the built artifacts should be placed
+
+        :type scratch_dir: str
+        :param scratch_dir:
+            Path to a directory that the workflow can use as scratch space
+
+        :type manifest_path: str
+        :param manifest_path:
+            Path to the dependency manifest
+
+        :type on_build: Callable[[WatchBuildResult], None]
+        :param on_build:
+            Optional, called after each build with its outcome
+
+        :type stop_event: threading.Event
+        :param stop_event:
+            Optional, the watch stops once this event is set. Without it, the watch runs until interrupted.
+
+        :type poll_interval: float
+        :param poll_interval:
+            Optional, maximum number of seconds between two checks of the stop event. This is also the interval
+            between two scans of the directories on platforms where file system notifications are not available.
+
+        :param kwargs:
+            Optional arguments passed to the workflow, see ``build``
+
+        :raises lambda_builders.exceptions.WorkflowNotFoundError: If a workflow for given capabilities is not found
+        """
+
+        if not os.path.exists(scratch_dir):
+            os.makedirs(scratch_dir)
+
+        workflow = self.selected_workflow_cls(source_dir, artifacts_dir, scratch_dir, manifest_path, **kwargs)
+
+        watcher = create_file_watcher(
+            self._get_watch_roots(source_dir, manifest_path),
+            poll_interval=poll_interval,
+            excluded_paths=[artifacts_dir, scratch_dir, kwargs.get("dependencies_dir")],
         )
 
-        return workflow.run()
+        try:
+            succeeded = self._run_watched_build(workflow, None, on_build)
+
+            while not (stop_event and stop_event.is_set()):
+                changed_paths = watcher.wait_for_changes(poll_interval)
+                if not changed_paths:
+                    continue
+
+                LOG.debug("Detected changes in %s", sorted(changed_paths))
+                # an incremental build relies on the outputs of a successful full build
+                succeeded = (
+                    self._run_watched_build(workflow, changed_paths, on_build)
+                    if succeeded
+                    else self._run_watched_build(workflow, None, on_build)
+                )
+        finally:
+            watcher.close()
+
+    @staticmethod
+    def _run_watched_build(workflow, changed_paths, on_build):
+        """
+        Runs a full build if no changed paths are given, or an incremental one otherwise, and reports its outcome.
+
+        :rtype: bool
+        :return: Whether the build succeeded
+        """
+        actions = []
+        error = None
+        try:
+            if changed_paths is None:
+                workflow.run()
+                actions = workflow.actions
+            else:
+                actions = workflow.run_incremental(changed_paths)
+        except LambdaBuilderError as ex:
+            LOG.error("Build failed: %s", str(ex))
+            error = ex
+
+        if on_build:
+            on_build(WatchBuildResult(changed_paths=changed_paths, actions=actions, error=error))
+
+        return error is None
+
+    @staticmethod
+    def _get_watch_roots(source_dir, manifest_path):
+        roots = [WatchRoot(source_dir)]
+
+        # the manifest is watched along with the files next to it, ex: lock files
+        manifest_dir = os.path.dirname(os.path.abspath(manifest_path))
+        source_path = os.path.join(os.path.abspath(source_dir), "")
+        if not os.path.join(manifest_dir, "").startswith(source_path):
+            roots.append(WatchRoot(manifest_dir, recursive=False))
+
+        return roots
 
     def _clear_workflows(self):
         DEFAULT_REGISTRY.clear()
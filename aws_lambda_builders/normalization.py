@@ -0,0 +1,92 @@
+"""
+Normalization of the built artifacts, so that building the same inputs twice produces identical artifacts
+"""
+
+import logging
+import os
+import stat
+from typing import Optional
+
+LOG = logging.getLogger(__name__)
+
+# Environment variable holding the timestamp given to reproducible build outputs, see
+# https://reproducible-builds.org/specs/source-date-epoch/
+SOURCE_DATE_EPOCH_ENV_VAR = "SOURCE_DATE_EPOCH"
+
+# 1980-01-01T00:00:00Z, the earliest timestamp a ZIP archive can hold
+DEFAULT_SOURCE_DATE_EPOCH = 315532800
+
+DIRECTORY_MODE = 0o755
+EXECUTABLE_FILE_MODE = 0o755
+FILE_MODE = 0o644
+
+
+def get_source_date_epoch() -> int:
+    """
+    Returns the timestamp to give to the artifacts, from the ``SOURCE_DATE_EPOCH`` environment variable if it is set
+    to a valid value.
+
+    Returns
+    -------
+    int
+        Number of seconds since the epoch
+    """
+    value = os.environ.get(SOURCE_DATE_EPOCH_ENV_VAR)
+    if value:
+        try:
+            return int(value)
+        except ValueError:
+            LOG.warning("Ignoring invalid %s value '%s'", SOURCE_DATE_EPOCH_ENV_VAR, value)
+    return DEFAULT_SOURCE_DATE_EPOCH
+
+
+def normalize_artifacts(artifacts_dir: str, epoch: Optional[int] = None) -> int:
+    """
+    Gives every file and directory under the artifacts directory the same timestamp and a canonical mode: files are
+    ``0o755`` if they were executable by anyone and ``0o644`` otherwise, and directories are ``0o755``. Symbolic links
+    are not followed, only their own timestamp is set when the platform allows it.
+
+    Parameters
+    ----------
+    artifacts_dir : str
+        Path to the artifacts directory
+    epoch : Optional[int]
+        Timestamp to set, by default the value returned by `get_source_date_epoch`
+
+    Returns
+    -------
+    int
+        Number of normalized paths
+    """
+    if epoch is None:
+        epoch = get_source_date_epoch()
+    times = (epoch, epoch)
+    count = 0
+
+    # bottom up, so that changing the children does not change the timestamp of a directory after it was set
+    for root, dirs, files in os.walk(artifacts_dir, topdown=False):
+        for name in files + dirs:
+            path = os.path.join(root, name)
+            if os.path.islink(path):
+                _set_link_times(path, times)
+            elif os.path.isdir(path):
+                os.chmod(path, DIRECTORY_MODE)
+                os.utime(path, times)
+            else:
+                executable = os.lstat(path).st_mode & (stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+                os.chmod(path, EXECUTABLE_FILE_MODE if executable else FILE_MODE)
+                os.utime(path, times)
+            count += 1
+
+    os.chmod(artifacts_dir, DIRECTORY_MODE)
+    os.utime(artifacts_dir, times)
+
+    LOG.debug("Normalized %d path(s) under %s with timestamp %d", count, artifacts_dir, epoch)
+    return count
+
+
+def _set_link_times(path: str, times) -> None:
+    if os.utime not in os.supports_follow_symlinks:
+        # the link itself can't be changed on this platform, and its target may be outside of the artifacts
+        return
+    os.utime(path, times, follow_symlinks=False)
@@ -0,0 +1,189 @@
+"""
+Management of the scratch directory and of the persistent cache shared between builds
+"""
+
+import hashlib
+import logging
+import os
+import shutil
+from typing import Iterable, List, Optional
+
+from aws_lambda_builders.actions import CleanUpAction
+
+LOG = logging.getLogger(__name__)
+
+
+def get_path_size(path: str) -> int:
+    """
+    Returns the number of bytes used by a file or by all the files under a directory. Symbolic links are not followed.
+
+    Parameters
+    ----------
+    path : str
+        Path to a file or a directory
+
+    Returns
+    -------
+    int
+        Size of the path in bytes
+    """
+    if os.path.islink(path) or not os.path.isdir(path):
+        try:
+            return os.lstat(path).st_size
+        except OSError:
+            return 0
+
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                # the file was removed while walking the tree
+                continue
+    return total
+
+
+def evict_least_recently_used(paths: Iterable[str], max_size: int) -> List[str]:
+    """
+    Removes the least recently used paths until their total size fits in the given budget. The modification time of
+    each path is used as its last use time, callers are expected to touch the paths they use.
+
+    Parameters
+    ----------
+    paths : Iterable[str]
+        Files or directories that are candidates for eviction
+    max_size : int
+        Maximum number of bytes the paths may use
+
+    Returns
+    -------
+    List[str]
+        The paths that were removed
+    """
+    entries = []
+    for path in paths:
+        try:
+            entries.append((os.lstat(path).st_mtime, path, get_path_size(path)))
+        except OSError:
+            continue
+
+    total_size = sum(size for _, _, size in entries)
+    evicted = []
+    for _, path, size in sorted(entries):
+        if total_size <= max_size:
+            break
+        LOG.debug("Evicting cache entry %s (%d bytes)", path, size)
+        if os.path.isdir(path) and not os.path.islink(path):
+            shutil.rmtree(path, ignore_errors=True)
+        else:
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+        total_size -= size
+        evicted.append(path)
+    return evicted
+
+
+class ScratchDirectoryManager(object):
+    """
+    Manages the scratch directory of a build on top of a persistent cache root.
+
+    Workflows keep some of their caches in well known sub-directories of the scratch directory. Before the build those
+    sub-directories are linked to entries under the cache root so that they survive between builds. After the build
+    everything else in the scratch directory is removed and the cache root is trimmed to its size budget by evicting
+    the least recently used entries.
+    """
+
+    # Sub-directories of the scratch directory holding caches worth keeping between builds, and whether the cache
+    # can be shared by every project or has to be kept per source directory.
+    CACHE_DIRECTORIES = {
+        "uv-cache": True,
+        "gradle-cache": False,
+    }
+
+    # Entries of the cache root that trim themselves to their own budget, and that concurrent builds read from while
+    # this one finishes, ex: the wheelhouse pip is given as --find-links. They are never evicted as a whole.
+    SELF_MANAGED_ENTRIES = ("pip-wheelhouse",)
+
+    def __init__(self, cache_dir: str, max_size: Optional[int] = None):
+        """
+        Parameters
+        ----------
+        cache_dir : str
+            Path to the persistent cache root
+        max_size : Optional[int]
+            Maximum number of bytes the cache root may use. The cache is not trimmed if not provided.
+        """
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+
+    def prepare(self, scratch_dir: str, source_dir: str) -> None:
+        """
+        Links the cache sub-directories of the scratch directory to their entries in the cache root
+
+        Parameters
+        ----------
+        scratch_dir : str
+            Path to the scratch directory of the build
+        source_dir : str
+            Path to the source directory of the build, used to key the caches that can't be shared
+        """
+        os.makedirs(scratch_dir, exist_ok=True)
+
+        for name, shared in self.CACHE_DIRECTORIES.items():
+            scratch_path = os.path.join(scratch_dir, name)
+            if os.path.lexists(scratch_path):
+                LOG.debug("%s already exists, it will not be linked to the cache", scratch_path)
+                continue
+
+            cache_path = os.path.join(self.cache_dir, self._get_entry_name(name, shared, source_dir))
+            os.makedirs(cache_path, exist_ok=True)
+            # the modification time of an entry is its last use time
+            os.utime(cache_path)
+
+            try:
+                os.symlink(os.path.abspath(cache_path), scratch_path, target_is_directory=True)
+            except OSError as ex:
+                LOG.debug("Unable to link %s to the cache, it will only live for this build", scratch_path, exc_info=ex)
+
+    def cleanup(self, scratch_dir: str) -> None:
+        """
+        Reclaims the per-build data in the scratch directory and trims the cache root to its size budget
+
+        Parameters
+        ----------
+        scratch_dir : str
+            Path to the scratch directory of the build
+        """
+        # links to the cache entries are unlinked, not followed, so the cache itself is kept
+        CleanUpAction(scratch_dir).execute()
+        self.evict()
+
+    def evict(self) -> List[str]:
+        """
+        Evicts the least recently used cache entries until the cache root fits in its size budget. The self managed
+        entries are not candidates, nor counted in the budget.
+
+        Returns
+        -------
+        List[str]
+            Paths of the evicted entries
+        """
+        if self.max_size is None or not os.path.isdir(self.cache_dir):
+            return []
+
+        entries = [
+            os.path.join(self.cache_dir, name)
+            for name in os.listdir(self.cache_dir)
+            if name not in self.SELF_MANAGED_ENTRIES
+        ]
+        return evict_least_recently_used(entries, self.max_size)
+
+    @staticmethod
+    def _get_entry_name(name: str, shared: bool, source_dir: str) -> str:
+        if shared:
+            return name
+        source_key = hashlib.sha256(os.path.abspath(source_dir).encode("utf-8")).hexdigest()[:16]
+        return "{}-{}".format(name, source_key)
@@ -14,6 +14,8 @@ from aws_lambda_builders.architecture import ARM64
 
 LOG = logging.getLogger(__name__)
 
+EXPERIMENTAL_FLAG_BUILD_PERFORMANCE = "experimentalBuildPerformance"
+
 
 def copytree(
     source: str,
@@ -213,6 +215,90 @@ def create_symlink_or_copy(source: str, destination: str) -> None:
         copytree(source, destination)
 
 
+def create_symlink_tree(
+    source: str,
+    destination: str,
+    ignore: Optional[Callable[[str, List[str]], Set[str]]] = None,
+    materialize: Optional[Callable[[str, List[str]], Set[str]]] = None,
+) -> None:
+    """
+    Stages a directory as a tree of symbolic links: the directories are created in the destination and each file is a
+    symbolic link to the file in the source. Staging takes time proportional to the number of files rather than to
+    their size.
+
+    Tools writing to the staged files would write to the source files through the links, so the paths a tool writes to
+    must be materialized: they are copied instead of linked. If symbolic links can't be created, the whole tree is
+    copied instead.
+
+    Parameters
+    ----------
+    source : str
+        Path to the source folder to stage.
+    destination : str
+        Path to destination folder.
+    ignore : Optional[Callable[[str, List[str]], Set[str]]]
+        A function that returns a set of file names to ignore, given a list of available file names, like the
+        ``ignore`` parameter of ``copytree``. By default None.
+    materialize : Optional[Callable[[str, List[str]], Set[str]]]
+        A function that returns a set of file or directory names to copy instead of linking, given a list of available
+        names, ex: ``shutil.ignore_patterns("package.json")``. Directories are copied with all their content. By
+        default None.
+    """
+
+    if not os.path.exists(source):
+        LOG.warning("Skipping staging operation since source %s does not exist", source)
+        return
+
+    try:
+        _create_symlink_tree(source, destination, ignore, materialize)
+    except OSError as ex:
+        LOG.warning(
+            "Symbolic link creation failed, falling back to copying files instead. To optimize speed, "
+            "consider enabling the necessary settings or privileges on your system to support symbolic links.",
+            exc_info=ex if LOG.isEnabledFor(logging.DEBUG) else None,
+        )
+        # copying over the links created so far would write to the source files
+        for root, dirs, files in os.walk(destination):
+            for name in files + dirs:
+                _remove_symlink(os.path.join(root, name))
+        copytree(source, destination, ignore=ignore)
+
+
+def _create_symlink_tree(source, destination, ignore, materialize):
+    os.makedirs(destination, exist_ok=True)
+
+    names = os.listdir(source)
+    ignored_names = ignore(source, names) if ignore else set()
+    materialized_names = materialize(source, names) if materialize else set()
+
+    for name in names:
+        if name in ignored_names:
+            LOG.debug("File (%s) is in ignored set, skipping it", name)
+            continue
+
+        new_source = os.path.join(source, name)
+        new_destination = os.path.join(destination, name)
+        is_directory = os.path.isdir(new_source) and not os.path.islink(new_source)
+
+        if name in materialized_names:
+            _remove_symlink(new_destination)
+            if is_directory:
+                copytree(new_source, new_destination, ignore=ignore)
+            else:
+                shutil.copy2(new_source, new_destination)
+        elif is_directory:
+            _create_symlink_tree(new_source, new_destination, ignore, materialize)
+        elif not os.path.islink(new_destination):
+            if os.path.lexists(new_destination):
+                os.remove(new_destination)
+            os.symlink(os.path.abspath(new_source), new_destination)
+
+
+def _remove_symlink(path: str) -> None:
+    if os.path.islink(path):
+        os.unlink(path)
+
+
 def _is_within_directory(directory: Union[str, os.PathLike], target: Union[str, os.PathLike]) -> bool:
     """Checks if target is located under directory"""
     abs_directory = os.path.abspath(directory)
@@ -238,6 +324,13 @@ def extract_tarfile(tarfile_path: Union[str, os.PathLike], unpack_dir: Union[str
         tar.extractall(unpack_dir)
 
 
+def is_experimental_build_improvements_enabled(experimental_flags: Optional[List[str]]) -> bool:
+    """
+    A function which will determine if experimental build improvements is active
+    """
+    return bool(experimental_flags) and EXPERIMENTAL_FLAG_BUILD_PERFORMANCE in experimental_flags
+
+
 def decode(to_decode: bytes, encoding: Optional[str] = None) -> str:
     """
     Perform a "safe" decoding of a series of bytes. Attempts to find the localized encoding
@@ -0,0 +1,323 @@
+"""
+Watchers reporting the files that changed in a set of directories, used to rebuild functions incrementally
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import logging
+import os
+import select
+import struct
+import sys
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+LOG = logging.getLogger(__name__)
+
+# Names of the directories that are never watched. They hold tool state or build output rather than sources.
+DEFAULT_EXCLUDED_DIRS = (".git", ".aws-sam", "node_modules", "__pycache__", ".venv", ".mypy_cache", ".pytest_cache")
+
+
+class WatchRoot(object):
+    """
+    A directory to watch, either with all of its sub-directories or only for the files it directly contains
+    """
+
+    def __init__(self, path: str, recursive: bool = True):
+        self.path = os.path.abspath(path)
+        self.recursive = recursive
+
+    def __repr__(self):
+        return "WatchRoot(path={}, recursive={})".format(self.path, self.recursive)
+
+
+class FileWatcher(object):
+    """
+    Base class of the file watchers. Watchers report the paths that changed since the previous call to
+    `wait_for_changes`.
+    """
+
+    def __init__(
+        self,
+        roots: List[WatchRoot],
+        excluded_dirs: Iterable[str] = DEFAULT_EXCLUDED_DIRS,
+        excluded_paths: Optional[Iterable[str]] = None,
+        debounce: float = 0.2,
+    ):
+        """
+        :type roots: list
+        :param roots: Directories to watch
+
+        :type excluded_dirs: Iterable[str]
+        :param excluded_dirs: Names of the directories to ignore wherever they are
+
+        :type excluded_paths: Iterable[str]
+        :param excluded_paths: Paths to ignore along with everything under them, ex: an artifacts directory nested in
+            the source directory
+
+        :type debounce: float
+        :param debounce: Seconds without any new change to wait for before reporting changes, so that a burst of
+            writes (ex: an editor saving a file) is reported once
+        """
+        self.roots = roots
+        self.excluded_dirs = set(excluded_dirs)
+        self.excluded_paths = [os.path.abspath(path) for path in excluded_paths or [] if path]
+        self.debounce = debounce
+
+    def wait_for_changes(self, timeout: float) -> Set[str]:
+        """
+        Waits until some files change, or until the timeout expires.
+
+        :type timeout: float
+        :param timeout: Maximum number of seconds to wait for a change
+
+        :rtype: Set[str]
+        :return: Absolute paths that changed, empty if nothing changed before the timeout. A watched directory is
+            reported when the watcher could not keep track of what changed in it.
+        """
+        raise NotImplementedError("wait_for_changes")
+
+    def close(self) -> None:
+        """
+        Releases the resources held by the watcher
+        """
+
+    def is_excluded(self, path: str) -> bool:
+        if os.path.basename(path) in self.excluded_dirs:
+            return True
+        return any(path == excluded or path.startswith(os.path.join(excluded, "")) for excluded in self.excluded_paths)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class PollingFileWatcher(FileWatcher):
+    """
+    Watcher comparing snapshots of the modification time and size of every file. It works on every platform.
+    """
+
+    def __init__(self, roots: List[WatchRoot], poll_interval: float = 0.5, **kwargs):
+        super(PollingFileWatcher, self).__init__(roots, **kwargs)
+        self.poll_interval = poll_interval
+        self._snapshot = self._take_snapshot()
+
+    def wait_for_changes(self, timeout: float) -> Set[str]:
+        deadline = time.monotonic() + timeout
+        while True:
+            snapshot = self._take_snapshot()
+            changes = self._diff(self._snapshot, snapshot)
+            if changes:
+                # wait for the files to settle before reporting them
+                while True:
+                    time.sleep(self.debounce)
+                    settled_snapshot = self._take_snapshot()
+                    new_changes = self._diff(snapshot, settled_snapshot)
+                    snapshot = settled_snapshot
+                    if not new_changes:
+                        break
+                    changes |= new_changes
+                self._snapshot = snapshot
+                return changes
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return set()
+            time.sleep(min(self.poll_interval, remaining))
+
+    def _take_snapshot(self) -> Dict[str, Tuple[int, int]]:
+        snapshot = {}
+        for root in self.roots:
+            self._scan(root.path, root.recursive, snapshot)
+        return snapshot
+
+    def _scan(self, directory: str, recursive: bool, snapshot: Dict[str, Tuple[int, int]]) -> None:
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            return
+
+        for entry in entries:
+            if self.is_excluded(entry.path):
+                continue
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive:
+                        self._scan(entry.path, recursive, snapshot)
+                    continue
+                stat = entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            snapshot[entry.path] = (stat.st_mtime_ns, stat.st_size)
+
+    @staticmethod
+    def _diff(before: Dict[str, Tuple[int, int]], after: Dict[str, Tuple[int, int]]) -> Set[str]:
+        changes = set(before.keys() ^ after.keys())
+        changes.update(path for path, stat in after.items() if path in before and before[path] != stat)
+        return changes
+
+
+class InotifyFileWatcher(FileWatcher):
+    """
+    Watcher using the Linux inotify API through ctypes, so that changes are reported without scanning directories.
+    """
+
+    IN_MODIFY = 0x00000002
+    IN_ATTRIB = 0x00000004
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_DELETE_SELF = 0x00000400
+    IN_MOVE_SELF = 0x00000800
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ISDIR = 0x40000000
+
+    WATCH_MASK = (
+        IN_MODIFY
+        | IN_ATTRIB
+        | IN_CLOSE_WRITE
+        | IN_MOVED_FROM
+        | IN_MOVED_TO
+        | IN_CREATE
+        | IN_DELETE
+        | IN_DELETE_SELF
+        | IN_MOVE_SELF
+    )
+
+    # struct inotify_event { int wd; uint32_t mask; uint32_t cookie; uint32_t len; char name[]; }
+    _EVENT_HEADER = struct.Struct("iIII")
+    _READ_SIZE = 64 * 1024
+
+    def __init__(self, roots: List[WatchRoot], **kwargs):
+        super(InotifyFileWatcher, self).__init__(roots, **kwargs)
+        self._libc = self._load_libc()
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, "inotify_init1 failed: {}".format(os.strerror(err)))
+
+        # watch descriptor -> (watched directory, root it belongs to)
+        self._watches: Dict[int, Tuple[str, WatchRoot]] = {}
+        try:
+            for root in self.roots:
+                self._add_watches(root.path, root)
+        except OSError:
+            self.close()
+            raise
+
+    @staticmethod
+    def is_supported() -> bool:
+        return sys.platform.startswith("linux")
+
+    @staticmethod
+    def _load_libc():
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        # make sure the symbols exist, older C libraries don't have them
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        return libc
+
+    def _add_watches(self, directory: str, root: WatchRoot) -> None:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), self.WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            if directory == root.path or err not in (errno.ENOENT, errno.ENOTDIR):
+                raise OSError(err, "Unable to watch {}: {}".format(directory, os.strerror(err)))
+            # the directory was removed before we could watch it
+            return
+        self._watches[wd] = (directory, root)
+
+        if not root.recursive:
+            return
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            return
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False) and not self.is_excluded(entry.path):
+                self._add_watches(entry.path, root)
+
+    def wait_for_changes(self, timeout: float) -> Set[str]:
+        changes: Set[str] = set()
+        wait_time = timeout
+        while True:
+            readable, _, _ = select.select([self._fd], [], [], wait_time)
+            if not readable:
+                return changes
+            changes |= self._read_events()
+            # keep reading until no more events arrive during the debounce window
+            wait_time = self.debounce
+
+    def _read_events(self) -> Set[str]:
+        changes: Set[str] = set()
+        try:
+            data = os.read(self._fd, self._READ_SIZE)
+        except BlockingIOError:
+            return changes
+
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = self._EVENT_HEADER.unpack_from(data, offset)
+            offset += self._EVENT_HEADER.size
+            name = os.fsdecode(data[offset : offset + length].rstrip(b"\0"))
+            offset += length
+
+            if mask & self.IN_Q_OVERFLOW:
+                # events were dropped, we can't know what changed
+                LOG.debug("inotify event queue overflowed")
+                changes.update(root.path for root in self.roots)
+                continue
+
+            if wd not in self._watches:
+                continue
+            directory, root = self._watches[wd]
+
+            if mask & self.IN_IGNORED:
+                # the watched directory was removed
+                del self._watches[wd]
+                continue
+
+            path = os.path.join(directory, name) if name else directory
+            if self.is_excluded(path) or (not root.recursive and name and mask & self.IN_ISDIR):
+                # only the files directly in non recursive roots are watched
+                continue
+            changes.add(path)
+
+            if root.recursive and mask & self.IN_ISDIR and mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                self._add_watches(path, root)
+
+        return changes
+
+    def close(self) -> None:
+        if getattr(self, "_fd", -1) >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def create_file_watcher(roots: List[WatchRoot], poll_interval: float = 0.5, **kwargs) -> FileWatcher:
+    """
+    Creates the most efficient watcher available on the current platform. inotify is used on Linux, and scanning the
+    directories periodically is used everywhere else, or if inotify can't be used (ex: the watch limit was reached).
+
+    :type roots: list
+    :param roots: Directories to watch
+
+    :type poll_interval: float
+    :param poll_interval: Seconds between two scans of the directories, if inotify can't be used
+
+    :rtype: FileWatcher
+    :return: The watcher
+    """
+    if InotifyFileWatcher.is_supported():
+        try:
+            return InotifyFileWatcher(roots, **kwargs)
+        except (OSError, AttributeError) as ex:
+            LOG.debug("Unable to use inotify, falling back to polling", exc_info=ex)
+
+    return PollingFileWatcher(roots, poll_interval=poll_interval, **kwargs)
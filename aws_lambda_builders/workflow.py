@@ -2,15 +2,25 @@
 Implementation of a base workflow
 """
 
+import fnmatch
 import functools
 import logging
 import os
+import shutil
 from collections import namedtuple
 from enum import Enum
-from typing import Optional
-
-from aws_lambda_builders.actions import ActionFailedError
+from typing import Iterable, List, Optional
+
+from aws_lambda_builders.actions import (
+    ActionFailedError,
+    CleanUpAction,
+    CopySourceAction,
+    DependencyManager,
+    LinkSourceTreeAction,
+    Purpose,
+)
 from aws_lambda_builders.architecture import X86_64
+from aws_lambda_builders.artifact_manifest import write_artifact_manifest
 from aws_lambda_builders.binary_path import BinaryPath
 from aws_lambda_builders.exceptions import (
     MisMatchRuntimeError,
@@ -18,6 +28,7 @@ from aws_lambda_builders.exceptions import (
     WorkflowFailedError,
     WorkflowUnknownError,
 )
+from aws_lambda_builders.normalization import normalize_artifacts
 from aws_lambda_builders.path_resolver import PathResolver
 from aws_lambda_builders.registry import DEFAULT_REGISTRY
 from aws_lambda_builders.validator import RuntimeValidator
@@ -113,7 +124,7 @@ def sanitize(func):  # pylint: disable=too-many-statements
             raise WorkflowFailedError(
                 workflow_name=self.NAME, action_name="Validation", reason="\n".join(validation_errors)
             )
-        func(self, *args, **kwargs)
+        return func(self, *args, **kwargs)
 
     return wrapper
 
@@ -183,6 +194,20 @@ class BaseWorkflow(object, metaclass=_WorkflowMetaClass):
     # The directory where the workflow builds/installs by default, each workflow should define this.
     DEFAULT_BUILD_DIR = None
 
+    # Names of the files, besides the manifest, that change how dependencies are resolved, ex: lock files. Each
+    # workflow should define its own. Incremental builds resolve the dependencies again only if the manifest or one of
+    # these files changed.
+    DEPENDENCY_FILES = ()
+
+    # Purposes of the actions that only depend on the dependencies. Incremental builds skip them when only the source
+    # code changed.
+    DEPENDENCY_PURPOSES = (
+        Purpose.RESOLVE_DEPENDENCIES,
+        Purpose.COPY_DEPENDENCIES,
+        Purpose.MOVE_DEPENDENCIES,
+        Purpose.CLEAN_UP,
+    )
+
     def __init__(
         self,
         source_dir,
@@ -202,6 +227,9 @@ class BaseWorkflow(object, metaclass=_WorkflowMetaClass):
         experimental_flags=None,
         build_in_source=None,
         unpatched_runtime=None,
+        artifact_manifest_path=None,
+        normalize_artifacts=False,
+        cache_dir=None,
     ):
         # pylint: disable-msg=too-many-locals
         """
@@ -248,6 +276,18 @@ class BaseWorkflow(object, metaclass=_WorkflowMetaClass):
 
         build_in_source: Optional[bool]
             Optional, will execute the build operation in the source directory if True.
+
+        artifact_manifest_path: Optional[str]
+            Optional, path of a manifest listing the size, mode and SHA-256 digest of every artifact, written once the
+            actions are done.
+
+        normalize_artifacts: bool
+            Optional, gives every artifact the timestamp from ``SOURCE_DATE_EPOCH`` and a canonical mode once the
+            actions are done, so that identical inputs produce identical artifacts. False by default.
+
+        cache_dir: Optional[str]
+            Optional, path of a persistent directory shared between builds, where workflows can keep caches (ex: built
+            packages) that outlive the scratch directory.
         """
 
         self.source_dir = source_dir
@@ -266,6 +306,12 @@ class BaseWorkflow(object, metaclass=_WorkflowMetaClass):
         self.is_building_layer = is_building_layer
         self.unpatched_runtime = unpatched_runtime
         self.experimental_flags = experimental_flags if experimental_flags else []
+        self.artifact_manifest_path = artifact_manifest_path
+        self.normalize_artifacts = normalize_artifacts
+        self.cache_dir = cache_dir
+
+        # Information about the last build, returned by `run`
+        self.build_report = {}
 
         # this represents where the build/install happens, not the final output directory (that's the artifacts_dir)
         self.build_dir = self._select_build_dir(build_in_source)
@@ -350,6 +396,9 @@ class BaseWorkflow(object, metaclass=_WorkflowMetaClass):
         """
         Actually perform the build by executing registered actions.
 
+        :rtype: dict
+        :return: Information about the build, ex: the digest of the artifacts if a manifest was requested
+
         :raises WorkflowFailedError: If the workflow does not contain any actions or if one of the actions ran into
             an error
 
@@ -363,7 +412,173 @@ class BaseWorkflow(object, metaclass=_WorkflowMetaClass):
                 workflow_name=self.NAME, action_name=None, reason="Workflow does not have any actions registered"
             )
 
+        actions = self.actions
+        self._run_actions(actions)
+        self._finalize_build(actions)
+
+        return self.build_report
+
+    def run_incremental(self, changed_paths: Iterable[str]) -> List:
+        """
+        Runs again the actions affected by the given changes, after a previous call to `run` succeeded. The binaries
+        required by the workflow were validated by that call, so they are not validated again.
+
+        :type changed_paths: Iterable[str]
+        :param changed_paths: Paths of the files or directories that changed since the previous build
+
+        :rtype: list
+        :return: The actions that were executed
+
+        :raises WorkflowFailedError: If one of the actions ran into an error
+
+        :raises WorkflowUnknownError: If one of the actions in the workflow raised an unhandled exception
+        """
+        changed_paths = list(changed_paths)
+        actions = self.get_actions_for_changes(changed_paths)
+
+        self._remove_deleted_sources(changed_paths)
+
+        LOG.debug("Running workflow '%s' incrementally with %d action(s)", self.NAME, len(actions))
+        self._run_actions(actions)
+        self._finalize_build(actions)
+
+        return actions
+
+    def get_actions_for_changes(self, changed_paths: Iterable[str]) -> List:
+        """
+        Selects the actions that have to run again for the given changes. Every action runs again if the dependencies
+        may have changed, otherwise the actions that only deal with dependencies are skipped. If deleted sources are
+        still staged outside of the artifacts directory, ex: in the scratch directory the Maven workflow builds in,
+        every action runs again after emptying the staging directories and the artifacts directory, since copying the
+        source again leaves the deleted sources and the outputs built from them behind.
+
+        :type changed_paths: Iterable[str]
+        :param changed_paths: Paths of the files or directories that changed since the previous build
+
+        :rtype: list
+        :return: The actions to execute, in the order of the workflow
+        """
+        changed_paths = list(changed_paths)
+        actions = self.actions
+
+        staging_dirs = self._get_stale_staging_dirs(changed_paths)
+        if staging_dirs:
+            LOG.info("Sources staged in %s were deleted, building again from scratch", ", ".join(staging_dirs))
+            if os.path.abspath(self.artifacts_dir) != os.path.abspath(self.source_dir):
+                staging_dirs.append(self.artifacts_dir)
+            return [CleanUpAction(directory) for directory in staging_dirs] + actions
+
+        if any(self._is_dependency_change(path) for path in changed_paths):
+            return actions
+
+        # When dependencies were moved out of the build directory, the remaining actions can't find them anymore
+        if any(action.PURPOSE == Purpose.MOVE_DEPENDENCIES for action in actions):
+            return actions
+
+        return [action for action in actions if action.PURPOSE not in self.DEPENDENCY_PURPOSES]
+
+    def _get_stale_staging_dirs(self, changed_paths: List[str]) -> List[str]:
+        """
+        Returns the directories other than the artifacts directory the source is copied or linked into that still hold
+        sources deleted since the previous build.
+        """
+        deleted_paths = [os.path.abspath(path) for path in changed_paths if not os.path.lexists(path)]
+        if not deleted_paths:
+            return []
+
+        artifacts_dir = os.path.abspath(self.artifacts_dir)
+        staging_dirs: List[str] = []
         for action in self.actions:
+            if not isinstance(action, (CopySourceAction, LinkSourceTreeAction)):
+                continue
+            source_dir = os.path.abspath(action.source_dir)
+            dest_dir = os.path.abspath(action.dest_dir)
+            if dest_dir in [artifacts_dir, source_dir] + staging_dirs:
+                continue
+            for path in deleted_paths:
+                if not path.startswith(os.path.join(source_dir, "")):
+                    continue
+                parts = os.path.relpath(path, source_dir).split(os.sep)
+                if parts[0] in DependencyManager.IGNORE_LIST or any(
+                    fnmatch.filter(parts, pattern) for pattern in action.excludes
+                ):
+                    continue
+                if os.path.lexists(os.path.join(dest_dir, *parts)):
+                    staging_dirs.append(dest_dir)
+                    break
+        return staging_dirs
+
+    def _remove_deleted_sources(self, changed_paths: List[str]) -> None:
+        """
+        Removes the artifacts of the source files and directories that were deleted or renamed since the previous
+        build, which copying the source again leaves behind. Dependencies installed in the source directory, ex:
+        node_modules, are left to the actions resolving them.
+        """
+        source_dir = os.path.abspath(self.source_dir)
+        artifacts_dir = os.path.abspath(self.artifacts_dir)
+        if source_dir == artifacts_dir:
+            return
+
+        for path in changed_paths:
+            changed_path = os.path.abspath(path)
+            if not changed_path.startswith(os.path.join(source_dir, "")) or os.path.lexists(changed_path):
+                continue
+            relative_path = os.path.relpath(changed_path, source_dir)
+            if relative_path.split(os.sep)[0] in DependencyManager.IGNORE_LIST:
+                continue
+
+            artifact_path = os.path.join(artifacts_dir, relative_path)
+            if os.path.isdir(artifact_path) and not os.path.islink(artifact_path):
+                LOG.debug("Removing the artifacts of the deleted directory %s", changed_path)
+                shutil.rmtree(artifact_path)
+            elif os.path.lexists(artifact_path):
+                LOG.debug("Removing the artifact of the deleted file %s", changed_path)
+                os.remove(artifact_path)
+
+    def _is_dependency_change(self, path: str) -> bool:
+        """
+        Whether a change to the given path may change the dependencies of the function. A directory is considered a
+        dependency change if it contains the manifest, which is what watchers report when they lose track of changes.
+        """
+        if os.path.basename(path) in self.DEPENDENCY_FILES:
+            return True
+
+        if not self.manifest_path:
+            return False
+
+        changed_path = os.path.abspath(path)
+        manifest_path = os.path.abspath(self.manifest_path)
+        return changed_path == manifest_path or manifest_path.startswith(os.path.join(changed_path, ""))
+
+    def _finalize_build(self, actions: List) -> None:
+        """
+        Post-processes the artifacts once every action succeeded, and records the outcome in the build report along
+        with the reports of the actions that ran.
+        """
+        self.build_report = {}
+        for action in actions:
+            if isinstance(action.report, dict):
+                self.build_report.update(action.report)
+
+        if self.normalize_artifacts and os.path.isdir(self.artifacts_dir):
+            try:
+                normalize_artifacts(self.artifacts_dir)
+            except OSError as ex:
+                raise WorkflowFailedError(workflow_name=self.NAME, action_name="NormalizeArtifacts", reason=str(ex))
+
+        if self.artifact_manifest_path:
+            try:
+                self.build_report["artifact_manifest"] = write_artifact_manifest(
+                    self.artifacts_dir, self.artifact_manifest_path
+                )
+            except OSError as ex:
+                raise WorkflowFailedError(workflow_name=self.NAME, action_name="ArtifactManifest", reason=str(ex))
+
+    def _run_actions(self, actions: List) -> None:
+        """
+        Executes the given actions in order, converting their failures into workflow errors.
+        """
+        for action in actions:
             action_info = "{}:{}".format(self.NAME, action.NAME)
             function_name = ""
             if self.options and "build_logical_id" in self.options:
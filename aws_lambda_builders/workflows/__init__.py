@@ -9,6 +9,7 @@ import aws_lambda_builders.workflows.java_gradle
 import aws_lambda_builders.workflows.java_maven
 import aws_lambda_builders.workflows.nodejs_npm
 import aws_lambda_builders.workflows.nodejs_npm_esbuild
+import aws_lambda_builders.workflows.nodejs_pnpm
 import aws_lambda_builders.workflows.python_pip
 import aws_lambda_builders.workflows.python_uv
 import aws_lambda_builders.workflows.ruby_bundler
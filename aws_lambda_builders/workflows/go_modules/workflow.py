@@ -15,6 +15,9 @@ class GoModulesWorkflow(BaseWorkflow):
 
     CAPABILITY = Capability(language="go", dependency_manager="modules", application_framework=None)
 
+    # Files besides the manifest that change the resolved dependencies
+    DEPENDENCY_FILES = ("go.sum",)
+
     DEFAULT_BUILD_DIR = BuildDirectory.SOURCE
     BUILD_IN_SOURCE_SUPPORT = BuildInSourceSupport.EXCLUSIVELY_SUPPORTED
 
@@ -25,6 +25,9 @@ class JavaGradleWorkflow(BaseWorkflow):
 
     CAPABILITY = Capability(language="java", dependency_manager="gradle", application_framework=None)
 
+    # Files besides the manifest that change the resolved dependencies
+    DEPENDENCY_FILES = ("gradle.properties", "settings.gradle", "settings.gradle.kts")
+
     INIT_FILE = "lambda-build-init.gradle"
 
     DEFAULT_BUILD_DIR = BuildDirectory.SCRATCH
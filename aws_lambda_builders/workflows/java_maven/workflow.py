@@ -2,7 +2,8 @@
 Java Maven Workflow
 """
 
-from aws_lambda_builders.actions import CleanUpAction, CopySourceAction
+from aws_lambda_builders.actions import CleanUpAction, CopySourceAction, LinkSourceTreeAction
+from aws_lambda_builders.utils import is_experimental_build_improvements_enabled
 from aws_lambda_builders.workflow import BaseWorkflow, BuildDirectory, BuildInSourceSupport, Capability
 from aws_lambda_builders.workflows.java.actions import JavaCopyDependenciesAction, JavaMoveDependenciesAction
 from aws_lambda_builders.workflows.java.utils import OSUtils
@@ -29,6 +30,9 @@ class JavaMavenWorkflow(BaseWorkflow):
 
     EXCLUDED_FILES = (".aws-sam", ".git")
 
+    # Maven writes its outputs to the target directory, it is copied rather than linked when staging the source
+    MATERIALIZED_FILES = ("target",)
+
     DEFAULT_BUILD_DIR = BuildDirectory.SCRATCH
     BUILD_IN_SOURCE_SUPPORT = BuildInSourceSupport.NOT_SUPPORTED
 
@@ -47,8 +51,15 @@ class JavaMavenWorkflow(BaseWorkflow):
         if self.is_building_layer:
             copy_artifacts_action = JavaMavenCopyLayerArtifactsAction(scratch_dir, artifacts_dir, self.os_utils)
 
+        if is_experimental_build_improvements_enabled(self.experimental_flags):
+            stage_source_action = LinkSourceTreeAction(
+                root_dir, scratch_dir, excludes=self.EXCLUDED_FILES, materialize=self.MATERIALIZED_FILES
+            )
+        else:
+            stage_source_action = CopySourceAction(root_dir, scratch_dir, excludes=self.EXCLUDED_FILES)
+
         self.actions = [
-            CopySourceAction(root_dir, scratch_dir, excludes=self.EXCLUDED_FILES),
+            stage_source_action,
             JavaMavenBuildAction(scratch_dir, subprocess_maven),
             JavaMavenCopyDependencyAction(scratch_dir, subprocess_maven),
             copy_artifacts_action,
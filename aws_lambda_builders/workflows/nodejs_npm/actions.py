@@ -208,6 +208,9 @@ class NodejsNpmrcAndLockfileCopyAction(BaseAction):
     DESCRIPTION = "Copying configuration from .npmrc and dependencies from lockfile/shrinkwrap"
     PURPOSE = Purpose.COPY_SOURCE
 
+    # Files copied from the source directory when they exist
+    FILENAMES = (".npmrc", "package-lock.json", "npm-shrinkwrap.json")
+
     def __init__(self, artifacts_dir, source_dir, osutils):
         """
         :type artifacts_dir: str
@@ -234,7 +237,7 @@ class NodejsNpmrcAndLockfileCopyAction(BaseAction):
         """
 
         try:
-            for filename in [".npmrc", "package-lock.json", "npm-shrinkwrap.json"]:
+            for filename in self.FILENAMES:
                 file_path = self.osutils.joinpath(self.source_dir, filename)
                 if self.osutils.file_exists(file_path):
                     LOG.debug("%s copying in: %s", filename, self.artifacts_dir)
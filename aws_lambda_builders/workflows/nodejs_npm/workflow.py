@@ -52,6 +52,9 @@ class NodejsNpmWorkflow(BaseWorkflow):
 
     CAPABILITY = Capability(language="nodejs", dependency_manager="npm", application_framework=None)
 
+    # Files besides the manifest that change the resolved dependencies
+    DEPENDENCY_FILES = (".npmrc", "package-lock.json", "npm-shrinkwrap.json")
+
     EXCLUDED_FILES = (".aws-sam", ".git")
 
     CONFIG_PROPERTY = "aws_sam"
@@ -12,10 +12,11 @@ from aws_lambda_builders.actions import (
     CopySourceAction,
     LinkSinglePathAction,
     LinkSourceAction,
+    LinkSourceTreeAction,
     MoveDependenciesAction,
 )
 from aws_lambda_builders.path_resolver import PathResolver
-from aws_lambda_builders.utils import which
+from aws_lambda_builders.utils import is_experimental_build_improvements_enabled, which
 from aws_lambda_builders.workflow import BaseWorkflow, BuildDirectory, BuildInSourceSupport, Capability
 from aws_lambda_builders.workflows.nodejs_npm import NodejsNpmWorkflow
 from aws_lambda_builders.workflows.nodejs_npm.npm import SubprocessNpm
@@ -39,8 +40,14 @@ class NodejsNpmEsbuildWorkflow(BaseWorkflow):
 
     CAPABILITY = Capability(language="nodejs", dependency_manager="npm-esbuild", application_framework=None)
 
+    # Files besides the manifest that change the resolved dependencies
+    DEPENDENCY_FILES = (".npmrc", "package-lock.json", "npm-shrinkwrap.json")
+
     EXCLUDED_FILES = (".aws-sam", ".git", "node_modules")
 
+    # Files npm may write to during the installation, they are copied rather than linked when staging the source
+    MATERIALIZED_FILES = ("package.json", "package-lock.json", "npm-shrinkwrap.json", ".npmrc")
+
     CONFIG_PROPERTY = "aws_sam"
 
     DEFAULT_BUILD_DIR = BuildDirectory.SCRATCH
@@ -83,11 +90,25 @@ class NodejsNpmEsbuildWorkflow(BaseWorkflow):
             )
 
         # if we're building in the source directory, we don't have to copy the source code
-        self.actions = (
-            []
-            if is_building_in_source
-            else [CopySourceAction(source_dir=self.source_dir, dest_dir=self.build_dir, excludes=self.EXCLUDED_FILES)]
-        )
+        self.actions = []
+        if not is_building_in_source:
+            if is_experimental_build_improvements_enabled(self.experimental_flags) and not is_external_manifest:
+                self.actions.append(
+                    LinkSourceTreeAction(
+                        source_dir=self.source_dir,
+                        dest_dir=self.build_dir,
+                        excludes=self.EXCLUDED_FILES,
+                        materialize=self.MATERIALIZED_FILES,
+                    )
+                )
+                # resolve imports from the staged links, where node_modules is, rather than from the source files,
+                # unless the customer configured it
+                if "preserve_symlinks" not in bundler_config:
+                    bundler_config = dict(bundler_config, preserve_symlinks=True)
+            else:
+                self.actions.append(
+                    CopySourceAction(source_dir=self.source_dir, dest_dir=self.build_dir, excludes=self.EXCLUDED_FILES)
+                )
 
         if is_external_manifest and not is_building_in_source:
             # copy the manifest file (package.json) to the build directory in case if the manifest file is not in the
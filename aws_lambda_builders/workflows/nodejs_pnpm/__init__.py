@@ -0,0 +1,5 @@
+"""
+Builds NodeJS Lambda functions using PNPM dependency manager
+"""
+
+from .workflow import NodejsPnpmWorkflow
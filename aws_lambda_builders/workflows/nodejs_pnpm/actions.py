@@ -0,0 +1,245 @@
+"""
+Actions to resolve NodeJS dependencies using PNPM
+"""
+
+import logging
+import os
+import shutil
+from typing import Optional
+
+from aws_lambda_builders.actions import ActionFailedError, BaseAction, Purpose
+from aws_lambda_builders.workflows.nodejs_npm.actions import NodejsNpmrcAndLockfileCopyAction
+from aws_lambda_builders.workflows.nodejs_pnpm.exceptions import PnpmExecutionError
+from aws_lambda_builders.workflows.nodejs_pnpm.pnpm import SubprocessPnpm
+
+LOG = logging.getLogger(__name__)
+
+# Directory of the content-addressable store PNPM installs the packages from, PNPM's global store by default
+PNPM_STORE_DIR_KEY = "pnpm_store_dir"
+# How PNPM imports the packages of its store into node_modules, one of PACKAGE_IMPORT_METHODS
+PNPM_PACKAGE_IMPORT_METHOD_KEY = "pnpm_package_import_method"
+# Whether the build fails instead of updating a pnpm-lock.yaml file that is not up to date with package.json
+PNPM_FROZEN_LOCKFILE_KEY = "use_pnpm_frozen_lockfile"
+
+# "auto" clones the files of the store when the file system supports it, hardlinks them otherwise, and copies them as
+# a last resort, ex: when the store is on another device than node_modules
+PACKAGE_IMPORT_METHODS = ("auto", "hardlink", "clone", "clone-or-copy", "copy")
+
+
+class NodejsPnpmInstallAction(BaseAction):
+    """
+    A Lambda Builder Action that installs the production dependencies of a PNPM project in a flat node_modules
+    directory, linking their files from the content-addressable store of PNPM
+    """
+
+    NAME = "PnpmInstall"
+    DESCRIPTION = "Installing dependencies from PNPM"
+    PURPOSE = Purpose.RESOLVE_DEPENDENCIES
+
+    def __init__(
+        self,
+        install_dir: str,
+        subprocess_pnpm: SubprocessPnpm,
+        store_dir: Optional[str] = None,
+        package_import_method: Optional[str] = None,
+        frozen_lockfile: Optional[bool] = False,
+    ):
+        """
+        Parameters
+        ----------
+        install_dir : str
+            Dependencies will be installed in this directory.
+        subprocess_pnpm : SubprocessPnpm
+            An instance of the PNPM process wrapper
+        store_dir : Optional[str]
+            Directory of the content-addressable store, the global store of PNPM if not set
+        package_import_method : Optional[str]
+            One of PACKAGE_IMPORT_METHODS, the method configured for PNPM if not set
+        frozen_lockfile : Optional[bool]
+            Uses the --frozen-lockfile PNPM option if True, by default False
+        """
+
+        super(NodejsPnpmInstallAction, self).__init__()
+        self.install_dir = install_dir
+        self.subprocess_pnpm = subprocess_pnpm
+        self.store_dir = store_dir
+        self.package_import_method = package_import_method
+        self.frozen_lockfile = frozen_lockfile
+
+    def execute(self):
+        """
+        Runs the action.
+
+        :raises lambda_builders.actions.ActionFailedError: when PNPM execution fails
+        """
+        self._validate_package_import_method()
+
+        try:
+            LOG.debug("NODEJS installing production dependencies with PNPM in: %s", self.install_dir)
+
+            # the workspace the build directory may be nested in must not be installed instead of it
+            command = ["install", "--prod", "--ignore-workspace"] + self._get_install_options()
+            self.subprocess_pnpm.run(command, cwd=self.install_dir)
+
+        except PnpmExecutionError as ex:
+            raise ActionFailedError(str(ex))
+
+    def _validate_package_import_method(self):
+        if self.package_import_method and self.package_import_method not in PACKAGE_IMPORT_METHODS:
+            raise ActionFailedError(
+                "{} must be one of {}, got {}".format(
+                    PNPM_PACKAGE_IMPORT_METHOD_KEY, ", ".join(PACKAGE_IMPORT_METHODS), self.package_import_method
+                )
+            )
+
+    def _get_install_options(self):
+        # the hoisted node linker lays node_modules out like NPM does, without symlinks
+        options = ["--config.node-linker=hoisted"]
+        if self.frozen_lockfile:
+            options.append("--frozen-lockfile")
+        if self.store_dir:
+            options.extend(["--store-dir", self.store_dir])
+        if self.package_import_method:
+            options.append("--config.package-import-method={}".format(self.package_import_method))
+        return options
+
+
+class NodejsPnpmDeployAction(NodejsPnpmInstallAction):
+    """
+    A Lambda Builder Action that installs the production dependencies of a package of a PNPM workspace from the
+    lockfile of the workspace, with `pnpm deploy`, and moves the flat node_modules directory it lays out into the
+    install directory
+    """
+
+    NAME = "PnpmDeploy"
+    DESCRIPTION = "Installing dependencies of a workspace package from PNPM"
+
+    def __init__(
+        self,
+        install_dir: str,
+        subprocess_pnpm: SubprocessPnpm,
+        workspace_root: str,
+        workspace_package: str,
+        deploy_dir: str,
+        store_dir: Optional[str] = None,
+        package_import_method: Optional[str] = None,
+        frozen_lockfile: Optional[bool] = False,
+    ):
+        """
+        Parameters
+        ----------
+        install_dir : str
+            Dependencies will be installed in this directory.
+        subprocess_pnpm : SubprocessPnpm
+            An instance of the PNPM process wrapper
+        workspace_root : str
+            Root of the workspace, the directory holding pnpm-workspace.yaml and the lockfile of the workspace
+        workspace_package : str
+            PNPM filter selecting the package in the workspace, ex: its name
+        deploy_dir : str
+            Directory the package is deployed into, emptied first and removed once its node_modules was moved
+        store_dir : Optional[str]
+            Directory of the content-addressable store, the global store of PNPM if not set
+        package_import_method : Optional[str]
+            One of PACKAGE_IMPORT_METHODS, the method configured for PNPM if not set
+        frozen_lockfile : Optional[bool]
+            Uses the --frozen-lockfile PNPM option if True, by default False
+        """
+        super(NodejsPnpmDeployAction, self).__init__(
+            install_dir,
+            subprocess_pnpm,
+            store_dir=store_dir,
+            package_import_method=package_import_method,
+            frozen_lockfile=frozen_lockfile,
+        )
+        self.workspace_root = workspace_root
+        self.workspace_package = workspace_package
+        self.deploy_dir = deploy_dir
+
+    def execute(self):
+        """
+        Runs the action.
+
+        :raises lambda_builders.actions.ActionFailedError: when PNPM execution or moving node_modules fails
+        """
+        self._validate_package_import_method()
+
+        try:
+            LOG.debug(
+                "NODEJS deploying production dependencies of %s of the PNPM workspace %s",
+                self.workspace_package,
+                self.workspace_root,
+            )
+            if os.path.isdir(self.deploy_dir):
+                shutil.rmtree(self.deploy_dir)
+
+            command = ["--filter", self.workspace_package, "deploy", self.deploy_dir, "--prod"]
+            self.subprocess_pnpm.run(command + self._get_install_options(), cwd=self.workspace_root)
+
+            installed_modules = os.path.join(self.install_dir, "node_modules")
+            if os.path.isdir(installed_modules):
+                shutil.rmtree(installed_modules)
+            deployed_modules = os.path.join(self.deploy_dir, "node_modules")
+            if os.path.isdir(deployed_modules):
+                shutil.move(deployed_modules, installed_modules)
+            shutil.rmtree(self.deploy_dir)
+
+        except PnpmExecutionError as ex:
+            raise ActionFailedError(str(ex))
+        except OSError as ex:
+            raise ActionFailedError(str(ex))
+
+
+class NodejsPnpmrcAndLockfileCopyAction(NodejsNpmrcAndLockfileCopyAction):
+    """
+    A Lambda Builder Action that copies package.json, the PNPM lockfile and the config file .npmrc
+    """
+
+    NAME = "CopyPnpmrcAndLockfile"
+    DESCRIPTION = "Copying the manifest, configuration from .npmrc and dependencies from pnpm-lock.yaml"
+
+    FILENAMES = ("package.json", ".npmrc", "pnpm-lock.yaml")
+
+
+class NodejsPnpmStateCleanUpAction(BaseAction):
+    """
+    A Lambda Builder Action that cleans up the state PNPM leaves in node_modules, which records local paths such as
+    the one of the store
+    """
+
+    NAME = "PnpmStateCleanUp"
+    DESCRIPTION = "Cleans the PNPM state files of node_modules"
+    PURPOSE = Purpose.COPY_SOURCE
+
+    STATE_FILES = ((".modules.yaml",), (".pnpm", "lock.yaml"))
+
+    def __init__(self, artifacts_dir, osutils):
+        """
+        :type artifacts_dir: str
+        :param artifacts_dir: an existing (writable) directory with project source files.
+            Dependencies are installed in this directory.
+
+        :type osutils: aws_lambda_builders.workflows.nodejs_npm.utils.OSUtils
+        :param osutils: An instance of OS Utilities for file manipulation
+        """
+
+        super(NodejsPnpmStateCleanUpAction, self).__init__()
+        self.artifacts_dir = artifacts_dir
+        self.osutils = osutils
+
+    def execute(self):
+        """
+        Runs the action.
+
+        :raises lambda_builders.actions.ActionFailedError: when deleting the state files fails
+        """
+
+        try:
+            for parts in self.STATE_FILES:
+                state_path = self.osutils.joinpath(self.artifacts_dir, "node_modules", *parts)
+                if self.osutils.file_exists(state_path):
+                    LOG.debug("%s cleanup in: %s", "/".join(parts), self.artifacts_dir)
+                    self.osutils.remove_file(state_path)
+
+        except OSError as ex:
+            raise ActionFailedError(str(ex))
@@ -0,0 +1,17 @@
+"""
+Exceptions for the Node.js PNPM workflow
+"""
+
+from aws_lambda_builders.exceptions import LambdaBuilderError
+
+
+class PnpmExecutionError(LambdaBuilderError):
+    """
+    Exception raised in case PNPM execution fails.
+    It will pass on the error output from the PNPM console.
+    """
+
+    MESSAGE = "PNPM Failed: {message}"
+
+    def __init__(self, **kwargs):
+        Exception.__init__(self, self.MESSAGE.format(**kwargs))
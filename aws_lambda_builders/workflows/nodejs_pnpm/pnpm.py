@@ -0,0 +1,76 @@
+"""
+Wrapper around calling pnpm through a subprocess.
+"""
+
+import logging
+
+from aws_lambda_builders.workflows.nodejs_pnpm.exceptions import PnpmExecutionError
+
+LOG = logging.getLogger(__name__)
+
+
+class SubprocessPnpm(object):
+    """
+    Wrapper around the PNPM command line utility, making it
+    easy to consume execution results.
+    """
+
+    def __init__(self, osutils, pnpm_exe=None):
+        """
+        :type osutils: aws_lambda_builders.workflows.nodejs_npm.utils.OSUtils
+        :param osutils: An instance of OS Utilities for file manipulation
+
+        :type pnpm_exe: str
+        :param pnpm_exe: Path to the PNPM binary. If not set,
+            the default executable path pnpm will be used
+        """
+        self.osutils = osutils
+
+        if pnpm_exe is None:
+            if osutils.is_windows():
+                pnpm_exe = "pnpm.cmd"
+            else:
+                pnpm_exe = "pnpm"
+
+        self.pnpm_exe = pnpm_exe
+
+    def run(self, args, cwd=None):
+        """
+        Runs the action.
+
+        :type args: list
+        :param args: Command line arguments to pass to PNPM
+
+        :type cwd: str
+        :param cwd: Directory where to execute the command (defaults to current dir)
+
+        :rtype: str
+        :return: text of the standard output from the command
+
+        :raises aws_lambda_builders.workflows.nodejs_pnpm.exceptions.PnpmExecutionError:
+            when the command executes with a non-zero return code. The exception will
+            contain the text of the standard error output from the command, or of the
+            standard output when PNPM reported the error there.
+
+        :raises ValueError: if arguments are not provided, or not a list
+        """
+
+        if not isinstance(args, list):
+            raise ValueError("args must be a list")
+
+        if not args:
+            raise ValueError("requires at least one arg")
+
+        invoke_pnpm = [self.pnpm_exe] + args
+
+        LOG.debug("executing PNPM: %s", invoke_pnpm)
+
+        p = self.osutils.popen(invoke_pnpm, stdout=self.osutils.pipe, stderr=self.osutils.pipe, cwd=cwd)
+
+        out, err = p.communicate()
+
+        if p.returncode != 0:
+            # PNPM writes most of its errors, ex: outdated lockfiles, to the standard output
+            raise PnpmExecutionError(message=err.decode("utf8").strip() or out.decode("utf8").strip())
+
+        return out.decode("utf8").strip()
@@ -0,0 +1,178 @@
+"""
+NodeJS PNPM Workflow
+"""
+
+import logging
+import os
+
+from aws_lambda_builders.actions import CleanUpAction, CopyDependenciesAction, CopySourceAction, MoveDependenciesAction
+from aws_lambda_builders.path_resolver import PathResolver
+from aws_lambda_builders.workflow import BaseWorkflow, BuildDirectory, BuildInSourceSupport, Capability
+from aws_lambda_builders.workflows.nodejs_npm.actions import NodejsNpmrcCleanUpAction
+from aws_lambda_builders.workflows.nodejs_npm.utils import OSUtils
+from aws_lambda_builders.workflows.nodejs_pnpm.actions import (
+    PNPM_FROZEN_LOCKFILE_KEY,
+    PNPM_PACKAGE_IMPORT_METHOD_KEY,
+    PNPM_STORE_DIR_KEY,
+    NodejsPnpmDeployAction,
+    NodejsPnpmInstallAction,
+    NodejsPnpmrcAndLockfileCopyAction,
+    NodejsPnpmStateCleanUpAction,
+)
+from aws_lambda_builders.workflows.nodejs_pnpm.pnpm import SubprocessPnpm
+
+LOG = logging.getLogger(__name__)
+
+
+class NodejsPnpmWorkflow(BaseWorkflow):
+    """
+    A Lambda builder workflow that knows how to pack
+    NodeJS projects using PNPM.
+    """
+
+    NAME = "NodejsPnpmBuilder"
+
+    CAPABILITY = Capability(language="nodejs", dependency_manager="pnpm", application_framework=None)
+
+    # Files besides the manifest that change the resolved dependencies
+    DEPENDENCY_FILES = (".npmrc", "pnpm-lock.yaml", "pnpm-workspace.yaml")
+
+    # node_modules of the source directory may be laid out by any package manager, dependencies are installed again
+    EXCLUDED_FILES = (".aws-sam", ".git", "node_modules")
+
+    CONFIG_PROPERTY = "aws_sam"
+
+    DEFAULT_BUILD_DIR = BuildDirectory.ARTIFACTS
+    BUILD_IN_SOURCE_SUPPORT = BuildInSourceSupport.NOT_SUPPORTED
+
+    def __init__(self, source_dir, artifacts_dir, scratch_dir, manifest_path, runtime=None, osutils=None, **kwargs):
+        super(NodejsPnpmWorkflow, self).__init__(
+            source_dir, artifacts_dir, scratch_dir, manifest_path, runtime=runtime, **kwargs
+        )
+
+        if osutils is None:
+            osutils = OSUtils()
+        self.osutils = osutils
+
+        self.actions = [CopySourceAction(source_dir, artifacts_dir, excludes=self.EXCLUDED_FILES)]
+
+        if not osutils.file_exists(manifest_path):
+            LOG.warning("package.json file not found. Continuing the build without dependencies.")
+            return
+
+        self.manifest_dir = self.osutils.dirname(self.manifest_path)
+        # package.json and pnpm-lock.yaml are in the manifest directory, which may not be the source directory
+        self.actions.append(NodejsPnpmrcAndLockfileCopyAction(artifacts_dir, self.manifest_dir, osutils=osutils))
+
+        if self.download_dependencies:
+            options = self.options if isinstance(self.options, dict) else {}
+            package_import_method = options.get(PNPM_PACKAGE_IMPORT_METHOD_KEY)
+            if self.normalize_artifacts and package_import_method in (None, "auto", "hardlink"):
+                # normalizing the artifacts would change the modes and timestamps of the files of the store
+                package_import_method = "clone-or-copy"
+            workspace_root = self._get_workspace_root_of_unlocked_package()
+            if workspace_root:
+                # only the lockfile of the workspace resolves the dependencies of the package
+                self.actions.append(
+                    NodejsPnpmDeployAction(
+                        install_dir=artifacts_dir,
+                        subprocess_pnpm=SubprocessPnpm(osutils),
+                        workspace_root=workspace_root,
+                        workspace_package=self._get_workspace_package_filter(workspace_root),
+                        deploy_dir=self.osutils.joinpath(scratch_dir, "pnpm-deploy"),
+                        store_dir=options.get(PNPM_STORE_DIR_KEY),
+                        package_import_method=package_import_method,
+                        frozen_lockfile=options.get(PNPM_FROZEN_LOCKFILE_KEY, False),
+                    )
+                )
+            else:
+                self.actions.append(
+                    NodejsPnpmInstallAction(
+                        install_dir=artifacts_dir,
+                        subprocess_pnpm=SubprocessPnpm(osutils),
+                        store_dir=options.get(PNPM_STORE_DIR_KEY),
+                        package_import_method=package_import_method,
+                        frozen_lockfile=options.get(PNPM_FROZEN_LOCKFILE_KEY, False),
+                    )
+                )
+
+        if self.dependencies_dir:
+            # if we downloaded dependencies, update dependencies_dir
+            if self.download_dependencies:
+                self.actions += self._actions_for_updating_dependencies_dir
+            # otherwise if we want to use the dependencies from dependencies_dir and we want to combine them,
+            # then copy them into the artifacts dir
+            elif self.combine_dependencies:
+                self.actions.append(CopySourceAction(self.dependencies_dir, artifacts_dir))
+
+        self.actions += self._actions_for_cleanup
+
+    def _get_workspace_root_of_unlocked_package(self):
+        """
+        Returns the root of the PNPM workspace the project is a package of, the closest parent directory of the
+        manifest directory holding pnpm-workspace.yaml, when the project has no pnpm-lock.yaml of its own.
+        """
+        if self.osutils.file_exists(self.osutils.joinpath(self.manifest_dir, "pnpm-lock.yaml")):
+            return None
+        directory = self.osutils.abspath(self.manifest_dir)
+        while True:
+            parent = self.osutils.dirname(directory)
+            if parent == directory:
+                return None
+            directory = parent
+            if self.osutils.file_exists(self.osutils.joinpath(directory, "pnpm-workspace.yaml")):
+                return directory
+
+    def _get_workspace_package_filter(self, workspace_root):
+        """
+        Returns the PNPM filter selecting the project among the packages of the workspace: its name, or its directory
+        relative to the root of the workspace if it has no name.
+        """
+        name = self.osutils.parse_json(self.manifest_path).get("name")
+        if name:
+            return name
+        relative_path = os.path.relpath(self.osutils.abspath(self.manifest_dir), workspace_root)
+        return "./{}".format(relative_path.replace(os.sep, "/"))
+
+    @property
+    def _actions_for_cleanup(self):
+        actions = [
+            NodejsNpmrcCleanUpAction(self.artifacts_dir, osutils=self.osutils),
+            NodejsPnpmStateCleanUpAction(self.artifacts_dir, osutils=self.osutils),
+        ]
+        if self.dependencies_dir:
+            actions.append(NodejsPnpmStateCleanUpAction(self.dependencies_dir, osutils=self.osutils))
+        return actions
+
+    @property
+    def _actions_for_updating_dependencies_dir(self):
+        # clean up the dependencies folder first
+        actions = [CleanUpAction(self.dependencies_dir)]
+        # if combine_dependencies is set, we should keep dependencies and source code in the artifact folder
+        # while copying the dependencies. Otherwise we should separate the dependencies and source code
+        if self.combine_dependencies:
+            actions.append(
+                CopyDependenciesAction(
+                    source_dir=self.source_dir,
+                    artifact_dir=self.artifacts_dir,
+                    destination_dir=self.dependencies_dir,
+                    manifest_dir=self.manifest_dir,
+                )
+            )
+        else:
+            actions.append(
+                MoveDependenciesAction(
+                    source_dir=self.source_dir,
+                    artifact_dir=self.artifacts_dir,
+                    destination_dir=self.dependencies_dir,
+                    manifest_dir=self.manifest_dir,
+                )
+            )
+
+        return actions
+
+    def get_resolvers(self):
+        """
+        specialized path resolver that just returns the list of executable for the runtime on the path.
+        """
+        return [PathResolver(runtime=self.runtime, binary="pnpm")]
@@ -3,26 +3,79 @@ Action to resolve Python dependencies using PIP
 """
 
 import logging
+import os
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 
 from aws_lambda_builders.actions import ActionFailedError, BaseAction, Purpose
-from aws_lambda_builders.architecture import X86_64
+from aws_lambda_builders.architecture import ARM64, X86_64
 from aws_lambda_builders.binary_path import BinaryPath
 from aws_lambda_builders.exceptions import MisMatchRuntimeError, RuntimeValidatorError
+from aws_lambda_builders.workflows.python_pip.distribution_report import report_distributions
 from aws_lambda_builders.workflows.python_pip.exceptions import MissingPipError
+from aws_lambda_builders.workflows.python_pip.import_pruning import find_unreachable_distributions, remove_distributions
+from aws_lambda_builders.workflows.python_pip.install_record import InstallRecord
 from aws_lambda_builders.workflows.python_pip.packager import (
     DependencyBuilder,
     PackagerError,
     PipRunner,
+    PipWorker,
     PythonPipDependencyBuilder,
     SubprocessPip,
 )
+from aws_lambda_builders.workflows.python_pip.resolution_lock import DEFAULT_LOCK_TTL, LOCKS_DIR_NAME, ResolutionLock
+from aws_lambda_builders.workflows.python_pip.slimming import get_slimming_settings, slim_dependencies
 from aws_lambda_builders.workflows.python_pip.utils import OSUtils
+from aws_lambda_builders.workflows.python_pip.wheel_index import WheelIndex
+from aws_lambda_builders.workflows.python_pip.wheelhouse import (
+    DEFAULT_WHEELHOUSE_MAX_SIZE,
+    WHEELHOUSE_DIR_NAME,
+    Wheelhouse,
+)
 
 LOG = logging.getLogger(__name__)
 
 PARENT_PYTHON_PKGS_KEY = "parent_python_packages"
+# Maximum number of pip processes downloading wheels at the same time
+DOWNLOAD_CONCURRENCY_KEY = "download_concurrency"
+# Maximum number of sdists built into wheels at the same time
+BUILD_CONCURRENCY_KEY = "build_concurrency"
+# Maximum number of wheels extracted at the same time
+INSTALL_CONCURRENCY_KEY = "install_concurrency"
+# Maximum number of bytes used by the wheelhouse kept under the cache directory
+WHEELHOUSE_MAX_SIZE_KEY = "wheelhouse_max_size"
+# Whether pip commands run in a single long lived process rather than one process each
+PIP_WORKER_KEY = "pip_worker"
+# Whether a single pip command first tries to download a Lambda compatible wheel for every dependency
+BINARY_FAST_PATH_KEY = "binary_fast_path"
+# Whether only the changed dependencies are installed into the dependencies directory
+INCREMENTAL_INSTALL_KEY = "incremental_install"
+# Whether the resolved dependencies are locked under the cache directory and reused by the next builds
+RESOLUTION_LOCK_KEY = "resolution_lock"
+# Number of seconds a lock file of the resolved dependencies is reused for
+RESOLUTION_LOCK_TTL_KEY = "resolution_lock_ttl"
+# Whether the Python files of the artifacts are compiled to bytecode
+COMPILE_BYTECODE_KEY = "compile_bytecode"
+# Whether the files of the dependencies that Lambda never uses are removed after they are installed
+SLIM_DEPENDENCIES_KEY = "slim_dependencies"
+# Glob patterns of other files of the dependencies to remove
+SLIM_REMOVE_PATTERNS_KEY = "slim_remove_patterns"
+# Glob patterns of files of the dependencies to keep, even if they match a pattern to remove
+SLIM_KEEP_PATTERNS_KEY = "slim_keep_patterns"
+# Whether the size of each installed distribution is reported in the result of the build
+DISTRIBUTION_REPORT_KEY = "distribution_report"
+# Mapping of other architectures to the directories their dependencies are installed into, in the same build
+ARCHITECTURE_DEPENDENCIES_DIRS_KEY = "architecture_dependencies_dirs"
+# Local directory of wheels every dependency is installed from, without using the package index
+OFFLINE_WHEELHOUSE_KEY = "offline_wheelhouse"
+# Whether the distributions the function never imports are only reported ("report") or also removed ("strict")
+IMPORT_PRUNING_KEY = "import_pruning"
+# Modules or handlers the analysis of the imports starts from, every module of the source by default
+IMPORT_PRUNING_ENTRY_POINTS_KEY = "import_pruning_entry_points"
+# Top-level modules that are always considered imported, ex: the ones imported dynamically
+IMPORT_PRUNING_KEEP_KEY = "import_pruning_keep"
+
+IMPORT_PRUNING_MODES = ("report", "strict")
 
 
 class PythonPipBuildAction(BaseAction):
@@ -32,7 +85,16 @@ class PythonPipBuildAction(BaseAction):
     LANGUAGE = "python"
 
     def __init__(
-        self, artifacts_dir, scratch_dir, manifest_path, runtime, dependencies_dir, binaries, architecture=X86_64
+        self,
+        artifacts_dir,
+        scratch_dir,
+        manifest_path,
+        runtime,
+        dependencies_dir,
+        binaries,
+        architecture=X86_64,
+        options=None,
+        cache_dir=None,
     ):
         self.artifacts_dir = artifacts_dir
         self.manifest_path = manifest_path
@@ -41,6 +103,8 @@ class PythonPipBuildAction(BaseAction):
         self.dependencies_dir = dependencies_dir
         self.binaries = binaries
         self.architecture = architecture
+        self.options = options or {}
+        self.cache_dir = cache_dir
 
         self._os_utils = OSUtils()
 
@@ -48,8 +112,16 @@ class PythonPipBuildAction(BaseAction):
         """
         Executes the build action for Python `pip` workflows.
         """
+        wheel_index = self._get_wheel_index()
         pip, python_with_pip = self._find_runtime_with_pip()
-        pip_runner = PipRunner(python_exe=python_with_pip, pip=pip)
+        wheelhouse = self._get_wheelhouse()
+        pip_runner = PipRunner(
+            python_exe=python_with_pip,
+            pip=pip,
+            download_concurrency=self.options.get(DOWNLOAD_CONCURRENCY_KEY, 1),
+            find_links=wheelhouse.directory if wheelhouse else None,
+            offline_wheelhouse=wheel_index.directory if wheel_index else None,
+        )
 
         dependency_builder = DependencyBuilder(
             osutils=self._os_utils,
@@ -57,6 +129,15 @@ class PythonPipBuildAction(BaseAction):
             pip_runner=pip_runner,
             runtime=self.runtime,
             architecture=self.architecture,
+            build_concurrency=self.options.get(BUILD_CONCURRENCY_KEY, 1),
+            install_concurrency=self.options.get(INSTALL_CONCURRENCY_KEY, 1),
+            wheelhouse=wheelhouse,
+            binary_fast_path=bool(self.options.get(BINARY_FAST_PATH_KEY)),
+            # the record of the installed wheels must not end up in the artifacts
+            incremental_install=bool(self.dependencies_dir and self.options.get(INCREMENTAL_INSTALL_KEY)),
+            resolution_lock=self._get_resolution_lock(),
+            wheel_index=wheel_index,
+            slimming=self._get_slimming_settings(),
         )
 
         package_builder = PythonPipDependencyBuilder(
@@ -75,19 +156,103 @@ class PythonPipBuildAction(BaseAction):
                 artifacts_dir_path=target_artifact_dir,
                 scratch_dir_path=self.scratch_dir,
                 requirements_path=self.manifest_path,
+                architecture_directories=self._get_architecture_directories(),
             )
         except PackagerError as ex:
             raise ActionFailedError(str(ex))
+        finally:
+            pip.close()
+
+        if self.options.get(DISTRIBUTION_REPORT_KEY):
+            self.report = {
+                "distribution_report": report_distributions(
+                    target_artifact_dir, self.manifest_path, self.runtime, self.architecture
+                )
+            }
+
+    def _get_slimming_settings(self) -> Optional[Dict[str, List[str]]]:
+        """
+        Returns the settings the installed dependencies are slimmed with, if they are.
+        """
+        if not self.options.get(SLIM_DEPENDENCIES_KEY):
+            return None
+        return get_slimming_settings(
+            self.options.get(SLIM_REMOVE_PATTERNS_KEY), self.options.get(SLIM_KEEP_PATTERNS_KEY)
+        )
 
-    def _find_runtime_with_pip(self) -> Tuple[SubprocessPip, str]:
+    def _get_architecture_directories(self) -> Optional[Dict[str, str]]:
+        """
+        Returns the directories the dependencies of other architectures are installed into, if any were provided.
+        """
+        architecture_directories = self.options.get(ARCHITECTURE_DEPENDENCIES_DIRS_KEY)
+        if not architecture_directories:
+            return None
+        unsupported = sorted(set(architecture_directories) - {X86_64, ARM64})
+        if unsupported:
+            raise ActionFailedError(
+                "Unsupported architecture(s) {} in {}".format(
+                    ", ".join(unsupported), ARCHITECTURE_DEPENDENCIES_DIRS_KEY
+                )
+            )
+        return {
+            architecture: directory
+            for architecture, directory in architecture_directories.items()
+            if architecture != self.architecture
+        }
+
+    def _get_wheel_index(self) -> Optional[WheelIndex]:
+        """
+        Returns the index of the offline wheelhouse, if one was provided.
+        """
+        offline_wheelhouse = self.options.get(OFFLINE_WHEELHOUSE_KEY)
+        if not offline_wheelhouse:
+            return None
+        if not os.path.isdir(offline_wheelhouse):
+            raise ActionFailedError("Offline wheelhouse {} is not a directory".format(offline_wheelhouse))
+        return WheelIndex(os.path.abspath(offline_wheelhouse))
+
+    def _get_wheelhouse(self) -> Optional[Wheelhouse]:
+        """
+        Returns the wheelhouse kept under the cache directory, if a cache directory was provided and the wheelhouse
+        can be created in it.
+        """
+        if not self.cache_dir:
+            return None
+        try:
+            return Wheelhouse(
+                os.path.join(self.cache_dir, WHEELHOUSE_DIR_NAME),
+                max_size=self.options.get(WHEELHOUSE_MAX_SIZE_KEY, DEFAULT_WHEELHOUSE_MAX_SIZE),
+            )
+        except OSError as ex:
+            LOG.debug("Unable to use a wheelhouse in %s", self.cache_dir, exc_info=ex)
+            return None
+
+    def _get_resolution_lock(self) -> Optional[ResolutionLock]:
+        """
+        Returns the lock file of the requirements kept under the cache directory, if locking was requested, a cache
+        directory was provided and the lock file can be created in it.
+        """
+        if not self.cache_dir or not self.options.get(RESOLUTION_LOCK_KEY):
+            return None
+        try:
+            return ResolutionLock(
+                os.path.join(self.cache_dir, LOCKS_DIR_NAME),
+                ResolutionLock.compute_key(self.manifest_path, self.runtime, self.architecture),
+                ttl=self.options.get(RESOLUTION_LOCK_TTL_KEY, DEFAULT_LOCK_TTL),
+            )
+        except OSError as ex:
+            LOG.debug("Unable to lock the dependencies in %s", self.cache_dir, exc_info=ex)
+            return None
+
+    def _find_runtime_with_pip(self) -> Tuple[Union[SubprocessPip, PipWorker], str]:
         """
         Finds a Python runtime that also contains `pip`.
 
         Returns
         -------
-        Tuple[SubprocessPip, str]
-            Returns a tuple of the SubprocessPip object created from
-            a valid Python runtime and the runtime path itself
+        Tuple[Union[SubprocessPip, PipWorker], str]
+            Returns a tuple of the SubprocessPip object (or PipWorker object if the `pip_worker` option is set)
+            created from a valid Python runtime and the runtime path itself
 
         Raises
         ------
@@ -105,7 +270,10 @@ class PythonPipBuildAction(BaseAction):
                 valid_python_path = binary_object.validator.validate(python_path)
 
                 if valid_python_path:
-                    pip = SubprocessPip(osutils=self._os_utils, python_exe=valid_python_path)
+                    if self.options.get(PIP_WORKER_KEY):
+                        pip = PipWorker(osutils=self._os_utils, python_exe=valid_python_path)
+                    else:
+                        pip = SubprocessPip(osutils=self._os_utils, python_exe=valid_python_path)
 
                     return (pip, valid_python_path)
             except (MisMatchRuntimeError, RuntimeValidatorError):
@@ -120,6 +288,169 @@ class PythonPipBuildAction(BaseAction):
         raise ActionFailedError("Failed to find a Python runtime containing pip on the PATH.")
 
 
+class PythonPruneImportsAction(BaseAction):
+    NAME = "PruneImports"
+    DESCRIPTION = "Finding the dependencies the function never imports"
+    PURPOSE = Purpose.RESOLVE_DEPENDENCIES
+    LANGUAGE = "python"
+
+    def __init__(self, source_dir, dependencies_dir, options=None, excludes=()):
+        self.source_dir = source_dir
+        self.dependencies_dir = dependencies_dir
+        self.options = options or {}
+        self.excludes = excludes
+
+    def execute(self) -> None:
+        """
+        Reports the installed distributions none of whose modules is imported from the source, and removes them in
+        strict mode.
+        """
+        mode = self.options.get(IMPORT_PRUNING_KEY)
+        if mode not in IMPORT_PRUNING_MODES:
+            raise ActionFailedError(
+                "{} must be one of {}, got {}".format(IMPORT_PRUNING_KEY, ", ".join(IMPORT_PRUNING_MODES), mode)
+            )
+        kept, unreachable = find_unreachable_distributions(
+            self.dependencies_dir,
+            self.source_dir,
+            entry_points=self.options.get(IMPORT_PRUNING_ENTRY_POINTS_KEY),
+            keep=self.options.get(IMPORT_PRUNING_KEEP_KEY),
+            excludes=self.excludes,
+        )
+        report = {
+            "mode": mode,
+            "kept_distributions": kept,
+            "unreachable_distributions": [
+                {
+                    "name": distribution["name"],
+                    "version": distribution["version"],
+                    "files": len(distribution["paths"]),
+                    "bytes": sum(os.lstat(path).st_size for path in distribution["paths"]),
+                }
+                for distribution in unreachable
+            ],
+            "removed_files": 0,
+        }
+        LOG.info(
+            "The function never imports %d distribution(s): %s",
+            len(unreachable),
+            ", ".join(distribution["name"] for distribution in unreachable),
+        )
+
+        if mode == "strict" and unreachable:
+            try:
+                removed_paths = remove_distributions(self.dependencies_dir, unreachable)
+            except OSError as ex:
+                raise ActionFailedError(str(ex))
+            report["removed_files"] = len(removed_paths)
+            record = InstallRecord.load(self.dependencies_dir)
+            if record is not None:
+                record.discard_files(removed_paths)
+                record.save(self.dependencies_dir)
+
+        self.report = {"import_pruning": report}
+
+
+class PythonSlimDependenciesAction(BaseAction):
+    NAME = "SlimDependencies"
+    DESCRIPTION = "Removing the files of the dependencies that Lambda never uses"
+    PURPOSE = Purpose.RESOLVE_DEPENDENCIES
+    LANGUAGE = "python"
+
+    def __init__(self, dependencies_dir, options=None):
+        self.dependencies_dir = dependencies_dir
+        self.options = options or {}
+
+    def execute(self) -> None:
+        """
+        Removes the files of the installed dependencies matching the slimming patterns, and reports the number of
+        files and bytes removed.
+        """
+        if not os.path.isdir(self.dependencies_dir):
+            return
+        try:
+            report, removed_paths = slim_dependencies(
+                self.dependencies_dir,
+                remove_patterns=self.options.get(SLIM_REMOVE_PATTERNS_KEY),
+                keep_patterns=self.options.get(SLIM_KEEP_PATTERNS_KEY),
+            )
+        except OSError as ex:
+            raise ActionFailedError(str(ex))
+        LOG.info(
+            "Removed %d file(s), %d byte(s) the function does not use from the dependencies",
+            report["removed_files"],
+            report["removed_bytes"],
+        )
+
+        record = InstallRecord.load(self.dependencies_dir)
+        if record is not None:
+            record.slim_files(
+                removed_paths,
+                get_slimming_settings(
+                    self.options.get(SLIM_REMOVE_PATTERNS_KEY), self.options.get(SLIM_KEEP_PATTERNS_KEY)
+                ),
+            )
+            record.save(self.dependencies_dir)
+
+        self.report = {"dependency_slimming": report}
+
+
+class PythonCompileBytecodeAction(BaseAction):
+    NAME = "CompileBytecode"
+    DESCRIPTION = "Compiling Python files to bytecode"
+    PURPOSE = Purpose.COMPILE_SOURCE
+    LANGUAGE = "python"
+
+    def __init__(self, directories, binaries, osutils=None):
+        self.directories = directories
+        self.binaries = binaries
+        self._os_utils = osutils or OSUtils()
+
+    def execute(self) -> None:
+        """
+        Compiles the Python files of the directories with the Python runtime of the build, so that Lambda imports them
+        from bytecode instead of compiling them on each cold start. The bytecode files are checked against a hash of
+        their source rather than its timestamp, which archives and the normalization of the artifacts change, and the
+        hash is not checked since the source can't change in Lambda.
+        """
+        binary_object: Optional[BinaryPath] = self.binaries.get(self.LANGUAGE)
+        if not binary_object:
+            raise ActionFailedError("Failed to fetch Python binaries from the PATH.")
+
+        for directory in self.directories:
+            if not os.path.isdir(directory):
+                continue
+            command = [
+                binary_object.binary_path,
+                "-m",
+                "compileall",
+                "-q",
+                # one worker per CPU
+                "-j",
+                "0",
+                "--invalidation-mode",
+                "unchecked-hash",
+                directory,
+            ]
+            LOG.debug("Compiling the Python files of %s to bytecode", directory)
+            p = self._os_utils.popen(
+                command,
+                stdout=self._os_utils.pipe,
+                stderr=self._os_utils.pipe,
+                env=self._os_utils.original_environ(),
+            )
+            out, err = p.communicate()
+            if p.returncode != 0:
+                # Files the runtime can't compile, ex: Python 2 files shipped by some packages, are only an issue if
+                # they are imported, which would fail without bytecode too.
+                LOG.warning(
+                    "Some Python files in %s could not be compiled to bytecode:\n%s%s",
+                    directory,
+                    out.decode(errors="replace"),
+                    err.decode(errors="replace"),
+                )
+
+
 class PythonCreateParentPackagesAction(BaseAction):
     NAME = "CreateParentPackages"
     DESCRIPTION = "Creating parent Python packages"
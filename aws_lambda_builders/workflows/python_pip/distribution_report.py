@@ -0,0 +1,184 @@
+"""
+Report of the size of the Python distributions installed in a directory
+"""
+
+import csv
+import os
+import re
+from email.parser import FeedParser
+
+from .markers import evaluate_marker, get_lambda_environment
+from .utils import normalize_name
+
+DIST_INFO_SUFFIX = ".dist-info"
+
+# Native libraries, including the versioned ones vendored into wheels, ex: libgfortran-040039e1.so.5.0.0
+NATIVE_LIBRARY_REGEX = re.compile(r"\.so(\.[0-9]+)*$")
+
+# Name and extras at the start of a requirement, ex: "urllib3<3,>=1.21.1" or "requests[socks]>=2"
+REQUIREMENT_NAME_REGEX = re.compile(r"^\s*([A-Za-z0-9][A-Za-z0-9._-]*)\s*(?:\[([^\]]*)\])?")
+
+
+def report_distributions(directory, requirements_path=None, runtime=None, architecture=None):
+    """
+    Reports the installed size, number of files and number of native libraries of every distribution installed in a
+    directory, along with the top-level requirements that pulled it in.
+
+    The top-level requirements are the requirements of the requirements file that are installed, and the
+    distributions no other installed distribution requires. A distribution is pulled in by every top-level requirement
+    it can be reached from through the ``Requires-Dist`` metadata of the installed distributions. Requirements only
+    count when their markers hold in Lambda, with the extras requested for the distribution that has them, ex: the
+    requirements of the "socks" extra of requests only count when a reached requirement is ``requests[socks]``.
+
+    :type directory: str
+    :param directory: Directory the distributions are installed in.
+
+    :type requirements_path: str
+    :param requirements_path: Optional path to the requirements file of the
+        build, in the pip format.
+
+    :type runtime: str
+    :param runtime: Optional Python runtime the markers are evaluated for.
+
+    :type architecture: str
+    :param architecture: Optional architecture the markers are evaluated for.
+
+    :rtype: dict
+    :return: The ``total_bytes`` and ``total_files`` of the distributions, and
+        the ``distributions`` sorted by decreasing installed size, each with
+        its ``name``, ``version``, ``bytes``, ``files``, ``native_libraries``
+        and ``top_level_requirements``.
+    """
+    distributions = {}
+    for entry in sorted(os.listdir(directory)) if os.path.isdir(directory) else []:
+        dist_info = os.path.join(directory, entry)
+        if entry.endswith(DIST_INFO_SUFFIX) and os.path.isdir(dist_info):
+            distribution = _read_distribution(directory, dist_info)
+            distributions[normalize_name(distribution["name"])] = distribution
+
+    environment = get_lambda_environment(runtime, architecture)
+    extras = {key: set() for key in distributions}
+    top_level = set()
+    for name, requested in _read_requirements(requirements_path, environment):
+        if name in distributions:
+            top_level.add(name)
+            extras[name].update(requested)
+    requirements = _follow_requirements(
+        {key: distribution.pop("requires") for key, distribution in distributions.items()}, extras, environment
+    )
+    required = set().union(*requirements.values())
+    top_level.update(name for name in distributions if name not in required)
+
+    for name in sorted(top_level):
+        for reached in _reach(name, requirements):
+            distributions[reached]["top_level_requirements"].append(distributions[name]["name"])
+
+    ordered = sorted(distributions.values(), key=lambda distribution: (-distribution["bytes"], distribution["name"]))
+    return {
+        "total_bytes": sum(distribution["bytes"] for distribution in ordered),
+        "total_files": sum(distribution["files"] for distribution in ordered),
+        "distributions": ordered,
+    }
+
+
+def _read_distribution(directory, dist_info):
+    metadata = FeedParser()
+    metadata_path = os.path.join(dist_info, "METADATA")
+    if os.path.isfile(metadata_path):
+        with open(metadata_path, "r", encoding="utf-8", errors="replace") as metadata_file:
+            metadata.feed(metadata_file.read())
+    message = metadata.close()
+    # the directory is named after the distribution, ex: requests-2.32.3.dist-info
+    name, _, version = os.path.basename(dist_info)[: -len(DIST_INFO_SUFFIX)].partition("-")
+
+    paths = list_installed_files(directory, dist_info)
+    return {
+        "name": message.get("Name") or name,
+        "version": message.get("Version") or version,
+        "bytes": sum(os.lstat(path).st_size for path in paths),
+        "files": len(paths),
+        "native_libraries": sum(1 for path in paths if NATIVE_LIBRARY_REGEX.search(path)),
+        "top_level_requirements": [],
+        "requires": [
+            parsed
+            for parsed in (_parse_requirement(requirement) for requirement in message.get_all("Requires-Dist", []))
+            if parsed
+        ],
+    }
+
+
+def list_installed_files(directory, dist_info):
+    """
+    Returns the paths of the files of a distribution installed in a directory that are still there, as listed by the
+    RECORD file of its .dist-info directory. Without it, ex: once the dependencies were slimmed, only the files of the
+    .dist-info directory are known.
+    """
+    record_path = os.path.join(dist_info, "RECORD")
+    if not os.path.isfile(record_path):
+        return [os.path.join(dist_info, name) for name in os.listdir(dist_info)]
+    paths = []
+    with open(record_path, "r", encoding="utf-8", newline="") as record_file:
+        for row in csv.reader(record_file):
+            if not row or os.path.isabs(row[0]) or row[0].split("/")[0] == "..":
+                # files installed outside of the directory, ex: scripts
+                continue
+            path = os.path.join(directory, *row[0].split("/"))
+            if os.path.isfile(path):
+                paths.append(path)
+    return paths
+
+
+def _read_requirements(requirements_path, environment):
+    if not requirements_path or not os.path.isfile(requirements_path):
+        return []
+    requirements = []
+    with open(requirements_path, "r", encoding="utf-8", errors="replace") as requirements_file:
+        for line in requirements_file:
+            requirement = line.split(" #", 1)[0].strip()
+            # options, references to other files, paths and URLs name no distribution
+            if not requirement or requirement.startswith(("#", "-", ".", "/")) or "://" in requirement.split("@", 1)[0]:
+                continue
+            parsed = _parse_requirement(requirement)
+            if parsed and (not parsed[2] or evaluate_marker(parsed[2], environment)):
+                requirements.append(parsed[:2])
+    return requirements
+
+
+def _parse_requirement(requirement):
+    # the normalized name, the normalized extras and the marker of a requirement, ex: "PySocks; extra == 'socks'"
+    match = REQUIREMENT_NAME_REGEX.match(requirement)
+    if not match:
+        return None
+    extras = {normalize_name(extra.strip()) for extra in (match.group(2) or "").split(",") if extra.strip()}
+    return normalize_name(match.group(1)), extras, requirement.partition(";")[2].strip()
+
+
+def _follow_requirements(requires, extras, environment):
+    """
+    Returns the installed distributions each installed distribution requires, and adds the extras requested by the
+    requirements to the extras of the required distributions, until no more extras are requested.
+    """
+    while True:
+        requirements = {key: set() for key in requires}
+        requested_extras = False
+        for key, parsed_requirements in requires.items():
+            for name, requested, marker in parsed_requirements:
+                if name not in extras or (marker and not evaluate_marker(marker, environment, extras[key])):
+                    continue
+                requirements[key].add(name)
+                if not extras[name].issuperset(requested):
+                    extras[name].update(requested)
+                    requested_extras = True
+        if not requested_extras:
+            return requirements
+
+
+def _reach(name, requirements):
+    reached = set()
+    pending = [name]
+    while pending:
+        current = pending.pop()
+        if current not in reached:
+            reached.add(current)
+            pending.extend(requirements[current])
+    return reached
@@ -0,0 +1,180 @@
+"""
+Static analysis of the imports of a Python function, to find the installed distributions it never imports
+"""
+
+import ast
+import fnmatch
+import logging
+import os
+
+from aws_lambda_builders.workflows.python_pip.distribution_report import DIST_INFO_SUFFIX, list_installed_files
+from aws_lambda_builders.workflows.python_pip.slimming import remove_emptied_directories
+
+LOG = logging.getLogger(__name__)
+
+# Functions importing the module named by their first argument
+DYNAMIC_IMPORT_FUNCTIONS = ("import_module", "__import__")
+
+
+def find_unreachable_distributions(dependencies_dir, source_dir, entry_points=None, keep=None, excludes=()):
+    """
+    Walks the ``import`` statements from the entry points of the function through the source directory and the
+    dependencies directory, and returns the installed distributions none of whose top-level modules is reachable.
+
+    The analysis works on top-level modules: once a top-level module is reached, every Python file of the module is
+    parsed, so a distribution is kept as soon as any of its modules may be imported. Dynamic imports of string
+    literals, ex: ``importlib.import_module("foo.bar")``, are followed too. Distributions without any top-level module,
+    ex: installing only data files, are always kept.
+
+    :type dependencies_dir: str
+    :param dependencies_dir: Directory the distributions are installed in.
+
+    :type source_dir: str
+    :param source_dir: Source directory of the function.
+
+    :type entry_points: list
+    :param entry_points: Modules or handlers the analysis starts from, ex:
+        ``app.lambda_handler``. Every top-level module of the source
+        directory is an entry point by default.
+
+    :type keep: list
+    :param keep: Top-level modules that are always reachable, ex: the ones
+        imported with names computed at runtime.
+
+    :type excludes: tuple
+    :param excludes: Glob patterns of the files and directories of the source
+        directory that are not part of the function.
+
+    :rtype: tuple
+    :return: The names of the distributions that are kept, and the
+        unreachable distributions as dicts with their ``name``, ``version``
+        and the ``paths`` of their files.
+    """
+    if entry_points:
+        roots = {entry_point.split(".")[0] for entry_point in entry_points}
+    else:
+        roots = set(_list_top_level_modules(source_dir, excludes))
+    roots.update(keep or [])
+
+    reached = set()
+    pending = sorted(roots)
+    while pending:
+        name = pending.pop()
+        if name in reached:
+            continue
+        reached.add(name)
+        for directory, directory_excludes in ((source_dir, excludes), (dependencies_dir, ())):
+            for path in _list_module_files(directory, name, directory_excludes):
+                pending.extend(_find_imported_modules(path) - reached)
+
+    kept, unreachable = [], []
+    for distribution in _list_distributions(dependencies_dir):
+        if distribution["modules"] and not distribution["modules"] & reached:
+            unreachable.append({key: distribution[key] for key in ("name", "version", "paths")})
+        else:
+            kept.append(distribution["name"])
+    LOG.debug("Reachable top-level modules: %s", sorted(reached))
+    return kept, unreachable
+
+
+def remove_distributions(dependencies_dir, distributions):
+    """
+    Removes the files of installed distributions, along with their .dist-info directories and the directories left
+    empty.
+
+    :rtype: set
+    :return: The paths of the removed files, relative to the dependencies
+        directory and using "/" as separator.
+    """
+    removed_paths = set()
+    for distribution in distributions:
+        for path in distribution["paths"]:
+            os.remove(path)
+            removed_paths.add(os.path.relpath(path, dependencies_dir).replace(os.sep, "/"))
+    remove_emptied_directories(dependencies_dir, removed_paths)
+    return removed_paths
+
+
+def _list_distributions(dependencies_dir):
+    distributions = []
+    for entry in sorted(os.listdir(dependencies_dir)) if os.path.isdir(dependencies_dir) else []:
+        dist_info = os.path.join(dependencies_dir, entry)
+        if not entry.endswith(DIST_INFO_SUFFIX) or not os.path.isdir(dist_info):
+            continue
+        name, _, version = entry[: -len(DIST_INFO_SUFFIX)].partition("-")
+        paths = list_installed_files(dependencies_dir, dist_info)
+        # the files of the .dist-info directory that are not listed by the RECORD file, ex: the RECORD file itself
+        for root, _, files in os.walk(dist_info):
+            paths.extend(os.path.join(root, filename) for filename in files)
+        paths = sorted(set(paths))
+        modules = set()
+        for path in paths:
+            top_level = os.path.relpath(path, dependencies_dir).split(os.sep)
+            module = _get_module_name(top_level[0], is_directory=len(top_level) > 1)
+            if module:
+                modules.add(module)
+        distributions.append({"name": name, "version": version, "paths": paths, "modules": modules})
+    return distributions
+
+
+def _get_module_name(entry, is_directory):
+    # ex: "requests" for the package directory, "six" for six.py and "_cffi_backend" for
+    # _cffi_backend.cpython-312-x86_64-linux-gnu.so. Directories like numpy.libs, .dist-info and .data directories are
+    # not modules.
+    if is_directory:
+        return entry if entry.isidentifier() else None
+    name, _, extension = entry.partition(".")
+    if name.isidentifier() and (extension == "py" or extension.endswith(("so", "pyd"))):
+        return name
+    return None
+
+
+def _list_top_level_modules(source_dir, excludes):
+    modules = []
+    for entry in sorted(os.listdir(source_dir)):
+        if any(fnmatch.fnmatch(entry, pattern) for pattern in excludes):
+            continue
+        module = _get_module_name(entry, is_directory=os.path.isdir(os.path.join(source_dir, entry)))
+        if module:
+            modules.append(module)
+    return modules
+
+
+def _list_module_files(directory, module, excludes):
+    module_file = os.path.join(directory, module + ".py")
+    if os.path.isfile(module_file):
+        return [module_file]
+    paths = []
+    for root, dirs, files in os.walk(os.path.join(directory, module)):
+        dirs[:] = [name for name in dirs if not any(fnmatch.fnmatch(name, pattern) for pattern in excludes)]
+        paths.extend(os.path.join(root, filename) for filename in sorted(files) if filename.endswith(".py"))
+    return paths
+
+
+def _find_imported_modules(path):
+    try:
+        with open(path, "rb") as source_file:
+            tree = ast.parse(source_file.read(), filename=path)
+    except (SyntaxError, ValueError):
+        # ex: Python 2 files shipped by some packages, which can't be imported either
+        LOG.debug("Unable to parse the imports of %s", path)
+        return set()
+
+    modules = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            modules.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            modules.add(node.module)
+        elif isinstance(node, ast.Call) and node.args and _is_dynamic_import(node.func):
+            argument = node.args[0]
+            if isinstance(argument, ast.Constant) and isinstance(argument.value, str):
+                modules.add(argument.value)
+    # relative imports name modules of the same top-level module
+    return {module.split(".")[0] for module in modules if module and not module.startswith(".")}
+
+
+def _is_dynamic_import(function):
+    if isinstance(function, ast.Name):
+        return function.id in DYNAMIC_IMPORT_FUNCTIONS
+    return isinstance(function, ast.Attribute) and function.attr in DYNAMIC_IMPORT_FUNCTIONS
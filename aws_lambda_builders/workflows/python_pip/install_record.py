@@ -0,0 +1,115 @@
+"""
+Record of the distributions installed in a dependencies directory, so that the next build only installs what changed
+"""
+
+import json
+import logging
+import os
+
+LOG = logging.getLogger(__name__)
+
+# Name of the record file, in the directory the dependencies are installed into
+INSTALL_RECORD_FILENAME = ".pip-install-record.json"
+
+INSTALL_RECORD_VERSION = 2
+
+
+class InstallRecord(object):
+    """
+    The wheels installed in a directory, each with the SHA-256 digest of the wheel file and the paths of the files it
+    installed, relative to the directory and using ``/`` as separator. The wheel file name holds the name, version,
+    python tag, abi tag and platform tag of the distribution, and the digest tells apart wheels built from local
+    directories whose content changed without a version change.
+    """
+
+    def __init__(self, distributions=None, slimming=None):
+        """
+        :type distributions: dict
+        :param distributions: Mapping of wheel file names to a dict with the
+            ``sha256`` digest of the wheel and the ``files`` it installed,
+            the ``slimmed`` files removed since by slimming the dependencies,
+            and ``partial`` when other files were removed after the install.
+
+        :type slimming: dict
+        :param slimming: The settings the slimmed files were removed with, see
+            ``slimming.get_slimming_settings``, or None.
+        """
+        self.distributions = distributions or {}
+        self.slimming = slimming
+
+    @classmethod
+    def load(cls, directory):
+        """
+        Reads the record of a directory.
+
+        :rtype: InstallRecord
+        :return: The record, or None if the directory has no valid record.
+        """
+        path = os.path.join(directory, INSTALL_RECORD_FILENAME)
+        try:
+            with open(path, "r") as record_file:
+                content = json.load(record_file)
+        except (OSError, ValueError):
+            LOG.debug("No valid install record in %s", directory)
+            return None
+        if not isinstance(content, dict) or content.get("version") != INSTALL_RECORD_VERSION:
+            LOG.debug("Ignoring install record %s written by another version", path)
+            return None
+        return cls(content.get("distributions"), content.get("slimming"))
+
+    def discard_files(self, paths):
+        """
+        Records that files were removed after the install, ex: by pruning the dependencies the function never imports,
+        which a later build may need again. The wheels they belong to are no longer recorded as installed, so that the
+        next build installs them again, and their remaining files are still listed so that the next build removes
+        them first.
+        """
+        for distribution in self.distributions.values():
+            remaining = [path for path in distribution["files"] if path not in paths]
+            if len(remaining) != len(distribution["files"]):
+                distribution["files"] = remaining
+                distribution["partial"] = True
+
+    def slim_files(self, paths, slimming):
+        """
+        Records that files were removed after the install by slimming the dependencies with the given settings. The
+        wheels they belong to are still recorded as installed, as long as the next builds slim the dependencies with
+        the same settings.
+        """
+        self.slimming = slimming
+        for distribution in self.distributions.values():
+            slimmed = [path for path in distribution["files"] if path in paths]
+            if slimmed:
+                distribution["files"] = [path for path in distribution["files"] if path not in paths]
+                distribution["slimmed"] = sorted(set(distribution.get("slimmed", [])) | set(slimmed))
+
+    def is_installed(self, filename, sha256, slimming=None):
+        """
+        Tells whether a wheel is recorded as installed, with the same digest, and with the files a build slimming the
+        dependencies with the given settings, or not slimming them when None, would have kept. Whether its files are
+        still there is up to the caller to check.
+        """
+        distribution = self.distributions.get(filename)
+        if distribution is None or distribution["sha256"] != sha256 or distribution.get("partial"):
+            return False
+        return not distribution.get("slimmed") or self.slimming == slimming
+
+    def save(self, directory):
+        """Writes the record of a directory, atomically so that readers never see a partial record."""
+        path = os.path.join(directory, INSTALL_RECORD_FILENAME)
+        temp_path = "{}.tmp{}".format(path, os.getpid())
+        with open(temp_path, "w") as record_file:
+            json.dump(
+                {"version": INSTALL_RECORD_VERSION, "distributions": self.distributions, "slimming": self.slimming},
+                record_file,
+                indent=2,
+                sort_keys=True,
+            )
+        os.replace(temp_path, path)
+
+    @staticmethod
+    def delete(directory):
+        """Removes the record of a directory, whose content no longer matches it."""
+        path = os.path.join(directory, INSTALL_RECORD_FILENAME)
+        if os.path.isfile(path):
+            os.remove(path)
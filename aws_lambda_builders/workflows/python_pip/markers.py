@@ -0,0 +1,191 @@
+"""
+Evaluation of the environment markers of Python requirements, ex: ``PySocks!=1.5.7; extra == "socks"``, for Lambda
+"""
+
+import logging
+import re
+
+from aws_lambda_builders.architecture import ARM64
+
+from .utils import normalize_name
+
+LOG = logging.getLogger(__name__)
+
+# Strings, comparison operators, parentheses and words, ex: variables, "and", "or", "not" and "in"
+MARKER_TOKEN_REGEX = re.compile(
+    r"""\s*(?:(?P<string>'[^']*'|"[^"]*")|(?P<operator>===|==|!=|<=|>=|~=|<|>|\(|\))|(?P<word>[A-Za-z_.]+))"""
+)
+
+# Comparison operators, "~=" and "===" compare strings for equality
+COMPARISONS = {
+    "==": lambda left, right: left == right,
+    "===": lambda left, right: left == right,
+    "~=": lambda left, right: left == right,
+    "!=": lambda left, right: left != right,
+    "<": lambda left, right: left < right,
+    "<=": lambda left, right: left <= right,
+    ">": lambda left, right: left > right,
+    ">=": lambda left, right: left >= right,
+    "in": lambda left, right: left in right,
+    "not in": lambda left, right: left not in right,
+}
+
+# Variables compared as versions rather than strings
+VERSION_VARIABLES = ("python_version", "python_full_version", "implementation_version")
+
+
+def get_lambda_environment(runtime=None, architecture=None):
+    """
+    Returns the values of the marker variables in Lambda. Variables whose value Lambda doesn't fix, ex: the full
+    version of Python, or that depend on a runtime or architecture that is not given, are left out.
+
+    :type runtime: str
+    :param runtime: Optional Python runtime, ex: python3.12.
+
+    :type architecture: str
+    :param architecture: Optional architecture of the function, x86_64 or arm64.
+
+    :rtype: dict
+    """
+    environment = {
+        "os_name": "posix",
+        "sys_platform": "linux",
+        "platform_system": "Linux",
+        "platform_python_implementation": "CPython",
+        "implementation_name": "cpython",
+    }
+    if runtime and runtime.startswith("python"):
+        environment["python_version"] = runtime[len("python") :]
+    if architecture:
+        environment["platform_machine"] = "aarch64" if architecture == ARM64 else "x86_64"
+    return environment
+
+
+def evaluate_marker(marker, environment, extras=()):
+    """
+    Evaluates the environment marker of a requirement, ex: ``python_version < "3.8" or extra == "socks"``.
+
+    Comparisons of variables the environment doesn't hold are true, and so are the markers that can't be parsed, so
+    that a requirement is only left out when it is known not to apply.
+
+    :type marker: str
+    :param marker: The marker, after the ";" of the requirement.
+
+    :type environment: dict
+    :param environment: Values of the marker variables, see get_lambda_environment.
+
+    :type extras: set
+    :param extras: Normalized names of the extras requested for the
+        distribution that has the requirement.
+
+    :rtype: bool
+    """
+    try:
+        tokens = _tokenize(marker)
+        value, position = _parse_or(tokens, 0, environment, extras)
+        if position != len(tokens):
+            raise ValueError("Unexpected {!r}".format(tokens[position][1]))
+        return value
+    except ValueError as ex:
+        LOG.debug("Could not evaluate the marker %r, considering it true: %s", marker, ex)
+        return True
+
+
+def _tokenize(marker):
+    tokens = []
+    position = 0
+    marker = marker.rstrip()
+    while position < len(marker):
+        match = MARKER_TOKEN_REGEX.match(marker, position)
+        if not match:
+            raise ValueError("Unexpected {!r}".format(marker[position:]))
+        tokens.append((match.lastgroup, match.group(match.lastgroup)))
+        position = match.end()
+    return tokens
+
+
+def _parse_or(tokens, position, environment, extras):
+    value, position = _parse_and(tokens, position, environment, extras)
+    while position < len(tokens) and tokens[position] == ("word", "or"):
+        right, position = _parse_and(tokens, position + 1, environment, extras)
+        value = value or right
+    return value, position
+
+
+def _parse_and(tokens, position, environment, extras):
+    value, position = _parse_comparison(tokens, position, environment, extras)
+    while position < len(tokens) and tokens[position] == ("word", "and"):
+        right, position = _parse_comparison(tokens, position + 1, environment, extras)
+        value = value and right
+    return value, position
+
+
+def _parse_comparison(tokens, position, environment, extras):
+    if position < len(tokens) and tokens[position] == ("operator", "("):
+        value, position = _parse_or(tokens, position + 1, environment, extras)
+        if position >= len(tokens) or tokens[position] != ("operator", ")"):
+            raise ValueError("Missing )")
+        return value, position + 1
+
+    left, position = _parse_value(tokens, position)
+    if position < len(tokens) and tokens[position] == ("word", "not"):
+        if position + 1 >= len(tokens) or tokens[position + 1] != ("word", "in"):
+            raise ValueError("Expected in after not")
+        operator, position = "not in", position + 2
+    elif position < len(tokens) and (tokens[position][0] == "operator" or tokens[position] == ("word", "in")):
+        operator, position = tokens[position][1], position + 1
+    else:
+        raise ValueError("Expected a comparison operator")
+    right, position = _parse_value(tokens, position)
+    return _compare(left, operator, right, environment, extras), position
+
+
+def _parse_value(tokens, position):
+    if position >= len(tokens) or tokens[position][0] == "operator":
+        raise ValueError("Expected a variable or a string")
+    kind, text = tokens[position]
+    if kind == "string":
+        return ("string", text[1:-1]), position + 1
+    return ("variable", text), position + 1
+
+
+def _compare(left, operator, right, environment, extras):
+    if ("variable", "extra") in (left, right):
+        other = right if left == ("variable", "extra") else left
+        if other[0] != "string" or operator not in ("==", "!="):
+            return True
+        return (normalize_name(other[1]) in extras) == (operator == "==")
+
+    variables = [side[1] for side in (left, right) if side[0] == "variable"]
+    values = [environment.get(side[1]) if side[0] == "variable" else side[1] for side in (left, right)]
+    if None in values:
+        # variables Lambda doesn't fix, or unknown ones
+        return True
+    left_value, right_value = values
+
+    if operator not in ("in", "not in", "===") and any(variable in VERSION_VARIABLES for variable in variables):
+        return _compare_versions(left_value, operator, right_value)
+    return COMPARISONS[operator](left_value, right_value)
+
+
+def _compare_versions(left_value, operator, right_value):
+    if right_value.endswith(".*") and operator in ("==", "!="):
+        prefix = _parse_version(right_value[:-2])
+        return (_parse_version(left_value)[: len(prefix)] == prefix) == (operator == "==")
+
+    left_version, right_version = _parse_version(left_value), _parse_version(right_value)
+    if operator == "~=":
+        # compatible release, ex: ~= "3.8.1" means >= 3.8.1 and == 3.8.*
+        return left_version >= right_version and left_version[: len(right_version) - 1] == right_version[:-1]
+    length = max(len(left_version), len(right_version))
+    left_version += (0,) * (length - len(left_version))
+    right_version += (0,) * (length - len(right_version))
+    return COMPARISONS[operator](left_version, right_version)
+
+
+def _parse_version(version):
+    # the release segment of the version, ex: (3, 13, 0) for 3.13.0rc1
+    match = re.match(r"\s*v?([0-9]+(\.[0-9]+)*)", version)
+    if not match:
+        raise ValueError("Invalid version {!r}".format(version))
+    return tuple(int(part) for part in match.group(1).split("."))
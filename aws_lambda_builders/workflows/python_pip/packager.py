@@ -2,18 +2,29 @@
 Installs packages using PIP
 """
 
+import base64
+import copy
 import itertools
+import json
 import logging
+import os
 import re
 import subprocess
+import tarfile
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from email.parser import FeedParser
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 from aws_lambda_builders.architecture import ARM64, X86_64
+from aws_lambda_builders.artifact_manifest import hash_file
 from aws_lambda_builders.utils import extract_tarfile
 
 from .compat import pip_import_string, pip_no_compile_c_env_vars, pip_no_compile_c_shim
-from .utils import OSUtils
+from .exceptions import MissingPipError
+from .install_record import InstallRecord
+from .utils import OSUtils, normalize_name
 
 LOG = logging.getLogger(__name__)
 
@@ -126,7 +137,15 @@ class PythonPipDependencyBuilder(object):
             dependency_builder = DependencyBuilder(self.osutils, python_exe, runtime, architecture=architecture)
         self._dependency_builder = dependency_builder
 
-    def build_dependencies(self, artifacts_dir_path, scratch_dir_path, requirements_path, ui=None, config=None):
+    def build_dependencies(
+        self,
+        artifacts_dir_path,
+        scratch_dir_path,
+        requirements_path,
+        ui=None,
+        config=None,
+        architecture_directories=None,
+    ):
         """Builds a python project's dependencies into an artifact directory.
 
         :type artifacts_dir_path: str
@@ -149,6 +168,11 @@ class PythonPipDependencyBuilder(object):
         :param config: To be determined. This is an optional config object
             we can extend at a later date to add more options to how pip is
             called.
+
+        :type architecture_directories: dict
+        :param architecture_directories: Optional mapping of other
+            architectures to the directories to write their dependencies into,
+            from the same resolution.
         """
         # TODO: The DependencyBuilder makes the assumption that it is running
         # in a virtual environment that matches the runtime you want to use.
@@ -157,7 +181,9 @@ class PythonPipDependencyBuilder(object):
         # by finding/creating a virtualenv of the correct version and when
         # pip is called set the appropriate env vars.
 
-        self._dependency_builder.build_site_packages(requirements_path, artifacts_dir_path, scratch_dir_path)
+        self._dependency_builder.build_site_packages(
+            requirements_path, artifacts_dir_path, scratch_dir_path, architecture_directories=architecture_directories
+        )
 
 
 class DependencyBuilder(object):
@@ -231,7 +257,25 @@ class DependencyBuilder(object):
         (2, 34): "manylinux_2_34",
     }
 
-    def __init__(self, osutils, runtime, python_exe, pip_runner=None, architecture=X86_64):
+    # Extensions of the wheels and sdists pip may process from local paths
+    _ARCHIVE_EXTENSIONS = (".whl", ".zip", ".tar.gz", ".tar.bz2")
+
+    def __init__(
+        self,
+        osutils,
+        runtime,
+        python_exe,
+        pip_runner=None,
+        architecture=X86_64,
+        build_concurrency=1,
+        install_concurrency=1,
+        wheelhouse=None,
+        binary_fast_path=False,
+        incremental_install=False,
+        resolution_lock=None,
+        wheel_index=None,
+        slimming=None,
+    ):
         """Initialize a DependencyBuilder.
 
         :type osutils: :class:`lambda_builders.utils.OSUtils`
@@ -247,6 +291,49 @@ class DependencyBuilder(object):
 
         :type architecture: str
         :param architecture: Architecture to build for.
+
+        :type build_concurrency: int
+        :param build_concurrency: Maximum number of sdists built into wheels
+            at the same time. Sdists are built one at a time by default.
+
+        :type install_concurrency: int
+        :param install_concurrency: Maximum number of wheels extracted into
+            the target directory at the same time. Wheels are extracted one at
+            a time by default.
+
+        :type wheelhouse: :class:`Wheelhouse`
+        :param wheelhouse: Optional persistent directory of wheels. The wheels
+            downloaded for Lambda or built from sdists are stored in it, so that
+            pip can find them in the next builds. It should also be given to
+            the pip runner as ``find_links``.
+
+        :type binary_fast_path: bool
+        :param binary_fast_path: Whether to first try to download a Lambda
+            compatible wheel for every dependency with a single pip command,
+            before falling back to the multi-pass algorithm.
+
+        :type incremental_install: bool
+        :param incremental_install: Whether to keep a record of the wheels
+            installed in the target directory, so that the next builds only
+            remove and install the wheels that changed instead of installing
+            every wheel into an emptied directory.
+
+        :type resolution_lock: :class:`ResolutionLock`
+        :param resolution_lock: Optional lock file of the requirements. The
+            wheels it lists are downloaded without resolving the dependencies
+            again, and it is written after the dependencies are resolved.
+
+        :type wheel_index: :class:`WheelIndex`
+        :param wheel_index: Optional index of a local directory of wheels. The
+            compatible wheels it holds are linked into the download directory
+            instead of being downloaded with pip.
+
+        :type slimming: dict
+        :param slimming: The settings the installed dependencies are slimmed
+            with after the install, see ``slimming.get_slimming_settings``, or
+            None if they are not slimmed. With ``incremental_install``, the
+            wheels slimmed by the previous build are only kept if the settings
+            didn't change.
         """
         self._osutils = osutils
         self.python_exe = python_exe
@@ -255,8 +342,19 @@ class DependencyBuilder(object):
         self._pip = pip_runner
         self.runtime = runtime
         self.architecture = architecture
-
-    def build_site_packages(self, requirements_filepath, target_directory, scratch_directory):
+        self._build_concurrency = max(1, build_concurrency or 1)
+        self._install_concurrency = max(1, install_concurrency or 1)
+        self._wheelhouse = wheelhouse
+        self._binary_fast_path = binary_fast_path
+        self._incremental_install = incremental_install
+        self._resolution_lock = resolution_lock
+        self._wheel_index = wheel_index
+        self._slimming = slimming
+        self._local_packages = set()
+
+    def build_site_packages(
+        self, requirements_filepath, target_directory, scratch_directory, architecture_directories=None
+    ):
         """Build site-packages directory for a set of requiremetns.
 
         :type requirements_filepath: str
@@ -273,15 +371,77 @@ class DependencyBuilder(object):
         :type scratch_directory: str
         :param scratch_directory: The directory to write temp files into.
 
+        :type architecture_directories: dict
+        :param architecture_directories: Optional mapping of other
+            architectures to the directories to build their dependencies into.
+            The dependencies are resolved once for all the architectures, see
+            ``_build_multi_architecture_site_packages``.
+
         :raises MissingDependencyError: This exception is raised if one or more
             packages could not be installed. The complete list of missing
             packages is included in the error object's ``missing`` property.
         """
-        if self._has_at_least_one_package(requirements_filepath):
+        if architecture_directories:
+            target_directories = dict(architecture_directories, **{self.architecture: target_directory})
+            if self._has_at_least_one_package(requirements_filepath):
+                self._build_multi_architecture_site_packages(
+                    requirements_filepath, target_directories, scratch_directory
+                )
+            else:
+                for architecture, directory in target_directories.items():
+                    # the directories of the other architectures are not cleaned up by the workflow
+                    self._for_architecture(architecture)._install_wheels(scratch_directory, directory, set())
+        elif self._has_at_least_one_package(requirements_filepath):
             wheels, packages_without_wheels = self._download_dependencies(scratch_directory, requirements_filepath)
             self._install_wheels(scratch_directory, target_directory, wheels)
             if packages_without_wheels:
                 raise MissingDependencyError(packages_without_wheels)
+        elif self._incremental_install:
+            # remove the wheels installed by the previous builds
+            self._install_wheels(scratch_directory, target_directory, set())
+
+    def _build_multi_architecture_site_packages(self, requirements_filename, target_directories, scratch_directory):
+        # The closure is downloaded once into the scratch directory, then each
+        # architecture runs the rest of the multi-pass algorithm in its own
+        # directory, starting from links to the sdists and to the wheels of
+        # the closure compatible with it. Pure Python wheels are downloaded
+        # once for all the architectures, only the platform specific wheels
+        # are downloaded for each of them, and the pure Python wheels built
+        # from sdists for an architecture are shared with the next ones. The
+        # binary fast path and the lock file, which resolve the dependencies
+        # for a single architecture, are not used.
+        deps = self._download_all_dependencies(requirements_filename, scratch_directory)
+        shared = {package.filename for package in deps}
+        missing = set()
+        architectures = [self.architecture] + sorted(set(target_directories) - {self.architecture})
+        for architecture in architectures:
+            builder = self._for_architecture(architecture)
+            with self._osutils.tempdir(dir=scratch_directory) as directory:
+                for filename in sorted(shared):
+                    if not filename.endswith(".whl") or builder._is_compatible_wheel_filename(filename):
+                        self._osutils.link_file(
+                            self._osutils.joinpath(scratch_directory, filename),
+                            self._osutils.joinpath(directory, filename),
+                        )
+                LOG.debug("Building the dependencies for %s", architecture)
+                wheels, missing_wheels = builder._complete_dependencies(directory, deps)
+                builder._install_wheels(directory, target_directories[architecture], wheels)
+                for wheel in wheels:
+                    if wheel.filename not in shared and wheel.filename[:-4].split("-")[-1] == "any":
+                        self._osutils.rename(
+                            self._osutils.joinpath(directory, wheel.filename),
+                            self._osutils.joinpath(scratch_directory, wheel.filename),
+                        )
+                        shared.add(wheel.filename)
+            missing.update(missing_wheels)
+        if missing:
+            raise MissingDependencyError(missing)
+
+    def _for_architecture(self, architecture):
+        # a builder with the same pip runner and options, for another architecture
+        builder = copy.copy(self)
+        builder.architecture = architecture
+        return builder
 
     def _has_at_least_one_package(self, filename):
         if not self._osutils.file_exists(filename):
@@ -298,12 +458,102 @@ class DependencyBuilder(object):
         return False
 
     def _download_dependencies(self, directory, requirements_filename):
+        if self._resolution_lock is not None:
+            compatible_wheels = self._download_locked_dependencies(directory)
+            if compatible_wheels is not None:
+                return compatible_wheels, set()
+
+        compatible_wheels, missing_wheels = self._resolve_dependencies(directory, requirements_filename)
+        if self._resolution_lock is not None:
+            self._lock_dependencies(directory, requirements_filename, compatible_wheels, missing_wheels)
+        return compatible_wheels, missing_wheels
+
+    def _download_locked_dependencies(self, directory):
+        # The locked wheels are downloaded with a single pip command that
+        # doesn't resolve their dependencies. pip finds the wheels built from
+        # sdists in the wheelhouse. The lock file is ignored if pip fails or
+        # any wheel differs from the locked one, ex: the wheelhouse evicted it.
+        locked_wheels = self._resolution_lock.load()
+        if not locked_wheels:
+            return None
+        lambda_abi = get_lambda_abi(self.runtime)
+        with self._osutils.tempdir(dir=directory) as lock_directory:
+            requirements_filename = self._osutils.joinpath(lock_directory, "requirements.txt")
+            with open(requirements_filename, "w") as requirements_file:
+                for wheel in locked_wheels:
+                    requirements_file.write("%s --hash=sha256:%s\n" % (wheel["requirement"], wheel["sha256"]))
+            wheel_directory = self._osutils.joinpath(lock_directory, "wheels")
+            self._osutils.makedirs(wheel_directory)
+            if not self._pip.download_binary_dependencies(
+                requirements_filename, wheel_directory, lambda_abi, self.compatible_platforms, no_deps=True
+            ):
+                LOG.debug("Unable to download the locked wheels, resolving the dependencies")
+                return None
+            downloaded = {
+                filename: hash_file(self._osutils.joinpath(wheel_directory, filename))
+                for filename in self._osutils.get_directory_contents(wheel_directory)
+            }
+            if downloaded != {wheel["filename"]: wheel["sha256"] for wheel in locked_wheels}:
+                LOG.debug("Downloaded wheels %s differ from the locked wheels, resolving the dependencies", downloaded)
+                return None
+            for filename in sorted(downloaded):
+                destination = self._osutils.joinpath(directory, filename)
+                if not self._osutils.file_exists(destination):
+                    self._osutils.rename(self._osutils.joinpath(wheel_directory, filename), destination)
+
+        compatible_wheels = {Package(directory, filename, self.python_exe) for filename in downloaded}
+        LOG.debug("compatible wheels downloaded from the lock file: %s", compatible_wheels)
+        if self._wheelhouse is not None:
+            self._update_wheelhouse(directory, set(), compatible_wheels)
+        return compatible_wheels
+
+    def _lock_dependencies(self, directory, requirements_filename, compatible_wheels, missing_wheels):
+        # Only closures that can be downloaded again by name and version are
+        # locked. The content of local packages and of requirements files
+        # referenced by the requirements can change without a change of the
+        # requirements, and allowlisted wheels can't be downloaded for Lambda.
+        # pip also reports the archives of local indexes and of the wheelhouse
+        # as processed local packages, those are downloaded again by version.
+        local_directories = [path for path in self._local_packages if not path.endswith(self._ARCHIVE_EXTENSIONS)]
+        if missing_wheels or local_directories or self._references_other_files(requirements_filename):
+            LOG.debug("Not locking the dependencies of %s", requirements_filename)
+            return
+        if not all(self._is_compatible_wheel_filename(wheel.filename) for wheel in compatible_wheels):
+            LOG.debug("Not locking allowlisted wheels of %s", requirements_filename)
+            return
+        self._resolution_lock.save(
+            [
+                {
+                    "requirement": wheel.identifier,
+                    "filename": wheel.filename,
+                    "sha256": hash_file(self._osutils.joinpath(directory, wheel.filename)),
+                }
+                for wheel in sorted(compatible_wheels, key=lambda wheel: wheel.filename)
+            ]
+        )
+
+    def _references_other_files(self, filename):
+        with open(filename, "r") as f:
+            for line in f:
+                option = line.strip().split("=", 1)[0].split(" ", 1)[0]
+                if option in ("-r", "-c", "-e", "--requirement", "--constraint", "--editable"):
+                    return True
+        return False
+
+    def _resolve_dependencies(self, directory, requirements_filename):
+        if self._binary_fast_path:
+            compatible_wheels, complete = self._download_binary_dependencies(directory, requirements_filename)
+            if complete:
+                return compatible_wheels, set()
+
         # Download all dependencies we can, letting pip choose what to
         # download.
         # deps should represent the best effort we can make to gather all the
         # dependencies.
         deps = self._download_all_dependencies(requirements_filename, directory)
+        return self._complete_dependencies(directory, deps)
 
+    def _complete_dependencies(self, directory, deps):
         # Sort the downloaded packages into three categories:
         # - sdists (Pip could not get a wheel so it gave us an sdist)
         # - lambda compatible wheel files
@@ -332,8 +582,9 @@ class DependencyBuilder(object):
         # Next we need to go through the downloaded packages and pick out any
         # dependencies that do not have a compatible wheel file downloaded.
         # For these packages we need to explicitly try to download a
-        # compatible wheel file.
-        missing_wheels = sdists | incompatible_wheels
+        # compatible wheel file. Packages that already have one, ex: kept from
+        # the single binary download, are skipped.
+        missing_wheels = (sdists | incompatible_wheels) - compatible_wheels
         self._download_binary_wheels(missing_wheels, directory)
 
         # Re-count the wheel files after the second download pass. Anything
@@ -376,30 +627,117 @@ class DependencyBuilder(object):
         LOG.debug("Final incompatible: %s", incompatible_wheels)
         LOG.debug("Final missing wheels: %s", missing_wheels)
 
+        if self._wheelhouse is not None:
+            self._update_wheelhouse(directory, deps, compatible_wheels)
+
         return compatible_wheels, missing_wheels
 
+    def _download_binary_dependencies(self, directory, requirements_filename):
+        # Most dependency closures only hold packages with a wheel compatible
+        # with Lambda, which a single pip command resolves and downloads. pip
+        # resolves all the requirements at once, so the command fails and
+        # saves nothing if any package has no compatible wheel. The command
+        # may also succeed with wheels incompatible with Lambda, ex: built
+        # from local directories. The compatible wheels are kept in the
+        # directory in that case, and the multi-pass algorithm only downloads
+        # or builds the packages still missing one. The wheels are downloaded
+        # into their own directory so that a failed attempt leaves no file
+        # behind. Returns the compatible wheels, and whether every package
+        # got one.
+        lambda_abi = get_lambda_abi(self.runtime)
+        with self._osutils.tempdir(dir=directory) as binary_directory:
+            if not self._pip.download_binary_dependencies(
+                requirements_filename, binary_directory, lambda_abi, self.compatible_platforms
+            ):
+                LOG.debug("Not all the dependencies have a compatible wheel, falling back to the multi-pass download")
+                return set(), False
+            filenames = sorted(self._osutils.get_directory_contents(binary_directory))
+            compatible_filenames = [
+                filename
+                for filename in filenames
+                if filename.endswith(".whl") and self._is_compatible_wheel_filename(filename)
+            ]
+            for filename in compatible_filenames:
+                destination = self._osutils.joinpath(directory, filename)
+                if not self._osutils.file_exists(destination):
+                    self._osutils.rename(self._osutils.joinpath(binary_directory, filename), destination)
+
+        compatible_wheels = {Package(directory, filename, self.python_exe) for filename in compatible_filenames}
+        if self._wheelhouse is not None:
+            # every wheel was downloaded for Lambda, none was built from a
+            # local directory
+            self._update_wheelhouse(directory, set(), compatible_wheels)
+        if len(compatible_filenames) < len(filenames):
+            LOG.debug(
+                "Incompatible files downloaded: %s, falling back to the multi-pass download for them",
+                sorted(set(filenames) - set(compatible_filenames)),
+            )
+            return compatible_wheels, False
+        LOG.debug("compatible wheels downloaded in a single pass: %s", compatible_wheels)
+        return compatible_wheels, True
+
+    def _update_wheelhouse(self, directory, downloaded_packages, compatible_wheels):
+        # Only the wheels downloaded for Lambda or built from sdists, which are
+        # the expensive ones to get, are stored. The wheels of the first
+        # download pass may have been built from local directories whose
+        # content changes without a version change, so they are only marked
+        # as used when they came from the wheelhouse.
+        downloaded_filenames = {package.filename for package in downloaded_packages}
+        for filename in sorted(wheel.filename for wheel in compatible_wheels):
+            if self._wheelhouse.contains(filename):
+                self._wheelhouse.touch(filename)
+            elif filename not in downloaded_filenames:
+                self._wheelhouse.store(directory, filename)
+        self._wheelhouse.evict()
+
     def _download_all_dependencies(self, requirements_filename, directory):
         # Download dependencies prefering wheel files but falling back to
         # raw source dependences to get the transitive closure over
         # the dependency graph. Return the set of all package objects
         # which will serve as the primary list of dependencies needed to deploy
         # successfully.
-        self._pip.download_all_dependencies(requirements_filename, directory)
+        self._local_packages = self._pip.download_all_dependencies(requirements_filename, directory) or set()
+        # pip only downloads files, the directory may also hold the caches
+        # linked into the scratch directory
         deps = {
             Package(directory, filename, self.python_exe)
             for filename in self._osutils.get_directory_contents(directory)
+            if self._osutils.file_exists(self._osutils.joinpath(directory, filename))
         }
         LOG.debug("Full dependency closure: %s", deps)
         return deps
 
     def _download_binary_wheels(self, packages, directory):
         # Try to get binary wheels for each package that isn't compatible.
+        if self._wheel_index is not None:
+            packages = self._link_indexed_wheels(packages, directory)
         LOG.debug("Downloading missing wheels: %s", packages)
         lambda_abi = get_lambda_abi(self.runtime)
         self._pip.download_manylinux_wheels(
             [pkg.identifier for pkg in packages], directory, lambda_abi, self.compatible_platforms
         )
 
+    def _link_indexed_wheels(self, packages, directory):
+        # The wheels of the local index are looked up by the name and version
+        # of each package, and a compatible one is linked into the directory,
+        # which saves a pip process per package. Only the packages without a
+        # compatible wheel in the index are returned, to be downloaded by pip.
+        remaining = set()
+        for package in packages:
+            compatible = [
+                filename
+                for filename in self._wheel_index.find(package.name, package.version)
+                if self._is_compatible_wheel_filename(filename)
+            ]
+            if not compatible:
+                remaining.add(package)
+                continue
+            destination = self._osutils.joinpath(directory, compatible[0])
+            if not self._osutils.file_exists(destination):
+                self._osutils.link_file(self._osutils.joinpath(self._wheel_index.directory, compatible[0]), destination)
+        LOG.debug("Compatible wheels found in the index of %s: %s", self._wheel_index.directory, packages - remaining)
+        return remaining
+
     @property
     def compatible_platforms(self) -> List[str]:
         """Get the list of all compatible platforms for the current architecture.
@@ -453,9 +791,37 @@ class DependencyBuilder(object):
 
     def _build_sdists(self, sdists, directory, compile_c=True):
         LOG.debug("Build missing wheels from sdists " "(C compiling %s): %s", compile_c, sdists)
-        for sdist in sdists:
-            path_to_sdist = self._osutils.joinpath(directory, sdist.filename)
-            self._pip.build_wheel(path_to_sdist, directory, compile_c)
+        if self._build_concurrency == 1 or len(sdists) <= 1:
+            for sdist in sdists:
+                path_to_sdist = self._osutils.joinpath(directory, sdist.filename)
+                self._pip.build_wheel(path_to_sdist, directory, compile_c)
+            return
+
+        # Each sdist is built in its own wheel directory so that concurrent
+        # builds never write to the same file. The wheels are then moved into
+        # the directory in the order of the sdist file names, so the result
+        # does not depend on which build finished first.
+        ordered_sdists = sorted(sdists, key=lambda sdist: sdist.filename)
+        with self._osutils.tempdir(dir=directory) as build_directory:
+
+            def build_isolated(index):
+                wheel_directory = self._osutils.joinpath(build_directory, str(index))
+                self._osutils.makedirs(wheel_directory)
+                path_to_sdist = self._osutils.joinpath(directory, ordered_sdists[index].filename)
+                self._pip.build_wheel(path_to_sdist, wheel_directory, compile_c)
+                return wheel_directory
+
+            max_workers = min(self._build_concurrency, len(ordered_sdists))
+            LOG.debug("Building %d sdists with %d workers", len(ordered_sdists), max_workers)
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                wheel_directories = list(executor.map(build_isolated, range(len(ordered_sdists))))
+
+            for wheel_directory in wheel_directories:
+                for filename in sorted(self._osutils.get_directory_contents(wheel_directory)):
+                    destination = self._osutils.joinpath(directory, filename)
+                    if self._osutils.file_exists(destination):
+                        continue
+                    self._osutils.rename(self._osutils.joinpath(wheel_directory, filename), destination)
 
     def _categorize_wheel_files(self, directory):
         final_wheels = [
@@ -564,20 +930,162 @@ class DependencyBuilder(object):
         for content_name in data_contents:
             if content_name in unpack_dirs:
                 source = self._osutils.joinpath(data_dir, content_name)
-                self._osutils.copytree(source, root)
-                # No reason to keep the purelib/platlib source directory around
-                # so we delete it to conserve space in the package.
-                self._osutils.rmtree(source)
+                # Moving the files rather than copying them also removes the
+                # purelib/platlib source directory, there is no reason to keep
+                # it around in the package.
+                self._osutils.move_tree(source, root)
 
     def _install_wheels(self, src_dir, dst_dir, wheels):
+        if self._incremental_install:
+            self._install_wheels_incrementally(src_dir, dst_dir, wheels)
+            return
         if self._osutils.directory_exists(dst_dir):
             self._osutils.rmtree(dst_dir)
         self._osutils.makedirs(dst_dir)
+        self._extract_wheels(src_dir, dst_dir, wheels)
+
+    def _install_wheels_incrementally(self, src_dir, dst_dir, wheels):
+        # The record lists the wheels installed by the previous build and the
+        # files each of them installed. Wheels with the same file name and
+        # digest whose files are all still there are kept, unless they were
+        # slimmed with other settings, the files of the other recorded wheels,
+        # including the ones partially pruned after the install, are removed,
+        # and only the new wheels are installed.
+        # Without a record, nothing is known about the content of the
+        # directory and every wheel is installed into an emptied directory.
+        record = InstallRecord.load(dst_dir) if self._osutils.directory_exists(dst_dir) else None
+        if record is None:
+            if self._osutils.directory_exists(dst_dir):
+                self._osutils.rmtree(dst_dir)
+            self._osutils.makedirs(dst_dir)
+            record = InstallRecord()
+
+        digests = {wheel.filename: hash_file(self._osutils.joinpath(src_dir, wheel.filename)) for wheel in wheels}
+        kept = {
+            filename
+            for filename, distribution in record.distributions.items()
+            if record.is_installed(filename, digests.get(filename), self._slimming)
+            and all(
+                self._osutils.file_exists(self._osutils.joinpath(dst_dir, *path.split("/")))
+                for path in distribution["files"]
+            )
+        }
+        removed = set(record.distributions) - kept
+        added = sorted((wheel for wheel in wheels if wheel.filename not in kept), key=lambda wheel: wheel.filename)
+        LOG.debug("Keeping installed wheels: %s", sorted(kept))
+        LOG.debug("Removing installed wheels: %s", sorted(removed))
+        LOG.debug("Installing wheels: %s", [wheel.filename for wheel in added])
+
+        # the record no longer matches the directory until the install completes
+        InstallRecord.delete(dst_dir)
+        kept_files = {path for filename in kept for path in record.distributions[filename]["files"]}
+        removed_files = {path for filename in removed for path in record.distributions[filename]["files"]}
+        self._remove_installed_files(dst_dir, removed_files - kept_files)
+        self._extract_wheels(src_dir, dst_dir, added)
+
+        distributions = {filename: record.distributions[filename] for filename in kept}
+        for wheel in added:
+            members = self._osutils.get_zipfile_contents(self._osutils.joinpath(src_dir, wheel.filename))
+            distributions[wheel.filename] = {
+                "sha256": digests[wheel.filename],
+                "files": sorted({self._get_installed_path(wheel, m) for m in members if not m.endswith("/")}),
+            }
+        slimmed = any(distribution.get("slimmed") for distribution in distributions.values())
+        InstallRecord(distributions, record.slimming if slimmed else None).save(dst_dir)
+
+    def _remove_installed_files(self, dst_dir, paths):
+        directories = set()
+        for path in paths:
+            parts = path.split("/")
+            file_path = self._osutils.joinpath(dst_dir, *parts)
+            if self._osutils.file_exists(file_path):
+                self._osutils.remove_file(file_path)
+            for index in range(1, len(parts)):
+                directories.add(tuple(parts[:index]))
+
+        # Remove the directories left empty, deepest first. Compiled files
+        # don't belong to any wheel, so a directory only holding __pycache__
+        # is empty too.
+        for parts in sorted(directories, key=len, reverse=True):
+            directory = self._osutils.joinpath(dst_dir, *parts)
+            if not self._osutils.directory_exists(directory):
+                continue
+            if set(self._osutils.get_directory_contents(directory)) <= {"__pycache__"}:
+                self._osutils.rmtree(directory)
+
+    def _extract_wheels(self, src_dir, dst_dir, wheels):
+        if self._install_concurrency > 1 and len(wheels) > 1:
+            self._install_wheels_concurrently(src_dir, dst_dir, wheels)
+            return
         for wheel in wheels:
             zipfile_path = self._osutils.joinpath(src_dir, wheel.filename)
             self._osutils.extract_zipfile(zipfile_path, dst_dir)
             self._install_purelib_and_platlib(wheel, dst_dir)
 
+    def _install_wheels_concurrently(self, src_dir, dst_dir, wheels):
+        # Wheels mostly install disjoint files, so they can be extracted at
+        # the same time. The files installed by more than one wheel are
+        # extracted afterwards one wheel at a time, so that the last wheel
+        # wins just like when the wheels are installed in sequence.
+        wheels = sorted(wheels, key=lambda wheel: wheel.filename)
+        zipfile_paths = [self._osutils.joinpath(src_dir, wheel.filename) for wheel in wheels]
+        wheel_members = [self._osutils.get_zipfile_contents(path) for path in zipfile_paths]
+
+        installers = {}
+        for wheel, members in zip(wheels, wheel_members):
+            for member in members:
+                if not member.endswith("/"):
+                    installers.setdefault(self._get_installed_path(wheel, member), []).append(wheel.filename)
+        conflicts = {path for path, filenames in installers.items() if len(filenames) > 1}
+        for path in sorted(conflicts):
+            LOG.warning(
+                "%s is installed by more than one package (%s), keeping the one from %s",
+                path,
+                ", ".join(installers[path]),
+                installers[path][-1],
+            )
+
+        # Create the directories up front, as concurrent extractions creating
+        # the same directory would fail.
+        directories = set()
+        for members in wheel_members:
+            for member in members:
+                parts = member.split("/")
+                for index in range(1, len(parts)):
+                    directories.add(tuple(parts[:index]))
+        for parts in sorted(directories):
+            directory = self._osutils.joinpath(dst_dir, *parts)
+            if not self._osutils.directory_exists(directory):
+                self._osutils.makedirs(directory)
+
+        disjoint_members, conflicting_members = [], []
+        for wheel, members in zip(wheels, wheel_members):
+            disjoint_members.append([m for m in members if self._get_installed_path(wheel, m) not in conflicts])
+            conflicting_members.append([m for m in members if self._get_installed_path(wheel, m) in conflicts])
+
+        def extract_disjoint_members(index):
+            self._osutils.extract_zipfile(zipfile_paths[index], dst_dir, members=disjoint_members[index])
+
+        max_workers = min(self._install_concurrency, len(wheels))
+        LOG.debug("Installing %d wheels with %d workers", len(wheels), max_workers)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # consume the results to raise the exceptions of the workers
+            list(executor.map(extract_disjoint_members, range(len(wheels))))
+
+        for index, wheel in enumerate(wheels):
+            if conflicting_members[index]:
+                self._osutils.extract_zipfile(zipfile_paths[index], dst_dir, members=conflicting_members[index])
+            self._install_purelib_and_platlib(wheel, dst_dir)
+
+    def _get_installed_path(self, wheel, member):
+        # Files in the purelib/platlib data directories end up in the root of
+        # the target directory.
+        for unpack_dir in ("purelib", "platlib"):
+            prefix = "%s/%s/" % (wheel.data_dir, unpack_dir)
+            if member.startswith(prefix):
+                return member[len(prefix) :]
+        return member
+
 
 class Package(object):
     """A class to represent a package downloaded but not yet installed."""
@@ -596,15 +1104,15 @@ class Package(object):
     def name(self):
         return self._name
 
+    @property
+    def version(self):
+        return self._version
+
     @property
     def data_dir(self):
         # The directory format is {distribution}-{version}.data
         return "%s-%s.data" % (self._name, self._version)
 
-    def _normalize_name(self, name):
-        # Taken directly from PEP 503
-        return re.sub(r"[-_.]+", "-", name).lower()
-
     @property
     def identifier(self):
         return "%s==%s" % (self._name, self._version)
@@ -633,7 +1141,7 @@ class Package(object):
             info_fetcher = SDistMetadataFetcher(self.python_exe, osutils=self._osutils)
             sdist_path = self._osutils.joinpath(self._directory, self.filename)
             name, version = info_fetcher.get_package_name_and_version(sdist_path)
-        normalized_name = self._normalize_name(name)
+        normalized_name = normalize_name(name)
         return normalized_name, version
 
 
@@ -649,6 +1157,14 @@ class SDistMetadataFetcher(object):
         "exec(compile(code, __file__, 'exec'))"
     )
 
+    _SDIST_EXTENSIONS = (".zip", ".tar.gz", ".tar.bz2")
+
+    # Name and version of the sdists already inspected, by SHA-256 digest of
+    # the archive. The content of an archive determines its metadata, so the
+    # results are shared by every build running in the process.
+    _cache: Dict[str, Tuple[str, str]] = {}
+    _cache_lock = threading.Lock()
+
     def __init__(self, python_exe, osutils=None):
         if osutils is None:
             osutils = OSUtils()
@@ -656,14 +1172,66 @@ class SDistMetadataFetcher(object):
         self.python_exe = python_exe
 
     def _parse_pkg_info_file(self, filepath):
+        data = self._osutils.get_file_contents(filepath, binary=False)
+        return self._parse_pkg_info(data)
+
+    def _parse_pkg_info(self, data):
         # The PKG-INFO generated by the egg-info command is in an email feed
         # format, so we use an email feedparser here to extract the metadata
         # from the PKG-INFO file.
-        data = self._osutils.get_file_contents(filepath, binary=False)
         parser = FeedParser()
         parser.feed(data)
         return parser.close()
 
+    def _read_archived_pkg_info(self, sdist_path: str) -> Optional[Tuple[str, str]]:
+        """
+        Reads the name and the version from the PKG-INFO file at the top of
+        the sdist, without extracting the archive. Every sdist built by a
+        recent build backend has one.
+
+        Parameters
+        ----------
+        sdist_path: str
+            The string path of the downloaded source distribution artifact
+
+        Returns
+        -------
+        Optional[Tuple[str, str]]
+            A tuple of the name and version of the package, or None if the
+            sdist has no usable PKG-INFO file
+        """
+        try:
+            if sdist_path.endswith(".zip"):
+                with zipfile.ZipFile(sdist_path) as archive:
+                    data = next(
+                        (archive.read(name) for name in archive.namelist() if self._is_top_level_pkg_info(name)),
+                        None,
+                    )
+            else:
+                data = None
+                # the archive is streamed, so only the members before PKG-INFO are read
+                with tarfile.open(sdist_path, "r|*") as archive:
+                    for member in archive:
+                        if member.isfile() and self._is_top_level_pkg_info(member.name):
+                            data = archive.extractfile(member).read()
+                            break
+        except (OSError, EOFError, tarfile.TarError, zipfile.BadZipFile) as ex:
+            LOG.debug("Unable to read PKG-INFO from %s", sdist_path, exc_info=ex)
+            return None
+
+        if data is None:
+            return None
+        metadata = self._parse_pkg_info(data.decode("utf-8", errors="replace"))
+        name, version = metadata["Name"], metadata["Version"]
+        if not name or not version or self._is_default_setuptools_values(name, version):
+            return None
+        return name, version
+
+    @staticmethod
+    def _is_top_level_pkg_info(member_name):
+        root, _, path = member_name.strip("/").partition("/")
+        return bool(root) and path == "PKG-INFO"
+
     def _get_pkg_info_filepath(self, package_dir):
         setup_py = self._osutils.joinpath(package_dir, "setup.py")
 
@@ -805,7 +1373,43 @@ class SDistMetadataFetcher(object):
 
     def get_package_name_and_version(self, sdist_path: str) -> Tuple[str, str]:
         """
-        Gets the package's name and version from the metadata file
+        Gets the package's name and version from the metadata file. The
+        PKG-INFO file at the top of the sdist is read without extracting it,
+        and the sdist is only extracted to run ``setup.py egg_info`` if it has
+        no usable PKG-INFO file. Results are cached by archive digest.
+
+        Parameters
+        ----------
+        sdist_path: str
+            The string path of the downloaded source distribution artifact
+
+        Returns
+        -------
+        Tuple[str, str]
+            A tuple of the name and version of the package
+        """
+        if not sdist_path.endswith(self._SDIST_EXTENSIONS):
+            raise InvalidSourceDistributionNameError(sdist_path)
+
+        digest = hash_file(sdist_path)
+        with self._cache_lock:
+            cached = self._cache.get(digest)
+        if cached:
+            return cached
+
+        name_and_version = self._read_archived_pkg_info(sdist_path)
+        if name_and_version is None:
+            LOG.debug("No usable PKG-INFO at the top of %s, running its setup.py", sdist_path)
+            name_and_version = self._get_name_and_version_from_setup(sdist_path)
+
+        with self._cache_lock:
+            self._cache[digest] = name_and_version
+        return name_and_version
+
+    def _get_name_and_version_from_setup(self, sdist_path: str) -> Tuple[str, str]:
+        """
+        Gets the package's name and version from the metadata generated by
+        the ``egg_info`` command of the extracted sdist
 
         Parameters
         ----------
@@ -867,6 +1471,104 @@ class SubprocessPip(object):
         rc = p.returncode
         return rc, out, err
 
+    def close(self):
+        # Every command runs in its own process, there is nothing to release
+        pass
+
+
+class PipWorker(object):
+    """Wrapper around a long lived process running successive pip commands.
+
+    Python is started and pip is imported once, by the worker in
+    ``pip_worker.py``, instead of once per pip command. Commands fall back to
+    a new process each, like :class:`SubprocessPip` does, when the worker is
+    busy with another command, when a setuptools shim has to be injected, or
+    if the worker can't be used.
+    """
+
+    _WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pip_worker.py")
+    _CLOSE_TIMEOUT = 10
+
+    def __init__(self, osutils=None, python_exe=None):
+        if osutils is None:
+            osutils = OSUtils()
+        self._osutils = osutils
+        self.python_exe = python_exe
+        self._process = None
+        self._import_string = None
+        self._subprocess_pip = None
+        self._lock = threading.Lock()
+        self._subprocess_pip_lock = threading.Lock()
+        self._start()
+
+    def _start(self):
+        try:
+            self._process = self._osutils.popen(
+                [self.python_exe, self._WORKER_SCRIPT],
+                stdin=self._osutils.pipe,
+                stdout=self._osutils.pipe,
+                env=self._osutils.original_environ(),
+            )
+            ready = json.loads(self._process.stdout.readline().decode("utf-8"))
+        except (OSError, ValueError) as ex:
+            LOG.debug("Unable to start a pip worker with %s", self.python_exe, exc_info=ex)
+            self.close()
+            return
+
+        if not ready.get("ready"):
+            self.close()
+            raise MissingPipError(python_path=self.python_exe)
+        self._import_string = ready["import_string"]
+        LOG.debug("Started a pip worker with %s", self.python_exe)
+
+    def main(self, args, env_vars=None, shim=None):
+        if env_vars is None:
+            env_vars = self._osutils.original_environ()
+        if shim or self._process is None or not self._lock.acquire(blocking=False):
+            return self._get_subprocess_pip().main(args, env_vars=env_vars, shim=shim)
+
+        try:
+            return self._send(args, env_vars)
+        except (OSError, ValueError) as ex:
+            LOG.debug("The pip worker failed, running pip in a new process from now on", exc_info=ex)
+            self.close()
+            return self._get_subprocess_pip().main(args, env_vars=env_vars, shim=shim)
+        finally:
+            self._lock.release()
+
+    def _send(self, args, env_vars):
+        request = json.dumps({"args": list(args), "env": dict(env_vars)}).encode("utf-8")
+        self._process.stdin.write(request + b"\n")
+        self._process.stdin.flush()
+        line = self._process.stdout.readline()
+        if not line:
+            raise OSError("The pip worker exited unexpectedly")
+        response = json.loads(line.decode("utf-8"))
+        return response["rc"], base64.b64decode(response["out"]), base64.b64decode(response["err"])
+
+    def _get_subprocess_pip(self):
+        with self._subprocess_pip_lock:
+            if self._subprocess_pip is None:
+                self._subprocess_pip = SubprocessPip(
+                    osutils=self._osutils, python_exe=self.python_exe, import_string=self._import_string
+                )
+            return self._subprocess_pip
+
+    def close(self):
+        """Stops the worker. Later commands each run in a new process."""
+        process, self._process = self._process, None
+        if process is None:
+            return
+        try:
+            # the worker exits once its stdin is closed
+            process.stdin.close()
+            process.wait(timeout=self._CLOSE_TIMEOUT)
+        except (OSError, subprocess.TimeoutExpired):
+            process.kill()
+            process.wait()
+        finally:
+            process.stdout.close()
+
 
 class PipRunner(object):
     """Wrapper around pip calls used by chalice."""
@@ -880,12 +1582,30 @@ class PipRunner(object):
     # eg. Processing ./package_a (from 123==1.1.1->-r requirements.txt (line 1))
     _LINK_IS_DIR_PATTERNS = ["Processing (.+?)[ ,\n]"]
 
-    def __init__(self, python_exe, pip, osutils=None):
+    def __init__(self, python_exe, pip, osutils=None, download_concurrency=1, find_links=None, offline_wheelhouse=None):
+        """
+        :type download_concurrency: int
+        :param download_concurrency: Maximum number of pip processes downloading
+            manylinux wheels at the same time. Wheels are downloaded one package
+            at a time by default.
+
+        :type find_links: str
+        :param find_links: Optional directory of wheels pip looks into, in
+            addition to the package index, when downloading packages.
+
+        :type offline_wheelhouse: str
+        :param offline_wheelhouse: Optional directory of wheels and sdists pip
+            gets every package from, instead of the package index. pip then
+            makes no network request, also when building sdists.
+        """
         if osutils is None:
             osutils = OSUtils()
         self.python_exe = python_exe
         self._wrapped_pip = pip
         self._osutils = osutils
+        self._download_concurrency = max(1, download_concurrency or 1)
+        self._find_links = find_links
+        self._offline_wheelhouse = offline_wheelhouse
 
     def _execute(self, command, args, env_vars=None, shim=None):
         """Execute a pip command with the given arguments."""
@@ -899,6 +1619,9 @@ class PipRunner(object):
     def build_wheel(self, wheel, directory, compile_c=True):
         """Build an sdist into a wheel file."""
         arguments = ["--no-deps", "--wheel-dir", directory, wheel]
+        if self._offline_wheelhouse:
+            # the build dependencies of the sdist come from the wheelhouse too
+            arguments.extend(self._find_links_arguments())
         env_vars = self._osutils.original_environ()
         shim = ""
         if not compile_c:
@@ -912,6 +1635,7 @@ class PipRunner(object):
     def download_all_dependencies(self, requirements_filename, directory):
         """Download all dependencies as sdist or wheel."""
         arguments = ["-r", requirements_filename, "--dest", directory, "--exists-action", "i"]
+        arguments.extend(self._find_links_arguments())
         rc, out, err = self._execute("download", arguments)
         # When downloading all dependencies we expect to get an rc of 0 back
         # since we are casting a wide net here letting pip have options about
@@ -938,6 +1662,10 @@ class PipRunner(object):
                 wheel_package_paths.add(str(match.group(1)))
 
         for wheel_package_path in wheel_package_paths:
+            if wheel_package_path.endswith(".whl") and self._is_in_wheel_directory(wheel_package_path):
+                # wheels found in the offline wheelhouse or in the directory of
+                # find_links are saved into the directory by pip as they are
+                continue
             # Looks odd we do not check on the error status of building the
             # wheel here. We can assume this is a valid package path since
             # we already passed the pip download stage. This stage would have
@@ -947,6 +1675,31 @@ class PipRunner(object):
             # as any other package we fail to build a valid wheel for, and
             # complain at deployment time.
             self.build_wheel(wheel_package_path, directory)
+        return wheel_package_paths
+
+    def download_binary_dependencies(self, requirements_filename, directory, lambda_abi, platforms, no_deps=False):
+        """Download manylinux wheel files for all the dependencies at once.
+
+        Returns whether pip found a compatible wheel for every dependency. The
+        dependencies of the requirements are not resolved if ``no_deps`` is
+        set, every dependency must then be listed in the requirements file.
+        """
+        arguments = [
+            "-r",
+            requirements_filename,
+            "--only-binary=:all:",
+            *(["--no-deps"] if no_deps else []),
+            *list(itertools.chain.from_iterable(["--platform", element] for element in platforms)),
+            "--implementation",
+            "cp",
+            "--abi",
+            lambda_abi,
+            "--dest",
+            directory,
+            *self._find_links_arguments(),
+        ]
+        rc, _, _ = self._execute("download", arguments)
+        return rc == 0
 
     def download_manylinux_wheels(self, packages, directory, lambda_abi, platforms):
         """Download wheel files for manylinux for all the given packages."""
@@ -958,17 +1711,57 @@ class PipRunner(object):
         # compatible with Lambda, which depends on the function architecture,
         # and cpython implementation. The compatible abi depends on the python
         # version and is checked later.
-        for package in packages:
-            arguments = [
-                "--only-binary=:all:",
-                "--no-deps",
-                *list(itertools.chain.from_iterable(["--platform", element] for element in platforms)),
-                "--implementation",
-                "cp",
-                "--abi",
-                lambda_abi,
-                "--dest",
-                directory,
-                package,
-            ]
-            self._execute("download", arguments)
+        if self._download_concurrency == 1 or len(packages) <= 1:
+            for package in packages:
+                self._download_manylinux_wheel(package, directory, lambda_abi, platforms)
+            return
+
+        # Each pip process downloads into its own directory, next to the
+        # destination so that the wheels can be renamed into it. This way pip
+        # processes never write to the same file.
+        def download_isolated(package):
+            with self._osutils.tempdir(dir=directory) as package_directory:
+                self._download_manylinux_wheel(package, package_directory, lambda_abi, platforms)
+                for filename in self._osutils.get_directory_contents(package_directory):
+                    destination = self._osutils.joinpath(directory, filename)
+                    if self._osutils.file_exists(destination):
+                        # keep the file already downloaded, as pip does
+                        continue
+                    self._osutils.rename(self._osutils.joinpath(package_directory, filename), destination)
+
+        max_workers = min(self._download_concurrency, len(packages))
+        LOG.debug("Downloading manylinux wheels for %d packages with %d workers", len(packages), max_workers)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # consume the results to raise the exceptions of the workers
+            list(executor.map(download_isolated, packages))
+
+    def _download_manylinux_wheel(self, package, directory, lambda_abi, platforms):
+        arguments = [
+            "--only-binary=:all:",
+            "--no-deps",
+            *list(itertools.chain.from_iterable(["--platform", element] for element in platforms)),
+            "--implementation",
+            "cp",
+            "--abi",
+            lambda_abi,
+            "--dest",
+            directory,
+            *self._find_links_arguments(),
+            package,
+        ]
+        self._execute("download", arguments)
+
+    def _is_in_wheel_directory(self, path):
+        path = os.path.normcase(os.path.abspath(path))
+        for directory in (self._offline_wheelhouse, self._find_links):
+            if directory and os.path.dirname(path) == os.path.normcase(os.path.abspath(directory)):
+                return True
+        return False
+
+    def _find_links_arguments(self):
+        arguments = []
+        if self._offline_wheelhouse:
+            arguments.extend(["--no-index", "--find-links", self._offline_wheelhouse])
+        if self._find_links:
+            arguments.extend(["--find-links", self._find_links])
+        return arguments
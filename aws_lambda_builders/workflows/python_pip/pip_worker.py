@@ -0,0 +1,110 @@
+"""
+Worker running successive pip commands in a single interpreter, so that Python is started and pip is imported once per
+build instead of once per pip command.
+
+It is started by `PipWorker` with the interpreter pip must run with. Each line it reads on stdin is a JSON request
+holding the arguments and the environment variables of a pip command, and it answers each request with a JSON line
+holding the return code and the output of the command. This file is executed by the target interpreter rather than
+imported, so it must only use the standard library.
+"""
+
+import base64
+import io
+import json
+import logging
+import os
+import sys
+import traceback
+import warnings
+
+# Import paths of the pip entry point, from the most recent pip versions to pip 9
+IMPORT_STRINGS = (
+    "from pip._internal.main import main",
+    "from pip._internal import main",
+    "from pip import main",
+)
+
+
+def _import_pip_main():
+    for import_string in IMPORT_STRINGS:
+        namespace = {}
+        try:
+            exec(import_string, namespace)
+        except ImportError:
+            continue
+        if callable(namespace["main"]):
+            return import_string, namespace["main"]
+    return None, None
+
+
+def _run_command(main, args, env_vars):
+    environ = dict(os.environ)
+    cwd = os.getcwd()
+    stdout, stderr = sys.stdout, sys.stderr
+    out, err = io.BytesIO(), io.BytesIO()
+    sys.stdout = io.TextIOWrapper(out, encoding="utf-8", errors="replace", write_through=True)
+    sys.stderr = io.TextIOWrapper(err, encoding="utf-8", errors="replace", write_through=True)
+    os.environ.clear()
+    os.environ.update(env_vars)
+    try:
+        with warnings.catch_warnings():
+            rc = main(args)
+    except SystemExit as ex:
+        rc = ex.code if isinstance(ex.code, int) else int(ex.code is not None)
+    except Exception:
+        traceback.print_exc()
+        rc = 1
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        output = (out.getvalue(), err.getvalue())
+        sys.stdout, sys.stderr = stdout, stderr
+        # reset the global state pip changes, so that every command starts from the same state
+        os.environ.clear()
+        os.environ.update(environ)
+        os.chdir(cwd)
+        for logger in [logging.getLogger()] + list(logging.Logger.manager.loggerDict.values()):
+            if isinstance(logger, logging.Logger):
+                logger.handlers = []
+    return rc or 0, output[0], output[1]
+
+
+def _write(channel, message):
+    channel.write(json.dumps(message).encode("utf-8") + b"\n")
+    channel.flush()
+
+
+def main():
+    # The running directory holds the modules of the workflow, which must not shadow the modules pip imports
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    sys.path[:] = [path for path in sys.path if os.path.abspath(path or ".") != script_dir]
+
+    # Answers are written to a copy of stdout. Anything else written to stdout or stderr, ex: by processes started by
+    # pip, is discarded so that it can't corrupt the answers.
+    channel = os.fdopen(os.dup(sys.stdout.fileno()), "wb")
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, sys.stdout.fileno())
+    os.dup2(devnull, sys.stderr.fileno())
+
+    import_string, pip_main = _import_pip_main()
+    if pip_main is None:
+        _write(channel, {"ready": False})
+        return 1
+    _write(channel, {"ready": True, "import_string": import_string})
+
+    for line in sys.stdin:
+        request = json.loads(line)
+        rc, out, err = _run_command(pip_main, request["args"], request["env"])
+        _write(
+            channel,
+            {
+                "rc": rc,
+                "out": base64.b64encode(out).decode("ascii"),
+                "err": base64.b64encode(err).decode("ascii"),
+            },
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
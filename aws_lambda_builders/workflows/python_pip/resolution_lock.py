@@ -0,0 +1,105 @@
+"""
+Lock files of the resolved dependency closures, kept between Python builds so that unchanged requirements are not
+resolved again
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+
+LOG = logging.getLogger(__name__)
+
+# Name of the directory of lock files under the cache root of the builds
+LOCKS_DIR_NAME = "pip-locks"
+
+# Number of seconds a lock file is used for if no time to live is configured
+DEFAULT_LOCK_TTL = 24 * 60 * 60
+
+RESOLUTION_LOCK_VERSION = 1
+
+
+class ResolutionLock(object):
+    """
+    The wheels resolved for a requirements file, each with its ``name==version`` requirement, file name and SHA-256
+    digest.
+
+    A lock file is keyed by the content of the requirements file, the runtime and the architecture, so it is no longer
+    used once any of them changes. It also expires after its time to live, so that builds with loose version
+    specifiers eventually pick up new releases of the dependencies.
+    """
+
+    def __init__(self, directory, key, ttl=DEFAULT_LOCK_TTL):
+        """
+        :type directory: str
+        :param directory: Path to the directory of lock files, created if it
+            doesn't exist.
+
+        :type key: str
+        :param key: Key of the lock file, see `compute_key`.
+
+        :type ttl: int
+        :param ttl: Number of seconds the lock file is used for after it was
+            written.
+        """
+        self.directory = directory
+        self.path = os.path.join(directory, "{}.json".format(key))
+        self.ttl = ttl
+        os.makedirs(self.directory, exist_ok=True)
+        # the directory is itself an entry of the cache root, whose modification time is its last use time
+        os.utime(self.directory)
+
+    @staticmethod
+    def compute_key(requirements_path, runtime, architecture):
+        sha256 = hashlib.sha256()
+        with open(requirements_path, "rb") as requirements_file:
+            sha256.update(requirements_file.read())
+        sha256.update("\0{}\0{}\0{}".format(runtime, architecture, RESOLUTION_LOCK_VERSION).encode("utf-8"))
+        return sha256.hexdigest()
+
+    def load(self):
+        """
+        Reads the locked wheels.
+
+        :rtype: list
+        :return: The locked wheels as dicts with the ``requirement``,
+            ``filename`` and ``sha256`` of each wheel, or None if there is no
+            valid lock file or it expired.
+        """
+        try:
+            if time.time() - os.path.getmtime(self.path) > self.ttl:
+                LOG.debug("Lock file %s expired", self.path)
+                return None
+            with open(self.path, "r") as lock_file:
+                content = json.load(lock_file)
+        except (OSError, ValueError):
+            LOG.debug("No valid lock file %s", self.path)
+            return None
+        if not isinstance(content, dict) or content.get("version") != RESOLUTION_LOCK_VERSION:
+            return None
+        return content.get("wheels")
+
+    def save(self, wheels):
+        """
+        Writes the locked wheels atomically, and removes the expired lock files of the directory.
+
+        :type wheels: list
+        :param wheels: The wheels as dicts with the ``requirement``,
+            ``filename`` and ``sha256`` of each wheel.
+        """
+        temp_path = "{}.tmp{}".format(self.path, os.getpid())
+        with open(temp_path, "w") as lock_file:
+            json.dump({"version": RESOLUTION_LOCK_VERSION, "wheels": wheels}, lock_file, indent=2, sort_keys=True)
+        os.replace(temp_path, self.path)
+        LOG.debug("Wrote lock file %s", self.path)
+
+        now = time.time()
+        for filename in os.listdir(self.directory):
+            path = os.path.join(self.directory, filename)
+            try:
+                if filename.endswith(".json") and now - os.path.getmtime(path) > self.ttl:
+                    os.remove(path)
+            except OSError:
+                # removed by a concurrent build
+                continue
@@ -0,0 +1,136 @@
+"""
+Removal of the files of the installed Python dependencies that Lambda never uses
+"""
+
+import fnmatch
+import logging
+import os
+
+LOG = logging.getLogger(__name__)
+
+# Files removed by default, as glob patterns matched against their path relative to the dependencies directory, using
+# "/" as separator. "*" also matches "/".
+DEFAULT_SLIMMING_PATTERNS = (
+    # type stubs
+    "*.pyi",
+    # lists of the installed files, only used to uninstall
+    "*.dist-info/RECORD",
+)
+
+# Patterns of files that are usually unused, but that some packages import or read at runtime, ex: a "test" package
+# imported by the package itself or C headers read by a JIT compiler. They are only removed when given in the patterns
+# to remove.
+OPTIONAL_SLIMMING_PATTERNS = (
+    # test suites in packages
+    "test/*",
+    "*/test/*",
+    # C headers, only used to build extensions
+    "*.h",
+    "*.hpp",
+)
+
+# Directories whose files are also removed by default, unless they are Python packages
+TEST_DIRECTORIES = ("tests",)
+DOCUMENTATION_DIRECTORIES = ("doc", "docs", "example", "examples")
+
+
+def slim_dependencies(directory, remove_patterns=None, keep_patterns=None):
+    """
+    Removes the files of the dependencies matching the default patterns or the given patterns, unless they match a
+    pattern to keep, along with the directories left empty.
+
+    :type directory: str
+    :param directory: Directory the dependencies are installed in
+
+    :type remove_patterns: list
+    :param remove_patterns: Glob patterns of other files to remove, matched
+        like `DEFAULT_SLIMMING_PATTERNS`, ex: `OPTIONAL_SLIMMING_PATTERNS`
+
+    :type keep_patterns: list
+    :param keep_patterns: Glob patterns of files to keep even if they match a
+        pattern to remove
+
+    :rtype: tuple
+    :return: The report of the removed files, with the number of files and
+        bytes removed in total and by pattern, and the set of the relative
+        paths of the removed files
+    """
+    patterns = list(DEFAULT_SLIMMING_PATTERNS) + list(remove_patterns or [])
+    keep_patterns = list(keep_patterns or [])
+    removed_paths = set()
+    by_pattern = {}
+    # relative paths of the test and documentation directories met so far, with a trailing "/"
+    directory_prefixes = []
+
+    for root, dirs, files in os.walk(directory):
+        relative_root = os.path.relpath(root, directory).replace(os.sep, "/")
+        prefix = "" if relative_root == "." else relative_root + "/"
+        for name in dirs:
+            if name in TEST_DIRECTORIES + DOCUMENTATION_DIRECTORIES and not os.path.isfile(
+                os.path.join(root, name, "__init__.py")
+            ):
+                directory_prefixes.append(prefix + name + "/")
+
+        for name in files:
+            relative_path = prefix + name
+            if any(fnmatch.fnmatchcase(relative_path, pattern) for pattern in keep_patterns):
+                continue
+            pattern = _get_matching_pattern(relative_path, patterns, directory_prefixes)
+            if pattern is None:
+                continue
+            path = os.path.join(root, name)
+            size = os.lstat(path).st_size
+            os.remove(path)
+            removed_paths.add(relative_path)
+            counts = by_pattern.setdefault(pattern, {"files": 0, "bytes": 0})
+            counts["files"] += 1
+            counts["bytes"] += size
+
+    remove_emptied_directories(directory, removed_paths)
+
+    report = {
+        "removed_files": sum(counts["files"] for counts in by_pattern.values()),
+        "removed_bytes": sum(counts["bytes"] for counts in by_pattern.values()),
+        "by_pattern": by_pattern,
+    }
+    LOG.debug("Removed %d file(s), %d byte(s) from %s", report["removed_files"], report["removed_bytes"], directory)
+    return report, removed_paths
+
+
+def get_slimming_settings(remove_patterns=None, keep_patterns=None):
+    """
+    Returns the settings files are slimmed with, in a form that can be stored as JSON and compared with the settings
+    of another build.
+
+    :rtype: dict
+    :return: The sorted patterns of the files to remove, including the
+        default ones, and of the files to keep
+    """
+    return {
+        "remove_patterns": sorted(set(DEFAULT_SLIMMING_PATTERNS) | set(remove_patterns or [])),
+        "keep_patterns": sorted(set(keep_patterns or [])),
+    }
+
+
+def _get_matching_pattern(relative_path, patterns, directory_prefixes):
+    for pattern in patterns:
+        if fnmatch.fnmatchcase(relative_path, pattern):
+            return pattern
+    for directory_prefix in directory_prefixes:
+        if relative_path.startswith(directory_prefix):
+            return "{}*".format(directory_prefix)
+    return None
+
+
+def remove_emptied_directories(directory, removed_paths):
+    """Removes the parent directories of removed files that are left empty."""
+    parents = set()
+    for relative_path in removed_paths:
+        parts = relative_path.split("/")
+        for index in range(1, len(parts)):
+            parents.add(tuple(parts[:index]))
+    # deepest first, so that the parents of removed directories are checked after them
+    for parts in sorted(parents, key=len, reverse=True):
+        path = os.path.join(directory, *parts)
+        if os.path.isdir(path) and not os.listdir(path):
+            os.rmdir(path)
@@ -5,14 +5,20 @@ Commonly used utilities
 import contextlib
 import io
 import os
+import re
 import shutil
 import subprocess
 import sys
 import tempfile
 import zipfile
-from typing import List, Optional
 
-EXPERIMENTAL_FLAG_BUILD_PERFORMANCE = "experimentalBuildPerformance"
+
+def normalize_name(name):
+    """
+    Normalizes the name of a distribution as described by PEP 503, so that "PySocks", "pysocks" and "py_socks", or
+    the names of wheel files, in which "-" is replaced with "_", name the same distribution.
+    """
+    return re.sub(r"[-_.]+", "-", name).lower()
 
 
 class OSUtils(object):
@@ -48,9 +54,13 @@ class OSUtils(object):
         with io.open(filename, mode, encoding=encoding) as f:
             return f.read()
 
-    def extract_zipfile(self, zipfile_path, unpack_dir):
+    def extract_zipfile(self, zipfile_path, unpack_dir, members=None):
+        with zipfile.ZipFile(zipfile_path, "r") as z:
+            z.extractall(unpack_dir, members)
+
+    def get_zipfile_contents(self, zipfile_path):
         with zipfile.ZipFile(zipfile_path, "r") as z:
-            z.extractall(unpack_dir)
+            return z.namelist()
 
     def directory_exists(self, path):
         return os.path.isdir(path)
@@ -79,16 +89,42 @@ class OSUtils(object):
     def rmtree(self, directory):
         shutil.rmtree(directory)
 
+    def rename(self, source, destination):
+        os.replace(source, destination)
+
+    def remove_file(self, path):
+        os.remove(path)
+
+    def link_file(self, source, destination):
+        # Hard links share the content of the file instead of copying it, the
+        # file is copied when the file system doesn't support them.
+        try:
+            os.link(source, destination)
+        except OSError:
+            shutil.copy2(source, destination)
+
+    def move_tree(self, source, destination):
+        # Merges the content of source into destination with renames, so that
+        # nothing is copied, then removes the emptied source directory.
+        for name in self.get_directory_contents(source):
+            new_source = os.path.join(source, name)
+            new_destination = os.path.join(destination, name)
+            if os.path.isdir(new_source) and os.path.isdir(new_destination) and not os.path.islink(new_source):
+                self.move_tree(new_source, new_destination)
+            else:
+                os.replace(new_source, new_destination)
+        os.rmdir(source)
+
     @contextlib.contextmanager
-    def tempdir(self):
-        tempdir = tempfile.mkdtemp()
+    def tempdir(self, dir=None):
+        tempdir = tempfile.mkdtemp(dir=dir)
         try:
             yield tempdir
         finally:
             shutil.rmtree(tempdir)
 
-    def popen(self, command, stdout=None, stderr=None, env=None):
-        p = subprocess.Popen(command, stdout=stdout, stderr=stderr, env=env)
+    def popen(self, command, stdout=None, stderr=None, env=None, stdin=None):
+        p = subprocess.Popen(command, stdout=stdout, stderr=stderr, env=env, stdin=stdin)
         return p
 
     def mtime(self, path):
@@ -101,10 +137,3 @@ class OSUtils(object):
     def basename(self, path):
         # type: (str) -> str
         return os.path.basename(path)
-
-
-def is_experimental_build_improvements_enabled(experimental_flags: Optional[List[str]]) -> bool:
-    """
-    A function which will determine if experimental build improvements is active
-    """
-    return bool(experimental_flags) and EXPERIMENTAL_FLAG_BUILD_PERFORMANCE in experimental_flags
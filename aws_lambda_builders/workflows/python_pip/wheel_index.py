@@ -0,0 +1,46 @@
+"""
+In-memory index of a local directory of wheels, used to pick Lambda compatible wheels without calling pip
+"""
+
+import logging
+import os
+
+from .utils import normalize_name
+
+LOG = logging.getLogger(__name__)
+
+
+class WheelIndex(object):
+    """
+    The wheel files of a flat directory, ex: a mirror of the wheels an air-gapped build may use, by distribution name
+    and version. The index is built once from the file names, which hold the name, version, python tag, abi tag and
+    platform tag of each wheel, so no wheel is opened.
+    """
+
+    def __init__(self, directory):
+        """
+        :type directory: str
+        :param directory: Path to the directory of wheels.
+        """
+        self.directory = directory
+        self._wheels = {}
+        for filename in sorted(os.listdir(directory)):
+            # name-version[-build]-python-abi-platform.whl
+            parts = filename[:-4].split("-")
+            if not filename.endswith(".whl") or len(parts) not in (5, 6):
+                continue
+            name, version = parts[0], parts[1]
+            self._wheels.setdefault(normalize_name(name), {}).setdefault(version, []).append(filename)
+        LOG.debug("Indexed the wheels of %d distributions in %s", len(self._wheels), directory)
+
+    def find(self, name, version):
+        """
+        Returns the file names of the wheels of a distribution version, sorted.
+
+        :type name: str
+        :param name: Name of the distribution, normalized or not.
+
+        :type version: str
+        :param version: Version of the distribution.
+        """
+        return list(self._wheels.get(normalize_name(name), {}).get(version, []))
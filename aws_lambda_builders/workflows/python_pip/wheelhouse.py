@@ -0,0 +1,91 @@
+"""
+Persistent directory of wheels shared between Python builds
+"""
+
+import logging
+import os
+import shutil
+import tempfile
+
+from aws_lambda_builders.scratch import evict_least_recently_used
+
+LOG = logging.getLogger(__name__)
+
+# Name of the wheelhouse directory under the cache root of the builds
+WHEELHOUSE_DIR_NAME = "pip-wheelhouse"
+
+# Budget of the wheelhouse if none is configured
+DEFAULT_WHEELHOUSE_MAX_SIZE = 2 * 1024 * 1024 * 1024
+
+
+class Wheelhouse(object):
+    """
+    A flat directory of wheel files that pip can use as ``--find-links``.
+
+    Wheels are keyed by their file name, which holds the name, version, python tag, abi tag and platform tag of the
+    distribution. Storing a wheel is atomic, so concurrent builds sharing the wheelhouse never see partial files. The
+    modification time of a wheel is its last use time, and the least recently used wheels are evicted when the
+    wheelhouse exceeds its size budget.
+    """
+
+    def __init__(self, directory, max_size=DEFAULT_WHEELHOUSE_MAX_SIZE):
+        """
+        :type directory: str
+        :param directory: Path to the wheelhouse, created if it doesn't exist.
+
+        :type max_size: int
+        :param max_size: Maximum number of bytes the wheels may use. The
+            wheelhouse is not trimmed if it is None.
+        """
+        self.directory = directory
+        self.max_size = max_size
+        os.makedirs(self.directory, exist_ok=True)
+        # the wheelhouse is itself an entry of the cache root, whose modification time is its last use time
+        os.utime(self.directory)
+
+    def contains(self, filename):
+        return os.path.isfile(os.path.join(self.directory, filename))
+
+    def touch(self, filename):
+        """Marks a wheel of the wheelhouse as used by the current build."""
+        try:
+            os.utime(os.path.join(self.directory, filename))
+        except OSError:
+            # the wheel was evicted by a concurrent build
+            LOG.debug("Unable to mark %s as used in the wheelhouse", filename)
+
+    def store(self, source_directory, filename):
+        """Copies a wheel into the wheelhouse, unless it is already there."""
+        destination = os.path.join(self.directory, filename)
+        if os.path.isfile(destination):
+            self.touch(filename)
+            return
+
+        # the temporary name does not end with .whl, so pip never picks it up
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, prefix=".", suffix=".tmp")
+        os.close(fd)
+        try:
+            shutil.copyfile(os.path.join(source_directory, filename), temp_path)
+            os.replace(temp_path, destination)
+        except OSError:
+            LOG.debug("Unable to store %s in the wheelhouse", filename, exc_info=True)
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return
+        LOG.debug("Stored %s in the wheelhouse %s", filename, self.directory)
+
+    def evict(self):
+        """
+        Evicts the least recently used wheels until the wheelhouse fits in its size budget.
+
+        :rtype: list
+        :return: Paths of the evicted wheels
+        """
+        if self.max_size is None:
+            return []
+        wheels = [
+            os.path.join(self.directory, filename)
+            for filename in os.listdir(self.directory)
+            if filename.endswith(".whl")
+        ]
+        return evict_least_recently_used(wheels, self.max_size)
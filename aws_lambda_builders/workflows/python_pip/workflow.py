@@ -6,12 +6,25 @@ import logging
 
 from aws_lambda_builders.actions import CleanUpAction, CopySourceAction, LinkSourceAction
 from aws_lambda_builders.path_resolver import PathResolver
+from aws_lambda_builders.utils import is_experimental_build_improvements_enabled
 from aws_lambda_builders.validator import RuntimeValidator
 from aws_lambda_builders.workflow import BaseWorkflow, BuildDirectory, BuildInSourceSupport, Capability
 from aws_lambda_builders.workflows.python_pip.validator import PythonRuntimeValidator
 
-from .actions import PARENT_PYTHON_PKGS_KEY, PythonCreateParentPackagesAction, PythonPipBuildAction
-from .utils import OSUtils, is_experimental_build_improvements_enabled
+from .actions import (
+    COMPILE_BYTECODE_KEY,
+    IMPORT_PRUNING_KEY,
+    INCREMENTAL_INSTALL_KEY,
+    PARENT_PYTHON_PKGS_KEY,
+    SLIM_DEPENDENCIES_KEY,
+    PythonCompileBytecodeAction,
+    PythonCreateParentPackagesAction,
+    PythonPipBuildAction,
+    PythonPruneImportsAction,
+    PythonSlimDependenciesAction,
+)
+from .install_record import INSTALL_RECORD_FILENAME
+from .utils import OSUtils
 
 LOG = logging.getLogger(__name__)
 
@@ -94,10 +107,14 @@ class PythonPipWorkflow(BaseWorkflow):
             return
 
         # If a requirements.txt exists, run pip builder before copy action.
+        incremental_install = bool(
+            self.dependencies_dir and isinstance(self.options, dict) and self.options.get(INCREMENTAL_INSTALL_KEY)
+        )
         if self.download_dependencies:
             self._use_pip = True
-            if self.dependencies_dir:
-                # clean up the dependencies folder before installing
+            if self.dependencies_dir and not incremental_install:
+                # clean up the dependencies folder before installing, unless only the changed dependencies are
+                # installed into it
                 self._actions.append(CleanUpAction(self.dependencies_dir))
             self._actions.append(
                 PythonPipBuildAction(
@@ -108,8 +125,26 @@ class PythonPipWorkflow(BaseWorkflow):
                     self.dependencies_dir,
                     binaries=self.binaries,
                     architecture=self.architecture,
+                    options=self.options,
+                    cache_dir=self.cache_dir,
                 )
             )
+            if isinstance(self.options, dict) and self.options.get(IMPORT_PRUNING_KEY):
+                # the imports are analyzed while the RECORD files of the distributions, which list their files, are
+                # still there
+                self._actions.append(
+                    PythonPruneImportsAction(
+                        source_dir,
+                        self.dependencies_dir or artifacts_dir,
+                        options=self.options,
+                        excludes=self.EXCLUDED_FILES,
+                    )
+                )
+            if isinstance(self.options, dict) and self.options.get(SLIM_DEPENDENCIES_KEY):
+                # the dependencies are slimmed before the source is copied next to them
+                self._actions.append(
+                    PythonSlimDependenciesAction(self.dependencies_dir or artifacts_dir, options=self.options)
+                )
         # if dependencies folder is provided, copy dependencies from dependencies folder to build folder
         # if combine_dependencies is false, will not copy the dependencies from dependencies folder to artifact
         # folder
@@ -118,6 +153,10 @@ class PythonPipWorkflow(BaseWorkflow):
             # symlinking python dependencies is disabled for now since it is breaking sam local commands
             if False and is_experimental_build_improvements_enabled(self.experimental_flags):
                 self._actions.append(LinkSourceAction(self.dependencies_dir, artifacts_dir))
+            elif incremental_install:
+                self._actions.append(
+                    CopySourceAction(self.dependencies_dir, artifacts_dir, excludes=[INSTALL_RECORD_FILENAME])
+                )
             else:
                 self._actions.append(CopySourceAction(self.dependencies_dir, artifacts_dir))
 
@@ -127,11 +166,19 @@ class PythonPipWorkflow(BaseWorkflow):
     def actions(self):
         """
         Returns the list of actions to be executed in this workflow.
-        If required, creating the parent package(s) must be executed last.
+        If required, creating the parent package(s) must be executed last, only followed by compiling the artifacts
+        to bytecode.
         """
+        actions = self._actions
         if self._should_create_parent_packages():
-            return self._actions + [PythonCreateParentPackagesAction(self.source_dir, self.artifacts_dir, self.options)]
-        return self._actions
+            actions = actions + [PythonCreateParentPackagesAction(self.source_dir, self.artifacts_dir, self.options)]
+        if self._should_compile_bytecode():
+            directories = [self.artifacts_dir]
+            if self.dependencies_dir and not self.combine_dependencies:
+                # the dependencies are not copied into the artifacts
+                directories.append(self.dependencies_dir)
+            actions = actions + [PythonCompileBytecodeAction(directories, self.binaries)]
+        return actions
 
     @actions.setter
     def actions(self, value):
@@ -164,7 +211,25 @@ class PythonPipWorkflow(BaseWorkflow):
             return PARENT_PYTHON_PKGS_KEY in self.options
         return False
 
+    def _should_compile_bytecode(self):
+        """
+        Determines if the artifacts should be compiled to bytecode based on the options provided.
+        """
+        return isinstance(self.options, dict) and bool(self.options.get(COMPILE_BYTECODE_KEY))
+
+    def _is_dependency_change(self, path):
+        """
+        Strict import pruning removes the distributions the source never imports, so a change to a Python file may
+        require distributions that were removed: the dependencies are installed and pruned again.
+        """
+        if super()._is_dependency_change(path):
+            return True
+        return (
+            isinstance(self.options, dict) and self.options.get(IMPORT_PRUNING_KEY) == "strict" and path.endswith(".py")
+        )
+
     def get_validators(self):
-        if not self._use_pip:
+        # the bytecode must be compiled by the Python version of the runtime
+        if not self._use_pip and not self._should_compile_bytecode():
             return [RuntimeValidator(runtime=self.runtime, architecture=self.architecture)]
         return [PythonRuntimeValidator(runtime=self.runtime, architecture=self.architecture)]
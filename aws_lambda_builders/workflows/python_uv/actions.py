@@ -3,17 +3,25 @@ Action to resolve Python dependencies using UV
 """
 
 import logging
+import os
 from typing import Optional
 
 from aws_lambda_builders.actions import ActionFailedError, BaseAction, Purpose
 from aws_lambda_builders.architecture import X86_64
+from aws_lambda_builders.workflows.python_pip.distribution_report import report_distributions
 
 from .exceptions import MissingUvError, UvBuildError, UvInstallationError
+from .export_cache import EXPORTS_DIR_NAME, ExportCache
 from .packager import PythonUvDependencyBuilder, SubprocessUv, UvRunner
-from .utils import OSUtils, UvConfig
+from .utils import LINK_MODES, OSUtils, UvConfig, get_user_cache_dir
 
 LOG = logging.getLogger(__name__)
 
+# Maximum number of bytes of the UV cache, which is pruned after the build when it is larger
+UV_CACHE_MAX_SIZE_KEY = "uv_cache_max_size"
+# How UV installs the files of its cache into the target directory, one of LINK_MODES
+UV_LINK_MODE_KEY = "uv_link_mode"
+
 
 class PythonUvBuildAction(BaseAction):
     """Action for building Python dependencies using UV."""
@@ -33,6 +41,9 @@ class PythonUvBuildAction(BaseAction):
         binaries,
         architecture=X86_64,
         config: Optional[UvConfig] = None,
+        distribution_report: bool = False,
+        cache_max_size: Optional[int] = None,
+        cache_dir: Optional[str] = None,
     ):
         self.artifacts_dir = artifacts_dir
         self.manifest_path = manifest_path
@@ -42,11 +53,19 @@ class PythonUvBuildAction(BaseAction):
         self.binaries = binaries
         self.architecture = architecture
         self.config = config or UvConfig()
+        self.distribution_report = distribution_report
+        self.cache_max_size = cache_max_size
+        self.cache_dir = cache_dir
 
         self._os_utils = OSUtils()
 
     def execute(self) -> None:
         """Execute the build action for Python UV workflows."""
+        if self.config.link_mode not in LINK_MODES:
+            raise ActionFailedError(
+                "{} must be one of {}, got {}".format(UV_LINK_MODE_KEY, ", ".join(LINK_MODES), self.config.link_mode)
+            )
+
         # Initialize UV components
         uv_subprocess = SubprocessUv(osutils=self._os_utils)
         uv_runner = UvRunner(uv_subprocess=uv_subprocess, osutils=self._os_utils)
@@ -56,6 +75,7 @@ class PythonUvBuildAction(BaseAction):
             osutils=self._os_utils,
             runtime=self.runtime,
             uv_runner=uv_runner,
+            export_cache=self._get_export_cache(),
         )
 
         try:
@@ -74,3 +94,41 @@ class PythonUvBuildAction(BaseAction):
             )
         except (MissingUvError, UvInstallationError, UvBuildError) as ex:
             raise ActionFailedError(str(ex))
+
+        self.report = {"uv_cache": self._report_cache(uv_runner)}
+        if self.distribution_report:
+            # requirements files name the top-level requirements, which are otherwise found from the installed ones
+            requirements_path = self.manifest_path if self.manifest_path.endswith(".txt") else None
+            self.report["distribution_report"] = report_distributions(
+                target_artifact_dir, requirements_path, self.runtime, self.architecture
+            )
+
+    def _get_export_cache(self) -> Optional[ExportCache]:
+        """
+        Returns the requirements exported by the previous builds, kept under the cache directory of the build or else
+        under the user cache directory, if they can be kept there.
+        """
+        cache_dir = self.cache_dir or get_user_cache_dir()
+        try:
+            return ExportCache(os.path.join(cache_dir, EXPORTS_DIR_NAME))
+        except OSError as ex:
+            LOG.debug("Unable to keep exported requirements in %s", cache_dir, exc_info=ex)
+            return None
+
+    def _report_cache(self, uv_runner: UvRunner) -> dict:
+        """
+        Reports how many of the installed packages came from the UV cache, and prunes the cache if it is larger than
+        its maximum size. Pruning failures don't fail the build, the cache is pruned again by the next one.
+        """
+        installed = uv_runner.cache_statistics["installed"]
+        report = {
+            "cache_dir": self.config.cache_dir,
+            "installed_packages": installed,
+            "cache_hits": max(installed - uv_runner.cache_statistics["prepared"], 0),
+        }
+        if self.cache_max_size is not None and self.config.cache_dir and not self.config.no_cache:
+            try:
+                report.update(uv_runner.prune_cache(self.config, self.cache_max_size))
+            except UvInstallationError as ex:
+                LOG.warning("Unable to prune the UV cache %s: %s", self.config.cache_dir, ex)
+        return report
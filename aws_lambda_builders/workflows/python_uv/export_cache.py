@@ -0,0 +1,110 @@
+"""
+Requirements exported from pyproject.toml projects, kept between UV builds so that unchanged projects are neither
+locked nor exported again
+"""
+
+import hashlib
+import logging
+import os
+import shutil
+import time
+from typing import Optional, Sequence
+
+LOG = logging.getLogger(__name__)
+
+# Name of the directory of exported requirements under the cache root of the builds
+EXPORTS_DIR_NAME = "uv-exports"
+
+# Number of seconds exported requirements are used for after they were written
+DEFAULT_EXPORT_TTL = 24 * 60 * 60
+
+EXPORT_CACHE_VERSION = 1
+
+
+class ExportCache:
+    """
+    Requirements files exported by `uv export`, keyed by the content of pyproject.toml and uv.lock, the Python version,
+    the architecture and the UV arguments that may change the resolution, ex: the index URLs.
+
+    A project with a uv.lock file always exports the same requirements, so the key changes whenever they may change.
+    The requirements also expire after their time to live, so that projects without uv.lock, which are locked again
+    once they expire, eventually pick up new releases of their dependencies.
+    """
+
+    def __init__(self, directory: str, ttl: int = DEFAULT_EXPORT_TTL):
+        """
+        Args:
+            directory: Path to the directory of exported requirements, created if it doesn't exist
+            ttl: Number of seconds exported requirements are used for after they were written
+        """
+        self.directory = directory
+        self.ttl = ttl
+        os.makedirs(self.directory, exist_ok=True)
+        # the directory is itself an entry of the cache root, whose modification time is its last use time
+        os.utime(self.directory)
+
+    @staticmethod
+    def compute_key(
+        pyproject_path: str,
+        python_version: str,
+        architecture: str,
+        lock_path: Optional[str] = None,
+        resolution_args: Sequence[str] = (),
+    ) -> str:
+        """
+        Compute the key of the requirements exported from a project, from its pyproject.toml and uv.lock files. The
+        lock file is the one alongside pyproject.toml unless given, ex: the one of the workspace of the project.
+        resolution_args are the UV arguments that may change the resolution, see UvConfig.to_resolution_args.
+        """
+        lock_path = lock_path or os.path.join(os.path.dirname(pyproject_path), "uv.lock")
+        sha256 = hashlib.sha256()
+        for path in (pyproject_path, lock_path):
+            if os.path.isfile(path):
+                with open(path, "rb") as project_file:
+                    sha256.update(project_file.read())
+            sha256.update(b"\0")
+        sha256.update("{}\0{}\0{}".format(python_version, architecture, EXPORT_CACHE_VERSION).encode("utf-8"))
+        for arg in resolution_args:
+            sha256.update("\0{}".format(arg).encode("utf-8"))
+        return sha256.hexdigest()
+
+    def load(self, key: str, destination: str) -> bool:
+        """
+        Copy the requirements exported under a key to the destination path.
+
+        Returns:
+            Whether requirements that did not expire were found
+        """
+        path = self._get_path(key)
+        try:
+            if time.time() - os.path.getmtime(path) > self.ttl:
+                LOG.debug("Exported requirements %s expired", path)
+                return False
+            shutil.copyfile(path, destination)
+        except OSError:
+            LOG.debug("No exported requirements %s", path)
+            return False
+        return True
+
+    def save(self, key: str, requirements_path: str) -> None:
+        """
+        Write the exported requirements atomically, and remove the expired ones of the directory.
+        """
+        path = self._get_path(key)
+        temp_path = "{}.tmp{}".format(path, os.getpid())
+        shutil.copyfile(requirements_path, temp_path)
+        os.replace(temp_path, path)
+        LOG.debug("Wrote exported requirements %s", path)
+
+        now = time.time()
+        for filename in os.listdir(self.directory):
+            entry_path = os.path.join(self.directory, filename)
+            try:
+                if filename.endswith(".txt") and now - os.path.getmtime(entry_path) > self.ttl:
+                    os.remove(entry_path)
+            except OSError:
+                # removed by a concurrent build
+                continue
+
+    def _get_path(self, key: str) -> str:
+        return os.path.join(self.directory, "{}.txt".format(key))
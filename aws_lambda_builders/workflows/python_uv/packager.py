@@ -4,15 +4,36 @@ UV-based Python dependency packager for AWS Lambda
 
 import logging
 import os
+import re
 from typing import Dict, List, Optional
 
 from aws_lambda_builders.architecture import ARM64, X86_64
+from aws_lambda_builders.scratch import get_path_size
 
 from .exceptions import LockFileError, MissingUvError, UvBuildError, UvInstallationError
-from .utils import OSUtils, UvConfig
+from .export_cache import ExportCache
+from .utils import (
+    LINK_MODE_AUTO,
+    OSUtils,
+    UvConfig,
+    detect_link_mode,
+    find_workspace_root,
+    get_default_cache_dir,
+    read_project_name,
+)
 
 LOG = logging.getLogger(__name__)
 
+# Sub-directory of the scratch directory the builder links to its persistent cache root, when it has one
+SCRATCH_CACHE_DIR_NAME = "uv-cache"
+
+# Summary lines of `uv pip install`, ex: "Prepared 5 packages in 236ms". Only the packages missing from the cache are
+# prepared, ie: downloaded or built.
+INSTALL_SUMMARY_REGEX = re.compile(r"^(Prepared|Installed) (\d+) packages? in ", re.MULTILINE)
+
+# Requirements file uv.lock files are exported to, in the scratch directory
+LOCK_REQUIREMENTS_FILENAME = "lock_requirements.txt"
+
 
 class SubprocessUv:
     """Low-level interface for executing UV commands via subprocess."""
@@ -89,6 +110,8 @@ class UvRunner:
 
         self._uv = uv_subprocess
         self._osutils = osutils
+        # Numbers of packages installed and prepared by the installs of this runner
+        self.cache_statistics = {"installed": 0, "prepared": 0}
 
     @property
     def uv_version(self) -> Optional[str]:
@@ -96,11 +119,49 @@ class UvRunner:
         return self._uv.get_uv_version()
 
     def _ensure_cache_dir(self, config: UvConfig, scratch_dir: str) -> None:
-        """Ensure UV cache directory is configured."""
-        if not config.cache_dir:
-            config.cache_dir = os.path.join(scratch_dir, "uv-cache")
-            if not os.path.exists(config.cache_dir):
+        """
+        Ensure UV cache directory is configured.
+
+        The cache of the scratch directory is used when the builder linked it to its persistent cache root, otherwise
+        the persistent cache shared by the builds of the machine, so that the cache is never cold.
+        """
+        if config.cache_dir or config.no_cache:
+            return
+        scratch_cache_dir = os.path.join(scratch_dir, SCRATCH_CACHE_DIR_NAME)
+        config.cache_dir = scratch_cache_dir if os.path.isdir(scratch_cache_dir) else get_default_cache_dir()
+        if not os.path.exists(config.cache_dir):
+            try:
                 self._osutils.makedirs(config.cache_dir)
+            except FileExistsError:
+                # created by a concurrent build
+                pass
+
+    def prune_cache(self, config: UvConfig, max_size: int) -> Dict[str, int]:
+        """
+        Prune the UV cache if it is larger than the given size.
+
+        `uv cache prune` removes the unused entries first. If the cache is still too large, `uv cache prune --ci`
+        also removes the pre-built wheels, which can be downloaded again, and keeps the wheels built from source. UV
+        waits for the builds using the cache to finish before pruning it.
+
+        Args:
+            config: UV configuration options, holding the cache directory
+            max_size: Maximum number of bytes the cache may use
+
+        Returns:
+            The number of bytes the cache used before and after pruning it
+        """
+        size = get_path_size(config.cache_dir)
+        statistics = {"bytes_before_pruning": size, "bytes": size}
+        for extra_args in ([], ["--ci"]):
+            if statistics["bytes"] <= max_size:
+                break
+            LOG.debug("Pruning UV cache %s of %d bytes", config.cache_dir, statistics["bytes"])
+            rc, _, stderr = self._uv.run_uv_command(["cache", "prune", "--cache-dir", config.cache_dir] + extra_args)
+            if rc != 0:
+                raise UvInstallationError(reason=f"UV cache prune failed: {stderr}")
+            statistics["bytes"] = get_path_size(config.cache_dir)
+        return statistics
 
     def install_requirements(
         self,
@@ -141,6 +202,8 @@ class UvRunner:
 
         # Add configuration arguments
         args.extend(config.to_uv_args())
+        if config.link_mode == LINK_MODE_AUTO and config.cache_dir and not config.no_cache:
+            args.extend(["--link-mode", detect_link_mode(config.cache_dir, target_dir, config.allow_hardlinks)])
 
         # Add platform-specific arguments
         if python_version:
@@ -164,6 +227,9 @@ class UvRunner:
         if rc != 0:
             raise UvInstallationError(reason=f"UV pip install failed: {stderr}")
 
+        for match in INSTALL_SUMMARY_REGEX.finditer(stderr or ""):
+            self.cache_statistics[match.group(1).lower()] += int(match.group(2))
+
         LOG.debug("UV pip install completed successfully: %s", stdout)
 
 
@@ -171,7 +237,11 @@ class PythonUvDependencyBuilder:
     """High-level dependency builder that orchestrates UV operations."""
 
     def __init__(
-        self, osutils: Optional[OSUtils] = None, runtime: Optional[str] = None, uv_runner: Optional[UvRunner] = None
+        self,
+        osutils: Optional[OSUtils] = None,
+        runtime: Optional[str] = None,
+        uv_runner: Optional[UvRunner] = None,
+        export_cache: Optional[ExportCache] = None,
     ):
         if osutils is None:
             osutils = OSUtils()
@@ -180,6 +250,7 @@ class PythonUvDependencyBuilder:
 
         self._osutils = osutils
         self._uv_runner = uv_runner
+        self._export_cache = export_cache
         self.runtime = runtime
 
     def build_dependencies(
@@ -265,13 +336,38 @@ class PythonUvDependencyBuilder:
         """
         Smart pyproject.toml handler that checks for uv.lock.
 
-        If uv.lock exists alongside pyproject.toml, use lock-based build for more precise dependency resolution.
-        Otherwise, use standard pyproject.toml build.
+        If the project is a member of a UV workspace, build from the lock file of the workspace. If uv.lock exists
+        alongside pyproject.toml, use lock-based build for more precise dependency resolution. Otherwise, use standard
+        pyproject.toml build.
+
+        When the requirements exported from the same pyproject.toml and uv.lock were kept by a previous build, they are
+        installed without running `uv lock` or `uv export`, so uv.lock is left untouched.
         """
         manifest_dir = os.path.dirname(manifest_path)
-        uv_lock_path = os.path.join(manifest_dir, "uv.lock")
-
-        if os.path.exists(uv_lock_path):
+        workspace_root = find_workspace_root(manifest_dir)
+        # the lock file and the paths of the exported requirements belong to the root of the workspace
+        project_dir = workspace_root or manifest_dir
+        uv_lock_path = os.path.join(project_dir, "uv.lock")
+
+        export_key = None
+        if self._export_cache:
+            export_key = self._export_cache.compute_key(
+                manifest_path, python_version, architecture, uv_lock_path, config.to_resolution_args()
+            )
+            requirements_path = os.path.join(scratch_dir, LOCK_REQUIREMENTS_FILENAME)
+            if self._export_cache.load(export_key, requirements_path):
+                LOG.info("pyproject.toml and uv.lock are unchanged - reusing their exported requirements")
+                self._install_exported_requirements(
+                    requirements_path, project_dir, target_dir, scratch_dir, python_version, architecture, config
+                )
+                return
+
+        if workspace_root:
+            LOG.info("Found UV workspace at %s - using the lock file of the workspace", workspace_root)
+            self._build_from_workspace_member(
+                manifest_path, workspace_root, target_dir, scratch_dir, python_version, architecture, config
+            )
+        elif os.path.exists(uv_lock_path):
             LOG.info("Found uv.lock alongside pyproject.toml - using lock-based build for precise dependencies")
             # Use lock file for more precise builds
             self._build_from_lock_file(uv_lock_path, target_dir, scratch_dir, python_version, architecture, config)
@@ -279,6 +375,48 @@ class PythonUvDependencyBuilder:
             # Standard pyproject.toml build
             self._build_from_pyproject(manifest_path, target_dir, scratch_dir, python_version, architecture, config)
 
+        if self._export_cache:
+            # `uv lock` and `uv export` may have written uv.lock, whose new content is the key of the next builds
+            self._save_exported_requirements(
+                {
+                    export_key,
+                    self._export_cache.compute_key(
+                        manifest_path, python_version, architecture, uv_lock_path, config.to_resolution_args()
+                    ),
+                },
+                os.path.join(scratch_dir, LOCK_REQUIREMENTS_FILENAME),
+            )
+
+    def _save_exported_requirements(self, keys, requirements_path: str) -> None:
+        """Keep the exported requirements for the next builds, which still succeed if they can't be kept."""
+        try:
+            for key in sorted(keys):
+                self._export_cache.save(key, requirements_path)
+        except OSError as ex:
+            LOG.debug("Unable to keep the exported requirements %s", requirements_path, exc_info=ex)
+
+    def _install_exported_requirements(
+        self,
+        requirements_path: str,
+        project_dir: str,
+        target_dir: str,
+        scratch_dir: str,
+        python_version: str,
+        architecture: str,
+        config: UvConfig,
+    ) -> None:
+        """Install the requirements exported from a lock file, with platform targeting."""
+        self._uv_runner.install_requirements(
+            requirements_path=requirements_path,
+            target_dir=target_dir,
+            scratch_dir=scratch_dir,
+            config=config,
+            python_version=python_version,
+            platform="linux",
+            cwd=project_dir,
+            architecture=architecture,
+        )
+
     def _is_requirements_file(self, filename: str) -> bool:
         """
         Check if a filename represents a valid requirements file.
@@ -309,12 +447,16 @@ class PythonUvDependencyBuilder:
         python_version: str,
         architecture: str,
         config: UvConfig,
+        package: Optional[str] = None,
     ) -> None:
         """Build dependencies from uv.lock file.
 
         Uses uv export to convert lock file to requirements.txt, then installs
         with uv pip install which supports cross-platform builds (--python-platform).
         This is necessary because uv sync doesn't support platform targeting.
+
+        The package is the workspace member to export the dependencies of, when the lock file is the one of a
+        workspace.
         """
         LOG.info("Building from UV lock file")
 
@@ -322,7 +464,7 @@ class PythonUvDependencyBuilder:
             project_dir = os.path.dirname(lock_path)
 
             # Export lock file to requirements.txt for platform-specific install
-            temp_requirements = os.path.join(scratch_dir, "lock_requirements.txt")
+            temp_requirements = os.path.join(scratch_dir, LOCK_REQUIREMENTS_FILENAME)
             export_args = [
                 "export",
                 "--format",
@@ -336,21 +478,17 @@ class PythonUvDependencyBuilder:
                 "--python",
                 python_version,
             ]
+            if package:
+                # the other members the package depends on are installed from their paths, not as editable packages
+                export_args.extend(["--package", package, "--no-editable"])
 
             rc, stdout, stderr = self._uv_runner._uv.run_uv_command(export_args, cwd=project_dir)
             if rc != 0:
                 raise LockFileError(reason=f"Failed to export lock file: {stderr}")
 
             # Install with platform targeting
-            self._uv_runner.install_requirements(
-                requirements_path=temp_requirements,
-                target_dir=target_dir,
-                scratch_dir=scratch_dir,
-                config=config,
-                python_version=python_version,
-                platform="linux",
-                cwd=project_dir,
-                architecture=architecture,
+            self._install_exported_requirements(
+                temp_requirements, project_dir, target_dir, scratch_dir, python_version, architecture, config
             )
         except LockFileError:
             raise
@@ -371,15 +509,8 @@ class PythonUvDependencyBuilder:
 
         try:
             # Generate lock file from pyproject.toml
-            LOG.debug("Creating lock file from pyproject.toml")
-            lock_args = ["lock", "--no-progress"]
-            if python_version:
-                lock_args.extend(["--python", python_version])
-
             project_dir = os.path.dirname(pyproject_path)
-            rc, stdout, stderr = self._uv_runner._uv.run_uv_command(lock_args, cwd=project_dir)
-            if rc != 0:
-                raise UvBuildError(reason=f"UV lock failed: {stderr}")
+            self._lock_project(project_dir, python_version)
 
             # Reuse lock file build logic
             lock_path = os.path.join(project_dir, "uv.lock")
@@ -388,6 +519,49 @@ class PythonUvDependencyBuilder:
         except Exception as e:
             raise UvBuildError(reason=f"Failed to build from pyproject.toml: {str(e)}")
 
+    def _build_from_workspace_member(
+        self,
+        pyproject_path: str,
+        workspace_root: str,
+        target_dir: str,
+        scratch_dir: str,
+        python_version: str,
+        architecture: str,
+        config: UvConfig,
+    ) -> None:
+        """
+        Build dependencies of a UV workspace member from the lock file of the workspace.
+
+        The workspace is only locked by the build of the first member if it has no uv.lock yet, and the requirements
+        of each member are exported from the lock file with `uv export --package`, so the functions of a workspace
+        share a single resolution.
+        """
+        try:
+            package = read_project_name(pyproject_path)
+            if not package:
+                raise UvBuildError(reason=f"No project name in {pyproject_path}")
+
+            lock_path = os.path.join(workspace_root, "uv.lock")
+            if not os.path.exists(lock_path):
+                self._lock_project(workspace_root, python_version)
+
+            self._build_from_lock_file(
+                lock_path, target_dir, scratch_dir, python_version, architecture, config, package=package
+            )
+        except Exception as e:
+            raise UvBuildError(reason=f"Failed to build workspace member {pyproject_path}: {str(e)}")
+
+    def _lock_project(self, project_dir: str, python_version: str) -> None:
+        """Create or update the uv.lock file of a project or workspace."""
+        LOG.debug("Creating lock file from pyproject.toml")
+        lock_args = ["lock", "--no-progress"]
+        if python_version:
+            lock_args.extend(["--python", python_version])
+
+        rc, stdout, stderr = self._uv_runner._uv.run_uv_command(lock_args, cwd=project_dir)
+        if rc != 0:
+            raise UvBuildError(reason=f"UV lock failed: {stderr}")
+
     def _build_from_requirements(
         self,
         requirements_path: str,
@@ -2,14 +2,39 @@
 Commonly used utilities for Python UV workflow
 """
 
+import glob
 import os
+import re
 import shutil
 import subprocess
+import sys
 from typing import List, Optional
 
 from aws_lambda_builders.workflows.python_pip.utils import OSUtils as BaseOSUtils
 
-EXPERIMENTAL_FLAG_BUILD_PERFORMANCE = "experimentalBuildPerformance"
+# Environment variable UV reads the location of its cache from
+UV_CACHE_DIR_ENV_VAR = "UV_CACHE_DIR"
+
+# Link mode picking the best way to install the files of the UV cache into the target directory
+LINK_MODE_AUTO = "auto"
+
+# Supported link modes. UV's "symlink" mode is not supported since Lambda artifacts can't link to the UV cache.
+LINK_MODES = (LINK_MODE_AUTO, "clone", "hardlink", "copy")
+
+# Table declaring a UV workspace in the pyproject.toml file of its root
+WORKSPACE_TABLE_REGEX = re.compile(r"^\s*\[\s*tool\.uv\.workspace\s*\]", re.MULTILINE)
+
+# Array of strings of the [tool.uv.workspace] table, ex: members = ["functions/*"], which may span several lines
+WORKSPACE_ARRAY_REGEX = re.compile(r"^\s*(members|exclude)\s*=\s*\[(.*?)\]", re.MULTILINE | re.DOTALL)
+
+# A string of a TOML file, or a comment, which is left out
+TOML_STRING_OR_COMMENT_REGEX = re.compile(r"(\"[^\"\n]*\"|'[^'\n]*')|#[^\n]*")
+
+# Table header of a TOML file, ex: "[project]"
+TABLE_HEADER_REGEX = re.compile(r"^\s*\[\s*([^\[\]]+?)\s*\]\s*(#.*)?$")
+
+# Name of the project in the [project] table of a pyproject.toml file
+PROJECT_NAME_REGEX = re.compile(r"^\s*name\s*=\s*[\"']([^\"']+)[\"']")
 
 
 class OSUtils(BaseOSUtils):
@@ -68,6 +93,147 @@ def detect_uv_manifest(source_dir: str) -> Optional[str]:
     return None
 
 
+def get_user_cache_dir() -> str:
+    """
+    Get the directory of the caches the builders keep for the user when the build has no cache directory, under the
+    user cache directory (XDG_CACHE_HOME or ~/.cache).
+
+    Returns:
+        Path to the directory, which may not exist yet
+    """
+    user_cache_dir = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(user_cache_dir, "aws-lambda-builders")
+
+
+def get_default_cache_dir() -> str:
+    """
+    Get the persistent UV cache directory shared by the builds that are not given one.
+
+    UV keeps its cache content-addressed and locks it while using it, so every build and function of the machine can
+    share it, including concurrent builds. The cache UV_CACHE_DIR points to is used if set, otherwise the "uv"
+    directory of the user cache directory of the builders.
+
+    Returns:
+        Path to the cache directory, which may not exist yet
+    """
+    return os.environ.get(UV_CACHE_DIR_ENV_VAR) or os.path.join(get_user_cache_dir(), "uv")
+
+
+def find_workspace_root(project_dir: str) -> Optional[str]:
+    """
+    Find the root of the UV workspace a project is a member of.
+
+    The root is the closest parent directory whose pyproject.toml declares a [tool.uv.workspace] table. Like UV, the
+    project is a member of the workspace when its directory matches one of the glob patterns of the `members` of the
+    table, relative to the root, and none of the patterns of its `exclude`. A project that is itself the root of a
+    workspace, or that is not a member of the closest workspace, is built as a standalone project.
+
+    Args:
+        project_dir: Directory of the pyproject.toml file of the project
+
+    Returns:
+        Path to the root directory of the workspace, or None if the project is not a member of a workspace
+    """
+    project_dir = os.path.abspath(project_dir)
+    directory = os.path.dirname(project_dir)
+    while True:
+        pyproject_path = os.path.join(directory, "pyproject.toml")
+        if os.path.isfile(pyproject_path):
+            with open(pyproject_path, "r", encoding="utf-8", errors="replace") as pyproject_file:
+                workspace = _read_workspace_table(pyproject_file.read())
+            if workspace is not None:
+                members = _expand_workspace_globs(directory, workspace.get("members", []))
+                excluded = _expand_workspace_globs(directory, workspace.get("exclude", []))
+                return directory if project_dir in members and project_dir not in excluded else None
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return None
+        directory = parent
+
+
+def _read_workspace_table(content: str) -> Optional[dict]:
+    """
+    Read the `members` and `exclude` arrays of the [tool.uv.workspace] table of a pyproject.toml file, None if the file
+    has no such table.
+    """
+    match = WORKSPACE_TABLE_REGEX.search(content)
+    if not match:
+        return None
+    # the table ends at the next table header
+    lines = content[match.end() :].splitlines(True)[1:]
+    end = next((index for index, line in enumerate(lines) if TABLE_HEADER_REGEX.match(line)), len(lines))
+    table = TOML_STRING_OR_COMMENT_REGEX.sub(lambda string: string.group(1) or "", "".join(lines[:end]))
+    return {
+        key: [string[1:-1] for string in re.findall(r"\"[^\"]*\"|'[^']*'", values)]
+        for key, values in WORKSPACE_ARRAY_REGEX.findall(table)
+    }
+
+
+def _expand_workspace_globs(root: str, patterns: List[str]) -> set:
+    """Expand glob patterns relative to the root of a workspace to the absolute paths of the directories they match."""
+    return {
+        os.path.abspath(path)
+        for pattern in patterns
+        for path in glob.glob(os.path.join(root, pattern), recursive=True)
+        if os.path.isdir(path)
+    }
+
+
+def read_project_name(pyproject_path: str) -> Optional[str]:
+    """
+    Read the name of the project of a pyproject.toml file.
+
+    Args:
+        pyproject_path: Path to the pyproject.toml file
+
+    Returns:
+        The name of the [project] table, or None if there is none
+    """
+    table = None
+    with open(pyproject_path, "r", encoding="utf-8", errors="replace") as pyproject_file:
+        for line in pyproject_file:
+            header = TABLE_HEADER_REGEX.match(line)
+            if header:
+                table = header.group(1)
+                continue
+            match = PROJECT_NAME_REGEX.match(line) if table == "project" else None
+            if match:
+                return match.group(1)
+    return None
+
+
+def detect_link_mode(cache_dir: str, target_dir: str, allow_hardlinks: bool = True) -> str:
+    """
+    Detect the best UV link mode to install files from the cache into the target directory.
+
+    Files can only be cloned or hardlinked within a filesystem, so they are copied when the cache and the target
+    directory are on different devices. Otherwise they are cloned on macOS, whose APFS filesystem supports
+    copy-on-write, and hardlinked on the other platforms, unless hardlinks are not allowed.
+
+    Args:
+        cache_dir: UV cache directory
+        target_dir: Directory the packages are installed into, which may not exist yet
+        allow_hardlinks: Whether the installed files may be the files of the cache, which is not the case when they
+            are modified in place, ex: when the artifacts are normalized
+
+    Returns:
+        The link mode, for the --link-mode argument of UV
+    """
+    # the device of the target directory is the one of its closest existing parent
+    target_parent = os.path.abspath(target_dir)
+    while not os.path.exists(target_parent) and os.path.dirname(target_parent) != target_parent:
+        target_parent = os.path.dirname(target_parent)
+    try:
+        same_device = os.stat(cache_dir).st_dev == os.stat(target_parent).st_dev
+    except OSError:
+        return "copy"
+    if not same_device:
+        return "copy"
+    if sys.platform == "darwin":
+        return "clone"
+    return "hardlink" if allow_hardlinks else "copy"
+
+
 def get_uv_version(uv_executable: str, osutils: OSUtils) -> Optional[str]:
     """
     Get UV version from the executable.
@@ -107,6 +273,8 @@ class UvConfig:
         compile_bytecode: bool = True,
         exclude_newer: Optional[str] = None,
         generate_hashes: bool = False,
+        link_mode: str = LINK_MODE_AUTO,
+        allow_hardlinks: bool = True,
     ):
         self.index_url = index_url
         self.extra_index_urls = extra_index_urls or []
@@ -117,6 +285,9 @@ class UvConfig:
         self.compile_bytecode = compile_bytecode
         self.exclude_newer = exclude_newer
         self.generate_hashes = generate_hashes
+        self.link_mode = link_mode
+        # whether the automatic link mode may hardlink the files of the cache, see detect_link_mode
+        self.allow_hardlinks = allow_hardlinks
 
     def to_uv_args(self) -> List[str]:
         """Convert configuration to UV command line arguments."""
@@ -146,4 +317,25 @@ class UvConfig:
         if self.generate_hashes:
             args.append("--generate-hashes")
 
+        # the automatic link mode depends on the target directory, see detect_link_mode
+        if self.link_mode != LINK_MODE_AUTO:
+            args.extend(["--link-mode", self.link_mode])
+
+        return args
+
+    def to_resolution_args(self) -> List[str]:
+        """
+        Convert the configuration to the UV arguments that may change the resolved dependencies, which are the ones
+        of to_uv_args, except the arguments of the cache and of the link mode.
+        """
+        args = []
+        uv_args = iter(self.to_uv_args())
+        for arg in uv_args:
+            if arg == "--no-cache":
+                continue
+            if arg in ("--cache-dir", "--link-mode"):
+                # skip the value too
+                next(uv_args)
+                continue
+            args.append(arg)
         return args
@@ -6,9 +6,10 @@ import logging
 
 from aws_lambda_builders.actions import CleanUpAction, CopyDependenciesAction, CopySourceAction
 from aws_lambda_builders.workflow import BaseWorkflow, BuildDirectory, BuildInSourceSupport, Capability
+from aws_lambda_builders.workflows.python_pip.actions import DISTRIBUTION_REPORT_KEY
 
-from .actions import PythonUvBuildAction
-from .utils import OSUtils, detect_uv_manifest
+from .actions import UV_CACHE_MAX_SIZE_KEY, UV_LINK_MODE_KEY, PythonUvBuildAction
+from .utils import LINK_MODE_AUTO, OSUtils, UvConfig, detect_uv_manifest
 
 LOG = logging.getLogger(__name__)
 
@@ -33,6 +34,9 @@ class PythonUvWorkflow(BaseWorkflow):
 
     CAPABILITY = Capability(language="python", dependency_manager="uv", application_framework=None)
 
+    # Files besides the manifest that change the resolved dependencies
+    DEPENDENCY_FILES = ("uv.lock", "pyproject.toml")
+
     # Common source files to exclude from build artifacts output
     # Based on Python PIP workflow with UV-specific additions
     EXCLUDED_FILES = (
@@ -118,6 +122,15 @@ class PythonUvWorkflow(BaseWorkflow):
         """
         self.actions = []
 
+        options = self.options if isinstance(self.options, dict) else {}
+        link_mode = options.get(UV_LINK_MODE_KEY, LINK_MODE_AUTO)
+        if self.normalize_artifacts and link_mode == "hardlink":
+            # normalizing the artifacts would change the modes and timestamps of the files of the UV cache
+            LOG.info(
+                "Copying the files of the UV cache instead of hardlinking them, since the artifacts are normalized"
+            )
+            link_mode = "copy"
+
         # Build dependencies if we have a manifest and download_dependencies is enabled
         if manifest_path and self.download_dependencies:
             # Determine target: dependencies_dir if provided, otherwise artifacts_dir (hybrid approach)
@@ -136,6 +149,10 @@ class PythonUvWorkflow(BaseWorkflow):
                     self.dependencies_dir,  # Pass for action's internal logic
                     binaries=self.binaries,
                     architecture=self.architecture,
+                    config=UvConfig(link_mode=link_mode, allow_hardlinks=not self.normalize_artifacts),
+                    distribution_report=bool(options.get(DISTRIBUTION_REPORT_KEY)),
+                    cache_max_size=options.get(UV_CACHE_MAX_SIZE_KEY),
+                    cache_dir=self.cache_dir,
                 )
             )
 
@@ -24,6 +24,9 @@ class RubyBundlerWorkflow(BaseWorkflow):
 
     CAPABILITY = Capability(language="ruby", dependency_manager="bundler", application_framework=None)
 
+    # Files besides the manifest that change the resolved dependencies
+    DEPENDENCY_FILES = ("Gemfile.lock",)
+
     EXCLUDED_FILES = (".aws-sam", ".git")
 
     DEFAULT_BUILD_DIR = BuildDirectory.ARTIFACTS
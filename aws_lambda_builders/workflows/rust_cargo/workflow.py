@@ -15,6 +15,9 @@ class RustCargoLambdaWorkflow(BaseWorkflow):
 
     CAPABILITY = Capability(language="rust", dependency_manager="cargo", application_framework=None)
 
+    # Files besides the manifest that change the resolved dependencies
+    DEPENDENCY_FILES = ("Cargo.lock",)
+
     DEFAULT_BUILD_DIR = BuildDirectory.SOURCE
     BUILD_IN_SOURCE_SUPPORT = BuildInSourceSupport.EXCLUSIVELY_SUPPORTED
 
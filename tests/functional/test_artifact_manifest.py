@@ -0,0 +1,79 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from aws_lambda_builders.artifact_manifest import hash_file, list_artifact_files, write_artifact_manifest
+
+
+def write(content, *args):
+    path = os.path.join(*args)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(content)
+    return path
+
+
+class TestWriteArtifactManifest(TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.artifacts_dir = os.path.join(self.root, "artifacts")
+        self.manifest_path = os.path.join(self.root, "manifest.json")
+        write(b"handler", self.artifacts_dir, "app.py")
+        write(b"helper", self.artifacts_dir, "lib", "helper.py")
+        os.chmod(write(b"#!/bin/sh", self.artifacts_dir, "bootstrap"), 0o755)
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_must_describe_every_file(self):
+        result = write_artifact_manifest(self.artifacts_dir, self.manifest_path, max_workers=2)
+
+        with open(self.manifest_path) as f:
+            manifest = json.load(f)
+
+        self.assertEqual(result, {"path": self.manifest_path, "digest": manifest["digest"], "file_count": 3})
+        self.assertEqual([entry["path"] for entry in manifest["files"]], ["app.py", "bootstrap", "lib/helper.py"])
+        self.assertEqual(
+            manifest["files"][0],
+            {
+                "path": "app.py",
+                "size": 7,
+                "mode": 0o644 & ~self._umask(),
+                "sha256": hashlib.sha256(b"handler").hexdigest(),
+            },
+        )
+        self.assertEqual(manifest["files"][1]["mode"], 0o755)
+
+    def test_digest_must_only_depend_on_contents(self):
+        digest = write_artifact_manifest(self.artifacts_dir, self.manifest_path)["digest"]
+
+        # touching files keeps the digest
+        os.utime(os.path.join(self.artifacts_dir, "app.py"), (0, 0))
+        self.assertEqual(write_artifact_manifest(self.artifacts_dir, self.manifest_path)["digest"], digest)
+
+        write(b"new handler", self.artifacts_dir, "app.py")
+        self.assertNotEqual(write_artifact_manifest(self.artifacts_dir, self.manifest_path)["digest"], digest)
+
+    def test_must_exclude_manifest_written_in_artifacts(self):
+        manifest_path = os.path.join(self.artifacts_dir, "manifest.json")
+
+        first = write_artifact_manifest(self.artifacts_dir, manifest_path)
+        second = write_artifact_manifest(self.artifacts_dir, manifest_path)
+
+        self.assertEqual(first["file_count"], 3)
+        self.assertEqual(first["digest"], second["digest"])
+
+    def test_must_not_follow_symlinks(self):
+        os.symlink("lib", os.path.join(self.artifacts_dir, "lib_link"))
+
+        self.assertEqual(list_artifact_files(self.artifacts_dir), ["app.py", "bootstrap", "lib/helper.py", "lib_link"])
+        self.assertEqual(hash_file(os.path.join(self.artifacts_dir, "lib_link")), hashlib.sha256(b"lib").hexdigest())
+
+    @staticmethod
+    def _umask():
+        umask = os.umask(0)
+        os.umask(umask)
+        return umask
@@ -2,13 +2,14 @@ import sys
 import os
 import shutil
 import tempfile
+import threading
 
 try:
     import pathlib
 except ImportError:
     import pathlib2 as pathlib
 
-from unittest import TestCase
+from unittest import TestCase, mock
 from aws_lambda_builders.builder import LambdaBuilder
 
 
@@ -59,3 +60,61 @@ class TestBuilderWithHelloWorkflow(TestCase):
             contents = fp.read()
 
         self.assertEqual(contents, self.expected_contents)
+
+
+class TestBuilderWatchWithStagedWorkflow(TestCase):
+    STAGED_WORKFLOW_MODULE = "staged_workflow.compile_staged"
+    TEST_WORKFLOWS_FOLDER = os.path.join(os.path.dirname(__file__), "testdata", "workflows")
+
+    def setUp(self):
+        sys.path.append(self.TEST_WORKFLOWS_FOLDER)
+
+        self.root = tempfile.mkdtemp()
+        self.source_dir = os.path.join(self.root, "source")
+        self.artifacts_dir = os.path.join(self.root, "artifacts")
+        self.scratch_dir = os.path.join(self.root, "scratch")
+        for directory in (self.source_dir, self.artifacts_dir):
+            os.makedirs(directory)
+        for name in ("app.py", "util.py"):
+            with open(os.path.join(self.source_dir, name), "w") as fp:
+                fp.write("")
+        self.staged_builder = LambdaBuilder(
+            language="python",
+            dependency_manager="staged",
+            application_framework="test",
+            supported_workflows=[self.STAGED_WORKFLOW_MODULE],
+        )
+
+    def tearDown(self):
+        self.staged_builder._clear_workflows()
+        shutil.rmtree(self.root)
+        sys.path.remove(self.TEST_WORKFLOWS_FOLDER)
+
+    def test_watch_removes_the_staged_copies_and_outputs_of_deleted_sources(self):
+        stop_event = threading.Event()
+        deleted_path = os.path.join(self.source_dir, "util.py")
+
+        def wait_for_changes(timeout):
+            if os.path.exists(deleted_path):
+                os.remove(deleted_path)
+                return {deleted_path}
+            stop_event.set()
+            return set()
+
+        watcher = mock.Mock()
+        watcher.wait_for_changes.side_effect = wait_for_changes
+        results = []
+        with mock.patch("aws_lambda_builders.builder.create_file_watcher", return_value=watcher):
+            self.staged_builder.watch(
+                self.source_dir,
+                self.artifacts_dir,
+                self.scratch_dir,
+                os.path.join(self.source_dir, "manifest"),
+                on_build=results.append,
+                stop_event=stop_event,
+                runtime="python3.12",
+            )
+
+        self.assertEqual([result.error for result in results], [None, None])
+        self.assertEqual(os.listdir(self.scratch_dir), ["app.py"])
+        self.assertEqual(os.listdir(self.artifacts_dir), ["app.py.out"])
@@ -170,3 +170,47 @@ class TestCliWithHelloWorkflow(TestCase):
         response = json.loads(stdout_data)
         self.assertIn("error", response)
         self.assertEqual(response["error"]["code"], 505)
+
+    def test_run_hello_workflow_with_artifact_manifest(self):
+        manifest_path = os.path.join(self.scratch_dir, "artifacts.json")
+        request_json = json.dumps(
+            {
+                "jsonschema": "2.0",
+                "id": 1234,
+                "method": "LambdaBuilder.build",
+                "params": {
+                    "__protocol_version": lambda_builders_protocol_version,
+                    "capability": {
+                        "language": self.language,
+                        "dependency_manager": self.dependency_manager,
+                        "application_framework": self.application_framework,
+                    },
+                    "supported_workflows": [self.HELLO_WORKFLOW_MODULE],
+                    "source_dir": self.source_dir,
+                    "artifacts_dir": self.artifacts_dir,
+                    "scratch_dir": self.scratch_dir,
+                    "manifest_path": "/ignored",
+                    "runtime": "python3.8",
+                    "optimizations": {},
+                    "options": {},
+                    "artifact_manifest_path": manifest_path,
+                },
+            }
+        )
+
+        env = copy.deepcopy(os.environ)
+        env["PYTHONPATH"] = self.python_path
+
+        p = subprocess.Popen([self.command_name], env=env, stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+        stdout_data = p.communicate(input=request_json.encode("utf-8"))[0]
+
+        response = json.loads(stdout_data)
+        self.assertNotIn("error", response)
+        with open(manifest_path) as fp:
+            manifest = json.load(fp)
+        self.assertEqual([entry["path"] for entry in manifest["files"]], ["hello.txt"])
+        self.assertEqual(
+            response["result"]["artifact_manifest"],
+            {"path": manifest_path, "digest": manifest["digest"], "file_count": 1},
+        )
+        shutil.rmtree(self.scratch_dir)
@@ -0,0 +1,70 @@
+import os
+import shutil
+import stat
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+from aws_lambda_builders.normalization import DEFAULT_SOURCE_DATE_EPOCH, get_source_date_epoch, normalize_artifacts
+
+
+def write(content, *args):
+    path = os.path.join(*args)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(content)
+    return path
+
+
+class TestNormalizeArtifacts(TestCase):
+    def setUp(self):
+        self.artifacts_dir = tempfile.mkdtemp()
+        self.handler = write("handler", self.artifacts_dir, "app.py")
+        self.bootstrap = write("#!/bin/sh", self.artifacts_dir, "bin", "bootstrap")
+        os.chmod(self.handler, 0o600)
+        os.chmod(self.bootstrap, 0o700)
+
+    def tearDown(self):
+        shutil.rmtree(self.artifacts_dir)
+
+    def test_must_set_timestamps_and_modes(self):
+        count = normalize_artifacts(self.artifacts_dir, epoch=1000)
+
+        self.assertEqual(count, 3)
+        for path, mode in [
+            (self.artifacts_dir, 0o755),
+            (os.path.join(self.artifacts_dir, "bin"), 0o755),
+            (self.handler, 0o644),
+            (self.bootstrap, 0o755),
+        ]:
+            path_stat = os.stat(path)
+            self.assertEqual(path_stat.st_mtime, 1000, path)
+            self.assertEqual(stat.S_IMODE(path_stat.st_mode), mode, path)
+
+    def test_must_not_follow_symlinks(self):
+        outside = write("outside", tempfile.mkdtemp(), "file.txt")
+        self.addCleanup(shutil.rmtree, os.path.dirname(outside))
+        os.chmod(outside, 0o600)
+        os.symlink(outside, os.path.join(self.artifacts_dir, "link"))
+        outside_mtime = os.stat(outside).st_mtime
+
+        normalize_artifacts(self.artifacts_dir, epoch=1000)
+
+        self.assertEqual(os.stat(outside).st_mtime, outside_mtime)
+        self.assertEqual(stat.S_IMODE(os.stat(outside).st_mode), 0o600)
+
+    @patch.dict("os.environ", {"SOURCE_DATE_EPOCH": "1700000000"})
+    def test_must_use_source_date_epoch(self):
+        normalize_artifacts(self.artifacts_dir)
+
+        self.assertEqual(os.stat(self.handler).st_mtime, 1700000000)
+
+
+class TestGetSourceDateEpoch(TestCase):
+    @patch.dict("os.environ", {}, clear=True)
+    def test_must_default_to_1980(self):
+        self.assertEqual(get_source_date_epoch(), DEFAULT_SOURCE_DATE_EPOCH)
+
+    @patch.dict("os.environ", {"SOURCE_DATE_EPOCH": "invalid"})
+    def test_must_ignore_invalid_value(self):
+        self.assertEqual(get_source_date_epoch(), DEFAULT_SOURCE_DATE_EPOCH)
@@ -0,0 +1,119 @@
+import os
+import shutil
+import tempfile
+import time
+from unittest import TestCase
+
+from aws_lambda_builders.scratch import ScratchDirectoryManager, evict_least_recently_used, get_path_size
+from aws_lambda_builders.workflows.python_pip.wheelhouse import WHEELHOUSE_DIR_NAME
+
+
+def file(size, *args):
+    path = os.path.join(*args)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(b"x" * size)
+    return path
+
+
+class TestScratchDirectoryManager(TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.root, "cache")
+        self.scratch_dir = os.path.join(self.root, "scratch")
+        self.source_dir = os.path.join(self.root, "source")
+        os.makedirs(self.source_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_must_keep_caches_between_builds(self):
+        manager = ScratchDirectoryManager(self.cache_dir)
+
+        manager.prepare(self.scratch_dir, self.source_dir)
+        file(10, self.scratch_dir, "uv-cache", "wheel")
+        file(10, self.scratch_dir, "gradle-cache", "state")
+        file(10, self.scratch_dir, "unpacked", "package", "index.js")
+        manager.cleanup(self.scratch_dir)
+
+        self.assertEqual(os.listdir(self.scratch_dir), [])
+
+        manager.prepare(self.scratch_dir, self.source_dir)
+        self.assertTrue(os.path.isfile(os.path.join(self.scratch_dir, "uv-cache", "wheel")))
+        self.assertTrue(os.path.isfile(os.path.join(self.scratch_dir, "gradle-cache", "state")))
+        self.assertFalse(os.path.exists(os.path.join(self.scratch_dir, "unpacked")))
+
+    def test_must_not_share_per_project_caches(self):
+        manager = ScratchDirectoryManager(self.cache_dir)
+        other_source_dir = os.path.join(self.root, "other_source")
+
+        manager.prepare(self.scratch_dir, self.source_dir)
+        file(10, self.scratch_dir, "uv-cache", "wheel")
+        file(10, self.scratch_dir, "gradle-cache", "state")
+        manager.cleanup(self.scratch_dir)
+
+        manager.prepare(self.scratch_dir, other_source_dir)
+        self.assertTrue(os.path.isfile(os.path.join(self.scratch_dir, "uv-cache", "wheel")))
+        self.assertEqual(os.listdir(os.path.join(self.scratch_dir, "gradle-cache")), [])
+
+    def test_must_not_replace_existing_scratch_content(self):
+        existing = file(10, self.scratch_dir, "uv-cache", "wheel")
+        manager = ScratchDirectoryManager(self.cache_dir)
+
+        manager.prepare(self.scratch_dir, self.source_dir)
+
+        self.assertFalse(os.path.islink(os.path.join(self.scratch_dir, "uv-cache")))
+        self.assertTrue(os.path.isfile(existing))
+
+    def test_must_evict_least_recently_used_entries(self):
+        file(100, self.cache_dir, "old", "data")
+        file(100, self.cache_dir, "new", "data")
+        os.utime(os.path.join(self.cache_dir, "old"), (time.time() - 100, time.time() - 100))
+
+        manager = ScratchDirectoryManager(self.cache_dir, max_size=150)
+        evicted = manager.evict()
+
+        self.assertEqual(evicted, [os.path.join(self.cache_dir, "old")])
+        self.assertEqual(os.listdir(self.cache_dir), ["new"])
+
+    def test_must_not_evict_self_managed_entries(self):
+        file(100, self.cache_dir, "entry", "data")
+        file(1000, self.cache_dir, WHEELHOUSE_DIR_NAME, "foo-1.0-py3-none-any.whl")
+        os.utime(os.path.join(self.cache_dir, WHEELHOUSE_DIR_NAME), (time.time() - 100, time.time() - 100))
+
+        evicted = ScratchDirectoryManager(self.cache_dir, max_size=150).evict()
+
+        self.assertEqual(evicted, [])
+        self.assertEqual(sorted(os.listdir(self.cache_dir)), ["entry", WHEELHOUSE_DIR_NAME])
+
+    def test_must_not_evict_without_budget(self):
+        file(100, self.cache_dir, "entry", "data")
+
+        self.assertEqual(ScratchDirectoryManager(self.cache_dir).evict(), [])
+
+
+class TestEvictLeastRecentlyUsed(TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_must_evict_files_in_use_order(self):
+        now = time.time()
+        paths = []
+        for index in range(3):
+            path = file(10, self.root, "file{}".format(index))
+            os.utime(path, (now - index, now - index))
+            paths.append(path)
+
+        evicted = evict_least_recently_used(paths, 15)
+
+        self.assertEqual(evicted, [paths[2], paths[1]])
+        self.assertTrue(os.path.exists(paths[0]))
+
+    def test_must_compute_size_of_directories(self):
+        file(10, self.root, "a", "file")
+        file(20, self.root, "a", "b", "file")
+
+        self.assertEqual(get_path_size(os.path.join(self.root, "a")), 30)
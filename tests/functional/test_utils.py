@@ -6,7 +6,7 @@ from tarfile import ExtractError
 
 from unittest import TestCase
 
-from aws_lambda_builders.utils import copytree, get_goarch, extract_tarfile
+from aws_lambda_builders.utils import copytree, create_symlink_tree, get_goarch, extract_tarfile
 from tests.testing_utils import read_link_without_junction_prefix
 
 
@@ -118,6 +118,56 @@ class TestCopyTree(TestCase):
         self.assertEqual(os.listdir(dest_symlink_dir_path), os.listdir(source_target_dir_path))
 
 
+class TestCreateSymlinkTree(TestCase):
+    def setUp(self):
+        self.source = tempfile.mkdtemp()
+        self.dest = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.source)
+        shutil.rmtree(self.dest)
+
+    def test_must_link_files_and_create_directories(self):
+        file(self.source, "a", "b", "c.txt")
+        file(self.source, "d.txt")
+        file(self.source, ".git", "HEAD")
+
+        create_symlink_tree(self.source, self.dest, ignore=shutil.ignore_patterns(".git"))
+
+        self.assertFalse(os.path.islink(os.path.join(self.dest, "a", "b")))
+        self.assertTrue(os.path.islink(os.path.join(self.dest, "a", "b", "c.txt")))
+        self.assertEqual(os.path.realpath(os.path.join(self.dest, "d.txt")), os.path.realpath(self.source) + "/d.txt")
+        self.assertFalse(os.path.exists(os.path.join(self.dest, ".git")))
+
+    def test_must_copy_materialized_paths(self):
+        file(self.source, "package.json")
+        file(self.source, "target", "classes", "App.class")
+        file(self.source, "src", "app.js")
+
+        create_symlink_tree(self.source, self.dest, materialize=shutil.ignore_patterns("package.json", "target"))
+
+        for path in [("package.json",), ("target", "classes", "App.class")]:
+            self.assertFalse(os.path.islink(os.path.join(self.dest, *path)))
+            self.assertTrue(os.path.isfile(os.path.join(self.dest, *path)))
+
+        # writing to a materialized file must not change the source
+        with open(os.path.join(self.dest, "package.json"), "w") as f:
+            f.write("changed")
+        with open(os.path.join(self.source, "package.json")) as f:
+            self.assertEqual(f.read(), "")
+
+    def test_must_restage_over_previous_staging(self):
+        file(self.source, "app.js")
+        file(self.source, "package.json")
+        create_symlink_tree(self.source, self.dest, materialize=shutil.ignore_patterns("package.json"))
+        file(self.source, "new.js")
+
+        create_symlink_tree(self.source, self.dest, materialize=shutil.ignore_patterns("package.json"))
+
+        self.assertEqual(sorted(os.listdir(self.dest)), ["app.js", "new.js", "package.json"])
+        self.assertTrue(os.path.islink(os.path.join(self.dest, "new.js")))
+
+
 class TestExtractTarFile(TestCase):
     def test_extract_tarfile_unpacks_a_tar(self):
         test_tar = os.path.join(os.path.dirname(__file__), "testdata", "test.tgz")
@@ -0,0 +1,96 @@
+import os
+import shutil
+import sys
+import tempfile
+from unittest import TestCase, skipUnless
+
+from aws_lambda_builders.watcher import (
+    InotifyFileWatcher,
+    PollingFileWatcher,
+    WatchRoot,
+    create_file_watcher,
+)
+
+
+def write(content, *args):
+    path = os.path.join(*args)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(content)
+    return path
+
+
+class WatcherTestMixin(object):
+    def setUp(self):
+        self.root = os.path.realpath(tempfile.mkdtemp())
+        self.source_dir = os.path.join(self.root, "source")
+        self.manifest_dir = os.path.join(self.root, "manifest")
+        self.handler = write("handler", self.source_dir, "app.py")
+        self.manifest = write("requests", self.manifest_dir, "requirements.txt")
+        self.watcher = self.create_watcher(
+            [WatchRoot(self.source_dir), WatchRoot(self.manifest_dir, recursive=False)],
+            excluded_paths=[os.path.join(self.source_dir, "build")],
+            debounce=0.05,
+        )
+
+    def tearDown(self):
+        self.watcher.close()
+        shutil.rmtree(self.root)
+
+    def test_must_report_nothing_without_changes(self):
+        self.assertEqual(self.watcher.wait_for_changes(0.1), set())
+
+    def test_must_report_modified_files(self):
+        write("new handler", self.handler)
+        write("requests\nboto3", self.manifest)
+
+        self.assertEqual(self.watcher.wait_for_changes(2), {self.handler, self.manifest})
+        self.assertEqual(self.watcher.wait_for_changes(0.1), set())
+
+    def test_must_report_files_in_new_directories(self):
+        os.makedirs(os.path.join(self.source_dir, "lib"))
+        self.watcher.wait_for_changes(2)
+
+        path = write("helper", self.source_dir, "lib", "helper.py")
+
+        self.assertIn(path, self.watcher.wait_for_changes(2))
+
+    def test_must_report_deleted_files(self):
+        os.remove(self.handler)
+
+        self.assertIn(self.handler, self.watcher.wait_for_changes(2))
+
+    def test_must_ignore_excluded_paths(self):
+        write("artifact", self.source_dir, "build", "app.py")
+        write("module", self.source_dir, "node_modules", "dep", "index.js")
+        write("nested", self.manifest_dir, "nested", "file.txt")
+
+        self.assertEqual(self.watcher.wait_for_changes(0.5), set())
+
+
+class TestPollingFileWatcher(WatcherTestMixin, TestCase):
+    def create_watcher(self, roots, **kwargs):
+        return PollingFileWatcher(roots, poll_interval=0.05, **kwargs)
+
+
+@skipUnless(sys.platform.startswith("linux"), "inotify is only available on Linux")
+class TestInotifyFileWatcher(WatcherTestMixin, TestCase):
+    def create_watcher(self, roots, **kwargs):
+        return InotifyFileWatcher(roots, **kwargs)
+
+
+class TestCreateFileWatcher(TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_must_use_inotify_when_supported(self):
+        with create_file_watcher([WatchRoot(self.root)]) as watcher:
+            expected_cls = InotifyFileWatcher if sys.platform.startswith("linux") else PollingFileWatcher
+            self.assertIsInstance(watcher, expected_cls)
+
+    def test_must_fall_back_to_polling_if_root_is_missing(self):
+        with create_file_watcher([WatchRoot(os.path.join(self.root, "missing"))]) as watcher:
+            self.assertIsInstance(watcher, PollingFileWatcher)
@@ -0,0 +1,45 @@
+"""
+Provides a test workflow that stages the source in the scratch directory and compiles each staged file into the
+artifacts directory
+"""
+
+import os
+
+from aws_lambda_builders.workflow import BaseWorkflow, BuildDirectory, BuildInSourceSupport, Capability
+from aws_lambda_builders.actions import BaseAction, CopySourceAction, Purpose
+
+
+class CompileStagedAction(BaseAction):
+    """
+    Sample test action that writes a compiled file to the artifacts directory for every staged file
+    """
+
+    NAME = "CompileStagedAction"
+    PURPOSE = Purpose.COMPILE_SOURCE
+    DESCRIPTION = "Compile the staged files into the artifacts directory"
+
+    EXTENSION = ".out"
+
+    def __init__(self, scratch_dir, artifacts_dir):
+        self.scratch_dir = scratch_dir
+        self.artifacts_dir = artifacts_dir
+
+    def execute(self):
+        for name in os.listdir(self.scratch_dir):
+            with open(os.path.join(self.artifacts_dir, name + self.EXTENSION), "w") as fp:
+                fp.write(name)
+
+
+class CompileStagedWorkflow(BaseWorkflow):
+    NAME = "CompileStagedWorkflow"
+    CAPABILITY = Capability(language="python", dependency_manager="staged", application_framework="test")
+    DEFAULT_BUILD_DIR = BuildDirectory.SCRATCH
+    BUILD_IN_SOURCE_SUPPORT = BuildInSourceSupport.NOT_SUPPORTED
+
+    def __init__(self, source_dir, artifacts_dir, scratch_dir, *args, **kwargs):
+        super(CompileStagedWorkflow, self).__init__(source_dir, artifacts_dir, scratch_dir, *args, **kwargs)
+
+        self.actions = [
+            CopySourceAction(source_dir, scratch_dir),
+            CompileStagedAction(scratch_dir, artifacts_dir),
+        ]
@@ -0,0 +1,38 @@
+import importlib.util
+import os
+import shutil
+import sys
+import tempfile
+from unittest import TestCase
+from unittest.mock import Mock
+
+from aws_lambda_builders.binary_path import BinaryPath
+from aws_lambda_builders.workflows.python_pip.actions import PythonCompileBytecodeAction
+
+
+class TestPythonCompileBytecodeAction(TestCase):
+    def setUp(self):
+        self.artifacts_dir = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.artifacts_dir, "package"))
+        with open(os.path.join(self.artifacts_dir, "package", "module.py"), "w") as f:
+            f.write("VALUE = 1\n")
+        with open(os.path.join(self.artifacts_dir, "py2.py"), "w") as f:
+            f.write("print 'python 2'\n")
+        self.binaries = {
+            "python": BinaryPath(resolver=Mock(), validator=Mock(), binary="python", binary_path=sys.executable)
+        }
+
+    def tearDown(self):
+        shutil.rmtree(self.artifacts_dir)
+
+    def test_writes_unchecked_hash_based_bytecode(self):
+        PythonCompileBytecodeAction([self.artifacts_dir], self.binaries).execute()
+
+        pyc_path = importlib.util.cache_from_source(os.path.join(self.artifacts_dir, "package", "module.py"))
+        with open(pyc_path, "rb") as f:
+            header = f.read(8)
+        self.assertEqual(header[:4], importlib.util.MAGIC_NUMBER)
+        # hash based, without checking the source
+        self.assertEqual(int.from_bytes(header[4:8], "little"), 0b01)
+        # files that can't be compiled are left as they are
+        self.assertFalse(os.path.exists(importlib.util.cache_from_source(os.path.join(self.artifacts_dir, "py2.py"))))
@@ -0,0 +1,162 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from aws_lambda_builders.architecture import ARM64, X86_64
+from aws_lambda_builders.workflows.python_pip.distribution_report import report_distributions
+
+
+class TestReportDistributions(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.requirements_path = os.path.join(self.directory, "requirements.txt")
+        self.site_packages = os.path.join(self.directory, "site-packages")
+        os.makedirs(self.site_packages)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _install(self, name, version, files, requires=()):
+        dist_info = "{}-{}.dist-info".format(name.replace("-", "_"), version)
+        records = []
+        for path, size in files.items():
+            self._write(path, "x" * size)
+            records.append("{},sha256=abc,{}".format(path, size))
+        self._write(
+            dist_info + "/METADATA",
+            "Metadata-Version: 2.1\nName: {}\nVersion: {}\n{}".format(
+                name, version, "".join("Requires-Dist: {}\n".format(requirement) for requirement in requires)
+            ),
+        )
+        records.append("{}/METADATA,,".format(dist_info))
+        records.append("../../bin/script,,")
+        self._write(dist_info + "/RECORD", "\n".join(records) + "\n")
+
+    def _write(self, path, content):
+        full_path = os.path.join(self.site_packages, *path.split("/"))
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        with open(full_path, "w") as f:
+            f.write(content)
+
+    def test_reports_size_of_distributions_and_top_level_requirements(self):
+        with open(self.requirements_path, "w") as f:
+            f.write("# comment\n--only-binary=:all:\nFoo>=1.0  # pinned later\n./local\n")
+        self._install("Foo", "1.0", {"foo/__init__.py": 10}, requires=["shared-lib<2", "PySocks; extra == 'socks'"])
+        self._install("bar", "2.0", {"bar/__init__.py": 20, "bar/_speedups.cpython-312-x86_64-linux-gnu.so": 100})
+        self._install(
+            "shared_lib",
+            "1.5",
+            {"shared_lib/__init__.py": 5, "shared_lib.libs/libz-0a1b2c.so.1.2.13": 50},
+            requires=["Foo"],
+        )
+        self._install("other", "3.0", {"other.py": 1}, requires=["shared.lib"])
+
+        report = report_distributions(self.site_packages, self.requirements_path)
+
+        metadata_sizes = {
+            name: os.path.getsize(os.path.join(self.site_packages, dist_info, "METADATA"))
+            for name, dist_info in [
+                ("Foo", "Foo-1.0.dist-info"),
+                ("bar", "bar-2.0.dist-info"),
+                ("shared_lib", "shared_lib-1.5.dist-info"),
+                ("other", "other-3.0.dist-info"),
+            ]
+        }
+        self.assertEqual(
+            report["distributions"],
+            [
+                {
+                    "name": "bar",
+                    "version": "2.0",
+                    "bytes": 120 + metadata_sizes["bar"],
+                    "files": 3,
+                    "native_libraries": 1,
+                    "top_level_requirements": ["bar"],
+                },
+                {
+                    "name": "shared_lib",
+                    "version": "1.5",
+                    "bytes": 55 + metadata_sizes["shared_lib"],
+                    "files": 3,
+                    "native_libraries": 1,
+                    # shared_lib and Foo require each other, Foo is a top-level requirement and other requires both
+                    "top_level_requirements": ["Foo", "other"],
+                },
+                {
+                    "name": "Foo",
+                    "version": "1.0",
+                    "bytes": 10 + metadata_sizes["Foo"],
+                    "files": 2,
+                    "native_libraries": 0,
+                    "top_level_requirements": ["Foo", "other"],
+                },
+                {
+                    "name": "other",
+                    "version": "3.0",
+                    "bytes": 1 + metadata_sizes["other"],
+                    "files": 2,
+                    "native_libraries": 0,
+                    "top_level_requirements": ["other"],
+                },
+            ],
+        )
+        self.assertEqual(report["total_files"], 10)
+        self.assertEqual(report["total_bytes"], sum(d["bytes"] for d in report["distributions"]))
+
+    def test_follows_requirements_whose_markers_hold_in_lambda(self):
+        with open(self.requirements_path, "w") as f:
+            f.write("requests[SOCKS]>=2\nlegacy; python_version < '3'\n")
+        self._install(
+            "requests",
+            "2.32.3",
+            {"requests/__init__.py": 10},
+            requires=[
+                "urllib3<3,>=1.21.1",
+                "PySocks!=1.5.7,>=1.5.6; extra == 'socks'",
+                'chardet<6,>=3.0.2; extra == "use-chardet-on-py3"',
+                "colorama; sys_platform == 'win32' or platform_machine == \"aarch64\"",
+            ],
+        )
+        for name in ["urllib3", "PySocks", "chardet", "colorama", "legacy"]:
+            self._install(name, "1.0", {"{}.py".format(name.lower()): 1})
+
+        report = report_distributions(self.site_packages, self.requirements_path, "python3.12", X86_64)
+
+        top_level_requirements = {
+            distribution["name"]: distribution["top_level_requirements"] for distribution in report["distributions"]
+        }
+        self.assertEqual(
+            top_level_requirements,
+            {
+                "requests": ["requests"],
+                "urllib3": ["requests"],
+                # requested through the socks extra of the requirements file
+                "PySocks": ["requests"],
+                # the extra is not requested, and the markers don't hold in Lambda
+                "chardet": ["chardet"],
+                "colorama": ["colorama"],
+                # the requirement of the requirements file doesn't hold either, it is only installed
+                "legacy": ["legacy"],
+            },
+        )
+
+        report = report_distributions(self.site_packages, self.requirements_path, "python3.12", ARM64)
+
+        self.assertEqual(
+            [d["top_level_requirements"] for d in report["distributions"] if d["name"] == "colorama"], [["requests"]]
+        )
+
+    def test_counts_files_of_dist_info_without_record(self):
+        self._install("foo", "1.0", {"foo/__init__.py": 10})
+        os.remove(os.path.join(self.site_packages, "foo-1.0.dist-info", "RECORD"))
+
+        report = report_distributions(self.site_packages)
+
+        self.assertEqual(report["distributions"][0]["files"], 1)
+        self.assertEqual(report["distributions"][0]["top_level_requirements"], ["foo"])
+
+    def test_reports_nothing_without_installed_distributions(self):
+        report = report_distributions(os.path.join(self.directory, "missing"), self.requirements_path)
+
+        self.assertEqual(report, {"total_bytes": 0, "total_files": 0, "distributions": []})
@@ -0,0 +1,98 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from aws_lambda_builders.workflows.python_pip.import_pruning import (
+    find_unreachable_distributions,
+    remove_distributions,
+)
+
+
+class TestImportPruning(TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.source_dir = os.path.join(self.root, "source")
+        self.dependencies_dir = os.path.join(self.root, "dependencies")
+        self._write(self.source_dir, "app.py", "import json\nfrom foo import client\n")
+        self._write(self.source_dir, "helpers/__init__.py", "import importlib\nimportlib.import_module('plugin.x')\n")
+        self._write(self.source_dir, "tests/test_app.py", "import pytest\n")
+        # foo imports bar, which is reached through it
+        self._install("foo", "1.0", {"foo/__init__.py": "from . import client\n", "foo/client.py": "import bar.x\n"})
+        self._install("bar", "2.0", {"bar/__init__.py": "", "bar/x.py": ""})
+        self._install("plugin", "1.0", {"plugin/__init__.py": "", "plugin/x.py": ""})
+        self._install("pytest", "8.0", {"pytest/__init__.py": "", "_pytest/main.py": "import baz\n"})
+        self._install("baz", "1.0", {"baz.py": ""})
+        # distributions installing no module are always kept
+        self._install("data", "1.0", {"data.libs/libdata.so.1": ""})
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def _write(self, directory, path, content):
+        full_path = os.path.join(directory, *path.split("/"))
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        with open(full_path, "w") as f:
+            f.write(content)
+
+    def _install(self, name, version, files):
+        dist_info = "{}-{}.dist-info".format(name, version)
+        for path, content in files.items():
+            self._write(self.dependencies_dir, path, content)
+        self._write(self.dependencies_dir, dist_info + "/METADATA", "Name: {}\n".format(name))
+        record = "".join(
+            "{},,\n".format(path) for path in list(files) + [dist_info + "/METADATA", dist_info + "/RECORD"]
+        )
+        self._write(self.dependencies_dir, dist_info + "/RECORD", record)
+
+    def _names(self, distributions):
+        return [distribution["name"] for distribution in distributions]
+
+    def test_finds_distributions_never_imported_from_the_source(self):
+        kept, unreachable = find_unreachable_distributions(self.dependencies_dir, self.source_dir, excludes=("tests",))
+
+        self.assertEqual(kept, ["bar", "data", "foo", "plugin"])
+        self.assertEqual(self._names(unreachable), ["baz", "pytest"])
+        self.assertEqual(unreachable[1]["version"], "8.0")
+        self.assertEqual(
+            sorted(
+                os.path.relpath(path, self.dependencies_dir).replace(os.sep, "/") for path in unreachable[1]["paths"]
+            ),
+            ["_pytest/main.py", "pytest-8.0.dist-info/METADATA", "pytest-8.0.dist-info/RECORD", "pytest/__init__.py"],
+        )
+
+    def test_keeps_distributions_imported_from_source_files_not_excluded(self):
+        kept, unreachable = find_unreachable_distributions(self.dependencies_dir, self.source_dir)
+
+        # the pytest distribution is kept, but its _pytest module is never imported
+        self.assertIn("pytest", kept)
+        self.assertEqual(self._names(unreachable), ["baz"])
+
+    def test_starts_from_the_entry_points_and_the_modules_to_keep(self):
+        kept, unreachable = find_unreachable_distributions(
+            self.dependencies_dir, self.source_dir, entry_points=["app.lambda_handler"], keep=["baz"]
+        )
+
+        self.assertEqual(kept, ["bar", "baz", "data", "foo"])
+        self.assertEqual(self._names(unreachable), ["plugin", "pytest"])
+
+    def test_removes_distributions_and_emptied_directories(self):
+        _, unreachable = find_unreachable_distributions(self.dependencies_dir, self.source_dir, excludes=("tests",))
+
+        removed_paths = remove_distributions(self.dependencies_dir, unreachable)
+
+        self.assertIn("_pytest/main.py", removed_paths)
+        self.assertIn("baz-1.0.dist-info/RECORD", removed_paths)
+        self.assertEqual(
+            sorted(os.listdir(self.dependencies_dir)),
+            [
+                "bar",
+                "bar-2.0.dist-info",
+                "data-1.0.dist-info",
+                "data.libs",
+                "foo",
+                "foo-1.0.dist-info",
+                "plugin",
+                "plugin-1.0.dist-info",
+            ],
+        )
@@ -0,0 +1,85 @@
+import json
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from aws_lambda_builders.workflows.python_pip.install_record import INSTALL_RECORD_FILENAME, InstallRecord
+
+
+class TestInstallRecord(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_must_save_and_load_record(self):
+        distributions = {"foo-1.0-py3-none-any.whl": {"sha256": "abc", "files": ["foo/__init__.py"]}}
+
+        InstallRecord(distributions).save(self.directory)
+
+        self.assertEqual(InstallRecord.load(self.directory).distributions, distributions)
+        # no temporary file is left behind
+        self.assertEqual(os.listdir(self.directory), [INSTALL_RECORD_FILENAME])
+
+    def test_must_ignore_missing_invalid_or_other_version_records(self):
+        self.assertIsNone(InstallRecord.load(self.directory))
+
+        path = os.path.join(self.directory, INSTALL_RECORD_FILENAME)
+        with open(path, "w") as f:
+            f.write("{")
+        self.assertIsNone(InstallRecord.load(self.directory))
+
+        with open(path, "w") as f:
+            json.dump({"version": 0, "distributions": {}}, f)
+        self.assertIsNone(InstallRecord.load(self.directory))
+
+    def test_must_delete_record(self):
+        InstallRecord().save(self.directory)
+
+        InstallRecord.delete(self.directory)
+        InstallRecord.delete(self.directory)
+
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_must_no_longer_consider_wheels_with_discarded_files_installed(self):
+        record = InstallRecord(
+            {
+                "foo-1.0-py3-none-any.whl": {"sha256": "abc", "files": ["foo/__init__.py", "foo/__init__.pyi"]},
+                "bar-1.0-py3-none-any.whl": {"sha256": "def", "files": ["bar/__init__.py"]},
+            }
+        )
+
+        record.discard_files({"foo/__init__.pyi"})
+
+        self.assertFalse(record.is_installed("foo-1.0-py3-none-any.whl", "abc"))
+        # the remaining files are still listed, so that they are removed before the wheel is installed again
+        self.assertEqual(record.distributions["foo-1.0-py3-none-any.whl"]["files"], ["foo/__init__.py"])
+        self.assertTrue(record.is_installed("bar-1.0-py3-none-any.whl", "def"))
+        self.assertFalse(record.is_installed("bar-1.0-py3-none-any.whl", "other"))
+        self.assertFalse(record.is_installed("baz-1.0-py3-none-any.whl", "abc"))
+
+    def test_must_consider_slimmed_wheels_installed_with_the_same_slimming_settings(self):
+        record = InstallRecord(
+            {
+                "foo-1.0-py3-none-any.whl": {"sha256": "abc", "files": ["foo/__init__.py", "foo/__init__.pyi"]},
+                "bar-1.0-py3-none-any.whl": {"sha256": "def", "files": ["bar/__init__.py"]},
+            }
+        )
+        settings = {"remove_patterns": ["*.pyi"], "keep_patterns": []}
+
+        record.slim_files({"foo/__init__.pyi"}, settings)
+        record.save(self.directory)
+        record = InstallRecord.load(self.directory)
+
+        self.assertEqual(record.distributions["foo-1.0-py3-none-any.whl"]["files"], ["foo/__init__.py"])
+        self.assertEqual(record.distributions["foo-1.0-py3-none-any.whl"]["slimmed"], ["foo/__init__.pyi"])
+        self.assertTrue(record.is_installed("foo-1.0-py3-none-any.whl", "abc", settings))
+        # the slimmed files would be kept by other settings, or without slimming
+        self.assertFalse(
+            record.is_installed("foo-1.0-py3-none-any.whl", "abc", {"remove_patterns": [], "keep_patterns": []})
+        )
+        self.assertFalse(record.is_installed("foo-1.0-py3-none-any.whl", "abc"))
+        # wheels without slimmed files don't depend on the settings
+        self.assertTrue(record.is_installed("bar-1.0-py3-none-any.whl", "def"))
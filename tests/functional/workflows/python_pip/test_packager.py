@@ -2,7 +2,12 @@ import sys
 import os
 import zipfile
 import tarfile
+import shutil
+import tempfile
+import threading
+import time
 import io
+import itertools
 from collections import defaultdict, namedtuple
 from unittest import TestCase, mock
 
@@ -14,12 +19,19 @@ from aws_lambda_builders.workflows.python_pip.packager import DependencyBuilder
 from aws_lambda_builders.workflows.python_pip.packager import Package
 from aws_lambda_builders.workflows.python_pip.packager import MissingDependencyError
 from aws_lambda_builders.workflows.python_pip.packager import SubprocessPip
+from aws_lambda_builders.workflows.python_pip.packager import PipWorker
 from aws_lambda_builders.workflows.python_pip.packager import SDistMetadataFetcher
 from aws_lambda_builders.workflows.python_pip.packager import InvalidSourceDistributionNameError
+from aws_lambda_builders.workflows.python_pip.actions import PythonSlimDependenciesAction
+from aws_lambda_builders.workflows.python_pip.install_record import InstallRecord
+from aws_lambda_builders.workflows.python_pip.resolution_lock import ResolutionLock
 from aws_lambda_builders.workflows.python_pip.packager import get_lambda_abi
 from aws_lambda_builders.workflows.python_pip.compat import pip_no_compile_c_env_vars
 from aws_lambda_builders.workflows.python_pip.compat import pip_no_compile_c_shim
 from aws_lambda_builders.workflows.python_pip.utils import OSUtils
+from aws_lambda_builders.workflows.python_pip.wheel_index import WheelIndex
+from aws_lambda_builders.workflows.python_pip.wheelhouse import Wheelhouse
+from aws_lambda_builders.workflows.python_pip.slimming import get_slimming_settings
 
 FakePipCall = namedtuple("FakePipEntry", ["args", "env_vars", "shim"])
 
@@ -77,6 +89,7 @@ class FakePip(object):
     def main(self, args, env_vars=None, shim=None):
         cmd, args = args[0], args[1:]
         self._calls[cmd].append((args, env_vars, shim))
+        return_tuple = self._return_tuple
         try:
             side_effects = self._side_effects[cmd].pop(0)
             for side_effect in side_effects:
@@ -89,9 +102,11 @@ class FakePip(object):
                     )
                 )
                 side_effect.execute(args)
+                if isinstance(side_effect, PipFailureSideEffect):
+                    return_tuple = (side_effect.rc, b"", side_effect.err)
         except IndexError:
             pass
-        return self._return_tuple
+        return return_tuple
 
     def set_return_tuple(self, rc, out, err):
         self._return_tuple = (rc, out, err)
@@ -100,6 +115,9 @@ class FakePip(object):
         side_effects = [PipSideEffect(pkg, "--dest", expected_args, whl_contents) for pkg in packages]
         self._side_effects["download"].append(side_effects)
 
+    def download_fails(self, expected_args, err=b"ERROR: No matching distribution found"):
+        self._side_effects["download"].append([PipFailureSideEffect(expected_args, err)])
+
     def wheels_to_build(self, expected_args, wheels_to_build, expected_env_vars=None, expected_shim=None):
         # The SubprocessPip class handles injecting the
         # subprocess_python_base_environ into the env vars if needed,
@@ -147,7 +165,9 @@ class PipSideEffect(object):
             package = Package(directory, filename, python_exe=sys.executable)
             with zipfile.ZipFile(filepath, "w") as z:
                 for content_path in self._whl_contents:
-                    z.writestr(content_path.format(package_name=self._package_name, data_dir=package.data_dir), b"")
+                    # a fixed timestamp, so that the same wheel has the same digest
+                    name = content_path.format(package_name=self._package_name, data_dir=package.data_dir)
+                    z.writestr(zipfile.ZipInfo(name), b"")
 
     def _build_fake_sdist(self, filepath):
         # tar.gz is the same no reason to test it here as it is tested in
@@ -176,6 +196,18 @@ class PipSideEffect(object):
                     self._build_fake_sdist(filepath)
 
 
+class PipFailureSideEffect(object):
+    def __init__(self, expected_args, err, rc=1):
+        self.expected_args = expected_args
+        self.expected_env_vars = None
+        self.expected_shim = None
+        self.err = err
+        self.rc = rc
+
+    def execute(self, args):
+        pass
+
+
 @pytest.fixture
 def osutils():
     return OSUtils()
@@ -248,6 +280,27 @@ class TestDependencyBuilder(object):
         for req in reqs:
             assert req in installed_packages
 
+    def test_ignores_directories_linked_into_scratch_dir(self, tmpdir, pip_runner, osutils):
+        reqs = ["foo"]
+        pip, runner = pip_runner
+        appdir, builder = self._make_appdir_and_dependency_builder(reqs, tmpdir, runner)
+        requirements_file = os.path.join(appdir, "requirements.txt")
+        pip.packages_to_download(
+            expected_args=["-r", requirements_file, "--dest", mock.ANY, "--exists-action", "i"],
+            packages=["foo-1.2-cp39-cp39-manylinux1_x86_64.whl"],
+        )
+
+        site_packages = os.path.join(appdir, ".chalice.", "site-packages")
+        with osutils.tempdir() as scratch_dir:
+            # the caches of other workflows are linked into the scratch directory when a cache directory is used
+            with osutils.tempdir() as cache_dir:
+                os.symlink(cache_dir, os.path.join(scratch_dir, "uv-cache"))
+                builder.build_site_packages(requirements_file, site_packages, scratch_dir)
+        installed_packages = os.listdir(site_packages)
+
+        pip.validate()
+        assert installed_packages == ["foo"]
+
     def test_can_use_abi3_whl_for_any_python3(self, tmpdir, pip_runner, osutils):
         reqs = ["foo", "bar", "baz", "qux"]
         pip, runner = pip_runner
@@ -729,6 +782,360 @@ class TestDependencyBuilder(object):
         for req in reqs:
             assert req in installed_packages
 
+    def test_links_compatible_wheels_of_the_wheel_index(self, tmpdir, osutils, pip_runner):
+        reqs = ["foo", "bar"]
+        pip, runner = pip_runner
+        index_directory = str(tmpdir.mkdir("index"))
+        # the index holds a wheel of bar compatible with Lambda
+        PipSideEffect("bar-1.2-cp39-cp39-manylinux1_x86_64.whl", None, None)._build_fake_whl(
+            index_directory, "bar-1.2-cp39-cp39-manylinux1_x86_64.whl"
+        )
+        appdir, builder = self._make_appdir_and_dependency_builder(
+            reqs, tmpdir, runner, wheel_index=WheelIndex(index_directory)
+        )
+        requirements_file = os.path.join(appdir, "requirements.txt")
+        pip.packages_to_download(
+            expected_args=["-r", requirements_file, "--dest", mock.ANY, "--exists-action", "i"],
+            packages=["foo-1.0-cp39-none-any.whl", "bar-1.2-cp39-cp39-macosx_10_6_intel.whl"],
+        )
+        site_packages = os.path.join(appdir, ".chalice.", "site-packages")
+        with osutils.tempdir() as scratch_dir:
+            builder.build_site_packages(requirements_file, site_packages, scratch_dir)
+        installed_packages = os.listdir(site_packages)
+
+        pip.validate()
+        # the compatible wheel of bar is not downloaded with pip
+        assert len(pip.calls["download"]) == 1
+        for req in reqs:
+            assert req in installed_packages
+
+    def _binary_download_args(self, requirements_file, builder):
+        return [
+            "-r",
+            requirements_file,
+            "--only-binary=:all:",
+            *itertools.chain.from_iterable(["--platform", platform] for platform in builder.compatible_platforms),
+            "--implementation",
+            "cp",
+            "--abi",
+            get_lambda_abi(builder.runtime),
+            "--dest",
+            mock.ANY,
+        ]
+
+    def test_can_get_all_whls_in_a_single_binary_download(self, tmpdir, osutils, pip_runner):
+        reqs = ["foo", "bar"]
+        pip, runner = pip_runner
+        appdir, builder = self._make_appdir_and_dependency_builder(reqs, tmpdir, runner, binary_fast_path=True)
+        requirements_file = os.path.join(appdir, "requirements.txt")
+        pip.packages_to_download(
+            expected_args=self._binary_download_args(requirements_file, builder),
+            packages=["foo-1.0-py3-none-any.whl", "bar-1.2-cp39-cp39-manylinux1_x86_64.whl"],
+        )
+        site_packages = os.path.join(appdir, ".chalice.", "site-packages")
+        with osutils.tempdir() as scratch_dir:
+            builder.build_site_packages(requirements_file, site_packages, scratch_dir)
+            scratch_contents = os.listdir(scratch_dir)
+        installed_packages = os.listdir(site_packages)
+
+        pip.validate()
+        assert len(pip.calls["download"]) == 1
+        assert sorted(scratch_contents) == ["bar-1.2-cp39-cp39-manylinux1_x86_64.whl", "foo-1.0-py3-none-any.whl"]
+        for req in reqs:
+            assert req in installed_packages
+
+    def test_falls_back_to_multi_pass_download_if_binary_download_fails(self, tmpdir, osutils, pip_runner):
+        reqs = ["foo", "bar"]
+        pip, runner = pip_runner
+        appdir, builder = self._make_appdir_and_dependency_builder(reqs, tmpdir, runner, binary_fast_path=True)
+        requirements_file = os.path.join(appdir, "requirements.txt")
+        # bar has no wheel compatible with Lambda, so pip downloads nothing
+        pip.download_fails(expected_args=self._binary_download_args(requirements_file, builder))
+        pip.packages_to_download(
+            expected_args=["-r", requirements_file, "--dest", mock.ANY, "--exists-action", "i"],
+            packages=["foo-1.0-py3-none-any.whl", "bar-1.2.zip"],
+        )
+        pip.wheels_to_build(
+            expected_args=["--no-deps", "--wheel-dir", mock.ANY, PathArgumentEndingWith("bar-1.2.zip")],
+            wheels_to_build=["bar-1.2-cp39-cp39-manylinux1_x86_64.whl"],
+        )
+        site_packages = os.path.join(appdir, ".chalice.", "site-packages")
+        with osutils.tempdir() as scratch_dir:
+            builder.build_site_packages(requirements_file, site_packages, scratch_dir)
+        installed_packages = os.listdir(site_packages)
+
+        pip.validate()
+        assert len(pip.calls["download"]) == 3
+        for req in reqs:
+            assert req in installed_packages
+
+    def test_keeps_compatible_wheels_of_the_binary_download(self, tmpdir, osutils, pip_runner):
+        reqs = ["foo", "bar"]
+        pip, runner = pip_runner
+        appdir, builder = self._make_appdir_and_dependency_builder(reqs, tmpdir, runner, binary_fast_path=True)
+        requirements_file = os.path.join(appdir, "requirements.txt")
+        # bar was built from a local directory for the host platform
+        pip.packages_to_download(
+            expected_args=self._binary_download_args(requirements_file, builder),
+            packages=["foo-1.0-cp39-cp39-manylinux1_x86_64.whl", "bar-1.2-cp39-cp39-macosx_10_9_x86_64.whl"],
+        )
+        pip.packages_to_download(
+            expected_args=["-r", requirements_file, "--dest", mock.ANY, "--exists-action", "i"],
+            packages=["foo-1.0-cp39-cp39-macosx_10_9_x86_64.whl", "bar-1.2-cp39-cp39-macosx_10_9_x86_64.whl"],
+        )
+        pip.packages_to_download(
+            expected_args=[
+                "--only-binary=:all:",
+                "--no-deps",
+                *itertools.chain.from_iterable(["--platform", platform] for platform in builder.compatible_platforms),
+                "--implementation",
+                "cp",
+                "--abi",
+                get_lambda_abi(builder.runtime),
+                "--dest",
+                mock.ANY,
+                "bar==1.2",
+            ],
+            packages=["bar-1.2-cp39-cp39-manylinux1_x86_64.whl"],
+        )
+        site_packages = os.path.join(appdir, ".chalice.", "site-packages")
+        with osutils.tempdir() as scratch_dir:
+            builder.build_site_packages(requirements_file, site_packages, scratch_dir)
+        installed_packages = os.listdir(site_packages)
+
+        pip.validate()
+        # foo kept its wheel of the binary download, only bar was downloaded again
+        assert len(pip.calls["download"]) == 3
+        for req in reqs:
+            assert req in installed_packages
+
+    def test_installs_only_changed_wheels_incrementally(self, tmpdir, osutils, pip_runner):
+        pip, runner = pip_runner
+        appdir, builder = self._make_appdir_and_dependency_builder(
+            ["foo", "bar"], tmpdir, runner, incremental_install=True
+        )
+        requirements_file = os.path.join(appdir, "requirements.txt")
+        site_packages = os.path.join(appdir, ".chalice.", "site-packages")
+        pip.packages_to_download(
+            expected_args=["-r", requirements_file, "--dest", mock.ANY, "--exists-action", "i"],
+            packages=["foo-1.0-py3-none-any.whl", "bar-1.0-py3-none-any.whl"],
+            whl_contents=["{package_name}/placeholder", "{package_name}/v1"],
+        )
+        with osutils.tempdir() as scratch_dir:
+            builder.build_site_packages(requirements_file, site_packages, scratch_dir)
+        foo_inode = os.stat(os.path.join(site_packages, "foo", "placeholder")).st_ino
+
+        # bar is upgraded and baz is added
+        self._write_requirements_txt(["foo", "bar==2.0", "baz"], appdir)
+        pip.packages_to_download(
+            expected_args=["-r", requirements_file, "--dest", mock.ANY, "--exists-action", "i"],
+            packages=["foo-1.0-py3-none-any.whl", "bar-2.0-py3-none-any.whl", "baz-1.0-py3-none-any.whl"],
+            whl_contents=["{package_name}/placeholder", "{package_name}/v1"],
+        )
+        with osutils.tempdir() as scratch_dir:
+            # bar 2.0 no longer ships v1
+            bar_wheel = os.path.join(scratch_dir, "bar-2.0-py3-none-any.whl")
+            with zipfile.ZipFile(bar_wheel, "w") as z:
+                z.writestr("bar/placeholder", b"")
+                z.writestr("bar/v2", b"")
+            builder.build_site_packages(requirements_file, site_packages, scratch_dir)
+
+        pip.validate()
+        assert sorted(os.listdir(site_packages)) == [".pip-install-record.json", "bar", "baz", "foo"]
+        assert sorted(os.listdir(os.path.join(site_packages, "bar"))) == ["placeholder", "v2"]
+        # foo was not installed again
+        assert os.stat(os.path.join(site_packages, "foo", "placeholder")).st_ino == foo_inode
+
+        # every dependency is removed
+        self._write_requirements_txt([], appdir)
+        with osutils.tempdir() as scratch_dir:
+            builder.build_site_packages(requirements_file, site_packages, scratch_dir)
+        assert os.listdir(site_packages) == [".pip-install-record.json"]
+
+    def test_reinstalls_wheels_whose_files_were_removed(self, tmpdir, osutils, pip_runner):
+        pip, runner = pip_runner
+        appdir, builder = self._make_appdir_and_dependency_builder(["foo"], tmpdir, runner, incremental_install=True)
+        requirements_file = os.path.join(appdir, "requirements.txt")
+        site_packages = os.path.join(appdir, ".chalice.", "site-packages")
+        for _ in range(2):
+            pip.packages_to_download(
+                expected_args=["-r", requirements_file, "--dest", mock.ANY, "--exists-action", "i"],
+                packages=["foo-1.0-py3-none-any.whl"],
+            )
+        with osutils.tempdir() as scratch_dir:
+            builder.build_site_packages(requirements_file, site_packages, scratch_dir)
+        shutil.rmtree(os.path.join(site_packages, "foo"))
+
+        with osutils.tempdir() as scratch_dir:
+            builder.build_site_packages(requirements_file, site_packages, scratch_dir)
+
+        assert os.listdir(os.path.join(site_packages, "foo")) == ["placeholder"]
+
+    def test_reinstalls_wheels_after_their_files_were_pruned(self, tmpdir, osutils, pip_runner):
+        pip, runner = pip_runner
+        appdir, builder = self._make_appdir_and_dependency_builder(
+            ["foo", "bar"], tmpdir, runner, incremental_install=True
+        )
+        requirements_file = os.path.join(appdir, "requirements.txt")
+        site_packages = os.path.join(appdir, ".chalice.", "site-packages")
+        for _ in range(2):
+            pip.packages_to_download(
+                expected_args=["-r", requirements_file, "--dest", mock.ANY, "--exists-action", "i"],
+                packages=["foo-1.0-py3-none-any.whl", "bar-1.0-py3-none-any.whl"],
+                whl_contents=["{package_name}/placeholder", "{package_name}/typing.pyi"],
+            )
+        with osutils.tempdir() as scratch_dir:
+            builder.build_site_packages(requirements_file, site_packages, scratch_dir)
+        bar_inode = os.stat(os.path.join(site_packages, "bar", "placeholder")).st_ino
+        # foo is pruned as a whole
+        shutil.rmtree(os.path.join(site_packages, "foo"))
+        record = InstallRecord.load(site_packages)
+        record.discard_files({"foo/placeholder", "foo/typing.pyi"})
+        record.save(site_packages)
+
+        with osutils.tempdir() as scratch_dir:
+            builder.build_site_packages(requirements_file, site_packages, scratch_dir)
+
+        pip.validate()
+        assert sorted(os.listdir(os.path.join(site_packages, "foo"))) == ["placeholder", "typing.pyi"]
+        # bar was not installed again
+        assert os.stat(os.path.join(site_packages, "bar", "placeholder")).st_ino == bar_inode
+        # both wheels are recorded as installed as a whole again
+        assert not any(
+            distribution.get("partial") for distribution in InstallRecord.load(site_packages).distributions.values()
+        )
+
+    def test_keeps_slimmed_wheels_while_the_slimming_settings_do_not_change(self, tmpdir, osutils, pip_runner):
+        pip, runner = pip_runner
+        options = {"slim_dependencies": True}
+        appdir, builder = self._make_appdir_and_dependency_builder(
+            ["foo"], tmpdir, runner, incremental_install=True, slimming=get_slimming_settings()
+        )
+        requirements_file = os.path.join(appdir, "requirements.txt")
+        site_packages = os.path.join(appdir, ".chalice.", "site-packages")
+        for _ in range(3):
+            pip.packages_to_download(
+                expected_args=["-r", requirements_file, "--dest", mock.ANY, "--exists-action", "i"],
+                packages=["foo-1.0-py3-none-any.whl"],
+                whl_contents=["{package_name}/placeholder", "{package_name}/typing.pyi"],
+            )
+        with osutils.tempdir() as scratch_dir:
+            builder.build_site_packages(requirements_file, site_packages, scratch_dir)
+        PythonSlimDependenciesAction(site_packages, options=options).execute()
+        foo_inode = os.stat(os.path.join(site_packages, "foo", "placeholder")).st_ino
+
+        with osutils.tempdir() as scratch_dir:
+            builder.build_site_packages(requirements_file, site_packages, scratch_dir)
+        PythonSlimDependenciesAction(site_packages, options=options).execute()
+
+        # foo was not installed again, and is still slimmed
+        assert os.listdir(os.path.join(site_packages, "foo")) == ["placeholder"]
+        assert os.stat(os.path.join(site_packages, "foo", "placeholder")).st_ino == foo_inode
+
+        # the type stubs are now kept
+        options["slim_keep_patterns"] = ["*.pyi"]
+        builder = DependencyBuilder(
+            OSUtils(),
+            "python3.9",
+            sys.executable,
+            runner,
+            incremental_install=True,
+            slimming=get_slimming_settings(keep_patterns=["*.pyi"]),
+        )
+        with osutils.tempdir() as scratch_dir:
+            builder.build_site_packages(requirements_file, site_packages, scratch_dir)
+        PythonSlimDependenciesAction(site_packages, options=options).execute()
+
+        pip.validate()
+        assert sorted(os.listdir(os.path.join(site_packages, "foo"))) == ["placeholder", "typing.pyi"]
+
+    def test_downloads_locked_wheels_without_resolving_again(self, tmpdir, osutils, pip_runner):
+        reqs = ["foo", "bar"]
+        pip, runner = pip_runner
+        lock = ResolutionLock(str(tmpdir.mkdir("locks")), "key")
+        appdir, builder = self._make_appdir_and_dependency_builder(reqs, tmpdir, runner, resolution_lock=lock)
+        requirements_file = os.path.join(appdir, "requirements.txt")
+        site_packages = os.path.join(appdir, ".chalice.", "site-packages")
+        wheels = ["bar-1.2-cp39-cp39-manylinux1_x86_64.whl", "foo-1.0-py3-none-any.whl"]
+        pip.packages_to_download(
+            expected_args=["-r", requirements_file, "--dest", mock.ANY, "--exists-action", "i"],
+            packages=wheels,
+        )
+        with osutils.tempdir() as scratch_dir:
+            builder.build_site_packages(requirements_file, site_packages, scratch_dir)
+        locked_wheels = lock.load()
+        assert [wheel["requirement"] for wheel in locked_wheels] == ["bar==1.2", "foo==1.0"]
+        assert [wheel["filename"] for wheel in locked_wheels] == wheels
+
+        shutil.rmtree(site_packages)
+        pip.packages_to_download(
+            expected_args=[
+                "-r",
+                mock.ANY,
+                "--only-binary=:all:",
+                "--no-deps",
+                *itertools.chain.from_iterable(["--platform", platform] for platform in builder.compatible_platforms),
+                "--implementation",
+                "cp",
+                "--abi",
+                get_lambda_abi(builder.runtime),
+                "--dest",
+                mock.ANY,
+            ],
+            packages=wheels,
+        )
+        with osutils.tempdir() as scratch_dir:
+            builder.build_site_packages(requirements_file, site_packages, scratch_dir)
+
+        pip.validate()
+        assert len(pip.calls["download"]) == 2
+        locked_requirements = pip.calls["download"][1][0][1]
+        assert not os.path.exists(locked_requirements)
+        for req in reqs:
+            assert req in os.listdir(site_packages)
+
+    def test_resolves_again_if_locked_wheels_differ(self, tmpdir, osutils, pip_runner):
+        pip, runner = pip_runner
+        lock = ResolutionLock(str(tmpdir.mkdir("locks")), "key")
+        lock.save([{"requirement": "foo==1.0", "filename": "foo-1.0-py3-none-any.whl", "sha256": "0" * 64}])
+        appdir, builder = self._make_appdir_and_dependency_builder(["foo"], tmpdir, runner, resolution_lock=lock)
+        requirements_file = os.path.join(appdir, "requirements.txt")
+        site_packages = os.path.join(appdir, ".chalice.", "site-packages")
+        pip.packages_to_download(expected_args=mock.ANY, packages=["foo-1.0-py3-none-any.whl"])
+        pip.packages_to_download(
+            expected_args=["-r", requirements_file, "--dest", mock.ANY, "--exists-action", "i"],
+            packages=["foo-1.0-py3-none-any.whl"],
+        )
+        with osutils.tempdir() as scratch_dir:
+            builder.build_site_packages(requirements_file, site_packages, scratch_dir)
+
+        pip.validate()
+        assert len(pip.calls["download"]) == 2
+        assert lock.load()[0]["sha256"] != "0" * 64
+        assert os.listdir(site_packages) == ["foo"]
+
+    def test_does_not_lock_local_packages(self, tmpdir, osutils, pip_runner):
+        pip, runner = pip_runner
+        lock = ResolutionLock(str(tmpdir.mkdir("locks")), "key")
+        appdir, builder = self._make_appdir_and_dependency_builder(["./foo"], tmpdir, runner, resolution_lock=lock)
+        requirements_file = os.path.join(appdir, "requirements.txt")
+        pip.set_return_tuple(0, b"Processing ../foo\n", b"")
+        pip.packages_to_download(
+            expected_args=["-r", requirements_file, "--dest", mock.ANY, "--exists-action", "i"],
+            packages=[],
+        )
+        pip.wheels_to_build(
+            expected_args=["--no-deps", "--wheel-dir", mock.ANY, "../foo"],
+            wheels_to_build=["foo-1.0-py3-none-any.whl"],
+        )
+        site_packages = os.path.join(appdir, ".chalice.", "site-packages")
+        with osutils.tempdir() as scratch_dir:
+            builder.build_site_packages(requirements_file, site_packages, scratch_dir)
+
+        pip.validate()
+        assert os.listdir(site_packages) == ["foo"]
+        assert lock.load() is None
+
     def test_allowlist_sqlalchemy(self, tmpdir, osutils, pip_runner):
         reqs = ["sqlalchemy==1.1.18"]
         pip, runner = pip_runner
@@ -796,6 +1203,126 @@ class TestDependencyBuilder(object):
         for req in reqs:
             assert req in installed_packages
 
+    def _arm64_manylinux_download_args(self, package):
+        return [
+            "--only-binary=:all:",
+            "--no-deps",
+            "--platform",
+            "any",
+            "--platform",
+            "linux_aarch64",
+            "--platform",
+            "manylinux2014_aarch64",
+            "--platform",
+            "manylinux_2_17_aarch64",
+            "--implementation",
+            "cp",
+            "--abi",
+            "cp39",
+            "--dest",
+            mock.ANY,
+            package,
+        ]
+
+    def test_builds_other_architectures_from_the_same_resolution(self, tmpdir, osutils, pip_runner):
+        reqs = ["foo", "bar"]
+        pip, runner = pip_runner
+        appdir, builder = self._make_appdir_and_dependency_builder(reqs, tmpdir, runner)
+        requirements_file = os.path.join(appdir, "requirements.txt")
+        pip.packages_to_download(
+            expected_args=["-r", requirements_file, "--dest", mock.ANY, "--exists-action", "i"],
+            packages=["foo-1.0-py3-none-any.whl", "bar-1.2-cp39-cp39-manylinux2014_x86_64.whl"],
+        )
+        # the pure Python wheel is shared, only the platform specific wheel is
+        # downloaded for arm64
+        pip.packages_to_download(
+            expected_args=self._arm64_manylinux_download_args("bar==1.2"),
+            packages=["bar-1.2-cp39-cp39-manylinux2014_aarch64.whl"],
+        )
+        site_packages = os.path.join(appdir, ".chalice", "site-packages")
+        arm64_site_packages = os.path.join(appdir, ".chalice", "arm64-site-packages")
+        with osutils.tempdir() as scratch_dir:
+            builder.build_site_packages(
+                requirements_file, site_packages, scratch_dir, architecture_directories={ARM64: arm64_site_packages}
+            )
+
+        pip.validate()
+        assert len(pip.calls["download"]) == 2
+        assert sorted(os.listdir(site_packages)) == ["bar", "foo"]
+        assert sorted(os.listdir(arm64_site_packages)) == ["bar", "foo"]
+
+    def test_shares_pure_python_wheels_built_for_an_architecture(self, tmpdir, osutils, pip_runner):
+        reqs = ["foo"]
+        pip, runner = pip_runner
+        appdir, builder = self._make_appdir_and_dependency_builder(reqs, tmpdir, runner)
+        requirements_file = os.path.join(appdir, "requirements.txt")
+        pip.packages_to_download(
+            expected_args=["-r", requirements_file, "--dest", mock.ANY, "--exists-action", "i"],
+            packages=["foo-1.2.zip"],
+        )
+        # no manylinux wheel for x86_64
+        pip.packages_to_download(expected_args=mock.ANY, packages=[])
+        pip.wheels_to_build(
+            expected_args=["--no-deps", "--wheel-dir", mock.ANY, PathArgumentEndingWith("foo-1.2.zip")],
+            wheels_to_build=["foo-1.2-py3-none-any.whl"],
+        )
+        # no manylinux wheel for arm64 either
+        pip.packages_to_download(expected_args=self._arm64_manylinux_download_args("foo==1.2"), packages=[])
+        site_packages = os.path.join(appdir, ".chalice", "site-packages")
+        arm64_site_packages = os.path.join(appdir, ".chalice", "arm64-site-packages")
+        with osutils.tempdir() as scratch_dir:
+            builder.build_site_packages(
+                requirements_file, site_packages, scratch_dir, architecture_directories={ARM64: arm64_site_packages}
+            )
+
+        pip.validate()
+        # the wheel built for x86_64 is installed for arm64 too
+        assert len(pip.calls["wheel"]) == 1
+        assert os.listdir(site_packages) == ["foo"]
+        assert os.listdir(arm64_site_packages) == ["foo"]
+
+    def test_can_reuse_wheels_built_from_sdist_through_wheelhouse(self, tmpdir, osutils, empty_env_osutils):
+        reqs = ["foo", "bar"]
+        wheelhouse = Wheelhouse(str(tmpdir.join("wheelhouse")))
+        pip = FakePip()
+        runner = PipRunner(
+            python_exe=sys.executable, pip=pip, osutils=empty_env_osutils, find_links=wheelhouse.directory
+        )
+        appdir, builder = self._make_appdir_and_dependency_builder(reqs, tmpdir, runner, wheelhouse=wheelhouse)
+        requirements_file = os.path.join(appdir, "requirements.txt")
+        download_args = ["-r", requirements_file, "--dest", mock.ANY, "--exists-action", "i"]
+        download_args += ["--find-links", wheelhouse.directory]
+        pip.packages_to_download(
+            expected_args=download_args,
+            packages=["foo-1.2.zip", "bar-1.2-cp39-cp39-manylinux1_x86_64.whl"],
+        )
+        pip.wheels_to_build(
+            expected_args=["--no-deps", "--wheel-dir", mock.ANY, PathArgumentEndingWith("foo-1.2.zip")],
+            wheels_to_build=["foo-1.2-cp39-none-any.whl"],
+        )
+        site_packages = os.path.join(appdir, ".chalice.", "site-packages")
+        with osutils.tempdir() as scratch_dir:
+            builder.build_site_packages(requirements_file, site_packages, scratch_dir)
+
+        # only the wheel built from the sdist is stored, the downloaded one is not
+        assert os.listdir(wheelhouse.directory) == ["foo-1.2-cp39-none-any.whl"]
+        stored_wheel = os.path.join(wheelhouse.directory, "foo-1.2-cp39-none-any.whl")
+        os.utime(stored_wheel, (0, 0))
+
+        # pip finds the stored wheel in the next build, so the sdist is not built again
+        pip.packages_to_download(
+            expected_args=download_args,
+            packages=["foo-1.2-cp39-none-any.whl", "bar-1.2-cp39-cp39-manylinux1_x86_64.whl"],
+        )
+        with osutils.tempdir() as scratch_dir:
+            builder.build_site_packages(requirements_file, site_packages, scratch_dir)
+
+        pip.validate()
+        assert len(pip.calls["wheel"]) == 1
+        assert os.path.getmtime(stored_wheel) > 0
+        for req in reqs:
+            assert req in os.listdir(site_packages)
+
     def test_build_sdist_makes_incompatible_whl(self, tmpdir, osutils, pip_runner):
         reqs = ["foo", "bar"]
         pip, runner = pip_runner
@@ -939,6 +1466,127 @@ class TestPipRunner(TestCase):
         pip_runner.build_wheel("wheel", "dir")
         os_utils_mock.original_environ.assert_called_once()
 
+    def test_download_manylinux_wheels_concurrently(self):
+        active = []
+        max_active = []
+        lock = threading.Lock()
+
+        def main(args, env_vars=None, shim=None):
+            with lock:
+                active.append(args[-1])
+                max_active.append(len(active))
+            time.sleep(0.05)
+            dest = args[args.index("--dest") + 1]
+            # every process downloads its own wheel and a wheel shared with the others
+            for name in ["%s-1.0-py3-none-any.whl" % args[-1], "shared-1.0-py3-none-any.whl"]:
+                with open(os.path.join(dest, name), "w") as f:
+                    f.write(args[-1])
+            with lock:
+                active.remove(args[-1])
+            return 0, b"", b""
+
+        pip_mock = mock.Mock()
+        pip_mock.main.side_effect = main
+        packages = ["foo", "bar", "baz", "qux"]
+        with tempfile.TemporaryDirectory() as directory:
+            pip_runner = PipRunner(sys.executable, pip_mock, OSUtils(), download_concurrency=2)
+            pip_runner.download_manylinux_wheels(packages, directory, "abi", ["any"])
+
+            assert sorted(os.listdir(directory)) == sorted(
+                ["%s-1.0-py3-none-any.whl" % package for package in packages] + ["shared-1.0-py3-none-any.whl"]
+            )
+        assert pip_mock.main.call_count == 4
+        assert max(max_active) == 2
+
+
+class TestDependencyBuilderBuildSdists(object):
+    def test_build_sdists_concurrently(self):
+        active = []
+        max_active = []
+        lock = threading.Lock()
+
+        def build_wheel(path_to_sdist, wheel_directory, compile_c):
+            name = os.path.basename(path_to_sdist).split("-")[0]
+            with lock:
+                active.append(name)
+                max_active.append(len(active))
+            time.sleep(0.05)
+            # every build produces its own wheel and a wheel shared with the others
+            for filename in ["%s-1.0-py3-none-any.whl" % name, "shared-1.0-py3-none-any.whl"]:
+                with open(os.path.join(wheel_directory, filename), "w") as f:
+                    f.write(name)
+            with lock:
+                active.remove(name)
+
+        pip_runner = mock.Mock(spec=PipRunner)
+        pip_runner.build_wheel.side_effect = build_wheel
+        names = ["foo", "bar", "baz", "qux"]
+        sdists = set()
+        for name in names:
+            sdist = mock.Mock()
+            sdist.filename = "%s-1.0.tar.gz" % name
+            sdists.add(sdist)
+
+        with tempfile.TemporaryDirectory() as directory:
+            builder = DependencyBuilder(OSUtils(), "python3.9", sys.executable, pip_runner, build_concurrency=3)
+            builder._build_sdists(sdists, directory, compile_c=True)
+
+            assert sorted(os.listdir(directory)) == sorted(
+                ["%s-1.0-py3-none-any.whl" % name for name in names] + ["shared-1.0-py3-none-any.whl"]
+            )
+            # the shared wheel comes from the first sdist in name order, whichever build finished first
+            with open(os.path.join(directory, "shared-1.0-py3-none-any.whl")) as f:
+                assert f.read() == "bar"
+        assert pip_runner.build_wheel.call_count == 4
+        assert max(max_active) == 3
+
+
+class TestDependencyBuilderInstallWheels(object):
+    def _write_wheel(self, directory, filename, contents):
+        with zipfile.ZipFile(os.path.join(directory, filename), "w") as z:
+            for name, content in contents.items():
+                z.writestr(name, content)
+        return Package(directory, filename, sys.executable)
+
+    def test_install_wheels_concurrently(self, tmpdir):
+        src_dir = str(tmpdir.mkdir("src"))
+        dst_dir = str(tmpdir.join("dst"))
+        wheels = [
+            self._write_wheel(
+                src_dir,
+                "foo-1.0-py3-none-any.whl",
+                {"foo/__init__.py": "foo", "ns/__init__.py": "foo", "foo-1.0.dist-info/METADATA": ""},
+            ),
+            self._write_wheel(
+                src_dir,
+                "bar-1.0-py3-none-any.whl",
+                {"bar-1.0.data/purelib/bar/__init__.py": "bar", "ns/__init__.py": "bar"},
+            ),
+            self._write_wheel(src_dir, "baz-1.0-py3-none-any.whl", {"ns/baz/__init__.py": "baz"}),
+        ]
+        builder = DependencyBuilder(
+            OSUtils(), "python3.9", sys.executable, mock.Mock(spec=PipRunner), install_concurrency=3
+        )
+
+        builder._install_wheels(src_dir, dst_dir, wheels)
+
+        installed = sorted(
+            os.path.relpath(os.path.join(root, name), dst_dir) for root, _, names in os.walk(dst_dir) for name in names
+        )
+        assert installed == sorted(
+            [
+                os.path.join("bar", "__init__.py"),
+                os.path.join("foo", "__init__.py"),
+                os.path.join("foo-1.0.dist-info", "METADATA"),
+                os.path.join("ns", "__init__.py"),
+                os.path.join("ns", "baz", "__init__.py"),
+            ]
+        )
+        assert not os.path.exists(os.path.join(dst_dir, "bar-1.0.data", "purelib"))
+        # the conflicting file comes from the last wheel in file name order
+        with open(os.path.join(dst_dir, "ns", "__init__.py")) as f:
+            assert f.read() == "foo"
+
 
 class TestSubprocessPip(object):
     def test_can_invoke_pip(self):
@@ -957,6 +1605,49 @@ class TestSubprocessPip(object):
         assert err != b""
 
 
+class TestPipWorker(object):
+    def test_can_run_successive_commands_in_one_process(self):
+        pip = PipWorker(python_exe=sys.executable)
+        try:
+            worker_pid = pip._process.pid
+            rc, out, _ = pip.main(["--version"])
+            assert rc == 0
+            assert out.startswith(b"pip ")
+            rc, _, err = pip.main(["badcommand"])
+            assert rc != 0
+            assert err != b""
+            rc, _, _ = pip.main(["--version"])
+            assert rc == 0
+            assert pip._process.pid == worker_pid
+        finally:
+            pip.close()
+
+    def test_runs_commands_with_given_environment(self):
+        pip = PipWorker(python_exe=sys.executable)
+        try:
+            # an invalid configuration file only makes pip fail if pip reads the environment of the command
+            env_vars = dict(os.environ, PIP_CONFIG_FILE=os.devnull, PIP_NO_PYTHON_VERSION_WARNING="1")
+            env_vars["PIP_DEFAULT_TIMEOUT"] = "not-a-number"
+            rc, _, _ = pip.main(["--version"], env_vars=env_vars)
+            assert rc != 0
+            rc, _, _ = pip.main(["--version"], env_vars=dict(os.environ))
+            assert rc == 0
+        finally:
+            pip.close()
+
+    def test_falls_back_to_new_process_when_worker_exited(self):
+        pip = PipWorker(python_exe=sys.executable)
+        try:
+            pip._process.kill()
+            pip._process.wait()
+            rc, out, _ = pip.main(["--version"])
+            assert rc == 0
+            assert out.startswith(b"pip ")
+            assert pip._process is None
+        finally:
+            pip.close()
+
+
 class TestSdistMetadataFetcher(object):
     _SETUPTOOLS = "from setuptools import setup"
     _DISTUTILS = "from distutils.core import setup"
@@ -1092,6 +1783,44 @@ class TestSdistMetadataFetcher(object):
             with pytest.raises(InvalidSourceDistributionNameError):
                 name, version = sdist_reader.get_package_name_and_version(filepath)
 
+    @pytest.mark.parametrize("ext", ["zip", "tar.gz", "tar.bz2"])
+    def test_reads_archived_pkg_info_without_running_setup_py(self, osutils, sdist_reader, ext):
+        setup_py = self._SETUP_PY % ("raise RuntimeError('setup.py must not run')", "foo", "1.0")
+        pkg_info_contents = "Metadata-Version: 2.1\nName: foo-bar\nVersion: 1.0b2\n"
+        with osutils.tempdir() as tempdir:
+            filepath = self._write_fake_sdist(setup_py, tempdir, ext, pkg_info_contents)
+            with mock.patch("aws_lambda_builders.workflows.python_pip.packager.subprocess") as subprocess_mock:
+                name, version = sdist_reader.get_package_name_and_version(filepath)
+        subprocess_mock.Popen.assert_not_called()
+        assert name == "foo-bar"
+        assert version == "1.0b2"
+
+    def test_runs_setup_py_without_archived_pkg_info(self, osutils, sdist_reader):
+        setup_py = self._SETUP_PY % (self._SETUPTOOLS, "foo", "1.0")
+        with osutils.tempdir() as tempdir:
+            filepath = self._write_fake_sdist(setup_py, tempdir, "tar.gz")
+            name, version = sdist_reader.get_package_name_and_version(filepath)
+        assert name == "foo"
+        assert version == "1.0"
+
+    def test_caches_name_and_version_by_archive_digest(self, osutils, sdist_reader):
+        setup_py = self._SETUP_PY % (self._SETUPTOOLS, "cached", "2.0")
+        pkg_info_contents = "Name: cached\nVersion: 2.0\n"
+        with osutils.tempdir() as tempdir:
+            filepath = self._write_fake_sdist(setup_py, tempdir, "tar.gz", pkg_info_contents)
+            copy_path = os.path.join(tempdir, "copy.tar.gz")
+            with open(filepath, "rb") as source, open(copy_path, "wb") as copy:
+                copy.write(source.read())
+            with mock.patch.object(
+                SDistMetadataFetcher, "_read_archived_pkg_info", wraps=sdist_reader._read_archived_pkg_info
+            ) as read_mock:
+                assert sdist_reader.get_package_name_and_version(filepath) == ("cached", "2.0")
+                assert SDistMetadataFetcher(sys.executable).get_package_name_and_version(copy_path) == (
+                    "cached",
+                    "2.0",
+                )
+        assert read_mock.call_count == 1
+
     def test_cant_get_egg_info_filename(self, osutils, sdist_reader):
         # In this scenario the setup.py file will fail with an import
         # error so we should verify we try a fallback to look for
@@ -0,0 +1,60 @@
+import os
+import shutil
+import tempfile
+import time
+from unittest import TestCase
+
+from aws_lambda_builders.workflows.python_pip.resolution_lock import ResolutionLock
+
+WHEELS = [{"requirement": "foo==1.0", "filename": "foo-1.0-py3-none-any.whl", "sha256": "abc"}]
+
+
+class TestResolutionLock(TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.directory = os.path.join(self.root, "locks")
+        self.requirements_path = os.path.join(self.root, "requirements.txt")
+        with open(self.requirements_path, "w") as f:
+            f.write("foo>=1.0\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_must_save_and_load_locked_wheels(self):
+        lock = ResolutionLock(self.directory, "key")
+
+        lock.save(WHEELS)
+
+        self.assertEqual(lock.load(), WHEELS)
+        # no temporary file is left behind
+        self.assertEqual(os.listdir(self.directory), ["key.json"])
+
+    def test_must_not_load_missing_or_expired_lock_files(self):
+        lock = ResolutionLock(self.directory, "key", ttl=60)
+        self.assertIsNone(lock.load())
+
+        lock.save(WHEELS)
+        expired = time.time() - 120
+        os.utime(lock.path, (expired, expired))
+
+        self.assertIsNone(lock.load())
+
+    def test_must_remove_expired_lock_files_when_saving(self):
+        old_lock = ResolutionLock(self.directory, "old", ttl=60)
+        old_lock.save(WHEELS)
+        expired = time.time() - 120
+        os.utime(old_lock.path, (expired, expired))
+
+        ResolutionLock(self.directory, "new", ttl=60).save(WHEELS)
+
+        self.assertEqual(os.listdir(self.directory), ["new.json"])
+
+    def test_key_must_depend_on_requirements_runtime_and_architecture(self):
+        key = ResolutionLock.compute_key(self.requirements_path, "python3.12", "x86_64")
+
+        self.assertEqual(key, ResolutionLock.compute_key(self.requirements_path, "python3.12", "x86_64"))
+        self.assertNotEqual(key, ResolutionLock.compute_key(self.requirements_path, "python3.13", "x86_64"))
+        self.assertNotEqual(key, ResolutionLock.compute_key(self.requirements_path, "python3.12", "arm64"))
+        with open(self.requirements_path, "w") as f:
+            f.write("foo>=2.0\n")
+        self.assertNotEqual(key, ResolutionLock.compute_key(self.requirements_path, "python3.12", "x86_64"))
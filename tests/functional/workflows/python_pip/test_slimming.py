@@ -0,0 +1,109 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from aws_lambda_builders.workflows.python_pip.slimming import OPTIONAL_SLIMMING_PATTERNS, slim_dependencies
+
+
+class TestSlimDependencies(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        for path in [
+            "foo/__init__.py",
+            "foo/__init__.pyi",
+            "foo/tests/test_foo.py",
+            "foo/docs/index.rst",
+            "foo/include/foo.h",
+            "foo-1.0.dist-info/METADATA",
+            "foo-1.0.dist-info/RECORD",
+            "bar/__init__.py",
+            "bar/examples/__init__.py",
+            "bar/examples/data.csv",
+            "bar/notes.md",
+            "baz/__init__.py",
+            "baz/tests/__init__.py",
+            "baz/tests/utils.py",
+        ]:
+            self._write(path, "x" * 10)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _write(self, path, content):
+        full_path = os.path.join(self.directory, *path.split("/"))
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        with open(full_path, "w") as f:
+            f.write(content)
+
+    def _list_files(self):
+        return sorted(
+            os.path.relpath(os.path.join(root, name), self.directory).replace(os.sep, "/")
+            for root, _, files in os.walk(self.directory)
+            for name in files
+        )
+
+    def test_removes_files_matching_default_patterns(self):
+        report, removed_paths = slim_dependencies(self.directory)
+
+        self.assertEqual(
+            self._list_files(),
+            [
+                "bar/__init__.py",
+                # a package named like a documentation directory is kept
+                "bar/examples/__init__.py",
+                "bar/examples/data.csv",
+                "bar/notes.md",
+                "baz/__init__.py",
+                # a package named like a test directory is kept
+                "baz/tests/__init__.py",
+                "baz/tests/utils.py",
+                "foo-1.0.dist-info/METADATA",
+                "foo/__init__.py",
+                # optional patterns are not applied by default
+                "foo/include/foo.h",
+            ],
+        )
+        self.assertEqual(
+            removed_paths,
+            {
+                "foo/__init__.pyi",
+                "foo/tests/test_foo.py",
+                "foo/docs/index.rst",
+                "foo-1.0.dist-info/RECORD",
+            },
+        )
+        # directories left empty are removed
+        self.assertFalse(os.path.exists(os.path.join(self.directory, "foo", "tests")))
+        self.assertEqual(report["removed_files"], 4)
+        self.assertEqual(report["removed_bytes"], 40)
+        self.assertEqual(report["by_pattern"]["foo/tests/*"], {"files": 1, "bytes": 10})
+        self.assertEqual(report["by_pattern"]["foo/docs/*"], {"files": 1, "bytes": 10})
+
+    def test_applies_patterns_to_remove_and_keep(self):
+        report, removed_paths = slim_dependencies(
+            self.directory, remove_patterns=["*.md"], keep_patterns=["*.pyi", "foo/tests/*"]
+        )
+
+        self.assertEqual(removed_paths, {"bar/notes.md", "foo/docs/index.rst", "foo-1.0.dist-info/RECORD"})
+        self.assertEqual(report["by_pattern"]["*.md"], {"files": 1, "bytes": 10})
+        self.assertTrue(os.path.isfile(os.path.join(self.directory, "foo", "tests", "test_foo.py")))
+
+    def test_applies_optional_patterns_when_given(self):
+        self._write("qux/test/test_qux.py", "x" * 10)
+
+        report, removed_paths = slim_dependencies(self.directory, remove_patterns=list(OPTIONAL_SLIMMING_PATTERNS))
+
+        self.assertIn("foo/include/foo.h", removed_paths)
+        self.assertIn("qux/test/test_qux.py", removed_paths)
+        self.assertFalse(os.path.exists(os.path.join(self.directory, "foo", "include")))
+        self.assertEqual(report["by_pattern"]["*.h"], {"files": 1, "bytes": 10})
+
+    def test_reports_nothing_removed_from_empty_directory(self):
+        empty_directory = os.path.join(self.directory, "empty")
+        os.makedirs(empty_directory)
+
+        report, removed_paths = slim_dependencies(empty_directory)
+
+        self.assertEqual(report, {"removed_files": 0, "removed_bytes": 0, "by_pattern": {}})
+        self.assertEqual(removed_paths, set())
@@ -1,4 +1,5 @@
 import io
+import os
 
 import pytest
 
@@ -19,3 +20,17 @@ class TestOSUtils(object):
 
         content = osutils.get_file_contents(filename, binary=False, encoding="utf-16")
         assert content == checkmark
+
+    def test_can_move_tree(self, tmpdir, osutils):
+        source = tmpdir.mkdir("source")
+        source.join("new.py").write("new")
+        source.mkdir("package").join("module.py").write("new")
+        destination = tmpdir.mkdir("destination")
+        destination.join("existing.py").write("existing")
+        destination.mkdir("package").join("module.py").write("old")
+
+        osutils.move_tree(str(source), str(destination))
+
+        assert not os.path.exists(str(source))
+        assert sorted(os.listdir(str(destination))) == ["existing.py", "new.py", "package"]
+        assert destination.join("package", "module.py").read() == "new"
@@ -0,0 +1,42 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from aws_lambda_builders.workflows.python_pip.wheel_index import WheelIndex
+
+
+class TestWheelIndex(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        for filename in [
+            "Foo_Bar-1.0-py3-none-any.whl",
+            "foo_bar-2.0-cp312-cp312-manylinux_2_17_x86_64.whl",
+            "foo_bar-2.0-cp312-cp312-manylinux_2_17_aarch64.whl",
+            "foo_bar-2.0-1-cp312-cp312-macosx_11_0_arm64.whl",
+            "foo_bar-3.0.tar.gz",
+            "invalid.whl",
+        ]:
+            open(os.path.join(self.directory, filename), "w").close()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_finds_wheels_by_normalized_name_and_version(self):
+        index = WheelIndex(self.directory)
+
+        self.assertEqual(index.find("foo-bar", "1.0"), ["Foo_Bar-1.0-py3-none-any.whl"])
+        self.assertEqual(
+            index.find("Foo.Bar", "2.0"),
+            [
+                "foo_bar-2.0-1-cp312-cp312-macosx_11_0_arm64.whl",
+                "foo_bar-2.0-cp312-cp312-manylinux_2_17_aarch64.whl",
+                "foo_bar-2.0-cp312-cp312-manylinux_2_17_x86_64.whl",
+            ],
+        )
+
+    def test_finds_nothing_for_unknown_versions_and_sdists(self):
+        index = WheelIndex(self.directory)
+
+        self.assertEqual(index.find("foo-bar", "3.0"), [])
+        self.assertEqual(index.find("invalid", "1.0"), [])
@@ -0,0 +1,52 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from aws_lambda_builders.workflows.python_pip.wheelhouse import Wheelhouse
+
+
+class TestWheelhouse(TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.source_dir = os.path.join(self.root, "source")
+        os.makedirs(self.source_dir)
+        self.wheelhouse = Wheelhouse(os.path.join(self.root, "wheelhouse"), max_size=None)
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def _write_wheel(self, filename, size):
+        with open(os.path.join(self.source_dir, filename), "wb") as f:
+            f.write(b"x" * size)
+
+    def test_must_store_wheels(self):
+        self._write_wheel("foo-1.0-cp39-cp39-linux_x86_64.whl", 10)
+
+        self.wheelhouse.store(self.source_dir, "foo-1.0-cp39-cp39-linux_x86_64.whl")
+
+        self.assertTrue(self.wheelhouse.contains("foo-1.0-cp39-cp39-linux_x86_64.whl"))
+        # no temporary file is left behind
+        self.assertEqual(os.listdir(self.wheelhouse.directory), ["foo-1.0-cp39-cp39-linux_x86_64.whl"])
+
+    def test_must_not_replace_stored_wheels(self):
+        self._write_wheel("foo-1.0-py3-none-any.whl", 10)
+        self.wheelhouse.store(self.source_dir, "foo-1.0-py3-none-any.whl")
+        self._write_wheel("foo-1.0-py3-none-any.whl", 20)
+
+        self.wheelhouse.store(self.source_dir, "foo-1.0-py3-none-any.whl")
+
+        self.assertEqual(os.path.getsize(os.path.join(self.wheelhouse.directory, "foo-1.0-py3-none-any.whl")), 10)
+
+    def test_must_evict_least_recently_used_wheels(self):
+        for index, filename in enumerate(["old-1.0-py3-none-any.whl", "new-1.0-py3-none-any.whl"]):
+            self._write_wheel(filename, 100)
+            self.wheelhouse.store(self.source_dir, filename)
+            os.utime(os.path.join(self.wheelhouse.directory, filename), (index, index))
+        self.wheelhouse.touch("old-1.0-py3-none-any.whl")
+        self.wheelhouse.max_size = 150
+
+        evicted = self.wheelhouse.evict()
+
+        self.assertEqual(evicted, [os.path.join(self.wheelhouse.directory, "new-1.0-py3-none-any.whl")])
+        self.assertEqual(os.listdir(self.wheelhouse.directory), ["old-1.0-py3-none-any.whl"])
@@ -0,0 +1,93 @@
+import os
+import shutil
+import tempfile
+import time
+from unittest import TestCase
+
+from aws_lambda_builders.workflows.python_uv.export_cache import ExportCache
+
+
+class TestExportCache(TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.directory = os.path.join(self.root, "exports")
+        self.pyproject_path = os.path.join(self.root, "pyproject.toml")
+        self.requirements_path = os.path.join(self.root, "lock_requirements.txt")
+        self.destination = os.path.join(self.root, "destination.txt")
+        self._write(self.pyproject_path, '[project]\ndependencies = ["foo"]\n')
+        self._write(self.requirements_path, "foo==1.0\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def _write(self, path, content):
+        with open(path, "w") as f:
+            f.write(content)
+
+    def test_must_save_and_load_exported_requirements(self):
+        cache = ExportCache(self.directory)
+
+        cache.save("key", self.requirements_path)
+
+        self.assertTrue(cache.load("key", self.destination))
+        with open(self.destination) as f:
+            self.assertEqual(f.read(), "foo==1.0\n")
+        # no temporary file is left behind
+        self.assertEqual(os.listdir(self.directory), ["key.txt"])
+
+    def test_must_not_load_missing_or_expired_requirements(self):
+        cache = ExportCache(self.directory, ttl=60)
+        self.assertFalse(cache.load("key", self.destination))
+
+        cache.save("key", self.requirements_path)
+        expired = time.time() - 120
+        os.utime(os.path.join(self.directory, "key.txt"), (expired, expired))
+
+        self.assertFalse(cache.load("key", self.destination))
+        self.assertFalse(os.path.exists(self.destination))
+
+    def test_must_remove_expired_requirements_when_saving(self):
+        cache = ExportCache(self.directory, ttl=60)
+        cache.save("old", self.requirements_path)
+        expired = time.time() - 120
+        os.utime(os.path.join(self.directory, "old.txt"), (expired, expired))
+
+        cache.save("new", self.requirements_path)
+
+        self.assertEqual(os.listdir(self.directory), ["new.txt"])
+
+    def test_key_must_depend_on_project_files_python_version_and_architecture(self):
+        key = ExportCache.compute_key(self.pyproject_path, "3.12", "x86_64")
+
+        self.assertEqual(key, ExportCache.compute_key(self.pyproject_path, "3.12", "x86_64"))
+        self.assertNotEqual(key, ExportCache.compute_key(self.pyproject_path, "3.13", "x86_64"))
+        self.assertNotEqual(key, ExportCache.compute_key(self.pyproject_path, "3.12", "arm64"))
+        self._write(os.path.join(self.root, "uv.lock"), "version = 1\n")
+        locked_key = ExportCache.compute_key(self.pyproject_path, "3.12", "x86_64")
+        self.assertNotEqual(key, locked_key)
+        self._write(self.pyproject_path, '[project]\ndependencies = ["foo>=2"]\n')
+        self.assertNotEqual(locked_key, ExportCache.compute_key(self.pyproject_path, "3.12", "x86_64"))
+
+    def test_key_must_depend_on_resolution_args(self):
+        key = ExportCache.compute_key(self.pyproject_path, "3.12", "x86_64", resolution_args=[])
+
+        self.assertEqual(key, ExportCache.compute_key(self.pyproject_path, "3.12", "x86_64"))
+        for resolution_args in [
+            ["--index-url", "https://mirror.com/simple"],
+            ["--extra-index-url", "https://extra.com/simple"],
+            ["--prerelease", "allow"],
+            ["--resolution", "lowest"],
+            ["--exclude-newer", "2023-01-01"],
+        ]:
+            self.assertNotEqual(
+                key, ExportCache.compute_key(self.pyproject_path, "3.12", "x86_64", resolution_args=resolution_args)
+            )
+
+    def test_key_must_depend_on_given_lock_file(self):
+        workspace_lock_path = os.path.join(self.root, "workspace.lock")
+        self._write(workspace_lock_path, "version = 1\n")
+        key = ExportCache.compute_key(self.pyproject_path, "3.12", "x86_64", workspace_lock_path)
+
+        self.assertNotEqual(key, ExportCache.compute_key(self.pyproject_path, "3.12", "x86_64"))
+        self._write(workspace_lock_path, "version = 2\n")
+        self.assertNotEqual(key, ExportCache.compute_key(self.pyproject_path, "3.12", "x86_64", workspace_lock_path))
@@ -0,0 +1,130 @@
+import logging
+import os
+import shutil
+import tempfile
+
+from unittest import TestCase, mock
+
+from parameterized import parameterized
+
+from aws_lambda_builders.builder import LambdaBuilder
+from aws_lambda_builders.supported_runtimes import NODEJS_RUNTIMES
+
+logger = logging.getLogger("aws_lambda_builders.workflows.nodejs_pnpm.workflow")
+
+
+class TestNodejsPnpmWorkflow(TestCase):
+    """
+    Verifies that `nodejs_pnpm` workflow works by building a Lambda using PNPM
+    """
+
+    TEST_DATA_FOLDER = os.path.join(os.path.dirname(__file__), "testdata")
+
+    SUPPORTED_RUNTIMES = [(runtime,) for runtime in NODEJS_RUNTIMES]
+
+    def setUp(self):
+        self.artifacts_dir = tempfile.mkdtemp()
+        self.scratch_dir = tempfile.mkdtemp()
+        self.dependencies_dir = tempfile.mkdtemp()
+        self.store_dir = tempfile.mkdtemp()
+
+        self.builder = LambdaBuilder(language="nodejs", dependency_manager="pnpm", application_framework=None)
+
+    def tearDown(self):
+        shutil.rmtree(self.artifacts_dir)
+        shutil.rmtree(self.scratch_dir)
+        shutil.rmtree(self.dependencies_dir)
+        shutil.rmtree(self.store_dir)
+
+    @parameterized.expand(SUPPORTED_RUNTIMES)
+    def test_builds_project_without_dependencies(self, runtime):
+        source_dir = os.path.join(self.TEST_DATA_FOLDER, "no-deps")
+
+        self.builder.build(
+            source_dir,
+            self.artifacts_dir,
+            self.scratch_dir,
+            os.path.join(source_dir, "package.json"),
+            runtime=runtime,
+        )
+
+        self.assertIn("included.js", os.listdir(self.artifacts_dir))
+        self.assertIn("package.json", os.listdir(self.artifacts_dir))
+
+    @parameterized.expand(SUPPORTED_RUNTIMES)
+    def test_builds_project_without_manifest(self, runtime):
+        source_dir = os.path.join(self.TEST_DATA_FOLDER, "no-manifest")
+
+        with mock.patch.object(logger, "warning") as mock_warning:
+            self.builder.build(
+                source_dir,
+                self.artifacts_dir,
+                self.scratch_dir,
+                os.path.join(source_dir, "package.json"),
+                runtime=runtime,
+            )
+
+        mock_warning.assert_called_once_with("package.json file not found. Continuing the build without dependencies.")
+        self.assertEqual({"app.js"}, set(os.listdir(self.artifacts_dir)))
+
+    @parameterized.expand(SUPPORTED_RUNTIMES)
+    def test_builds_project_with_production_dependencies_in_a_flat_layout(self, runtime):
+        source_dir = os.path.join(self.TEST_DATA_FOLDER, "pnpm-deps")
+
+        self.builder.build(
+            source_dir,
+            self.artifacts_dir,
+            self.scratch_dir,
+            os.path.join(source_dir, "package.json"),
+            runtime=runtime,
+            options={"pnpm_store_dir": self.store_dir, "pnpm_package_import_method": "hardlink"},
+        )
+
+        node_modules = os.path.join(self.artifacts_dir, "node_modules")
+        self.assertIn("minimal-request-promise", os.listdir(node_modules))
+        self.assertNotIn("left-pad", os.listdir(node_modules))
+        self.assertNotIn(".modules.yaml", os.listdir(node_modules))
+
+        # the package is a real directory, with its files hardlinked from the store
+        package_dir = os.path.join(node_modules, "minimal-request-promise")
+        self.assertFalse(os.path.islink(package_dir))
+        self.assertGreater(os.stat(os.path.join(package_dir, "package.json")).st_nlink, 1)
+        self.assertTrue(os.listdir(self.store_dir))
+
+    @parameterized.expand(SUPPORTED_RUNTIMES)
+    def test_builds_project_with_dependencies_dir(self, runtime):
+        source_dir = os.path.join(self.TEST_DATA_FOLDER, "pnpm-deps")
+
+        self.builder.build(
+            source_dir,
+            self.artifacts_dir,
+            self.scratch_dir,
+            os.path.join(source_dir, "package.json"),
+            runtime=runtime,
+            dependencies_dir=self.dependencies_dir,
+            combine_dependencies=False,
+        )
+
+        self.assertNotIn("node_modules", os.listdir(self.artifacts_dir))
+        self.assertIn("minimal-request-promise", os.listdir(os.path.join(self.dependencies_dir, "node_modules")))
+
+    @parameterized.expand(SUPPORTED_RUNTIMES)
+    def test_builds_package_of_a_workspace_from_the_workspace(self, runtime):
+        source_dir = os.path.join(self.TEST_DATA_FOLDER, "workspace", "packages", "hello")
+
+        self.builder.build(
+            source_dir,
+            self.artifacts_dir,
+            self.scratch_dir,
+            os.path.join(source_dir, "package.json"),
+            runtime=runtime,
+            options={"pnpm_store_dir": self.store_dir},
+        )
+
+        node_modules = os.path.join(self.artifacts_dir, "node_modules")
+        self.assertIn("minimal-request-promise", os.listdir(node_modules))
+        self.assertNotIn("left-pad", os.listdir(node_modules))
+        # the workspace package is copied rather than linked to the workspace
+        self.assertFalse(os.path.islink(os.path.join(node_modules, "shared")))
+        self.assertIn("included.js", os.listdir(os.path.join(node_modules, "shared")))
+        self.assertNotIn("pnpm-deploy", os.listdir(self.scratch_dir))
@@ -0,0 +1 @@
+//included
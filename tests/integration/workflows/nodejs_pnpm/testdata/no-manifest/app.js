@@ -0,0 +1,2 @@
+const HELLO_WORLD = "Hello world!"
+console.log(HELLO_WORLD)
\ No newline at end of file
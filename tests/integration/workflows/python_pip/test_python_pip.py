@@ -12,7 +12,7 @@ from parameterized import parameterized_class
 from aws_lambda_builders.builder import LambdaBuilder
 from aws_lambda_builders.exceptions import WorkflowFailedError
 from aws_lambda_builders.utils import which
-from aws_lambda_builders.workflows.python_pip.utils import EXPERIMENTAL_FLAG_BUILD_PERFORMANCE
+from aws_lambda_builders.utils import EXPERIMENTAL_FLAG_BUILD_PERFORMANCE
 
 logger = logging.getLogger("aws_lambda_builders.workflows.python_pip.workflow")
 IS_WINDOWS = platform.system().lower() == "windows"
@@ -257,6 +257,51 @@ class TestPythonPipWorkflow(TestCase):
         for f in expected_files:
             self.assertIn(f, output_files)
 
+    @skipIf(IS_WINDOWS, "Skip in windows tests")
+    def test_must_produce_identical_artifacts_when_normalized(self):
+        source_dir = os.path.join(self.source_dir, "local-dependencies")
+        manifest = os.path.join(source_dir, "requirements.txt")
+        with open(manifest, "w") as f:
+            f.write(str(source_dir))
+
+        trees = []
+        digests = []
+        for _ in range(2):
+            artifacts_dir = tempfile.mkdtemp()
+            scratch_dir = tempfile.mkdtemp()
+            self.addCleanup(shutil.rmtree, artifacts_dir)
+            self.addCleanup(shutil.rmtree, scratch_dir)
+            report = self.builder.build(
+                source_dir,
+                artifacts_dir,
+                scratch_dir,
+                manifest,
+                runtime=self.runtime,
+                experimental_flags=self.experimental_flags,
+                normalize_artifacts=True,
+                artifact_manifest_path=os.path.join(scratch_dir, "artifacts.json"),
+            )
+            trees.append(self._snapshot_tree(artifacts_dir))
+            digests.append(report["artifact_manifest"]["digest"])
+
+        self.assertIn("local_package", {path.split(os.sep)[0] for path in trees[0]})
+        self.assertEqual(trees[0], trees[1])
+        self.assertEqual(digests[0], digests[1])
+
+    @staticmethod
+    def _snapshot_tree(directory):
+        snapshot = {}
+        for root, dirs, files in os.walk(directory):
+            for name in dirs + files:
+                path = os.path.join(root, name)
+                path_stat = os.lstat(path)
+                content = None
+                if os.path.isfile(path):
+                    with open(path, "rb") as f:
+                        content = f.read()
+                snapshot[os.path.relpath(path, directory)] = (path_stat.st_mode, path_stat.st_mtime_ns, content)
+        return snapshot
+
     @skipIf(IS_WINDOWS, "Skip in windows tests")
     def test_must_resolve_unknown_package_name(self):
         self.builder.build(
@@ -11,7 +11,7 @@ from parameterized import parameterized_class
 from aws_lambda_builders.builder import LambdaBuilder
 from aws_lambda_builders.exceptions import WorkflowFailedError
 from aws_lambda_builders.utils import which
-from aws_lambda_builders.workflows.python_uv.utils import EXPERIMENTAL_FLAG_BUILD_PERFORMANCE
+from aws_lambda_builders.utils import EXPERIMENTAL_FLAG_BUILD_PERFORMANCE
 
 IS_WINDOWS = platform.system().lower() == "windows"
 
@@ -13,6 +13,7 @@ from aws_lambda_builders.actions import (
     CleanUpAction,
     DependencyManager,
     LinkSinglePathAction,
+    LinkSourceTreeAction,
 )
 
 
@@ -64,6 +65,18 @@ class TestCopySourceAction_execute(TestCase):
         copytree_mock.assert_called_with(source_dir, dest_dir, ignore=ANY, maintain_symlinks=False)
 
 
+class TestLinkSourceTreeAction_execute(TestCase):
+    @patch("aws_lambda_builders.actions.utils.create_symlink_tree")
+    def test_must_link(self, create_symlink_tree_mock):
+        action = LinkSourceTreeAction("source", "dest", excludes=[".git"], materialize=["package.json"])
+        action.execute()
+
+        create_symlink_tree_mock.assert_called_once_with("source", "dest", ignore=ANY, materialize=ANY)
+        _, kwargs = create_symlink_tree_mock.call_args
+        self.assertEqual(kwargs["ignore"]("source", [".git", "app.js"]), {".git"})
+        self.assertEqual(kwargs["materialize"]("source", ["package.json", "app.js"]), {"package.json"})
+
+
 class TestCopyDependenciesAction_execute(TestCase):
     @patch("aws_lambda_builders.actions.os.makedirs")
     @patch("aws_lambda_builders.actions.os.path.dirname")
@@ -1,10 +1,12 @@
 import itertools
+import os
 from unittest import TestCase
 from unittest.mock import Mock, call, patch
 
 from parameterized import parameterized
 
-from aws_lambda_builders.builder import LambdaBuilder
+from aws_lambda_builders.builder import LambdaBuilder, WatchBuildResult
+from aws_lambda_builders.exceptions import WorkflowFailedError
 from aws_lambda_builders.registry import DEFAULT_REGISTRY
 from aws_lambda_builders.workflow import BaseWorkflow, BuildDirectory, BuildInSourceSupport, Capability
 
@@ -169,6 +171,8 @@ class TestLambdaBuilder_build(TestCase):
             is_building_layer=is_building_layer,
             experimental_flags=experimental_flags,
             build_in_source=build_in_source,
+            artifact_manifest_path="artifact_manifest_path",
+            normalize_artifacts=True,
         )
 
         workflow_cls.assert_called_with(
@@ -189,6 +193,9 @@ class TestLambdaBuilder_build(TestCase):
             is_building_layer=is_building_layer,
             experimental_flags=experimental_flags,
             build_in_source=build_in_source,
+            artifact_manifest_path="artifact_manifest_path",
+            normalize_artifacts=True,
+            cache_dir=None,
         )
         workflow_instance.run.assert_called_once()
         os_mock.path.exists.assert_called_once_with("scratch_dir")
@@ -196,3 +203,167 @@ class TestLambdaBuilder_build(TestCase):
             os_mock.makedirs.assert_not_called()
         else:
             os_mock.makedirs.assert_called_once_with("scratch_dir")
+
+    @patch("aws_lambda_builders.builder.ScratchDirectoryManager")
+    @patch("aws_lambda_builders.builder.os")
+    @patch("aws_lambda_builders.builder.get_workflow")
+    def test_must_manage_scratch_dir_with_cache_dir(self, get_workflow_mock, os_mock, scratch_manager_mock):
+        workflow_cls = Mock()
+        workflow_instance = workflow_cls.return_value = Mock()
+        get_workflow_mock.return_value = workflow_cls
+        scratch_manager = scratch_manager_mock.return_value
+
+        builder = LambdaBuilder(self.lang, self.lang_framework, self.app_framework, supported_workflows=[])
+        builder.build(
+            "source_dir", "artifacts_dir", "scratch_dir", "manifest_path", cache_dir="cache_dir", cache_max_size=10
+        )
+
+        scratch_manager_mock.assert_called_once_with("cache_dir", max_size=10)
+        scratch_manager.prepare.assert_called_once_with("scratch_dir", "source_dir")
+        self.assertEqual(workflow_cls.call_args[1]["cache_dir"], "cache_dir")
+        workflow_instance.run.assert_called_once()
+        scratch_manager.cleanup.assert_called_once_with("scratch_dir")
+
+    @patch("aws_lambda_builders.builder.ScratchDirectoryManager")
+    @patch("aws_lambda_builders.builder.os")
+    @patch("aws_lambda_builders.builder.get_workflow")
+    def test_must_cleanup_scratch_dir_when_build_fails(self, get_workflow_mock, os_mock, scratch_manager_mock):
+        workflow_cls = Mock()
+        workflow_cls.return_value.run.side_effect = ValueError("failed")
+        get_workflow_mock.return_value = workflow_cls
+        scratch_manager = scratch_manager_mock.return_value
+
+        builder = LambdaBuilder(self.lang, self.lang_framework, self.app_framework, supported_workflows=[])
+        with self.assertRaises(ValueError):
+            builder.build("source_dir", "artifacts_dir", "scratch_dir", "manifest_path", cache_dir="cache_dir")
+
+        scratch_manager.cleanup.assert_called_once_with("scratch_dir")
+
+    @patch("aws_lambda_builders.builder.ScratchDirectoryManager")
+    @patch("aws_lambda_builders.builder.os")
+    @patch("aws_lambda_builders.builder.get_workflow")
+    def test_must_not_manage_scratch_dir_without_cache_dir(self, get_workflow_mock, os_mock, scratch_manager_mock):
+        get_workflow_mock.return_value = Mock()
+
+        builder = LambdaBuilder(self.lang, self.lang_framework, self.app_framework, supported_workflows=[])
+        builder.build("source_dir", "artifacts_dir", "scratch_dir", "manifest_path")
+
+        scratch_manager_mock.assert_not_called()
+
+    @patch("aws_lambda_builders.builder.os")
+    @patch("aws_lambda_builders.builder.get_workflow")
+    def test_must_return_build_report(self, get_workflow_mock, os_mock):
+        workflow_cls = Mock()
+        workflow_cls.return_value.run.return_value = {"artifact_manifest": {"digest": "digest"}}
+        get_workflow_mock.return_value = workflow_cls
+
+        builder = LambdaBuilder(self.lang, self.lang_framework, self.app_framework, supported_workflows=[])
+        report = builder.build("source_dir", "artifacts_dir", "scratch_dir", "manifest_path")
+
+        self.assertEqual(report, {"artifact_manifest": {"digest": "digest"}})
+
+
+class TestLambdaBuilder_watch(TestCase):
+    def setUp(self):
+        self.stop_event = Mock()
+        self.stop_event.is_set.return_value = False
+        self.changes = []
+
+        def wait_for_changes(timeout):
+            if not self.changes:
+                self.stop_event.is_set.return_value = True
+                return set()
+            return self.changes.pop(0)
+
+        self.watcher = Mock()
+        self.watcher.wait_for_changes.side_effect = wait_for_changes
+        self.on_build = Mock()
+
+    @patch("aws_lambda_builders.builder.create_file_watcher")
+    @patch("aws_lambda_builders.builder.os.makedirs")
+    @patch("aws_lambda_builders.builder.get_workflow")
+    def test_must_build_then_rebuild_incrementally(self, get_workflow_mock, makedirs_mock, create_watcher_mock):
+        workflow_cls = Mock()
+        workflow = workflow_cls.return_value
+        workflow.run_incremental.return_value = ["copy"]
+        get_workflow_mock.return_value = workflow_cls
+        create_watcher_mock.return_value = self.watcher
+        self.changes = [set(), {"source_dir/app.py"}]
+
+        builder = LambdaBuilder("python", "pip", None, supported_workflows=[])
+        builder.watch(
+            "source_dir",
+            "artifacts_dir",
+            "scratch_dir",
+            "source_dir/requirements.txt",
+            on_build=self.on_build,
+            stop_event=self.stop_event,
+            runtime="python3.12",
+        )
+
+        workflow_cls.assert_called_once_with(
+            "source_dir", "artifacts_dir", "scratch_dir", "source_dir/requirements.txt", runtime="python3.12"
+        )
+        workflow.run.assert_called_once_with()
+        workflow.run_incremental.assert_called_once_with({"source_dir/app.py"})
+        self.assertEqual(
+            self.on_build.call_args_list,
+            [
+                call(WatchBuildResult(changed_paths=None, actions=workflow.actions, error=None)),
+                call(WatchBuildResult(changed_paths={"source_dir/app.py"}, actions=["copy"], error=None)),
+            ],
+        )
+        self.watcher.close.assert_called_once_with()
+
+    @patch("aws_lambda_builders.builder.create_file_watcher")
+    @patch("aws_lambda_builders.builder.os.makedirs")
+    @patch("aws_lambda_builders.builder.get_workflow")
+    def test_must_keep_running_full_builds_until_one_succeeds(
+        self, get_workflow_mock, makedirs_mock, create_watcher_mock
+    ):
+        workflow_cls = Mock()
+        workflow = workflow_cls.return_value
+        error = WorkflowFailedError(workflow_name="workflow", action_name="action", reason="failed")
+        workflow.run.side_effect = [error, None]
+        get_workflow_mock.return_value = workflow_cls
+        create_watcher_mock.return_value = self.watcher
+        self.changes = [{"source_dir/app.py"}, {"source_dir/app.py"}]
+
+        builder = LambdaBuilder("python", "pip", None, supported_workflows=[])
+        builder.watch(
+            "source_dir",
+            "artifacts_dir",
+            "scratch_dir",
+            "source_dir/requirements.txt",
+            on_build=self.on_build,
+            stop_event=self.stop_event,
+        )
+
+        self.assertEqual(workflow.run.call_count, 2)
+        workflow.run_incremental.assert_called_once_with({"source_dir/app.py"})
+        self.assertEqual(self.on_build.call_args_list[0], call(WatchBuildResult(None, [], error)))
+
+    @patch("aws_lambda_builders.builder.create_file_watcher")
+    @patch("aws_lambda_builders.builder.os.makedirs")
+    @patch("aws_lambda_builders.builder.get_workflow")
+    def test_must_watch_manifest_directory_outside_source(self, get_workflow_mock, makedirs_mock, create_watcher_mock):
+        get_workflow_mock.return_value = Mock()
+        create_watcher_mock.return_value = self.watcher
+
+        builder = LambdaBuilder("python", "pip", None, supported_workflows=[])
+        builder.watch(
+            "source_dir",
+            "artifacts_dir",
+            "scratch_dir",
+            "manifest_dir/requirements.txt",
+            stop_event=self.stop_event,
+            dependencies_dir="dependencies_dir",
+        )
+
+        roots, kwargs = create_watcher_mock.call_args
+        self.assertEqual(
+            [(root.path, root.recursive) for root in roots[0]],
+            [(os.path.abspath("source_dir"), True), (os.path.abspath("manifest_dir"), False)],
+        )
+        self.assertEqual(kwargs["excluded_paths"], ["artifacts_dir", "scratch_dir", "dependencies_dir"])
+        self.watcher.close.assert_called_once_with()
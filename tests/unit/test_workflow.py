@@ -1,7 +1,9 @@
 import os
+import shutil
 import sys
+import tempfile
 from unittest import TestCase
-from unittest.mock import Mock, MagicMock, call
+from unittest.mock import Mock, MagicMock, call, patch
 
 from parameterized import parameterized
 
@@ -18,7 +20,7 @@ from aws_lambda_builders.exceptions import (
     UnsupportedRuntimeError,
     UnsupportedArchitectureError,
 )
-from aws_lambda_builders.actions import ActionFailedError
+from aws_lambda_builders.actions import ActionFailedError, CopySourceAction, LinkSourceTreeAction, Purpose
 
 
 class TestRegisteringWorkflows(TestCase):
@@ -268,6 +270,69 @@ class TestBaseWorkflow_run(TestCase):
         )
         self.assertTrue(self.validator_mock.validate.call_count, 1)
 
+    def test_must_report_what_actions_report(self):
+        self.mock_binaries()
+        reporting_action = Mock(report={"slimming": {"removed_files": 1}})
+        self.work.actions = [Mock(), reporting_action]
+
+        report = self.work.run()
+
+        self.assertEqual(report, {"slimming": {"removed_files": 1}})
+
+    @patch("aws_lambda_builders.workflow.write_artifact_manifest")
+    def test_must_write_artifact_manifest_after_actions(self, write_manifest_mock):
+        self.mock_binaries()
+        write_manifest_mock.return_value = {"path": "manifest.json", "digest": "digest", "file_count": 1}
+        self.work.artifact_manifest_path = "manifest.json"
+        self.work.actions = [Mock()]
+
+        report = self.work.run()
+
+        write_manifest_mock.assert_called_once_with("artifacts_dir", "manifest.json")
+        self.assertEqual(report, {"artifact_manifest": write_manifest_mock.return_value})
+
+    @patch("aws_lambda_builders.workflow.os.path.isdir")
+    @patch("aws_lambda_builders.workflow.normalize_artifacts")
+    @patch("aws_lambda_builders.workflow.write_artifact_manifest")
+    def test_must_normalize_artifacts_before_writing_manifest(self, write_manifest_mock, normalize_mock, isdir_mock):
+        self.mock_binaries()
+        isdir_mock.return_value = True
+        calls = Mock()
+        calls.attach_mock(normalize_mock, "normalize")
+        calls.attach_mock(write_manifest_mock, "write_manifest")
+        self.work.normalize_artifacts = True
+        self.work.artifact_manifest_path = "manifest.json"
+        self.work.actions = [Mock()]
+
+        self.work.run()
+
+        self.assertEqual(
+            calls.mock_calls,
+            [call.normalize("artifacts_dir"), call.write_manifest("artifacts_dir", "manifest.json")],
+        )
+
+    @patch("aws_lambda_builders.workflow.write_artifact_manifest")
+    def test_must_not_write_artifact_manifest_by_default(self, write_manifest_mock):
+        self.mock_binaries()
+        self.work.actions = [Mock()]
+
+        report = self.work.run()
+
+        write_manifest_mock.assert_not_called()
+        self.assertEqual(report, {})
+
+    @patch("aws_lambda_builders.workflow.write_artifact_manifest")
+    def test_must_raise_if_artifact_manifest_cannot_be_written(self, write_manifest_mock):
+        self.mock_binaries()
+        write_manifest_mock.side_effect = OSError("disk full")
+        self.work.artifact_manifest_path = "manifest.json"
+        self.work.actions = [Mock()]
+
+        with self.assertRaises(WorkflowFailedError) as ex:
+            self.work.run()
+
+        self.assertIn("ArtifactManifest", str(ex.exception))
+
     def test_must_fail_workflow_binary_resolution_failure(self):
         self.mock_binaries()
         action_mock = Mock()
@@ -397,6 +462,147 @@ class TestBaseWorkflow_run(TestCase):
         self.assertIn("Architecture invalid_arch is not supported for runtime python3.12", str(ex.exception))
 
 
+class TestBaseWorkflow_run_incremental(TestCase):
+    class MyWorkflow(BaseWorkflow):
+        __TESTING__ = True
+        NAME = "MyWorkflow"
+        CAPABILITY = Capability(
+            language="test", dependency_manager="testframework", application_framework="appframework"
+        )
+        DEFAULT_BUILD_DIR = BuildDirectory.SCRATCH
+        BUILD_IN_SOURCE_SUPPORT = BuildInSourceSupport.NOT_SUPPORTED
+        DEPENDENCY_FILES = ("package-lock.json",)
+
+    def setUp(self):
+        self.work = self.MyWorkflow(
+            "source_dir",
+            "artifacts_dir",
+            "scratch_dir",
+            os.path.join("source_dir", "requirements.txt"),
+            runtime="runtime",
+        )
+        self.resolve = Mock(PURPOSE=Purpose.RESOLVE_DEPENDENCIES)
+        self.copy_source = Mock(PURPOSE=Purpose.COPY_SOURCE)
+        self.compile_source = Mock(PURPOSE=Purpose.COMPILE_SOURCE)
+        self.work.actions = [self.resolve, self.copy_source, self.compile_source]
+
+    def test_must_skip_dependency_actions_for_source_changes(self):
+        actions = self.work.run_incremental([os.path.join("source_dir", "app.py")])
+
+        self.assertEqual(actions, [self.copy_source, self.compile_source])
+        self.resolve.execute.assert_not_called()
+        self.copy_source.execute.assert_called_once_with()
+        self.compile_source.execute.assert_called_once_with()
+
+    @parameterized.expand(
+        [
+            (os.path.join("source_dir", "requirements.txt"),),
+            (os.path.abspath(os.path.join("source_dir", "requirements.txt")),),
+            (os.path.join("source_dir", "package-lock.json"),),
+            ("source_dir",),
+        ]
+    )
+    def test_must_run_all_actions_for_dependency_changes(self, changed_path):
+        actions = self.work.run_incremental([os.path.join("source_dir", "app.py"), changed_path])
+
+        self.assertEqual(actions, [self.resolve, self.copy_source, self.compile_source])
+        self.resolve.execute.assert_called_once_with()
+
+    def test_must_skip_dependency_actions_for_lock_files_of_other_workflows(self):
+        actions = self.work.run_incremental([os.path.join("source_dir", "go.sum")])
+
+        self.assertEqual(actions, [self.copy_source, self.compile_source])
+
+    def test_must_remove_the_artifacts_of_deleted_sources(self):
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+        source_dir = os.path.join(root, "source")
+        artifacts_dir = os.path.join(root, "artifacts")
+        for directory in (source_dir, artifacts_dir):
+            os.makedirs(os.path.join(directory, "node_modules"))
+            os.makedirs(os.path.join(directory, "lib"))
+            for path in ("app.py", os.path.join("lib", "util.py")):
+                with open(os.path.join(directory, path), "w") as f:
+                    f.write("")
+        # app.py was renamed to main.py, and lib and node_modules were deleted
+        os.rename(os.path.join(source_dir, "app.py"), os.path.join(source_dir, "main.py"))
+        shutil.rmtree(os.path.join(source_dir, "lib"))
+        os.rmdir(os.path.join(source_dir, "node_modules"))
+        self.work.source_dir = source_dir
+        self.work.artifacts_dir = artifacts_dir
+
+        self.work.run_incremental(
+            [os.path.join(source_dir, name) for name in ("app.py", "main.py", "lib", "node_modules", "missing.py")]
+        )
+
+        self.assertEqual(sorted(os.listdir(artifacts_dir)), ["node_modules"])
+
+    @parameterized.expand([(CopySourceAction,), (LinkSourceTreeAction,)])
+    def test_must_build_from_scratch_if_deleted_sources_are_staged_outside_artifacts(self, stage_action_class):
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+        source_dir, scratch_dir, artifacts_dir = (
+            os.path.join(root, name) for name in ("source", "scratch", "artifacts")
+        )
+        os.makedirs(source_dir)
+        with open(os.path.join(source_dir, "App.java"), "w") as f:
+            f.write("")
+        with open(os.path.join(source_dir, "Util.java"), "w") as f:
+            f.write("")
+        self.work.source_dir = source_dir
+        self.work.artifacts_dir = artifacts_dir
+        stage_source = stage_action_class(source_dir, scratch_dir, excludes=[".aws-sam"])
+        self.work.actions = [stage_source, self.compile_source]
+        # the previous build staged both sources and compiled them
+        stage_source.execute()
+        os.makedirs(os.path.join(scratch_dir, "target"))
+        os.makedirs(artifacts_dir)
+        for name in ("App.class", "Util.class"):
+            for directory in (os.path.join(scratch_dir, "target"), artifacts_dir):
+                with open(os.path.join(directory, name), "w") as f:
+                    f.write("")
+        os.remove(os.path.join(source_dir, "Util.java"))
+
+        actions = self.work.run_incremental([os.path.join(source_dir, "Util.java")])
+
+        self.assertEqual([action.NAME for action in actions[:2]], ["CleanUp", "CleanUp"])
+        self.assertEqual(actions[2:], [stage_source, self.compile_source])
+        self.assertEqual(os.listdir(scratch_dir), ["App.java"])
+        self.assertEqual(os.listdir(artifacts_dir), [])
+        self.compile_source.execute.assert_called_once_with()
+
+    def test_must_not_build_from_scratch_if_deleted_sources_were_not_staged(self):
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+        source_dir, scratch_dir = os.path.join(root, "source"), os.path.join(root, "scratch")
+        os.makedirs(os.path.join(scratch_dir, ".aws-sam"))
+        self.work.source_dir = source_dir
+        self.work.artifacts_dir = os.path.join(root, "artifacts")
+        self.work.actions = [CopySourceAction(source_dir, scratch_dir, excludes=[".aws-sam"]), self.compile_source]
+
+        actions = self.work.get_actions_for_changes(
+            [os.path.join(source_dir, ".aws-sam"), os.path.join(source_dir, "App.java")]
+        )
+
+        self.assertEqual(actions, self.work.actions)
+
+    def test_must_run_all_actions_if_dependencies_are_moved(self):
+        move = Mock(PURPOSE=Purpose.MOVE_DEPENDENCIES)
+        self.work.actions = [self.resolve, move, self.copy_source]
+
+        actions = self.work.run_incremental([os.path.join("source_dir", "app.py")])
+
+        self.assertEqual(actions, [self.resolve, move, self.copy_source])
+
+    def test_must_raise_if_action_failed(self):
+        self.copy_source.execute.side_effect = ActionFailedError()
+
+        with self.assertRaises(WorkflowFailedError):
+            self.work.run_incremental([os.path.join("source_dir", "app.py")])
+
+        self.compile_source.execute.assert_not_called()
+
+
 class TestBaseWorkflow_repr(TestCase):
     class MyWorkflow(BaseWorkflow):
         __TESTING__ = True
@@ -9,7 +9,7 @@ from aws_lambda_builders.workflows.java_maven.actions import (
     JavaMavenCopyDependencyAction,
     JavaMavenCopyLayerArtifactsAction,
 )
-from aws_lambda_builders.actions import CopySourceAction, CleanUpAction
+from aws_lambda_builders.actions import CopySourceAction, CleanUpAction, LinkSourceTreeAction
 from aws_lambda_builders.workflows.java_maven.maven_resolver import MavenResolver
 from aws_lambda_builders.workflows.java_maven.maven_validator import MavenValidator
 from aws_lambda_builders.architecture import ARM64
@@ -29,6 +29,15 @@ class TestJavaMavenWorkflow(TestCase):
         self.assertIsInstance(workflow.actions[2], JavaMavenCopyDependencyAction)
         self.assertIsInstance(workflow.actions[3], JavaMavenCopyArtifactsAction)
 
+    def test_workflow_links_source_with_experimental_build_performance(self):
+        workflow = JavaMavenWorkflow(
+            "source", "artifacts", "scratch_dir", "manifest", experimental_flags=["experimentalBuildPerformance"]
+        )
+        self.assertIsInstance(workflow.actions[0], LinkSourceTreeAction)
+        self.assertEqual(workflow.actions[0].excludes, (".aws-sam", ".git"))
+        self.assertEqual(workflow.actions[0].materialize, ("target",))
+        self.assertIsInstance(workflow.actions[1], JavaMavenBuildAction)
+
     def test_workflow_sets_up_resolvers(self):
         workflow = JavaMavenWorkflow("source", "artifacts", "scratch_dir", "manifest")
         resolvers = workflow.get_resolvers()
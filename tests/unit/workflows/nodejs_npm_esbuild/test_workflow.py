@@ -10,6 +10,7 @@ from aws_lambda_builders.actions import (
     MoveDependenciesAction,
     LinkSourceAction,
     LinkSinglePathAction,
+    LinkSourceTreeAction,
 )
 from aws_lambda_builders.architecture import ARM64
 from aws_lambda_builders.workflows.nodejs_npm.actions import (
@@ -69,6 +70,45 @@ class TestNodejsNpmEsbuildWorkflow(TestCase):
             [call("source/package-lock.json"), call("source/npm-shrinkwrap.json")]
         )
 
+    def test_workflow_links_source_with_experimental_build_performance(self):
+        self.osutils.file_exists.side_effect = [True, False, False]
+
+        workflow = NodejsNpmEsbuildWorkflow(
+            "source",
+            "artifacts",
+            "scratch_dir",
+            "source/manifest",
+            osutils=self.osutils,
+            experimental_flags=["experimentalBuildPerformance"],
+            options={"minify": True},
+        )
+
+        self.assertEqual(len(workflow.actions), 3)
+        self.assertIsInstance(workflow.actions[0], LinkSourceTreeAction)
+        self.assertEqual(
+            workflow.actions[0].materialize, ("package.json", "package-lock.json", "npm-shrinkwrap.json", ".npmrc")
+        )
+        self.assertIsInstance(workflow.actions[1], NodejsNpmInstallAction)
+        self.assertIsInstance(workflow.actions[2], EsbuildBundleAction)
+        self.assertEqual(workflow.actions[2]._bundler_config, {"minify": True, "preserve_symlinks": True})
+        self.assertEqual(workflow.options, {"minify": True})
+
+    def test_workflow_keeps_the_configured_preserve_symlinks_with_experimental_build_performance(self):
+        self.osutils.file_exists.side_effect = [True, False, False]
+
+        workflow = NodejsNpmEsbuildWorkflow(
+            "source",
+            "artifacts",
+            "scratch_dir",
+            "source/manifest",
+            osutils=self.osutils,
+            experimental_flags=["experimentalBuildPerformance"],
+            options={"preserve_symlinks": False},
+        )
+
+        self.assertIsInstance(workflow.actions[0], LinkSourceTreeAction)
+        self.assertEqual(workflow.actions[2]._bundler_config, {"preserve_symlinks": False})
+
     def test_sets_up_esbuild_search_path_from_npm_bin(self):
         self.popen.out = b"project/"
 
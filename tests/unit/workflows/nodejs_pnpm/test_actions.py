@@ -0,0 +1,218 @@
+import itertools
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch, call
+from parameterized import parameterized
+
+from aws_lambda_builders.actions import ActionFailedError
+from aws_lambda_builders.workflows.nodejs_pnpm.actions import (
+    NodejsPnpmDeployAction,
+    NodejsPnpmInstallAction,
+    NodejsPnpmrcAndLockfileCopyAction,
+    NodejsPnpmStateCleanUpAction,
+)
+from aws_lambda_builders.workflows.nodejs_pnpm.pnpm import PnpmExecutionError
+
+
+class TestNodejsPnpmInstallAction(TestCase):
+    @patch("aws_lambda_builders.workflows.nodejs_pnpm.pnpm.SubprocessPnpm")
+    def test_installs_production_dependencies_in_a_hoisted_layout(self, SubprocessPnpmMock):
+        subprocess_pnpm = SubprocessPnpmMock.return_value
+
+        action = NodejsPnpmInstallAction("artifacts", subprocess_pnpm=subprocess_pnpm)
+
+        action.execute()
+
+        expected_args = ["install", "--prod", "--ignore-workspace", "--config.node-linker=hoisted"]
+
+        subprocess_pnpm.run.assert_called_with(expected_args, cwd="artifacts")
+
+    @patch("aws_lambda_builders.workflows.nodejs_pnpm.pnpm.SubprocessPnpm")
+    def test_passes_the_store_import_method_and_frozen_lockfile(self, SubprocessPnpmMock):
+        subprocess_pnpm = SubprocessPnpmMock.return_value
+
+        action = NodejsPnpmInstallAction(
+            "artifacts",
+            subprocess_pnpm=subprocess_pnpm,
+            store_dir="/cache/pnpm-store",
+            package_import_method="hardlink",
+            frozen_lockfile=True,
+        )
+
+        action.execute()
+
+        expected_args = [
+            "install",
+            "--prod",
+            "--ignore-workspace",
+            "--config.node-linker=hoisted",
+            "--frozen-lockfile",
+            "--store-dir",
+            "/cache/pnpm-store",
+            "--config.package-import-method=hardlink",
+        ]
+
+        subprocess_pnpm.run.assert_called_with(expected_args, cwd="artifacts")
+
+    @patch("aws_lambda_builders.workflows.nodejs_pnpm.pnpm.SubprocessPnpm")
+    def test_raises_action_failed_for_an_unknown_import_method(self, SubprocessPnpmMock):
+        subprocess_pnpm = SubprocessPnpmMock.return_value
+
+        action = NodejsPnpmInstallAction("artifacts", subprocess_pnpm=subprocess_pnpm, package_import_method="symlink")
+
+        with self.assertRaises(ActionFailedError) as raised:
+            action.execute()
+
+        self.assertEqual(
+            raised.exception.args[0],
+            "pnpm_package_import_method must be one of auto, hardlink, clone, clone-or-copy, copy, got symlink",
+        )
+        subprocess_pnpm.run.assert_not_called()
+
+    @patch("aws_lambda_builders.workflows.nodejs_pnpm.pnpm.SubprocessPnpm")
+    def test_raises_action_failed_when_pnpm_fails(self, SubprocessPnpmMock):
+        subprocess_pnpm = SubprocessPnpmMock.return_value
+
+        builder_instance = SubprocessPnpmMock.return_value
+        builder_instance.run.side_effect = PnpmExecutionError(message="boom!")
+
+        action = NodejsPnpmInstallAction("artifacts", subprocess_pnpm=subprocess_pnpm)
+
+        with self.assertRaises(ActionFailedError) as raised:
+            action.execute()
+
+        self.assertEqual(raised.exception.args[0], "PNPM Failed: boom!")
+
+
+class TestNodejsPnpmDeployAction(TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.install_dir = os.path.join(self.root, "artifacts")
+        self.deploy_dir = os.path.join(self.root, "scratch", "pnpm-deploy")
+        os.makedirs(os.path.join(self.install_dir, "node_modules", "stale"))
+        # left behind by a previous build
+        os.makedirs(self.deploy_dir)
+
+    @patch("aws_lambda_builders.workflows.nodejs_pnpm.pnpm.SubprocessPnpm")
+    def test_deploys_the_package_from_the_workspace_and_moves_its_node_modules(self, SubprocessPnpmMock):
+        subprocess_pnpm = SubprocessPnpmMock.return_value
+
+        def deploy(args, cwd):
+            # pnpm refuses to deploy into a directory that is not empty
+            self.assertFalse(os.path.exists(self.deploy_dir))
+            os.makedirs(os.path.join(self.deploy_dir, "node_modules", "lodash"))
+
+        subprocess_pnpm.run.side_effect = deploy
+        action = NodejsPnpmDeployAction(
+            self.install_dir,
+            subprocess_pnpm=subprocess_pnpm,
+            workspace_root="/monorepo",
+            workspace_package="hello",
+            deploy_dir=self.deploy_dir,
+            frozen_lockfile=True,
+        )
+
+        action.execute()
+
+        subprocess_pnpm.run.assert_called_once_with(
+            [
+                "--filter",
+                "hello",
+                "deploy",
+                self.deploy_dir,
+                "--prod",
+                "--config.node-linker=hoisted",
+                "--frozen-lockfile",
+            ],
+            cwd="/monorepo",
+        )
+        self.assertEqual(os.listdir(os.path.join(self.install_dir, "node_modules")), ["lodash"])
+        self.assertFalse(os.path.exists(self.deploy_dir))
+
+    @patch("aws_lambda_builders.workflows.nodejs_pnpm.pnpm.SubprocessPnpm")
+    def test_raises_action_failed_when_pnpm_deploy_fails(self, SubprocessPnpmMock):
+        subprocess_pnpm = SubprocessPnpmMock.return_value
+        subprocess_pnpm.run.side_effect = PnpmExecutionError(message="ERR_PNPM_OUTDATED_LOCKFILE")
+        action = NodejsPnpmDeployAction(
+            self.install_dir,
+            subprocess_pnpm=subprocess_pnpm,
+            workspace_root="/monorepo",
+            workspace_package="hello",
+            deploy_dir=self.deploy_dir,
+        )
+
+        with self.assertRaises(ActionFailedError) as raised:
+            action.execute()
+
+        self.assertEqual(raised.exception.args[0], "PNPM Failed: ERR_PNPM_OUTDATED_LOCKFILE")
+        # the dependencies of the previous build are left as they are
+        self.assertEqual(os.listdir(os.path.join(self.install_dir, "node_modules")), ["stale"])
+
+
+class TestNodejsPnpmrcAndLockfileCopyAction(TestCase):
+    @parameterized.expand(itertools.product([True, False], [True, False], [True, False]))
+    @patch("aws_lambda_builders.workflows.nodejs_npm.utils.OSUtils")
+    def test_copies_into_a_project_if_file_exists(self, manifest_exists, npmrc_exists, lockfile_exists, OSUtilMock):
+        osutils = OSUtilMock.return_value
+        osutils.joinpath.side_effect = lambda a, b: "{}/{}".format(a, b)
+
+        action = NodejsPnpmrcAndLockfileCopyAction("artifacts", "manifest", osutils=osutils)
+        osutils.file_exists.side_effect = [manifest_exists, npmrc_exists, lockfile_exists]
+        action.execute()
+
+        filename_exists = {
+            "package.json": manifest_exists,
+            ".npmrc": npmrc_exists,
+            "pnpm-lock.yaml": lockfile_exists,
+        }
+
+        file_exists_calls = [call("manifest/{}".format(filename)) for filename in filename_exists]
+        copy_file_calls = [
+            call("manifest/{}".format(filename), "artifacts") for filename, exists in filename_exists.items() if exists
+        ]
+
+        osutils.file_exists.assert_has_calls(file_exists_calls)
+        osutils.copy_file.assert_has_calls(copy_file_calls)
+
+    @patch("aws_lambda_builders.workflows.nodejs_npm.utils.OSUtils")
+    def test_raises_action_failed_when_copying_fails(self, OSUtilMock):
+        osutils = OSUtilMock.return_value
+        osutils.joinpath.side_effect = lambda a, b: "{}/{}".format(a, b)
+
+        osutils.copy_file.side_effect = OSError()
+
+        action = NodejsPnpmrcAndLockfileCopyAction("artifacts", "manifest", osutils=osutils)
+
+        with self.assertRaises(ActionFailedError):
+            action.execute()
+
+
+class TestNodejsPnpmStateCleanUpAction(TestCase):
+    @patch("aws_lambda_builders.workflows.nodejs_npm.utils.OSUtils")
+    def test_removes_the_state_files_that_exist(self, OSUtilMock):
+        osutils = OSUtilMock.return_value
+        osutils.joinpath.side_effect = lambda *args: "/".join(args)
+        osutils.file_exists.side_effect = [True, False]
+
+        action = NodejsPnpmStateCleanUpAction("artifacts", osutils=osutils)
+        action.execute()
+
+        osutils.file_exists.assert_has_calls(
+            [call("artifacts/node_modules/.modules.yaml"), call("artifacts/node_modules/.pnpm/lock.yaml")]
+        )
+        osutils.remove_file.assert_called_once_with("artifacts/node_modules/.modules.yaml")
+
+    @patch("aws_lambda_builders.workflows.nodejs_npm.utils.OSUtils")
+    def test_raises_action_failed_when_removing_fails(self, OSUtilMock):
+        osutils = OSUtilMock.return_value
+        osutils.joinpath.side_effect = lambda *args: "/".join(args)
+
+        osutils.remove_file.side_effect = OSError()
+
+        action = NodejsPnpmStateCleanUpAction("artifacts", osutils=osutils)
+
+        with self.assertRaises(ActionFailedError):
+            action.execute()
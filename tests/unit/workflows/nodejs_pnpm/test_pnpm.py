@@ -0,0 +1,94 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+from aws_lambda_builders.workflows.nodejs_pnpm.pnpm import SubprocessPnpm, PnpmExecutionError
+
+
+class FakePopen:
+    def __init__(self, out=b"out", err=b"err", retcode=0):
+        self.out = out
+        self.err = err
+        self.returncode = retcode
+
+    def communicate(self):
+        return self.out, self.err
+
+
+class TestSubprocessPnpm(TestCase):
+    @patch("aws_lambda_builders.workflows.nodejs_npm.utils.OSUtils")
+    def setUp(self, OSUtilMock):
+        self.osutils = OSUtilMock.return_value
+        self.osutils.pipe = "PIPE"
+        self.popen = FakePopen()
+        self.osutils.popen.side_effect = [self.popen]
+        self.under_test = SubprocessPnpm(self.osutils, pnpm_exe="/a/b/c/pnpm.exe")
+
+    def test_run_executes_pnpm_on_nixes(self):
+        self.osutils.is_windows.side_effect = [False]
+
+        self.under_test = SubprocessPnpm(self.osutils)
+
+        self.under_test.run(["install", "--prod"])
+
+        self.osutils.popen.assert_called_with(["pnpm", "install", "--prod"], cwd=None, stderr="PIPE", stdout="PIPE")
+
+    def test_run_executes_pnpm_cmd_on_windows(self):
+        self.osutils.is_windows.side_effect = [True]
+
+        self.under_test = SubprocessPnpm(self.osutils)
+
+        self.under_test.run(["install", "--prod"])
+
+        self.osutils.popen.assert_called_with(["pnpm.cmd", "install", "--prod"], cwd=None, stderr="PIPE", stdout="PIPE")
+
+    def test_uses_custom_pnpm_path_if_supplied(self):
+        self.under_test.run(["install"])
+
+        self.osutils.popen.assert_called_with(["/a/b/c/pnpm.exe", "install"], cwd=None, stderr="PIPE", stdout="PIPE")
+
+    def test_uses_cwd_if_supplied(self):
+        self.under_test.run(["install"], cwd="/a/cwd")
+
+        self.osutils.popen.assert_called_with(
+            ["/a/b/c/pnpm.exe", "install"], cwd="/a/cwd", stderr="PIPE", stdout="PIPE"
+        )
+
+    def test_returns_popen_out_decoded_if_retcode_is_0(self):
+        self.popen.out = b"some encoded text\n\n"
+
+        result = self.under_test.run(["install"])
+
+        self.assertEqual(result, "some encoded text")
+
+    def test_raises_PnpmExecutionError_with_err_text_if_retcode_is_not_0(self):
+        self.popen.returncode = 1
+        self.popen.err = b"some error text\n\n"
+
+        with self.assertRaises(PnpmExecutionError) as raised:
+            self.under_test.run(["install"])
+
+        self.assertEqual(raised.exception.args[0], "PNPM Failed: some error text")
+
+    def test_raises_PnpmExecutionError_with_out_text_if_err_text_is_empty(self):
+        self.popen.returncode = 1
+        self.popen.out = b"ERR_PNPM_OUTDATED_LOCKFILE Cannot install with frozen-lockfile\n"
+        self.popen.err = b""
+
+        with self.assertRaises(PnpmExecutionError) as raised:
+            self.under_test.run(["install"])
+
+        self.assertEqual(
+            raised.exception.args[0], "PNPM Failed: ERR_PNPM_OUTDATED_LOCKFILE Cannot install with frozen-lockfile"
+        )
+
+    def test_raises_ValueError_if_args_not_a_list(self):
+        with self.assertRaises(ValueError) as raised:
+            self.under_test.run(("install"))
+
+        self.assertEqual(raised.exception.args[0], "args must be a list")
+
+    def test_raises_ValueError_if_args_empty(self):
+        with self.assertRaises(ValueError) as raised:
+            self.under_test.run([])
+
+        self.assertEqual(raised.exception.args[0], "requires at least one arg")
@@ -0,0 +1,212 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+from aws_lambda_builders.actions import (
+    CleanUpAction,
+    CopyDependenciesAction,
+    CopySourceAction,
+    MoveDependenciesAction,
+)
+from aws_lambda_builders.workflows.nodejs_npm.actions import NodejsNpmrcCleanUpAction
+from aws_lambda_builders.workflows.nodejs_npm.utils import OSUtils
+from aws_lambda_builders.workflows.nodejs_pnpm.actions import (
+    NodejsPnpmDeployAction,
+    NodejsPnpmInstallAction,
+    NodejsPnpmrcAndLockfileCopyAction,
+    NodejsPnpmStateCleanUpAction,
+)
+from aws_lambda_builders.workflows.nodejs_pnpm.workflow import NodejsPnpmWorkflow
+
+
+class TestNodejsPnpmWorkflow(TestCase):
+    """
+    the workflow requires an external utility (pnpm) to run, so this is just a quick wiring test to provide fast
+    feedback if things are badly broken
+    """
+
+    @patch("aws_lambda_builders.workflows.nodejs_npm.utils.OSUtils")
+    def setUp(self, OSUtilMock):
+        self.osutils = OSUtilMock.return_value
+        self.osutils.dirname.return_value = "source"
+        self.osutils.is_windows.return_value = False
+        self.osutils.file_exists.return_value = True
+
+    def test_workflow_sets_up_pnpm_actions_without_dependencies_dir(self):
+        workflow = NodejsPnpmWorkflow("source", "artifacts", "scratch_dir", "source/package.json", osutils=self.osutils)
+
+        self.assertEqual(len(workflow.actions), 5)
+        self.assertIsInstance(workflow.actions[0], CopySourceAction)
+        self.assertEqual(workflow.actions[0].excludes, (".aws-sam", ".git", "node_modules"))
+        self.assertIsInstance(workflow.actions[1], NodejsPnpmrcAndLockfileCopyAction)
+        self.assertEqual(workflow.actions[1].source_dir, "source")
+        self.assertIsInstance(workflow.actions[2], NodejsPnpmInstallAction)
+        self.assertEqual(workflow.actions[2].install_dir, "artifacts")
+        self.assertIsNone(workflow.actions[2].store_dir)
+        self.assertIsNone(workflow.actions[2].package_import_method)
+        self.assertFalse(workflow.actions[2].frozen_lockfile)
+        self.assertIsInstance(workflow.actions[3], NodejsNpmrcCleanUpAction)
+        self.assertIsInstance(workflow.actions[4], NodejsPnpmStateCleanUpAction)
+
+    def test_workflow_copies_the_manifest_and_lockfile_from_an_external_manifest_directory(self):
+        self.osutils.dirname.return_value = "not_source"
+
+        workflow = NodejsPnpmWorkflow(
+            "source", "artifacts", "scratch_dir", "not_source/package.json", osutils=self.osutils
+        )
+
+        self.assertIsInstance(workflow.actions[1], NodejsPnpmrcAndLockfileCopyAction)
+        self.assertEqual(workflow.actions[1].source_dir, "not_source")
+        self.assertEqual(workflow.actions[1].artifacts_dir, "artifacts")
+
+    def test_workflow_passes_the_pnpm_options_to_the_install_action(self):
+        workflow = NodejsPnpmWorkflow(
+            "source",
+            "artifacts",
+            "scratch_dir",
+            "source/package.json",
+            osutils=self.osutils,
+            options={
+                "pnpm_store_dir": "/cache/pnpm-store",
+                "pnpm_package_import_method": "hardlink",
+                "use_pnpm_frozen_lockfile": True,
+            },
+        )
+
+        install_action = workflow.actions[2]
+        self.assertIsInstance(install_action, NodejsPnpmInstallAction)
+        self.assertEqual(install_action.store_dir, "/cache/pnpm-store")
+        self.assertEqual(install_action.package_import_method, "hardlink")
+        self.assertTrue(install_action.frozen_lockfile)
+
+    def test_workflow_does_not_hardlink_the_store_when_normalizing_artifacts(self):
+        for package_import_method, expected in [
+            (None, "clone-or-copy"),
+            ("auto", "clone-or-copy"),
+            ("hardlink", "clone-or-copy"),
+            ("clone", "clone"),
+            ("copy", "copy"),
+        ]:
+            workflow = NodejsPnpmWorkflow(
+                "source",
+                "artifacts",
+                "scratch_dir",
+                "source/package.json",
+                osutils=self.osutils,
+                options={"pnpm_package_import_method": package_import_method},
+                normalize_artifacts=True,
+            )
+
+            self.assertEqual(workflow.actions[2].package_import_method, expected)
+
+    def test_workflow_finds_the_workspace_of_a_package_without_lockfile(self):
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+        package_dir = os.path.join(root, "packages", "hello")
+        os.makedirs(package_dir)
+        for path in ["pnpm-workspace.yaml", "pnpm-lock.yaml"]:
+            open(os.path.join(root, path), "w").close()
+        manifest_path = os.path.join(package_dir, "package.json")
+        with open(manifest_path, "w") as f:
+            f.write('{"name": "hello"}')
+
+        workflow = NodejsPnpmWorkflow(
+            "source",
+            "artifacts",
+            "scratch_dir",
+            manifest_path,
+            osutils=OSUtils(),
+            options={"use_pnpm_frozen_lockfile": True},
+        )
+
+        self.assertIsInstance(workflow.actions[2], NodejsPnpmDeployAction)
+        self.assertEqual(workflow.actions[2].workspace_root, root)
+        self.assertEqual(workflow.actions[2].workspace_package, "hello")
+        self.assertEqual(workflow.actions[2].deploy_dir, os.path.join("scratch_dir", "pnpm-deploy"))
+        self.assertTrue(workflow.actions[2].frozen_lockfile)
+
+        # a package without a name is selected by its directory
+        with open(manifest_path, "w") as f:
+            f.write("{}")
+        workflow = NodejsPnpmWorkflow("source", "artifacts", "scratch_dir", manifest_path, osutils=OSUtils())
+
+        self.assertEqual(workflow.actions[2].workspace_package, "./packages/hello")
+
+        # a package with its own lockfile is installed from it
+        open(os.path.join(package_dir, "pnpm-lock.yaml"), "w").close()
+        workflow = NodejsPnpmWorkflow("source", "artifacts", "scratch_dir", manifest_path, osutils=OSUtils())
+
+        self.assertIsInstance(workflow.actions[2], NodejsPnpmInstallAction)
+        self.assertNotIsInstance(workflow.actions[2], NodejsPnpmDeployAction)
+
+    def test_workflow_only_copies_the_source_if_manifest_doesnt_exist(self):
+        self.osutils.file_exists.return_value = False
+
+        workflow = NodejsPnpmWorkflow("source", "artifacts", "scratch_dir", "source/package.json", osutils=self.osutils)
+
+        self.assertEqual(len(workflow.actions), 1)
+        self.assertIsInstance(workflow.actions[0], CopySourceAction)
+
+    def test_workflow_moves_dependencies_to_dependencies_dir(self):
+        workflow = NodejsPnpmWorkflow(
+            "source",
+            "artifacts",
+            "scratch_dir",
+            "source/package.json",
+            dependencies_dir="dep",
+            combine_dependencies=False,
+            osutils=self.osutils,
+        )
+
+        self.assertEqual(len(workflow.actions), 8)
+        self.assertIsInstance(workflow.actions[2], NodejsPnpmInstallAction)
+        self.assertIsInstance(workflow.actions[3], CleanUpAction)
+        self.assertIsInstance(workflow.actions[4], MoveDependenciesAction)
+        self.assertIsInstance(workflow.actions[5], NodejsNpmrcCleanUpAction)
+        self.assertIsInstance(workflow.actions[6], NodejsPnpmStateCleanUpAction)
+        self.assertEqual(workflow.actions[6].artifacts_dir, "artifacts")
+        self.assertIsInstance(workflow.actions[7], NodejsPnpmStateCleanUpAction)
+        self.assertEqual(workflow.actions[7].artifacts_dir, "dep")
+
+    def test_workflow_copies_dependencies_to_dependencies_dir_when_combining_them(self):
+        workflow = NodejsPnpmWorkflow(
+            "source",
+            "artifacts",
+            "scratch_dir",
+            "source/package.json",
+            dependencies_dir="dep",
+            osutils=self.osutils,
+        )
+
+        self.assertIsInstance(workflow.actions[3], CleanUpAction)
+        self.assertIsInstance(workflow.actions[4], CopyDependenciesAction)
+
+    def test_workflow_copies_dependencies_dir_without_download_dependencies(self):
+        workflow = NodejsPnpmWorkflow(
+            "source",
+            "artifacts",
+            "scratch_dir",
+            "source/package.json",
+            dependencies_dir="dep",
+            download_dependencies=False,
+            osutils=self.osutils,
+        )
+
+        self.assertEqual(len(workflow.actions), 6)
+        self.assertIsInstance(workflow.actions[0], CopySourceAction)
+        self.assertIsInstance(workflow.actions[1], NodejsPnpmrcAndLockfileCopyAction)
+        self.assertIsInstance(workflow.actions[2], CopySourceAction)
+        self.assertEqual(workflow.actions[2].source_dir, "dep")
+        self.assertEqual(workflow.actions[2].dest_dir, "artifacts")
+
+    def test_workflow_resolves_pnpm(self):
+        workflow = NodejsPnpmWorkflow(
+            "source", "artifacts", "scratch_dir", "source/package.json", runtime="nodejs20.x", osutils=self.osutils
+        )
+
+        resolvers = workflow.get_resolvers()
+
+        self.assertEqual(len(resolvers), 1)
+        self.assertEqual(resolvers[0].binary, "pnpm")
@@ -1,3 +1,4 @@
+import os
 import sys
 from unittest import TestCase
 from unittest.mock import ANY, MagicMock, Mock, patch
@@ -7,10 +8,14 @@ from aws_lambda_builders.architecture import ARM64, X86_64
 from aws_lambda_builders.binary_path import BinaryPath
 from aws_lambda_builders.workflows.python_pip.actions import (
     PARENT_PYTHON_PKGS_KEY,
+    PythonCompileBytecodeAction,
     PythonCreateParentPackagesAction,
     PythonPipBuildAction,
+    PythonPruneImportsAction,
+    PythonSlimDependenciesAction,
 )
 from aws_lambda_builders.workflows.python_pip.exceptions import MissingPipError
+from aws_lambda_builders.workflows.python_pip.install_record import InstallRecord
 from aws_lambda_builders.workflows.python_pip.packager import PackagerError
 
 
@@ -33,13 +38,268 @@ class TestPythonPipBuildAction(TestCase):
         action.execute()
 
         dependency_builder_mock.assert_called_with(
-            osutils=ANY, pip_runner=ANY, runtime="runtime", architecture=X86_64, python_exe=ANY
+            osutils=ANY,
+            pip_runner=ANY,
+            runtime="runtime",
+            architecture=X86_64,
+            python_exe=ANY,
+            build_concurrency=1,
+            install_concurrency=1,
+            wheelhouse=None,
+            binary_fast_path=False,
+            incremental_install=False,
+            resolution_lock=None,
+            wheel_index=None,
+            slimming=None,
         )
 
         builder_instance.build_dependencies.assert_called_with(
-            artifacts_dir_path="artifacts", scratch_dir_path="scratch_dir", requirements_path="manifest"
+            artifacts_dir_path="artifacts",
+            scratch_dir_path="scratch_dir",
+            requirements_path="manifest",
+            architecture_directories=None,
         )
 
+    @patch("aws_lambda_builders.workflows.python_pip.actions.PythonPipDependencyBuilder")
+    @patch("aws_lambda_builders.workflows.python_pip.actions.DependencyBuilder")
+    @patch("aws_lambda_builders.workflows.python_pip.actions.PythonPipBuildAction._find_runtime_with_pip")
+    def test_action_must_build_other_architectures(
+        self, find_runtime_mock, dependency_builder_mock, pip_dependency_builder_mock
+    ):
+        builder_instance = pip_dependency_builder_mock.return_value
+        find_runtime_mock.return_value = (Mock(), Mock())
+
+        action = PythonPipBuildAction(
+            "artifacts",
+            "scratch_dir",
+            "manifest",
+            "runtime",
+            "dependencies",
+            {"python": BinaryPath(resolver=Mock(), validator=Mock(), binary="python", binary_path=sys.executable)},
+            options={"architecture_dependencies_dirs": {ARM64: "arm64_dependencies", X86_64: "ignored"}},
+        )
+        action.execute()
+
+        builder_instance.build_dependencies.assert_called_with(
+            artifacts_dir_path="dependencies",
+            scratch_dir_path="scratch_dir",
+            requirements_path="manifest",
+            architecture_directories={ARM64: "arm64_dependencies"},
+        )
+
+    @patch("aws_lambda_builders.workflows.python_pip.actions.PythonPipDependencyBuilder")
+    @patch("aws_lambda_builders.workflows.python_pip.actions.DependencyBuilder")
+    @patch("aws_lambda_builders.workflows.python_pip.actions.PythonPipBuildAction._find_runtime_with_pip")
+    def test_action_must_fail_on_unsupported_architectures(
+        self, find_runtime_mock, dependency_builder_mock, pip_dependency_builder_mock
+    ):
+        pip = Mock()
+        find_runtime_mock.return_value = (pip, Mock())
+
+        action = PythonPipBuildAction(
+            "artifacts",
+            "scratch_dir",
+            "manifest",
+            "runtime",
+            None,
+            {"python": BinaryPath(resolver=Mock(), validator=Mock(), binary="python", binary_path=sys.executable)},
+            options={"architecture_dependencies_dirs": {"riscv64": "dependencies"}},
+        )
+
+        with self.assertRaises(ActionFailedError) as ex:
+            action.execute()
+        self.assertEqual(str(ex.exception), "Unsupported architecture(s) riscv64 in architecture_dependencies_dirs")
+        pip.close.assert_called_once_with()
+
+    @patch("aws_lambda_builders.workflows.python_pip.actions.PythonPipBuildAction._find_runtime_with_pip")
+    def test_action_must_fail_without_offline_wheelhouse_directory(self, find_runtime_mock):
+        action = PythonPipBuildAction(
+            "artifacts",
+            "scratch_dir",
+            "manifest",
+            "runtime",
+            None,
+            {"python": BinaryPath(resolver=Mock(), validator=Mock(), binary="python", binary_path=sys.executable)},
+            options={"offline_wheelhouse": "/missing/wheelhouse"},
+        )
+
+        with self.assertRaises(ActionFailedError) as ex:
+            action.execute()
+        self.assertEqual(str(ex.exception), "Offline wheelhouse /missing/wheelhouse is not a directory")
+        find_runtime_mock.assert_not_called()
+
+    @patch("aws_lambda_builders.workflows.python_pip.actions.report_distributions")
+    @patch("aws_lambda_builders.workflows.python_pip.actions.PythonPipDependencyBuilder")
+    @patch("aws_lambda_builders.workflows.python_pip.actions.DependencyBuilder")
+    @patch("aws_lambda_builders.workflows.python_pip.actions.PythonPipBuildAction._find_runtime_with_pip")
+    def test_action_must_report_installed_distributions(
+        self, find_runtime_mock, dependency_builder_mock, pip_dependency_builder_mock, report_mock
+    ):
+        find_runtime_mock.return_value = (Mock(), Mock())
+        report_mock.return_value = {"total_bytes": 0, "total_files": 0, "distributions": []}
+
+        action = PythonPipBuildAction(
+            "artifacts",
+            "scratch_dir",
+            "manifest",
+            "runtime",
+            "dependencies",
+            {"python": BinaryPath(resolver=Mock(), validator=Mock(), binary="python", binary_path=sys.executable)},
+            options={"distribution_report": True},
+        )
+        action.execute()
+
+        report_mock.assert_called_once_with("dependencies", "manifest", "runtime", X86_64)
+        self.assertEqual(action.report, {"distribution_report": report_mock.return_value})
+
+    @patch("aws_lambda_builders.workflows.python_pip.actions.PythonPipDependencyBuilder")
+    @patch("aws_lambda_builders.workflows.python_pip.actions.DependencyBuilder")
+    @patch("aws_lambda_builders.workflows.python_pip.actions.PipRunner")
+    @patch("aws_lambda_builders.workflows.python_pip.actions.PythonPipBuildAction._find_runtime_with_pip")
+    def test_action_must_pass_concurrency_options(
+        self, find_runtime_mock, pip_runner_mock, dependency_builder_mock, pip_dependency_builder_mock
+    ):
+        pip, python = Mock(), Mock()
+        find_runtime_mock.return_value = (pip, python)
+
+        action = PythonPipBuildAction(
+            "artifacts",
+            "scratch_dir",
+            "manifest",
+            "runtime",
+            None,
+            {"python": BinaryPath(resolver=Mock(), validator=Mock(), binary="python", binary_path=sys.executable)},
+            options={
+                "download_concurrency": 8,
+                "build_concurrency": 4,
+                "install_concurrency": 2,
+                "binary_fast_path": True,
+            },
+        )
+        action.execute()
+
+        pip_runner_mock.assert_called_with(
+            python_exe=python, pip=pip, download_concurrency=8, find_links=None, offline_wheelhouse=None
+        )
+        dependency_builder_mock.assert_called_with(
+            osutils=ANY,
+            pip_runner=pip_runner_mock.return_value,
+            runtime="runtime",
+            architecture=X86_64,
+            python_exe=python,
+            build_concurrency=4,
+            install_concurrency=2,
+            wheelhouse=None,
+            binary_fast_path=True,
+            incremental_install=False,
+            resolution_lock=None,
+            wheel_index=None,
+            slimming=None,
+        )
+
+    @patch("aws_lambda_builders.workflows.python_pip.actions.PythonPipDependencyBuilder")
+    @patch("aws_lambda_builders.workflows.python_pip.actions.DependencyBuilder")
+    @patch("aws_lambda_builders.workflows.python_pip.actions.PythonPipBuildAction._find_runtime_with_pip")
+    def test_action_must_install_incrementally_only_into_dependencies_dir(
+        self, find_runtime_mock, dependency_builder_mock, pip_dependency_builder_mock
+    ):
+        find_runtime_mock.return_value = (Mock(), Mock())
+        binaries = {
+            "python": BinaryPath(resolver=Mock(), validator=Mock(), binary="python", binary_path=sys.executable)
+        }
+
+        for dependencies_dir, expected in ((None, False), ("dependencies", True)):
+            action = PythonPipBuildAction(
+                "artifacts",
+                "scratch_dir",
+                "manifest",
+                "runtime",
+                dependencies_dir,
+                binaries,
+                options={"incremental_install": True},
+            )
+            action.execute()
+
+            self.assertEqual(dependency_builder_mock.call_args.kwargs["incremental_install"], expected)
+
+    @patch("aws_lambda_builders.workflows.python_pip.actions.PythonPipDependencyBuilder")
+    @patch("aws_lambda_builders.workflows.python_pip.actions.DependencyBuilder")
+    @patch("aws_lambda_builders.workflows.python_pip.actions.PythonPipBuildAction._find_runtime_with_pip")
+    def test_action_must_pass_slimming_settings(
+        self, find_runtime_mock, dependency_builder_mock, pip_dependency_builder_mock
+    ):
+        find_runtime_mock.return_value = (Mock(), Mock())
+        action = PythonPipBuildAction(
+            "artifacts",
+            "scratch_dir",
+            "manifest",
+            "runtime",
+            "dependencies",
+            {"python": BinaryPath(resolver=Mock(), validator=Mock(), binary="python", binary_path=sys.executable)},
+            options={"incremental_install": True, "slim_dependencies": True, "slim_keep_patterns": ["foo/*"]},
+        )
+        action.execute()
+
+        self.assertEqual(
+            dependency_builder_mock.call_args.kwargs["slimming"],
+            {"remove_patterns": ["*.dist-info/RECORD", "*.pyi"], "keep_patterns": ["foo/*"]},
+        )
+
+    @patch("aws_lambda_builders.workflows.python_pip.actions.PythonPipDependencyBuilder")
+    @patch("aws_lambda_builders.workflows.python_pip.actions.DependencyBuilder")
+    @patch("aws_lambda_builders.workflows.python_pip.actions.PipRunner")
+    @patch("aws_lambda_builders.workflows.python_pip.actions.Wheelhouse")
+    @patch("aws_lambda_builders.workflows.python_pip.actions.PythonPipBuildAction._find_runtime_with_pip")
+    def test_action_must_use_wheelhouse_in_cache_dir(
+        self, find_runtime_mock, wheelhouse_mock, pip_runner_mock, dependency_builder_mock, pip_dependency_builder_mock
+    ):
+        find_runtime_mock.return_value = (Mock(), Mock())
+        wheelhouse = wheelhouse_mock.return_value
+
+        action = PythonPipBuildAction(
+            "artifacts",
+            "scratch_dir",
+            "manifest",
+            "runtime",
+            None,
+            {"python": BinaryPath(resolver=Mock(), validator=Mock(), binary="python", binary_path=sys.executable)},
+            options={"wheelhouse_max_size": 100},
+            cache_dir="cache_dir",
+        )
+        action.execute()
+
+        wheelhouse_mock.assert_called_with(os.path.join("cache_dir", "pip-wheelhouse"), max_size=100)
+        self.assertEqual(pip_runner_mock.call_args[1]["find_links"], wheelhouse.directory)
+        self.assertEqual(dependency_builder_mock.call_args[1]["wheelhouse"], wheelhouse)
+
+    @patch("aws_lambda_builders.workflows.python_pip.actions.PythonPipDependencyBuilder")
+    @patch("aws_lambda_builders.workflows.python_pip.actions.DependencyBuilder")
+    @patch("aws_lambda_builders.workflows.python_pip.actions.Wheelhouse")
+    @patch("aws_lambda_builders.workflows.python_pip.actions.ResolutionLock")
+    @patch("aws_lambda_builders.workflows.python_pip.actions.PythonPipBuildAction._find_runtime_with_pip")
+    def test_action_must_use_resolution_lock_in_cache_dir(
+        self, find_runtime_mock, lock_mock, wheelhouse_mock, dependency_builder_mock, pip_dependency_builder_mock
+    ):
+        find_runtime_mock.return_value = (Mock(), Mock())
+        lock_mock.compute_key.return_value = "key"
+
+        action = PythonPipBuildAction(
+            "artifacts",
+            "scratch_dir",
+            "manifest",
+            "runtime",
+            None,
+            {"python": BinaryPath(resolver=Mock(), validator=Mock(), binary="python", binary_path=sys.executable)},
+            architecture=ARM64,
+            options={"resolution_lock": True, "resolution_lock_ttl": 60},
+            cache_dir="cache_dir",
+        )
+        action.execute()
+
+        lock_mock.compute_key.assert_called_with("manifest", "runtime", ARM64)
+        lock_mock.assert_called_with(os.path.join("cache_dir", "pip-locks"), "key", ttl=60)
+        self.assertEqual(dependency_builder_mock.call_args[1]["resolution_lock"], lock_mock.return_value)
+
     @patch("aws_lambda_builders.workflows.python_pip.actions.PythonPipDependencyBuilder")
     @patch("aws_lambda_builders.workflows.python_pip.actions.DependencyBuilder")
     @patch("aws_lambda_builders.workflows.python_pip.actions.PythonPipBuildAction._find_runtime_with_pip")
@@ -61,11 +321,26 @@ class TestPythonPipBuildAction(TestCase):
         action.execute()
 
         dependency_builder_mock.assert_called_with(
-            osutils=ANY, pip_runner=ANY, runtime="runtime", architecture=ARM64, python_exe=ANY
+            osutils=ANY,
+            pip_runner=ANY,
+            runtime="runtime",
+            architecture=ARM64,
+            python_exe=ANY,
+            build_concurrency=1,
+            install_concurrency=1,
+            wheelhouse=None,
+            binary_fast_path=False,
+            incremental_install=False,
+            resolution_lock=None,
+            wheel_index=None,
+            slimming=None,
         )
 
         builder_instance.build_dependencies.assert_called_with(
-            artifacts_dir_path="artifacts", scratch_dir_path="scratch_dir", requirements_path="manifest"
+            artifacts_dir_path="artifacts",
+            scratch_dir_path="scratch_dir",
+            requirements_path="manifest",
+            architecture_directories=None,
         )
 
     @patch("aws_lambda_builders.workflows.python_pip.actions.PythonPipDependencyBuilder")
@@ -87,6 +362,9 @@ class TestPythonPipBuildAction(TestCase):
         with self.assertRaises(ActionFailedError):
             action.execute()
 
+        # the pip processes are released even if the build failed
+        find_runtime_mock.return_value[0].close.assert_called_once_with()
+
     @patch("aws_lambda_builders.workflows.python_pip.actions.PythonPipDependencyBuilder")
     @patch("aws_lambda_builders.workflows.python_pip.actions.PythonPipBuildAction._find_runtime_with_pip")
     def test_action_must_call_builder_with_dependencies_dir(self, find_runtime_mock, pip_dependency_builder_mock):
@@ -104,7 +382,10 @@ class TestPythonPipBuildAction(TestCase):
         action.execute()
 
         builder_instance.build_dependencies.assert_called_with(
-            artifacts_dir_path="dependencies_dir", scratch_dir_path="scratch_dir", requirements_path="manifest"
+            artifacts_dir_path="dependencies_dir",
+            scratch_dir_path="scratch_dir",
+            requirements_path="manifest",
+            architecture_directories=None,
         )
 
     def test_find_runtime_missing_binary_object(self):
@@ -151,6 +432,29 @@ class TestPythonPipBuildAction(TestCase):
         self.assertEqual(pip, expected_pip)
         self.assertEqual(runtime_path, expected_python_path)
 
+    @patch("aws_lambda_builders.workflows.python_pip.actions.SubprocessPip")
+    @patch("aws_lambda_builders.workflows.python_pip.actions.PipWorker")
+    def test_find_runtime_found_pip_worker(self, pip_worker_mock, pip_subprocess_mock):
+        expected_python_path = "my_python_path"
+
+        mock_binary_path = Mock()
+        mock_binary_path.resolver = Mock()
+        mock_binary_path.resolver.exec_paths = [expected_python_path]
+        mock_binary_path.validator = Mock()
+        mock_binary_path.validator.validate.return_value = expected_python_path
+
+        mock_binaries = Mock()
+        mock_binaries.get = Mock(return_value=mock_binary_path)
+
+        pip, runtime_path = PythonPipBuildAction(
+            Mock(), Mock(), Mock(), Mock(), Mock(), mock_binaries, options={"pip_worker": True}
+        )._find_runtime_with_pip()
+
+        self.assertEqual(pip, pip_worker_mock.return_value)
+        self.assertEqual(runtime_path, expected_python_path)
+        pip_worker_mock.assert_called_once_with(osutils=ANY, python_exe=expected_python_path)
+        pip_subprocess_mock.assert_not_called()
+
     @patch("aws_lambda_builders.workflows.python_pip.actions.SubprocessPip")
     def test_find_runtime_no_pip_matches(self, pip_subprocess_mock):
         python_path = "my_python_path"
@@ -189,6 +493,177 @@ class TestPythonPipBuildAction(TestCase):
             self.assertEqual(str(ex.exception), "Failed to find a Python runtime containing pip on the PATH.")
 
 
+class TestPythonPruneImportsAction(TestCase):
+    def setUp(self):
+        self.unreachable = [{"name": "foo", "version": "1.0", "paths": [os.path.join("dependencies", "foo.py")]}]
+
+    def test_raises_action_failed_for_unknown_modes(self):
+        with self.assertRaises(ActionFailedError) as ex:
+            PythonPruneImportsAction("source", "dependencies", options={"import_pruning": "all"}).execute()
+        self.assertEqual(str(ex.exception), "import_pruning must be one of report, strict, got all")
+
+    @patch("aws_lambda_builders.workflows.python_pip.actions.remove_distributions")
+    @patch("aws_lambda_builders.workflows.python_pip.actions.os.lstat")
+    @patch("aws_lambda_builders.workflows.python_pip.actions.find_unreachable_distributions")
+    def test_reports_unreachable_distributions(self, find_mock, lstat_mock, remove_mock):
+        find_mock.return_value = (["bar"], self.unreachable)
+        lstat_mock.return_value.st_size = 10
+        options = {"import_pruning": "report", "import_pruning_entry_points": ["app"], "import_pruning_keep": ["baz"]}
+        action = PythonPruneImportsAction("source", "dependencies", options=options, excludes=("tests",))
+
+        action.execute()
+
+        find_mock.assert_called_once_with(
+            "dependencies", "source", entry_points=["app"], keep=["baz"], excludes=("tests",)
+        )
+        remove_mock.assert_not_called()
+        self.assertEqual(
+            action.report,
+            {
+                "import_pruning": {
+                    "mode": "report",
+                    "kept_distributions": ["bar"],
+                    "unreachable_distributions": [{"name": "foo", "version": "1.0", "files": 1, "bytes": 10}],
+                    "removed_files": 0,
+                }
+            },
+        )
+
+    @patch("aws_lambda_builders.workflows.python_pip.actions.InstallRecord.load")
+    @patch("aws_lambda_builders.workflows.python_pip.actions.remove_distributions")
+    @patch("aws_lambda_builders.workflows.python_pip.actions.os.lstat")
+    @patch("aws_lambda_builders.workflows.python_pip.actions.find_unreachable_distributions")
+    def test_removes_unreachable_distributions_in_strict_mode(self, find_mock, lstat_mock, remove_mock, load_mock):
+        find_mock.return_value = ([], self.unreachable)
+        lstat_mock.return_value.st_size = 10
+        remove_mock.return_value = {"foo.py"}
+        record = InstallRecord({"foo-1.0-py3-none-any.whl": {"sha256": "abc", "files": ["foo.py"]}})
+        record.save = Mock()
+        load_mock.return_value = record
+        action = PythonPruneImportsAction("source", "dependencies", options={"import_pruning": "strict"})
+
+        action.execute()
+
+        remove_mock.assert_called_once_with("dependencies", self.unreachable)
+        self.assertEqual(action.report["import_pruning"]["removed_files"], 1)
+        self.assertEqual(record.distributions["foo-1.0-py3-none-any.whl"]["files"], [])
+        record.save.assert_called_once_with("dependencies")
+
+    @patch("aws_lambda_builders.workflows.python_pip.actions.remove_distributions")
+    @patch("aws_lambda_builders.workflows.python_pip.actions.os.lstat")
+    @patch("aws_lambda_builders.workflows.python_pip.actions.find_unreachable_distributions")
+    def test_raises_action_failed_when_distributions_cannot_be_removed(self, find_mock, lstat_mock, remove_mock):
+        find_mock.return_value = ([], self.unreachable)
+        lstat_mock.return_value.st_size = 10
+        remove_mock.side_effect = OSError("Permission denied")
+
+        with self.assertRaises(ActionFailedError) as ex:
+            PythonPruneImportsAction("source", "dependencies", options={"import_pruning": "strict"}).execute()
+        self.assertEqual(str(ex.exception), "Permission denied")
+
+
+class TestPythonSlimDependenciesAction(TestCase):
+    @patch("aws_lambda_builders.workflows.python_pip.actions.InstallRecord.load")
+    @patch("aws_lambda_builders.workflows.python_pip.actions.slim_dependencies")
+    @patch("aws_lambda_builders.workflows.python_pip.actions.os.path.isdir")
+    def test_slims_dependencies_and_reports_removed_files(self, isdir_mock, slim_mock, load_mock):
+        isdir_mock.return_value = True
+        report = {"removed_files": 1, "removed_bytes": 10, "by_pattern": {"*.pyi": {"files": 1, "bytes": 10}}}
+        slim_mock.return_value = (report, {"foo/__init__.pyi"})
+        load_mock.return_value = None
+        action = PythonSlimDependenciesAction(
+            "dependencies", options={"slim_remove_patterns": ["*.md"], "slim_keep_patterns": ["foo/*"]}
+        )
+
+        action.execute()
+
+        slim_mock.assert_called_once_with("dependencies", remove_patterns=["*.md"], keep_patterns=["foo/*"])
+        self.assertEqual(action.report, {"dependency_slimming": report})
+
+    @patch("aws_lambda_builders.workflows.python_pip.actions.InstallRecord.load")
+    @patch("aws_lambda_builders.workflows.python_pip.actions.slim_dependencies")
+    @patch("aws_lambda_builders.workflows.python_pip.actions.os.path.isdir")
+    def test_removes_slimmed_files_from_install_record(self, isdir_mock, slim_mock, load_mock):
+        isdir_mock.return_value = True
+        slim_mock.return_value = ({"removed_files": 1, "removed_bytes": 10, "by_pattern": {}}, {"foo/__init__.pyi"})
+        record = InstallRecord(
+            {"foo-1.0-py3-none-any.whl": {"sha256": "abc", "files": ["foo/__init__.py", "foo/__init__.pyi"]}}
+        )
+        record.save = Mock()
+        load_mock.return_value = record
+
+        PythonSlimDependenciesAction("dependencies").execute()
+
+        self.assertEqual(record.distributions["foo-1.0-py3-none-any.whl"]["files"], ["foo/__init__.py"])
+        self.assertEqual(record.distributions["foo-1.0-py3-none-any.whl"]["slimmed"], ["foo/__init__.pyi"])
+        settings = {"remove_patterns": ["*.dist-info/RECORD", "*.pyi"], "keep_patterns": []}
+        self.assertEqual(record.slimming, settings)
+        self.assertTrue(record.is_installed("foo-1.0-py3-none-any.whl", "abc", settings))
+        record.save.assert_called_once_with("dependencies")
+
+    @patch("aws_lambda_builders.workflows.python_pip.actions.slim_dependencies")
+    @patch("aws_lambda_builders.workflows.python_pip.actions.os.path.isdir")
+    def test_raises_action_failed_when_files_cannot_be_removed(self, isdir_mock, slim_mock):
+        isdir_mock.return_value = True
+        slim_mock.side_effect = OSError("Permission denied")
+
+        with self.assertRaises(ActionFailedError) as ex:
+            PythonSlimDependenciesAction("dependencies").execute()
+        self.assertEqual(str(ex.exception), "Permission denied")
+
+
+class TestPythonCompileBytecodeAction(TestCase):
+    def setUp(self):
+        self.osutils = Mock()
+        self.osutils.popen.return_value.communicate.return_value = (b"", b"")
+        self.osutils.popen.return_value.returncode = 0
+        self.binaries = {
+            "python": BinaryPath(resolver=Mock(), validator=Mock(), binary="python", binary_path="/usr/bin/python3.12")
+        }
+
+    @patch("aws_lambda_builders.workflows.python_pip.actions.os.path.isdir")
+    def test_compiles_existing_directories(self, isdir_mock):
+        isdir_mock.side_effect = lambda path: path == "artifacts"
+        action = PythonCompileBytecodeAction(["artifacts", "missing"], self.binaries, osutils=self.osutils)
+
+        action.execute()
+
+        self.osutils.popen.assert_called_once_with(
+            [
+                "/usr/bin/python3.12",
+                "-m",
+                "compileall",
+                "-q",
+                "-j",
+                "0",
+                "--invalidation-mode",
+                "unchecked-hash",
+                "artifacts",
+            ],
+            stdout=self.osutils.pipe,
+            stderr=self.osutils.pipe,
+            env=self.osutils.original_environ.return_value,
+        )
+
+    @patch("aws_lambda_builders.workflows.python_pip.actions.os.path.isdir")
+    def test_does_not_fail_on_files_that_cannot_be_compiled(self, isdir_mock):
+        isdir_mock.return_value = True
+        self.osutils.popen.return_value.returncode = 1
+        self.osutils.popen.return_value.communicate.return_value = (b"*** Error compiling 'py2.py'", b"")
+        action = PythonCompileBytecodeAction(["artifacts"], self.binaries, osutils=self.osutils)
+
+        with self.assertLogs("aws_lambda_builders.workflows.python_pip.actions", level="WARNING") as logs:
+            action.execute()
+
+        self.assertIn("py2.py", logs.output[0])
+
+    def test_must_raise_without_python_binary(self):
+        action = PythonCompileBytecodeAction(["artifacts"], {}, osutils=self.osutils)
+
+        with self.assertRaises(ActionFailedError):
+            action.execute()
+
+
 class TestPythonCreateParentPackagesAction(TestCase):
     def setUp(self):
         self.source = "source"
@@ -0,0 +1,62 @@
+from unittest import TestCase
+
+from parameterized import parameterized
+
+from aws_lambda_builders.architecture import ARM64
+from aws_lambda_builders.workflows.python_pip.markers import evaluate_marker, get_lambda_environment
+
+
+class TestGetLambdaEnvironment(TestCase):
+    def test_returns_variables_of_runtime_and_architecture(self):
+        environment = get_lambda_environment("python3.12", ARM64)
+
+        self.assertEqual(environment["python_version"], "3.12")
+        self.assertEqual(environment["platform_machine"], "aarch64")
+        self.assertEqual(environment["sys_platform"], "linux")
+
+    def test_leaves_out_variables_of_missing_runtime_and_architecture(self):
+        environment = get_lambda_environment()
+
+        self.assertNotIn("python_version", environment)
+        self.assertNotIn("platform_machine", environment)
+
+
+class TestEvaluateMarker(TestCase):
+    def setUp(self):
+        self.environment = get_lambda_environment("python3.12", "x86_64")
+
+    @parameterized.expand(
+        [
+            ('python_version >= "3.8"', True),
+            ("python_version < '3.10'", False),
+            ('"3.12" == python_version', True),
+            ('python_version ~= "3.9"', True),
+            ('python_version ~= "3.9.1"', False),
+            ('python_version == "3.*"', True),
+            ('python_version in "3.11 3.12"', True),
+            ('sys_platform == "win32" or (os_name == "posix" and platform_machine != "aarch64")', True),
+            ('sys_platform == "linux" and platform_system == "Darwin"', False),
+            ('platform_machine not in "arm64 aarch64"', True),
+            # variables Lambda doesn't fix are considered true
+            ('python_full_version >= "3.12.4" and sys_platform == "linux"', True),
+            ('platform_release == "6.1"', True),
+        ]
+    )
+    def test_evaluates_environment_markers(self, marker, expected):
+        self.assertEqual(evaluate_marker(marker, self.environment), expected)
+
+    @parameterized.expand(
+        [
+            ('extra == "socks"', set(), False),
+            ('extra == "Socks"', {"socks"}, True),
+            ('extra == "use_chardet.on-py3"', {"use-chardet-on-py3"}, True),
+            ('extra != "socks"', {"socks"}, False),
+            ('python_version < "3" and extra == "socks"', {"socks"}, False),
+        ]
+    )
+    def test_evaluates_extras(self, marker, extras, expected):
+        self.assertEqual(evaluate_marker(marker, self.environment, extras), expected)
+
+    @parameterized.expand(['python_version >= "3.8" and', '(python_version >= "3.8"', "python_version", "!!"])
+    def test_considers_invalid_markers_true(self, marker):
+        self.assertTrue(evaluate_marker(marker, self.environment))
@@ -153,7 +153,7 @@ class TestPythonPipDependencyBuilder(object):
         )
         builder.build_dependencies("artifacts/path/", "scratch_dir/path/", "path/to/requirements.txt")
         mock_dep_builder.build_site_packages.assert_called_once_with(
-            "path/to/requirements.txt", "artifacts/path/", "scratch_dir/path/"
+            "path/to/requirements.txt", "artifacts/path/", "scratch_dir/path/", architecture_directories=None
         )
 
     @mock.patch("aws_lambda_builders.workflows.python_pip.packager.DependencyBuilder")
@@ -329,6 +329,36 @@ class TestPipRunner(object):
         runner.download_manylinux_wheels([], "directory", "abi", [])
         assert len(pip.calls) == 0
 
+    def test_download_binary_dependencies(self, pip_factory):
+        pip, runner = pip_factory()
+        downloaded = runner.download_binary_dependencies(
+            "requirements.txt", "directory", "abi", ["any", "manylinux2014_x86_64"]
+        )
+
+        assert downloaded
+        assert len(pip.calls) == 1
+        assert pip.calls[0].args == [
+            "download",
+            "-r",
+            "requirements.txt",
+            "--only-binary=:all:",
+            "--platform",
+            "any",
+            "--platform",
+            "manylinux2014_x86_64",
+            "--implementation",
+            "cp",
+            "--abi",
+            "abi",
+            "--dest",
+            "directory",
+        ]
+
+    def test_download_binary_dependencies_reports_failure(self, pip_factory):
+        pip, runner = pip_factory()
+        pip.add_return((1, b"", b"ERROR: No matching distribution found for foo"))
+        assert not runner.download_binary_dependencies("requirements.txt", "directory", "abi", ["any"])
+
     def test_does_find_local_directory(self, pip_factory):
         pip, runner = pip_factory()
         pip.add_return((0, b"Processing ../local-dir\n", b""))
@@ -366,6 +396,72 @@ class TestPipRunner(object):
         assert ["wheel", "--no-deps", "--wheel-dir", "directory", "../local-dir-2"] in pip_calls
         assert ["wheel", "--no-deps", "--wheel-dir", "directory", "../local-dir-3"] in pip_calls
 
+    def test_does_not_build_wheels_found_in_offline_wheelhouse(self):
+        pip = FakePip()
+        runner = PipRunner(python_exe=sys.executable, pip=pip, offline_wheelhouse="/mirror")
+        pip.add_return((0, b"Processing /mirror/foo-1.0-py3-none-any.whl (from -r requirements.txt)\n", b""))
+        runner.download_all_dependencies("requirements.txt", "directory")
+        assert len(pip.calls) == 1
+
+    def test_does_not_build_wheels_found_in_find_links(self):
+        pip = FakePip()
+        runner = PipRunner(python_exe=sys.executable, pip=pip, find_links="/cache/pip-wheelhouse")
+        pip.add_return(
+            (
+                0,
+                b"Processing /cache/pip-wheelhouse/foo-1.0-py3-none-any.whl (from -r requirements.txt)\n"
+                b"Processing /wheels/bar-1.0-py3-none-any.whl (from -r requirements.txt)\n",
+                b"",
+            )
+        )
+        runner.download_all_dependencies("requirements.txt", "directory")
+        # only the wheel found outside of the wheelhouse is built
+        assert [call.args for call in pip.calls][1:] == [
+            ["wheel", "--no-deps", "--wheel-dir", "directory", "/wheels/bar-1.0-py3-none-any.whl"]
+        ]
+
+    def test_builds_local_wheels_without_offline_wheelhouse(self, pip_factory):
+        pip, runner = pip_factory()
+        pip.add_return((0, b"Processing /wheels/foo-1.0-py3-none-any.whl (from -r requirements.txt)\n", b""))
+        runner.download_all_dependencies("requirements.txt", "directory")
+        assert [call.args for call in pip.calls][1] == [
+            "wheel",
+            "--no-deps",
+            "--wheel-dir",
+            "directory",
+            "/wheels/foo-1.0-py3-none-any.whl",
+        ]
+
+    def test_uses_only_offline_wheelhouse(self):
+        pip = FakePip()
+        runner = PipRunner(
+            python_exe=sys.executable, pip=pip, find_links="/cache/wheelhouse", offline_wheelhouse="/mirror"
+        )
+        offline_arguments = ["--no-index", "--find-links", "/mirror", "--find-links", "/cache/wheelhouse"]
+
+        runner.download_all_dependencies("requirements.txt", "directory")
+        runner.build_wheel("foo-1.0.tar.gz", "directory")
+
+        assert pip.calls[0].args == [
+            "download",
+            "-r",
+            "requirements.txt",
+            "--dest",
+            "directory",
+            "--exists-action",
+            "i",
+            *offline_arguments,
+        ]
+        # the build dependencies of sdists are installed from the offline wheelhouse too
+        assert pip.calls[1].args == [
+            "wheel",
+            "--no-deps",
+            "--wheel-dir",
+            "directory",
+            "foo-1.0.tar.gz",
+            *offline_arguments,
+        ]
+
     def test_raise_no_such_package_error(self, pip_factory):
         pip, runner = pip_factory()
         pip.add_return((1, b"", (b"Could not find a version that satisfies the " b"requirement BadPackageName ")))
@@ -445,7 +541,7 @@ class TestSDistMetadataFetcher(TestCase):
         get_name_ver_mock.side_effect = [(original_name, original_version), ("UNKNOWN", "0.0.0")]
 
         sdist = SDistMetadataFetcher(OSUtils)
-        name, version = sdist.get_package_name_and_version(mock.Mock())
+        name, version = sdist._get_name_and_version_from_setup(mock.Mock())
 
         self.assertEqual(name, original_name)
         self.assertEqual(version, original_version)
@@ -482,7 +578,7 @@ class TestSDistMetadataFetcher(TestCase):
         get_name_ver_mock.side_effect = [name_version, (fallback_name, fallback_version)]
 
         sdist = SDistMetadataFetcher(OSUtils)
-        name, version = sdist.get_package_name_and_version(mock.Mock())
+        name, version = sdist._get_name_and_version_from_setup(mock.Mock())
 
         self.assertEqual(name, fallback_name)
         self.assertEqual(version, fallback_version)
@@ -514,7 +610,7 @@ class TestSDistMetadataFetcher(TestCase):
         get_name_ver_mock.side_effect = [(not_default_name, not_default_version), (fallback_name, fallback_version)]
 
         sdist = SDistMetadataFetcher(OSUtils)
-        name, version = sdist.get_package_name_and_version(mock.Mock())
+        name, version = sdist._get_name_and_version_from_setup(mock.Mock())
 
         self.assertEqual(name, not_default_name)
         self.assertEqual(version, not_default_version)
@@ -737,9 +833,11 @@ class TestDependencyBuilder(object):
 
         builder._install_purelib_and_platlib(wheel, "/root")
 
-        # Should copy purelib and platlib directories
-        assert osutils.copytree.call_count == 2
-        assert osutils.rmtree.call_count == 2
+        # Should move purelib and platlib directories
+        assert osutils.move_tree.call_count == 2
+        osutils.move_tree.assert_any_call("/root/package-1.0.data/purelib", "/root")
+        osutils.move_tree.assert_any_call("/root/package-1.0.data/platlib", "/root")
+        osutils.copytree.assert_not_called()
 
     def test_install_wheels(self):
         osutils = mock.Mock(spec=OSUtils)
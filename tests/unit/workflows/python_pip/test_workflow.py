@@ -6,9 +6,17 @@ from parameterized import parameterized_class
 from aws_lambda_builders.actions import CopySourceAction, CleanUpAction, LinkSourceAction
 from aws_lambda_builders.path_resolver import PathResolver
 from aws_lambda_builders.validator import RuntimeValidator
-from aws_lambda_builders.workflows.python_pip.utils import OSUtils, EXPERIMENTAL_FLAG_BUILD_PERFORMANCE
+from aws_lambda_builders.utils import EXPERIMENTAL_FLAG_BUILD_PERFORMANCE
+from aws_lambda_builders.workflows.python_pip.utils import OSUtils
 from aws_lambda_builders.workflows.python_pip.validator import PythonRuntimeValidator
-from aws_lambda_builders.workflows.python_pip.workflow import PythonPipBuildAction, PythonPipWorkflow
+from aws_lambda_builders.workflows.python_pip.workflow import (
+    PythonCompileBytecodeAction,
+    PythonCreateParentPackagesAction,
+    PythonPipBuildAction,
+    PythonPipWorkflow,
+    PythonPruneImportsAction,
+    PythonSlimDependenciesAction,
+)
 
 
 @parameterized_class(
@@ -156,6 +164,120 @@ class TestPythonPipWorkflow(TestCase):
             self.assertEqual(self.workflow.actions[2].excludes, [])
         self.assertIsInstance(self.workflow.actions[3], CopySourceAction)
 
+    def test_workflow_keeps_dependencies_dir_with_incremental_install(self):
+        osutils_mock = Mock(spec=self.osutils)
+        osutils_mock.file_exists.return_value = True
+        self.workflow = PythonPipWorkflow(
+            "source",
+            "artifacts",
+            "scratch_dir",
+            "manifest",
+            runtime="python3.9",
+            osutils=osutils_mock,
+            dependencies_dir="dep",
+            download_dependencies=True,
+            experimental_flags=self.experimental_flags,
+            options={"incremental_install": True},
+        )
+        self.assertEqual(len(self.workflow.actions), 3)
+        self.assertIsInstance(self.workflow.actions[0], PythonPipBuildAction)
+        self.assertIsInstance(self.workflow.actions[1], CopySourceAction)
+        # the record of the installed wheels is not copied into the artifacts
+        self.assertEqual(self.workflow.actions[1].excludes, [".pip-install-record.json"])
+        self.assertIsInstance(self.workflow.actions[2], CopySourceAction)
+
+    def test_workflow_slims_dependencies_before_copying_them(self):
+        osutils_mock = Mock(spec=self.osutils)
+        osutils_mock.file_exists.return_value = True
+        self.workflow = PythonPipWorkflow(
+            "source",
+            "artifacts",
+            "scratch_dir",
+            "manifest",
+            runtime="python3.9",
+            osutils=osutils_mock,
+            dependencies_dir="dep",
+            download_dependencies=True,
+            experimental_flags=self.experimental_flags,
+            options={"slim_dependencies": True},
+        )
+        self.assertEqual(len(self.workflow.actions), 5)
+        self.assertIsInstance(self.workflow.actions[0], CleanUpAction)
+        self.assertIsInstance(self.workflow.actions[1], PythonPipBuildAction)
+        self.assertIsInstance(self.workflow.actions[2], PythonSlimDependenciesAction)
+        self.assertEqual(self.workflow.actions[2].dependencies_dir, "dep")
+        self.assertIsInstance(self.workflow.actions[3], CopySourceAction)
+        self.assertIsInstance(self.workflow.actions[4], CopySourceAction)
+
+    def test_workflow_prunes_imports_before_slimming_dependencies(self):
+        osutils_mock = Mock(spec=self.osutils)
+        osutils_mock.file_exists.return_value = True
+        self.workflow = PythonPipWorkflow(
+            "source",
+            "artifacts",
+            "scratch_dir",
+            "manifest",
+            runtime="python3.9",
+            osutils=osutils_mock,
+            dependencies_dir="dep",
+            download_dependencies=True,
+            experimental_flags=self.experimental_flags,
+            options={"import_pruning": "strict", "slim_dependencies": True},
+        )
+        self.assertEqual(len(self.workflow.actions), 6)
+        self.assertIsInstance(self.workflow.actions[1], PythonPipBuildAction)
+        self.assertIsInstance(self.workflow.actions[2], PythonPruneImportsAction)
+        self.assertEqual(self.workflow.actions[2].source_dir, "source")
+        self.assertEqual(self.workflow.actions[2].dependencies_dir, "dep")
+        self.assertIsInstance(self.workflow.actions[3], PythonSlimDependenciesAction)
+        self.assertIsInstance(self.workflow.actions[4], CopySourceAction)
+        self.assertIsInstance(self.workflow.actions[5], CopySourceAction)
+
+    def test_workflow_prunes_imports_again_when_python_files_change(self):
+        osutils_mock = Mock(spec=self.osutils)
+        osutils_mock.file_exists.return_value = True
+        for mode, expected_actions in [("strict", 5), ("report", 2)]:
+            self.workflow = PythonPipWorkflow(
+                "source",
+                "artifacts",
+                "scratch_dir",
+                "source/requirements.txt",
+                runtime="python3.9",
+                osutils=osutils_mock,
+                dependencies_dir="dep",
+                download_dependencies=True,
+                experimental_flags=self.experimental_flags,
+                options={"import_pruning": mode},
+            )
+
+            actions = self.workflow.get_actions_for_changes(["source/app.py"])
+
+            self.assertEqual(len(actions), expected_actions)
+            # other source files only copy the source again
+            self.assertEqual(len(self.workflow.get_actions_for_changes(["source/data.json"])), 2)
+
+    def test_workflow_compiles_bytecode_last(self):
+        osutils_mock = Mock(spec=self.osutils)
+        osutils_mock.file_exists.return_value = True
+        self.workflow = PythonPipWorkflow(
+            "source",
+            "artifacts",
+            "scratch_dir",
+            "manifest",
+            runtime="python3.9",
+            osutils=osutils_mock,
+            dependencies_dir="dep",
+            download_dependencies=True,
+            combine_dependencies=False,
+            experimental_flags=self.experimental_flags,
+            options={"compile_bytecode": True, "parent_python_packages": "app"},
+        )
+        self.assertIsInstance(self.workflow.actions[-2], PythonCreateParentPackagesAction)
+        self.assertIsInstance(self.workflow.actions[-1], PythonCompileBytecodeAction)
+        # the dependencies are not copied into the artifacts, so they are compiled in place
+        self.assertEqual(self.workflow.actions[-1].directories, ["artifacts", "dep"])
+        self.assertIsInstance(self.workflow.get_validators()[0], PythonRuntimeValidator)
+
     def test_workflow_sets_up_actions_without_download_dependencies_without_dependencies_dir(self):
         osutils_mock = Mock(spec=self.osutils)
         osutils_mock.file_exists.return_value = True
@@ -212,5 +334,7 @@ class TestPythonPipWorkflow(TestCase):
             None,
             binaries=ANY,
             architecture="ARM64",
+            options=None,
+            cache_dir=None,
         )
         self.assertEqual(2, len(self.workflow.actions))
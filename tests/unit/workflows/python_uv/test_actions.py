@@ -0,0 +1,16 @@
+from unittest import TestCase
+
+from aws_lambda_builders.actions import ActionFailedError
+from aws_lambda_builders.workflows.python_uv.actions import PythonUvBuildAction
+from aws_lambda_builders.workflows.python_uv.utils import UvConfig
+
+
+class TestPythonUvBuildAction(TestCase):
+    def test_raises_action_failed_for_unknown_link_modes(self):
+        action = PythonUvBuildAction(
+            "artifacts", "scratch", "requirements.txt", "python3.12", None, {}, config=UvConfig(link_mode="symlink")
+        )
+
+        with self.assertRaises(ActionFailedError) as ex:
+            action.execute()
+        self.assertEqual(str(ex.exception), "uv_link_mode must be one of auto, clone, hardlink, copy, got symlink")
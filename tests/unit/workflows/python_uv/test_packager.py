@@ -1,6 +1,8 @@
 import os
+import shutil
+import tempfile
 from unittest import TestCase
-from unittest.mock import Mock, patch
+from unittest.mock import Mock, call, patch
 
 from aws_lambda_builders.architecture import X86_64
 from aws_lambda_builders.workflows.python_uv.exceptions import MissingUvError, UvBuildError, UvInstallationError
@@ -125,6 +127,123 @@ class TestUvRunner(TestCase):
         self.assertIn("-r", args_called)
         self.assertIn("/path/to/requirements.txt", args_called)
 
+    @patch("aws_lambda_builders.workflows.python_uv.packager.get_default_cache_dir")
+    def test_install_requirements_uses_persistent_cache_by_default(self, default_cache_dir_mock):
+        default_cache_dir_mock.return_value = "/persistent/uv"
+        self.mock_subprocess_uv.run_uv_command.return_value = (0, "", "")
+        config = UvConfig()
+
+        self.uv_runner.install_requirements(
+            requirements_path="/path/to/requirements.txt", target_dir="/target", scratch_dir="/scratch", config=config
+        )
+
+        self.assertEqual(config.cache_dir, "/persistent/uv")
+        self.mock_osutils.makedirs.assert_called_once_with("/persistent/uv")
+        args_called = self.mock_subprocess_uv.run_uv_command.call_args[0][0]
+        self.assertIn("--cache-dir", args_called)
+
+    def test_install_requirements_uses_cache_linked_into_scratch_dir(self):
+        scratch_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, scratch_dir)
+        os.mkdir(os.path.join(scratch_dir, "uv-cache"))
+        self.mock_subprocess_uv.run_uv_command.return_value = (0, "", "")
+        config = UvConfig()
+
+        self.uv_runner.install_requirements(
+            requirements_path="/path/to/requirements.txt", target_dir="/target", scratch_dir=scratch_dir, config=config
+        )
+
+        self.assertEqual(config.cache_dir, os.path.join(scratch_dir, "uv-cache"))
+        self.mock_osutils.makedirs.assert_not_called()
+
+    @patch("aws_lambda_builders.workflows.python_uv.packager.detect_link_mode")
+    def test_install_requirements_detects_link_mode(self, detect_link_mode_mock):
+        detect_link_mode_mock.return_value = "hardlink"
+        self.mock_subprocess_uv.run_uv_command.return_value = (0, "", "")
+
+        self.uv_runner.install_requirements(
+            requirements_path="/path/to/requirements.txt",
+            target_dir="/target",
+            scratch_dir="/scratch",
+            config=UvConfig(cache_dir="/cache"),
+        )
+
+        detect_link_mode_mock.assert_called_once_with("/cache", "/target", True)
+        args_called = self.mock_subprocess_uv.run_uv_command.call_args[0][0]
+        self.assertEqual(args_called[args_called.index("--link-mode") + 1], "hardlink")
+
+    @patch("aws_lambda_builders.workflows.python_uv.packager.detect_link_mode")
+    def test_install_requirements_uses_configured_link_mode(self, detect_link_mode_mock):
+        self.mock_subprocess_uv.run_uv_command.return_value = (0, "", "")
+
+        self.uv_runner.install_requirements(
+            requirements_path="/path/to/requirements.txt",
+            target_dir="/target",
+            scratch_dir="/scratch",
+            config=UvConfig(cache_dir="/cache", link_mode="copy"),
+        )
+
+        detect_link_mode_mock.assert_not_called()
+        args_called = self.mock_subprocess_uv.run_uv_command.call_args[0][0]
+        self.assertEqual(args_called.count("--link-mode"), 1)
+        self.assertEqual(args_called[args_called.index("--link-mode") + 1], "copy")
+
+    def test_install_requirements_does_not_set_cache_when_disabled(self):
+        self.mock_subprocess_uv.run_uv_command.return_value = (0, "", "")
+        config = UvConfig(no_cache=True)
+
+        self.uv_runner.install_requirements(
+            requirements_path="/path/to/requirements.txt", target_dir="/target", scratch_dir="/scratch", config=config
+        )
+
+        self.assertIsNone(config.cache_dir)
+
+    def test_install_requirements_counts_packages_prepared_outside_the_cache(self):
+        self.mock_subprocess_uv.run_uv_command.side_effect = [
+            (0, "", "Resolved 5 packages in 954ms\nPrepared 2 packages in 236ms\nInstalled 5 packages in 4ms\n"),
+            (0, "", "Resolved 1 package in 3ms\nInstalled 1 package in 1ms\n"),
+        ]
+
+        for _ in range(2):
+            self.uv_runner.install_requirements(
+                requirements_path="/path/to/requirements.txt",
+                target_dir="/target",
+                scratch_dir="/scratch",
+                config=UvConfig(cache_dir="/cache"),
+            )
+
+        self.assertEqual(self.uv_runner.cache_statistics, {"installed": 6, "prepared": 2})
+
+    @patch("aws_lambda_builders.workflows.python_uv.packager.get_path_size")
+    def test_prune_cache_prunes_until_the_cache_fits(self, get_path_size_mock):
+        get_path_size_mock.side_effect = [300, 200, 50]
+        self.mock_subprocess_uv.run_uv_command.return_value = (0, "", "")
+
+        statistics = self.uv_runner.prune_cache(UvConfig(cache_dir="/cache"), 100)
+
+        self.assertEqual(statistics, {"bytes_before_pruning": 300, "bytes": 50})
+        self.assertEqual(
+            [call[0][0] for call in self.mock_subprocess_uv.run_uv_command.call_args_list],
+            [["cache", "prune", "--cache-dir", "/cache"], ["cache", "prune", "--cache-dir", "/cache", "--ci"]],
+        )
+
+    @patch("aws_lambda_builders.workflows.python_uv.packager.get_path_size")
+    def test_prune_cache_does_nothing_when_the_cache_fits(self, get_path_size_mock):
+        get_path_size_mock.return_value = 50
+
+        statistics = self.uv_runner.prune_cache(UvConfig(cache_dir="/cache"), 100)
+
+        self.assertEqual(statistics, {"bytes_before_pruning": 50, "bytes": 50})
+        self.mock_subprocess_uv.run_uv_command.assert_not_called()
+
+    @patch("aws_lambda_builders.workflows.python_uv.packager.get_path_size")
+    def test_prune_cache_failure(self, get_path_size_mock):
+        get_path_size_mock.return_value = 300
+        self.mock_subprocess_uv.run_uv_command.return_value = (2, "", "error message")
+
+        with self.assertRaises(UvInstallationError):
+            self.uv_runner.prune_cache(UvConfig(cache_dir="/cache"), 100)
+
     def test_install_requirements_failure(self):
         self.mock_subprocess_uv.run_uv_command.return_value = (1, "", "error message")
 
@@ -157,6 +276,129 @@ class TestPythonUvDependencyBuilder(TestCase):
             self.builder._extract_python_version("")
         self.assertIn("Runtime is required", str(context.exception))
 
+    @patch("os.path.exists")
+    def test_pyproject_build_reuses_exported_requirements(self, mock_exists):
+        export_cache = Mock()
+        export_cache.load.return_value = True
+        self.builder = PythonUvDependencyBuilder(
+            osutils=self.mock_osutils, runtime="python3.9", uv_runner=self.mock_uv_runner, export_cache=export_cache
+        )
+
+        self.builder._handle_pyproject_build(
+            os.path.join("project", "pyproject.toml"),
+            "/target",
+            "scratch",
+            "3.9",
+            X86_64,
+            UvConfig(index_url="https://mirror.com/simple", link_mode="copy"),
+        )
+
+        # the index changes the exported requirements, the link mode doesn't
+        export_cache.compute_key.assert_called_once_with(
+            os.path.join("project", "pyproject.toml"),
+            "3.9",
+            X86_64,
+            os.path.join("project", "uv.lock"),
+            ["--index-url", "https://mirror.com/simple"],
+        )
+        export_cache.load.assert_called_once_with(
+            export_cache.compute_key.return_value, os.path.join("scratch", "lock_requirements.txt")
+        )
+        # neither `uv lock` nor `uv export` run
+        self.mock_uv_runner._uv.run_uv_command.assert_not_called()
+        export_cache.save.assert_not_called()
+        call_args = self.mock_uv_runner.install_requirements.call_args
+        self.assertEqual(call_args[1]["requirements_path"], os.path.join("scratch", "lock_requirements.txt"))
+        self.assertEqual(call_args[1]["cwd"], "project")
+
+    @patch("os.path.exists")
+    def test_pyproject_build_keeps_exported_requirements(self, mock_exists):
+        mock_exists.return_value = False
+        export_cache = Mock()
+        export_cache.load.return_value = False
+        # uv.lock is written by `uv lock`, which changes the key
+        export_cache.compute_key.side_effect = ["before", "after"]
+        self.mock_uv_runner._uv.run_uv_command.return_value = (0, "", "")
+        self.builder = PythonUvDependencyBuilder(
+            osutils=self.mock_osutils, runtime="python3.9", uv_runner=self.mock_uv_runner, export_cache=export_cache
+        )
+
+        self.builder._handle_pyproject_build(
+            os.path.join("project", "pyproject.toml"), "/target", "scratch", "3.9", X86_64, UvConfig()
+        )
+
+        self.assertEqual(
+            [call[0][0][0] for call in self.mock_uv_runner._uv.run_uv_command.call_args_list], ["lock", "export"]
+        )
+        requirements_path = os.path.join("scratch", "lock_requirements.txt")
+        self.assertEqual(
+            export_cache.save.call_args_list, [call("after", requirements_path), call("before", requirements_path)]
+        )
+
+    @patch("aws_lambda_builders.workflows.python_uv.packager.read_project_name")
+    @patch("aws_lambda_builders.workflows.python_uv.packager.find_workspace_root")
+    @patch("os.path.exists")
+    def test_pyproject_build_of_workspace_member(self, mock_exists, find_workspace_root_mock, read_project_name_mock):
+        mock_exists.return_value = False
+        find_workspace_root_mock.return_value = "workspace"
+        read_project_name_mock.return_value = "hello"
+        self.mock_uv_runner._uv.run_uv_command.return_value = (0, "", "")
+
+        self.builder._handle_pyproject_build(
+            os.path.join("workspace", "functions", "hello", "pyproject.toml"),
+            "/target",
+            "scratch",
+            "3.9",
+            X86_64,
+            UvConfig(),
+        )
+
+        # the workspace is locked once, and the member exported from its lock file
+        lock_call, export_call = self.mock_uv_runner._uv.run_uv_command.call_args_list
+        self.assertEqual(lock_call[0][0][0], "lock")
+        self.assertEqual(lock_call[1]["cwd"], "workspace")
+        export_args = export_call[0][0]
+        self.assertEqual(export_args[0], "export")
+        self.assertEqual(export_args[export_args.index("--package") + 1], "hello")
+        self.assertIn("--no-editable", export_args)
+        self.assertEqual(export_call[1]["cwd"], "workspace")
+        # the paths of the other members are relative to the workspace root
+        self.assertEqual(self.mock_uv_runner.install_requirements.call_args[1]["cwd"], "workspace")
+
+    @patch("aws_lambda_builders.workflows.python_uv.packager.read_project_name")
+    @patch("aws_lambda_builders.workflows.python_uv.packager.find_workspace_root")
+    @patch("os.path.exists")
+    def test_pyproject_build_of_workspace_member_uses_existing_lock_file(
+        self, mock_exists, find_workspace_root_mock, read_project_name_mock
+    ):
+        mock_exists.return_value = True
+        find_workspace_root_mock.return_value = "workspace"
+        read_project_name_mock.return_value = "hello"
+        self.mock_uv_runner._uv.run_uv_command.return_value = (0, "", "")
+
+        self.builder._handle_pyproject_build(
+            os.path.join("workspace", "functions", "hello", "pyproject.toml"),
+            "/target",
+            "scratch",
+            "3.9",
+            X86_64,
+            UvConfig(),
+        )
+
+        self.assertEqual([call[0][0][0] for call in self.mock_uv_runner._uv.run_uv_command.call_args_list], ["export"])
+
+    @patch("aws_lambda_builders.workflows.python_uv.packager.read_project_name")
+    @patch("aws_lambda_builders.workflows.python_uv.packager.find_workspace_root")
+    def test_pyproject_build_of_workspace_member_without_name(self, find_workspace_root_mock, read_project_name_mock):
+        find_workspace_root_mock.return_value = "workspace"
+        read_project_name_mock.return_value = None
+
+        with self.assertRaises(UvBuildError) as context:
+            self.builder._handle_pyproject_build(
+                os.path.join("workspace", "hello", "pyproject.toml"), "/target", "scratch", "3.9", X86_64, UvConfig()
+            )
+        self.assertIn("No project name", str(context.exception))
+
     def test_build_from_lock_file(self):
         # Mock the uv command for export
         self.mock_uv_runner._uv.run_uv_command.return_value = (0, b"", b"")
@@ -1,13 +1,18 @@
 import os
+import shutil
 import tempfile
 from unittest import TestCase
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 from aws_lambda_builders.workflows.python_uv.utils import (
     OSUtils,
     UvConfig,
+    detect_link_mode,
     detect_uv_manifest,
+    find_workspace_root,
+    get_default_cache_dir,
     get_uv_version,
+    read_project_name,
 )
 
 
@@ -86,6 +91,119 @@ class TestDetectUvManifest(TestCase):
             self.assertEqual(result, req_dev_path)
 
 
+class TestGetDefaultCacheDir(TestCase):
+    def test_uses_uv_cache_dir_environment_variable(self):
+        with patch.dict(os.environ, {"UV_CACHE_DIR": "/uv/cache", "XDG_CACHE_HOME": "/xdg"}):
+            self.assertEqual(get_default_cache_dir(), "/uv/cache")
+
+    def test_uses_user_cache_directory(self):
+        with patch.dict(os.environ, {"XDG_CACHE_HOME": "/xdg"}):
+            os.environ.pop("UV_CACHE_DIR", None)
+            self.assertEqual(get_default_cache_dir(), os.path.join("/xdg", "aws-lambda-builders", "uv"))
+
+
+class TestUvWorkspaces(TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.member_dir = os.path.join(self.root, "functions", "hello")
+        os.makedirs(self.member_dir)
+        self._write(os.path.join(self.root, "pyproject.toml"), '[tool.uv.workspace]\nmembers = ["functions/*"]\n')
+        self._write(
+            os.path.join(self.member_dir, "pyproject.toml"),
+            '[build-system]\nname = "not-the-project"\n\n[project]  # the function\nname = "hello"\nversion = "0.1.0"\n',
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def _write(self, path, content):
+        with open(path, "w") as f:
+            f.write(content)
+
+    def test_find_workspace_root_of_member(self):
+        self.assertEqual(find_workspace_root(self.member_dir), os.path.abspath(self.root))
+
+    def test_find_no_workspace_root_of_workspace_root(self):
+        self.assertIsNone(find_workspace_root(self.root))
+
+    def test_find_no_workspace_root_of_standalone_project(self):
+        self._write(os.path.join(self.root, "pyproject.toml"), '[project]\nname = "root"\n')
+
+        self.assertIsNone(find_workspace_root(self.member_dir))
+
+    def test_find_no_workspace_root_of_project_that_is_not_a_member(self):
+        other_dir = os.path.join(self.root, "tools", "other")
+        os.makedirs(other_dir)
+        self._write(os.path.join(other_dir, "pyproject.toml"), '[project]\nname = "other"\n')
+
+        self.assertIsNone(find_workspace_root(other_dir))
+
+    def test_find_no_workspace_root_of_excluded_member(self):
+        self._write(
+            os.path.join(self.root, "pyproject.toml"),
+            "[tool.uv.workspace]\n"
+            "members = [\n"
+            '    "functions/*",  # every function\n'
+            "    'libs/**',\n"
+            "]\n"
+            'exclude = ["functions/hello"]\n'
+            "\n"
+            "[tool.other]\n"
+            'exclude = ["functions/world"]\n',
+        )
+        world_dir = os.path.join(self.root, "functions", "world")
+        lib_dir = os.path.join(self.root, "libs", "nested", "lib")
+        os.makedirs(world_dir)
+        os.makedirs(lib_dir)
+
+        self.assertIsNone(find_workspace_root(self.member_dir))
+        # the exclude array of another table doesn't apply
+        self.assertEqual(find_workspace_root(world_dir), os.path.abspath(self.root))
+        self.assertEqual(find_workspace_root(lib_dir), os.path.abspath(self.root))
+
+    def test_find_no_workspace_root_without_members(self):
+        self._write(os.path.join(self.root, "pyproject.toml"), "[tool.uv.workspace]\n")
+
+        self.assertIsNone(find_workspace_root(self.member_dir))
+
+    def test_read_project_name(self):
+        self.assertEqual(read_project_name(os.path.join(self.member_dir, "pyproject.toml")), "hello")
+        self.assertIsNone(read_project_name(os.path.join(self.root, "pyproject.toml")))
+
+
+class TestDetectLinkMode(TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.root, "cache")
+        os.mkdir(self.cache_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    @patch("aws_lambda_builders.workflows.python_uv.utils.sys.platform", "linux")
+    def test_hardlinks_on_the_same_device(self):
+        # the target directory doesn't exist yet, its parent is on the same device
+        self.assertEqual(detect_link_mode(self.cache_dir, os.path.join(self.root, "target", "python")), "hardlink")
+
+    @patch("aws_lambda_builders.workflows.python_uv.utils.sys.platform", "linux")
+    def test_copies_on_the_same_device_without_hardlinks(self):
+        self.assertEqual(detect_link_mode(self.cache_dir, self.root, allow_hardlinks=False), "copy")
+
+    @patch("aws_lambda_builders.workflows.python_uv.utils.sys.platform", "darwin")
+    def test_clones_on_macos(self):
+        self.assertEqual(detect_link_mode(self.cache_dir, self.root), "clone")
+        self.assertEqual(detect_link_mode(self.cache_dir, self.root, allow_hardlinks=False), "clone")
+
+    @patch("aws_lambda_builders.workflows.python_uv.utils.os.stat")
+    def test_copies_across_devices(self, stat_mock):
+        stat_mock.side_effect = lambda path: Mock(st_dev=1 if path == self.cache_dir else 2)
+
+        self.assertEqual(detect_link_mode(self.cache_dir, self.root), "copy")
+
+    def test_copies_without_cache_directory(self):
+        self.assertEqual(detect_link_mode(os.path.join(self.root, "missing"), self.root), "copy")
+
+
 class TestGetUvVersion(TestCase):
     def test_get_uv_version_success(self):
         osutils_mock = Mock()
@@ -150,7 +268,26 @@ class TestUvConfig(TestCase):
         self.assertIn("--exclude-newer", args)
         self.assertIn("2023-01-01", args)
 
+    def test_uv_config_link_mode(self):
+        config = UvConfig(link_mode="copy")
+        args = config.to_uv_args()
+        self.assertEqual(args, ["--link-mode", "copy"])
+
     def test_uv_config_generate_hashes(self):
         config = UvConfig(generate_hashes=True)
         args = config.to_uv_args()
         self.assertIn("--generate-hashes", args)
+
+    def test_uv_config_resolution_args_leave_out_cache_and_link_mode(self):
+        config = UvConfig(
+            index_url="https://index.com",
+            cache_dir="/tmp/uv-cache",
+            no_cache=True,
+            prerelease="allow",
+            exclude_newer="2023-01-01",
+            link_mode="copy",
+        )
+        args = config.to_resolution_args()
+        self.assertEqual(
+            args, ["--index-url", "https://index.com", "--prerelease", "allow", "--exclude-newer", "2023-01-01"]
+        )
@@ -5,7 +5,8 @@ from parameterized import parameterized_class
 
 from aws_lambda_builders.actions import CleanUpAction, CopyDependenciesAction, CopySourceAction
 from aws_lambda_builders.workflows.python_uv.actions import PythonUvBuildAction
-from aws_lambda_builders.workflows.python_uv.utils import EXPERIMENTAL_FLAG_BUILD_PERFORMANCE, OSUtils
+from aws_lambda_builders.utils import EXPERIMENTAL_FLAG_BUILD_PERFORMANCE
+from aws_lambda_builders.workflows.python_uv.utils import OSUtils
 from aws_lambda_builders.workflows.python_uv.workflow import PythonUvWorkflow
 
 
@@ -41,6 +42,89 @@ class TestPythonUvWorkflow(TestCase):
         self.assertIsInstance(self.workflow.actions[0], PythonUvBuildAction)
         self.assertIsInstance(self.workflow.actions[1], CopySourceAction)
 
+    def test_workflow_passes_distribution_report_option(self):
+        self.assertFalse(self.workflow.actions[0].distribution_report)
+
+        self.workflow = PythonUvWorkflow(
+            "source",
+            "artifacts",
+            "scratch_dir",
+            "manifest",
+            runtime="python3.9",
+            osutils=self.osutils_mock,
+            experimental_flags=self.experimental_flags,
+            options={"distribution_report": True},
+        )
+
+        self.assertTrue(self.workflow.actions[0].distribution_report)
+
+    def test_workflow_passes_cache_max_size_option(self):
+        self.assertIsNone(self.workflow.actions[0].cache_max_size)
+
+        self.workflow = PythonUvWorkflow(
+            "source",
+            "artifacts",
+            "scratch_dir",
+            "manifest",
+            runtime="python3.9",
+            osutils=self.osutils_mock,
+            experimental_flags=self.experimental_flags,
+            options={"uv_cache_max_size": 1024},
+        )
+
+        self.assertEqual(self.workflow.actions[0].cache_max_size, 1024)
+
+    def test_workflow_passes_link_mode_option(self):
+        self.assertEqual(self.workflow.actions[0].config.link_mode, "auto")
+
+        self.workflow = PythonUvWorkflow(
+            "source",
+            "artifacts",
+            "scratch_dir",
+            "manifest",
+            runtime="python3.9",
+            osutils=self.osutils_mock,
+            experimental_flags=self.experimental_flags,
+            options={"uv_link_mode": "copy"},
+        )
+
+        self.assertEqual(self.workflow.actions[0].config.link_mode, "copy")
+
+    def test_workflow_does_not_hardlink_the_cache_when_normalizing_artifacts(self):
+        self.assertTrue(self.workflow.actions[0].config.allow_hardlinks)
+
+        for link_mode, expected_link_mode in [("auto", "auto"), ("hardlink", "copy"), ("clone", "clone")]:
+            self.workflow = PythonUvWorkflow(
+                "source",
+                "artifacts",
+                "scratch_dir",
+                "manifest",
+                runtime="python3.9",
+                osutils=self.osutils_mock,
+                experimental_flags=self.experimental_flags,
+                options={"uv_link_mode": link_mode},
+                normalize_artifacts=True,
+            )
+
+            self.assertEqual(self.workflow.actions[0].config.link_mode, expected_link_mode)
+            self.assertFalse(self.workflow.actions[0].config.allow_hardlinks)
+
+    def test_workflow_passes_cache_dir(self):
+        self.assertIsNone(self.workflow.actions[0].cache_dir)
+
+        self.workflow = PythonUvWorkflow(
+            "source",
+            "artifacts",
+            "scratch_dir",
+            "manifest",
+            runtime="python3.9",
+            osutils=self.osutils_mock,
+            experimental_flags=self.experimental_flags,
+            cache_dir="cache",
+        )
+
+        self.assertEqual(self.workflow.actions[0].cache_dir, "cache")
+
     def test_workflow_sets_up_actions_without_requirements(self):
         self.osutils_mock.file_exists.return_value = False
         self.workflow = PythonUvWorkflow(